@@ -11,6 +11,11 @@ setup(
         'console_scripts': [
             'scraper=src.data.cli:main',
         ],
+        'cov2_crime_housing.scrapers': [
+            'bellingham_crime=src.data.scrapers.bellingham_crime:BellinghamCrimeScraper',
+            'seattle_crime=src.data.scrapers.seattle_crime:SeattleCrimeScraper',
+            'property_sales=src.data.scrapers.property_sales:PropertySalesScraper',
+        ],
     },
     python_requires='>=3.8',
 )
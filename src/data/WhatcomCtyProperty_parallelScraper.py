@@ -3,46 +3,93 @@
 Created on Mon Mar 15 19:58:12 2021
 
 @author: Varun.Ramesh
+
+Enrich the sales written by the property_sales scraper with assessor
+details. Run in the directory holding Bellingham_Property_Part1.csv; the
+property_details pipeline stage runs it in the interim data directory.
 """
+import time
+
 import pandas as pd
+
 import helper_functions
-from itertools import combinations,cycle, islice
-import pathos.multiprocessing as mp
-from selenium import webdriver
-import time
 
-def chunks(l, n):
-    """Yield n number of striped chunks from l."""
+PART1_FILE = 'Bellingham_Property_Part1.csv'
+PART2_FILE = 'Bellingham_Property_Part2.csv'
+COMBINED_FILE = 'Bellingham_Property_Sale_Combined.csv'
+
+COLUMNS = ['Sale Date', 'assesors_link', 'Neighborhood', 'Land Acres',
+           'Built Sq ft', 'bedroom', 'bathroom', 'year_built']
+
+# Column names of the housing EDA input, read by src.features.cleaning
+COMBINED_COLUMNS = ['Unique ID', 'Address', 'Sale Date_part1', 'Sale Price',
+                    'assesors_link_part1', 'Neighborhood_org',
+                    'Land Acres_org', 'Built Sq ft_org', 'bedroom_org',
+                    'bathroom_org', 'year_built_org']
+
+_worker = None
+
+
+def chunks(items, n):
+    """Yield n number of striped chunks from items."""
     for i in range(0, n):
-        yield l[i::n]
-
-#Read list of propery sales to be scraped
-df_part1 = pd.read_csv('Bellingham_Property_Part1.csv', index_col=[0])
-
-#create empty dataframe to store property information
-df_part2 = pd.DataFrame(columns = ['Sale Date', 'assesors_link','Neighborhood', 'Land Acres','Built Sq ft','bedroom','bathroom','year_built'])  
-
-p = mp.ProcessingPool(mp.cpu_count()) #use pathos for multi-processing
-total_chunks = 1000 #split dataset into 1000 chunks processed in parallel
-chunked_links = chunks(assesors_link,total_chunks); #list of chunked links
-
-chunk_number = 0
-
-for out in chunked_links: #process links in chunks
-    chunk_number+=1   
-    start = time.time()
-    df = pd.DataFrame(p.map(helper_functions.scrape_website, out),columns = ['Sale Date','assesors_link','Neighborhood', 'Land Acres','Built Sq ft','bedroom','bathroom','year_built'])
-    df_part2 = pd.concat([df_part2,df],axis =0)
-    print('Completed processing {} of {} chunks in {} secs'.format(chunk_number,total_chunks,(time.time() - start)))
-          
-#unique id is used to join
-df_part2['Unique ID'] = [ x+'_sep_'+y for x,y in zip(df_part2['Sale Date'].tolist(),df_part2['assesors_link'].tolist())]
-
-#write output to csv
-df_part2.to_csv('Bellingham_Property_Part2.csv')   
-              
-df_combined = df_part1.set_index('Unique ID').join(df_part2.set_index('Unique ID'),lsuffix='_part1', rsuffix='_part2')
-
-#export dataframe to cvs
-df_combined.to_csv('Bellingham_Property_Sale_Combined.csv')            
-    
\ No newline at end of file
+        yield items[i::n]
+
+
+def scrape_link(unique_id):
+    """Scrape one sale with this process's browser, started on first use."""
+    global _worker
+    if _worker is None:
+        _worker = helper_functions.create_worker()
+    return helper_functions.scrape_website(unique_id, _worker)
+
+
+def read_sales(path):
+    """Read the property_sales output and key each sale as scrape_website
+    expects: sale date and assessor link joined by '_sep_'."""
+    df_part1 = pd.read_csv(path, dtype=str)
+    df_part1['Unique ID'] = (df_part1['Sale Date'] + '_sep_'
+                             + df_part1['Assessor Link'])
+    return df_part1
+
+
+def combine(df_part1, df_part2):
+    """Join the scraped details onto the sales in the EDA input layout."""
+    details = df_part2.drop(columns=['Sale Date', 'assesors_link'])
+    details = details.drop_duplicates('Unique ID').rename(
+        columns=lambda c: c if c == 'Unique ID' else c + '_org')
+    sales = df_part1.rename(columns={'Sale Date': 'Sale Date_part1',
+                                     'Assessor Link': 'assesors_link_part1'})
+    return sales.merge(details, on='Unique ID', how='left')[COMBINED_COLUMNS]
+
+
+def enrich(scrape=scrape_link, map_fn=map, total_chunks=1000):
+    """Scrape the details of every sale in chunks and write the outputs."""
+    df_part1 = read_sales(PART1_FILE)
+    links = df_part1['Unique ID'].dropna().unique().tolist()
+
+    parts = [pd.DataFrame(columns=COLUMNS)]
+    chunk_number = 0
+    for out in chunks(links, total_chunks):  # process links in chunks
+        chunk_number += 1
+        if not out:
+            continue
+        start = time.time()
+        parts.append(pd.DataFrame(list(map_fn(scrape, out)), columns=COLUMNS))
+        print('Completed processing {} of {} chunks in {} secs'.format(
+            chunk_number, total_chunks, (time.time() - start)))
+    df_part2 = pd.concat(parts, axis=0, ignore_index=True)
+
+    # unique id is used to join
+    df_part2['Unique ID'] = df_part2['Sale Date'] + '_sep_' + \
+        df_part2['assesors_link']
+    df_part2.to_csv(PART2_FILE, index=False)
+
+    combine(df_part1, df_part2).to_csv(COMBINED_FILE, index=False)
+
+
+if __name__ == '__main__':
+    import pathos.multiprocessing as mp
+
+    pool = mp.ProcessingPool(mp.cpu_count())  # use pathos for multi-processing
+    enrich(map_fn=pool.map)
@@ -1,23 +1,213 @@
 """Unified CLI for web scraping tools."""
 import click
+import importlib
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.data.config_manager import ConfigManager
-from src.data.utils.logger import setup_logger
-from src.data.scrapers.bellingham_crime import BellinghamCrimeScraper
-from src.data.scrapers.seattle_crime import SeattleCrimeScraper
-from src.data.scrapers.property_sales import PropertySalesScraper
+from src.data.utils.logger import (
+    get_logger, setup_logger, stop_queue_logging
+)
 
 
-# Scraper registry
+# Scraper registry as 'module:Class' paths. Scraper modules pull in pandas,
+# bs4, selenium and tenacity, so they are imported only when a scraper runs.
 SCRAPER_CLASSES = {
-    'bellingham_crime': BellinghamCrimeScraper,
-    'seattle_crime': SeattleCrimeScraper,
-    'property_sales': PropertySalesScraper,
+    'bellingham_crime':
+        'src.data.scrapers.bellingham_crime:BellinghamCrimeScraper',
+    'seattle_crime':
+        'src.data.scrapers.seattle_crime:SeattleCrimeScraper',
+    'property_sales':
+        'src.data.scrapers.property_sales:PropertySalesScraper',
 }
 
+# Entry point group for scrapers registered by other installed packages
+SCRAPER_ENTRY_POINT_GROUP = 'cov2_crime_housing.scrapers'
+
+
+def get_scraper_registry() -> Dict[str, str]:
+    """
+    Get all registered scrapers.
+
+    Built-in scrapers take precedence over entry points with the same name.
+
+    Returns:
+        Dictionary mapping scraper name to its 'module:Class' path
+    """
+    from importlib import metadata
+
+    try:
+        entry_points = metadata.entry_points(group=SCRAPER_ENTRY_POINT_GROUP)
+    except TypeError:
+        # Python < 3.10 returns a dict of groups
+        entry_points = metadata.entry_points().get(
+            SCRAPER_ENTRY_POINT_GROUP, []
+        )
+
+    registry = {ep.name: ep.value for ep in entry_points}
+    registry.update(SCRAPER_CLASSES)
+    return registry
+
+
+def load_scraper_class(scraper_name: str) -> Optional[type]:
+    """
+    Import and return a scraper class by name.
+
+    Args:
+        scraper_name: Registered scraper name (e.g., 'bellingham_crime')
+
+    Returns:
+        Scraper class, or None if no scraper is registered under that name
+    """
+    target = (SCRAPER_CLASSES.get(scraper_name)
+              or get_scraper_registry().get(scraper_name))
+    if not target:
+        return None
+
+    module_name, class_name = target.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def build_scraper(
+    scraper_name: str,
+    config_manager: ConfigManager,
+    project_root: Optional[str] = None
+):
+    """
+    Create a configured scraper instance.
+
+    Args:
+        scraper_name: Registered scraper name (e.g., 'bellingham_crime')
+        config_manager: Loaded configuration
+        project_root: Root for the scraper's data paths. Current directory
+            if None
+
+    Returns:
+        Scraper instance, or None if no scraper is registered under that name
+    """
+    scraper_config = dict(config_manager.get_scraper_config(scraper_name))
+    scraper_config.setdefault(
+        'metrics_dir', config_manager.get('metrics.dir', 'logs/metrics')
+    )
+    if config_manager.get('store.enabled', False):
+        scraper_config.setdefault(
+            'store_path',
+            config_manager.get('store.path', 'data/store.sqlite')
+        )
+
+    scraper_class = load_scraper_class(scraper_name)
+    if not scraper_class:
+        return None
+    return scraper_class(name=scraper_name, config=scraper_config,
+                         project_root=project_root or str(Path.cwd()))
+
+
+def _echo_heading(title: str) -> None:
+    """Echo a section title between rules."""
+    click.echo(f"\n{'=' * 60}")
+    click.echo(title)
+    click.echo('=' * 60)
+
+
+def _selected_scrapers(
+    config_manager: ConfigManager,
+    all_scrapers: bool,
+    flags: Dict[str, bool]
+) -> List[str]:
+    """
+    Names of the scrapers an update should run.
+
+    Args:
+        config_manager: Loaded configuration
+        all_scrapers: Run every enabled scraper
+        flags: Scraper name to whether its option was given
+
+    Returns:
+        Scraper names in run order
+    """
+    if all_scrapers:
+        return [
+            name
+            for name, scraper_config in
+            config_manager.get_all_scrapers().items()
+            if scraper_config.get('enabled', False)
+        ]
+    return [name for name, selected in flags.items() if selected]
+
+
+def _run_scraper(
+    scraper_name: str,
+    config_manager: ConfigManager,
+    profile_dir: Optional[Path]
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Run one scraper and echo its outcome.
+
+    Args:
+        scraper_name: Registered scraper name
+        config_manager: Loaded configuration
+        profile_dir: Directory for profile reports, or None to skip profiling
+
+    Returns:
+        Whether the run succeeded, and its profile summary if profiled
+    """
+    logger = get_logger('scraper.cli')
+    summary = None
+    try:
+        scraper = build_scraper(scraper_name, config_manager)
+        if not scraper:
+            logger.error(f"Scraper not implemented: {scraper_name}")
+            return False, None
+
+        if profile_dir is not None:
+            from src.data.utils.profiling import profile_call
+
+            success, summary = profile_call(
+                scraper_name,
+                scraper.run,
+                profile_dir,
+                top_n=config_manager.get('profiling.top_n', 25)
+            )
+        else:
+            success = scraper.run()
+    except Exception as e:
+        logger.error(f"Error running {scraper_name}: {e}", exc_info=True)
+        click.echo(f"✗ {scraper_name} failed: {e}")
+        return False, None
+
+    if success:
+        metrics = scraper.metrics
+        click.echo(
+            f"✓ {scraper_name} completed successfully "
+            f"({metrics.rows} rows in {metrics.duration_seconds:.1f}s, "
+            f"{metrics.requests} requests, {metrics.retries} retries)"
+        )
+    else:
+        click.echo(f"✗ {scraper_name} failed")
+    return success, summary
+
+
+def _echo_profiles(
+    profiles: Dict[str, Dict[str, Any]],
+    profile_dir: Path
+) -> None:
+    """Echo the hotspots of each profiled scraper run."""
+    _echo_heading(f"Profile hotspots (reports in {profile_dir})")
+
+    for scraper_name, summary in profiles.items():
+        click.echo(
+            f"\n{scraper_name}: {summary['total_seconds']:.1f}s "
+            f"CPU-profiled, peak traced memory "
+            f"{summary['peak_memory_mb']:.1f} MB"
+        )
+        for spot in summary['hotspots']:
+            click.echo(
+                f"  {spot['tottime']:8.3f}s own "
+                f"{spot['cumtime']:8.3f}s cum "
+                f"{spot['calls']:>8} calls  {spot['function']}"
+            )
+
 
 @click.group()
 @click.version_option(version='0.2.0')
@@ -27,93 +217,72 @@ def cli():
 
 
 @cli.command()
-@click.option('--all', 'all_scrapers', is_flag=True, help='Update all enabled scrapers')
-@click.option('--bellingham-crime', 'bellingham_crime', is_flag=True, help='Update Bellingham crime data')
-@click.option('--seattle-crime', 'seattle_crime', is_flag=True, help='Update Seattle crime data')
-@click.option('--property-sales', 'property_sales', is_flag=True, help='Update property sales data')
-@click.option('--config', type=click.Path(exists=True), help='Path to config file')
-@click.option('--log-level', type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR']), default='INFO')
-def update(all_scrapers, bellingham_crime, seattle_crime, property_sales, config, log_level):
+@click.option('--all', 'all_scrapers', is_flag=True,
+              help='Update all enabled scrapers')
+@click.option('--bellingham-crime', 'bellingham_crime', is_flag=True,
+              help='Update Bellingham crime data')
+@click.option('--seattle-crime', 'seattle_crime', is_flag=True,
+              help='Update Seattle crime data')
+@click.option('--property-sales', 'property_sales', is_flag=True,
+              help='Update property sales data')
+@click.option('--config', type=click.Path(exists=True),
+              help='Path to config file')
+@click.option('--log-level',
+              type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR']),
+              default='INFO')
+@click.option('--profile', is_flag=True,
+              help='Profile CPU and memory of each scraper run')
+def update(all_scrapers, bellingham_crime, seattle_crime, property_sales,
+           config, log_level, profile):
     """Update data from web sources."""
     # Load configuration
     config_manager = ConfigManager(config_path=config)
 
     # Setup logging
     log_config = config_manager.get('logging', {})
-    logger = setup_logger(
-        name='scraper.cli',
+    setup_logger(
+        name='scraper',
         log_file=log_config.get('file', 'logs/scraper.log'),
-        level=getattr(logging, log_level)
+        level=getattr(logging, log_level),
+        format_string=log_config.get('format'),
+        max_bytes=log_config.get('max_bytes', 10485760),
+        backup_count=log_config.get('backup_count', 5),
+        use_queue=log_config.get('queue', False),
+        json_lines=log_config.get('json', False),
+        process_safe=log_config.get('process_safe', False)
     )
+    logger = get_logger('scraper.cli')
 
     logger.info("=" * 60)
     logger.info("Starting unified web scraper")
     logger.info("=" * 60)
 
     # Determine which scrapers to run
-    scrapers_to_run = []
-
-    if all_scrapers:
-        # Run all enabled scrapers
-        all_scraper_configs = config_manager.get_all_scrapers()
-        for scraper_name, scraper_config in all_scraper_configs.items():
-            if scraper_config.get('enabled', False):
-                scrapers_to_run.append(scraper_name)
-    else:
-        # Run specific scrapers
-        if bellingham_crime:
-            scrapers_to_run.append('bellingham_crime')
-        if seattle_crime:
-            scrapers_to_run.append('seattle_crime')
-        if property_sales:
-            scrapers_to_run.append('property_sales')
+    scrapers_to_run = _selected_scrapers(config_manager, all_scrapers, {
+        'bellingham_crime': bellingham_crime,
+        'seattle_crime': seattle_crime,
+        'property_sales': property_sales,
+    })
 
     if not scrapers_to_run:
-        click.echo("No scrapers selected. Use --all or specify individual scrapers.")
+        click.echo("No scrapers selected. "
+                   "Use --all or specify individual scrapers.")
         return
 
     # Run scrapers
     results = {}
+    profiles = {}
+    profile_dir = Path(config_manager.get('profiling.dir', 'logs/profiles'))
     for scraper_name in scrapers_to_run:
-        click.echo(f"\n{'=' * 60}")
-        click.echo(f"Running: {scraper_name}")
-        click.echo('=' * 60)
-
-        try:
-            # Get scraper configuration
-            scraper_config = config_manager.get_scraper_config(scraper_name)
-
-            # Get scraper class
-            scraper_class = SCRAPER_CLASSES.get(scraper_name)
-            if not scraper_class:
-                logger.error(f"Scraper not implemented: {scraper_name}")
-                results[scraper_name] = False
-                continue
-
-            # Initialize and run scraper
-            scraper = scraper_class(
-                name=scraper_name,
-                config=scraper_config,
-                project_root=str(Path.cwd())
-            )
-
-            success = scraper.run()
-            results[scraper_name] = success
-
-            if success:
-                click.echo(f"✓ {scraper_name} completed successfully")
-            else:
-                click.echo(f"✗ {scraper_name} failed")
-
-        except Exception as e:
-            logger.error(f"Error running {scraper_name}: {e}", exc_info=True)
-            results[scraper_name] = False
-            click.echo(f"✗ {scraper_name} failed: {e}")
+        _echo_heading(f"Running: {scraper_name}")
+        results[scraper_name], summary = _run_scraper(
+            scraper_name, config_manager, profile_dir if profile else None
+        )
+        if summary is not None:
+            profiles[scraper_name] = summary
 
     # Summary
-    click.echo(f"\n{'=' * 60}")
-    click.echo("Summary")
-    click.echo('=' * 60)
+    _echo_heading("Summary")
 
     successful = sum(1 for v in results.values() if v)
     total = len(results)
@@ -124,12 +293,62 @@ def update(all_scrapers, bellingham_crime, seattle_crime, property_sales, config
         status = "✓" if success else "✗"
         click.echo(f"  {status} {scraper_name}")
 
+    if profiles:
+        _echo_profiles(profiles, profile_dir)
+
+    stop_queue_logging()
+
+
+def _echo_file_status(path: Path, max_age: Dict[str, float],
+                      default_max_age: float) -> None:
+    """
+    Echo one data file's size, rows, dates and staleness from its manifest.
+
+    Args:
+        path: Data file
+        max_age: Scraper name to days after which its data is stale
+        default_max_age: Stale threshold for scrapers not in max_age
+    """
+    from src.data.utils.manifest import manifest_age_days, read_manifest
+
+    size_bytes = path.stat().st_size
+    size_mb = size_bytes / (1024 * 1024)
+    manifest = read_manifest(path)
+
+    if manifest is None:
+        click.echo(f"  - {path.name} ({size_mb:.2f} MB) - no manifest")
+        return
+
+    flags = []
+    age = manifest_age_days(manifest)
+    if age is not None and age > max_age.get(manifest.get('scraper'),
+                                             default_max_age):
+        flags.append('STALE')
+    if manifest.get('size_bytes') != size_bytes:
+        flags.append('MODIFIED SINCE MANIFEST')
+
+    click.echo(f"  - {path.name} ({size_mb:.2f} MB) "
+               f"{manifest['row_count']:,} rows"
+               + (f" [{', '.join(flags)}]" if flags else ''))
+    if manifest.get('min_date'):
+        click.echo(f"      dates {manifest['min_date'][:10]} "
+                   f"to {manifest['max_date'][:10]}")
+    if age is not None:
+        click.echo(f"      updated {age:.1f} days ago")
+
 
 @cli.command()
-@click.option('--config', type=click.Path(exists=True), help='Path to config file')
+@click.option('--config', type=click.Path(exists=True),
+              help='Path to config file')
 def status(config):
-    """Check status of data files."""
+    """Check status of data files from their metadata sidecars."""
     config_manager = ConfigManager(config_path=config)
+    default_stale_days = config_manager.get('status.stale_after_days', 7)
+    stale_days = {
+        name: scraper_config.get('stale_after_days', default_stale_days)
+        for name, scraper_config in
+        config_manager.get_all_scrapers().items()
+    }
 
     click.echo("Data Directory Status")
     click.echo("=" * 60)
@@ -140,13 +359,12 @@ def status(config):
             data_dir = config_manager.get_data_dir(dir_type)
 
             if data_dir.exists():
-                files = list(data_dir.glob('*.csv'))
+                files = sorted(data_dir.glob('*.csv'))
                 click.echo(f"\n{dir_type.upper()}: {data_dir}")
 
                 if files:
                     for f in files:
-                        size_mb = f.stat().st_size / (1024 * 1024)
-                        click.echo(f"  - {f.name} ({size_mb:.2f} MB)")
+                        _echo_file_status(f, stale_days, default_stale_days)
                 else:
                     click.echo("  (no CSV files)")
             else:
@@ -156,6 +374,170 @@ def status(config):
             click.echo(f"\n{dir_type.upper()}: Error - {e}")
 
 
+@cli.command('rebuild-index')
+@click.argument('scraper_names', nargs=-1)
+@click.option('--config', type=click.Path(exists=True),
+              help='Path to config file')
+def rebuild_index(scraper_names, config):
+    """Rebuild dedup key indexes from the data files.
+
+    Rebuilds the named scrapers, or every scraper with dedup_keys if none
+    are given.
+    """
+    config_manager = ConfigManager(config_path=config)
+    all_scraper_configs = config_manager.get_all_scrapers()
+
+    if not scraper_names:
+        scraper_names = [
+            name for name, scraper_config in all_scraper_configs.items()
+            if scraper_config.get('dedup_keys')
+        ]
+
+    failed = False
+    for scraper_name in scraper_names:
+        scraper_config = all_scraper_configs.get(scraper_name)
+        scraper_class = load_scraper_class(scraper_name)
+        if scraper_config is None or scraper_class is None:
+            click.echo(f"✗ {scraper_name}: unknown scraper")
+            failed = True
+            continue
+
+        try:
+            scraper = scraper_class(name=scraper_name, config=scraper_config,
+                                    project_root=str(Path.cwd()))
+            result = scraper.rebuild_key_index()
+        except Exception as e:
+            click.echo(f"✗ {scraper_name}: {e}")
+            failed = True
+            continue
+
+        duplicates = ''
+        if result['duplicates']:
+            duplicates = f" ({result['duplicates']:,} duplicate rows in data)"
+        click.echo(f"✓ {scraper_name}: {result['keys']:,} keys "
+                   f"from {result['rows']:,} rows{duplicates}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument('sql')
+@click.option('--config', type=click.Path(exists=True),
+              help='Path to config file')
+@click.option('--db', type=click.Path(),
+              help='Store file. Defaults to store.path from the config')
+@click.option('--format', 'output_format',
+              type=click.Choice(['table', 'csv']), default='table')
+@click.option('--explain', is_flag=True,
+              help='Show the query plan instead of running the query')
+def query(sql, config, db, output_format, explain):
+    """Run ad-hoc SQL against the analytical store.
+
+    Each scraper has a table named after it. Filter indexed columns with
+    equality or range predicates so SQLite can use the index, e.g.
+
+        query "SELECT * FROM bellingham_crime
+               WHERE Location = '1200 BLOCK STATE ST'
+               AND Date >= '2020-01-01'"
+    """
+    from src.data.utils.store import AnalyticalStore
+
+    config_manager = ConfigManager(config_path=config)
+    db_path = Path(db or config_manager.get('store.path', 'data/store.sqlite'))
+    if not db_path.exists():
+        raise click.ClickException(
+            f"Store not found: {db_path}. "
+            f"Enable store in the config and run update."
+        )
+
+    with AnalyticalStore(db_path, read_only=True) as store:
+        try:
+            if explain:
+                for line in store.explain(sql):
+                    click.echo(line)
+                return
+
+            result = store.query(sql)
+        except Exception as e:
+            raise click.ClickException(f"Query failed: {e}")
+
+    if output_format == 'csv':
+        click.echo(result.to_csv(index=False), nl=False)
+    else:
+        click.echo(result.to_string(index=False)
+                   if not result.empty else '(no rows)')
+        click.echo(f"\n{len(result):,} rows")
+
+
+@cli.command()
+@click.argument('direction', type=click.Choice(['push', 'pull']))
+@click.argument('target')
+@click.option('--config', type=click.Path(exists=True),
+              help='Path to config file')
+@click.option('--root', type=click.Path(),
+              help='Local data directory. Defaults to sync.root from the '
+                   'config')
+@click.option('--jobs', type=int, help='Parallel part transfers')
+@click.option('--part-size-mb', type=int, help='Part size for new targets')
+@click.option('--delete', is_flag=True,
+              help='Remove files that no longer exist on the source side')
+@click.option('--dry-run', is_flag=True,
+              help='Show what would be transferred')
+@click.option('--profile', 'aws_profile',
+              help='AWS profile for s3:// targets')
+@click.option('--endpoint-url',
+              help='S3-compatible endpoint, e.g. a local MinIO')
+def sync(direction, target, config, root, jobs, part_size_mb, delete,
+         dry_run, aws_profile, endpoint_url):
+    """Sync the data directory with TARGET.
+
+    TARGET is s3://bucket/prefix or a directory.
+
+    Only files whose content hash differs from the target's manifest are
+    transferred, and of those only the parts that changed.
+    """
+    from src.data.utils.sync import open_target, pull, push
+
+    config_manager = ConfigManager(config_path=config)
+    root = Path(root or config_manager.get('sync.root', 'data'))
+    jobs = jobs or config_manager.get('sync.jobs', 8)
+    part_size_mb = part_size_mb or config_manager.get('sync.part_size_mb', 8)
+    part_size = part_size_mb * 1024 * 1024
+
+    try:
+        sync_target = open_target(target, profile=aws_profile,
+                                  endpoint_url=endpoint_url)
+        if direction == 'push':
+            report = push(root, sync_target, part_size=part_size, jobs=jobs,
+                          delete=delete, dry_run=dry_run)
+        else:
+            report = pull(root, sync_target, jobs=jobs, delete=delete,
+                          dry_run=dry_run)
+    except Exception as e:
+        raise click.ClickException(f"Sync failed: {e}")
+
+    if dry_run:
+        verb = 'Would transfer'
+    else:
+        verb = 'Uploaded' if direction == 'push' else 'Downloaded'
+    for rel in report['transferred']:
+        click.echo(f"{verb}: {rel}")
+    for rel in report['deleted']:
+        click.echo(f"{'Would delete' if dry_run else 'Deleted'}: {rel}")
+    for rel, error in report['failed'].items():
+        click.echo(f"✗ {rel}: {error}")
+
+    click.echo(f"\n{len(report['transferred'])} transferred, "
+               f"{report['unchanged']} unchanged, "
+               f"{len(report['deleted'])} deleted; "
+               f"{report['bytes_transferred'] / 2 ** 20:.1f} MB transferred, "
+               f"{report['bytes_reused'] / 2 ** 20:.1f} MB reused "
+               f"in {report['seconds']:.1f}s")
+    if report['failed']:
+        raise SystemExit(1)
+
+
 def main():
     """Entry point for CLI."""
     cli()
@@ -7,13 +7,19 @@ import yaml
 class ConfigManager:
     """Manages application configuration from YAML file."""
 
-    def __init__(self, config_path: Optional[str] = None, project_root: Optional[str] = None):
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        project_root: Optional[str] = None
+    ):
         """
         Initialize configuration manager.
 
         Args:
-            config_path: Path to YAML configuration file. Defaults to src/data/config.yaml
-            project_root: Project root directory. Defaults to current working directory
+            config_path: Path to YAML configuration file. Defaults to
+                src/data/config.yaml
+            project_root: Project root directory. Defaults to current
+                working directory
         """
         if project_root is None:
             self.project_root = Path.cwd()
@@ -29,7 +35,9 @@ class ConfigManager:
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         if not self.config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+            raise FileNotFoundError(
+                f"Configuration file not found: {self.config_path}"
+            )
 
         with open(self.config_path, 'r') as f:
             return yaml.safe_load(f)
@@ -39,7 +47,8 @@ class ConfigManager:
         Get configuration value using dot notation.
 
         Args:
-            key: Configuration key in dot notation (e.g., 'scrapers.bellingham_crime.url')
+            key: Configuration key in dot notation
+                (e.g., 'scrapers.bellingham_crime.url')
             default: Default value if key not found
 
         Returns:
@@ -68,7 +77,9 @@ class ConfigManager:
         """
         config = self.get(f'scrapers.{scraper_name}', default={})
         if not config:
-            raise ValueError(f"Scraper configuration not found: {scraper_name}")
+            raise ValueError(
+                f"Scraper configuration not found: {scraper_name}"
+            )
 
         return config
 
@@ -77,7 +88,8 @@ class ConfigManager:
         Get absolute path to data directory.
 
         Args:
-            dir_type: Type of data directory ('raw', 'interim', 'processed', 'external')
+            dir_type: Type of data directory ('raw', 'interim', 'processed',
+                'external')
 
         Returns:
             Absolute path to data directory
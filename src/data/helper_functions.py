@@ -3,52 +3,71 @@ from bs4 import BeautifulSoup
 import re
 from selenium.webdriver.chrome.options import Options
 
+ASSESSOR_URL = 'https://property.whatcomcounty.us/PropertyAccess/'
+DRIVER_PATH = 'D:/Tools/MyTools/Drivers/chromedriver.exe'
+
 
 def create_worker():
     chrome_options = Options()
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--disable-dev-shm-usage')    
-    worker = webdriver.Chrome(executable_path='D:/Tools/MyTools/Drivers/chromedriver.exe',chrome_options=chrome_options)
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    worker = webdriver.Chrome(executable_path=DRIVER_PATH,
+                              chrome_options=chrome_options)
     return worker
 
 
-def scrape_website(url,worker):
-    sale_date = url.split('_sep_')[0]
-    link = url.split('_sep_')[1]
-    worker.get('https://property.whatcomcounty.us/PropertyAccess/'+link)
-    sub_content = worker.page_source
-    sub_content_soup = BeautifulSoup(sub_content,'html.parser')
+def _cell_after(soup, div_id, label, skip=0, default='0'):
+    """Text of the cell after a label, or default if the page lacks it."""
     try:
-        neighborhood = sub_content_soup.find("div", {"id": "propertyDetails"}).find(text = 'Neighborhood:').findNext('td').contents[0].__str__()
-    except:
-       neighborhood = '0' 
-    try:
-        land_acres= sub_content_soup.find("div", {"id": "propertyDetails"}).find(text = 'Legal Acres:').findNext('td').contents[0].__str__()
-    except:
-        land_acres = '0'
-    try:
-        built_sq_ft= sub_content_soup.find("div", {"id": "improvementBuildingDetails"}).find(text = 'State Code:').findNext('td').findNext('td').contents[0].__str__()
-    except:
-        built_sq_ft='0'
-        bedroom='0'
-        bathroom='0'
-        year_built='0'
-        return sale_date,link,neighborhood,land_acres,built_sq_ft,bedroom,bathroom,year_built             
-    try:
-        bedroom=sub_content_soup.find("div", {"id": "improvementBuildingDetails"}).find(text = 'Number of Bedrooms:').findNext('td').contents[0].__str__()
-    except:
-        bedroom='0'
+        cell = soup.find("div", {"id": div_id}).find(text=label)
+        for _ in range(skip + 1):
+            cell = cell.findNext('td')
+        return cell.contents[0].__str__()
+    except Exception:
+        return default
+
+
+def _bathrooms(soup):
+    """Sum of every 'Bath' count on the page, or '0' if unparseable."""
     try:
+        details = soup.find("div", {"id": "improvementBuildingDetails"})
         bathroom = 0
-        baths=sub_content_soup.find("div", {"id": "improvementBuildingDetails"}).find_all(text = re.compile(r"Baths*"))
-        for bath in baths:
-            bathroom+=int(sub_content_soup.find("div", {"id": "improvementBuildingDetails"}).find(text = re.compile(bath)).findNext('td').contents[0])
-        bathroom = str(bathroom)
-    except:
-        bathroom='0'
+        for bath in details.find_all(text=re.compile(r"Baths*")):
+            cell = details.find(text=re.compile(bath)).findNext('td')
+            bathroom += int(cell.contents[0])
+        return str(bathroom)
+    except Exception:
+        return '0'
+
+
+def _year_built(soup):
     try:
-        year_built=sub_content_soup.find("table", class_='improvementDetails').find(text = re.compile(r"[0-9]{4}$")).__str__()
-    except:
-        year_built = '0'
-    return sale_date,link,neighborhood,land_acres,built_sq_ft,bedroom,bathroom,year_built
\ No newline at end of file
+        table = soup.find("table", class_='improvementDetails')
+        return table.find(text=re.compile(r"[0-9]{4}$")).__str__()
+    except Exception:
+        return '0'
+
+
+def scrape_website(url, worker):
+    sale_date = url.split('_sep_')[0]
+    link = url.split('_sep_')[1]
+    worker.get(ASSESSOR_URL + link)
+    sub_content = worker.page_source
+    sub_content_soup = BeautifulSoup(sub_content, 'html.parser')
+    neighborhood = _cell_after(sub_content_soup, 'propertyDetails',
+                               'Neighborhood:')
+    land_acres = _cell_after(sub_content_soup, 'propertyDetails',
+                             'Legal Acres:')
+    built_sq_ft = _cell_after(sub_content_soup, 'improvementBuildingDetails',
+                              'State Code:', skip=1, default=None)
+    if built_sq_ft is None:
+        # No improvement details, so no building to describe
+        return (sale_date, link, neighborhood, land_acres,
+                '0', '0', '0', '0')
+    bedroom = _cell_after(sub_content_soup, 'improvementBuildingDetails',
+                          'Number of Bedrooms:')
+    bathroom = _bathrooms(sub_content_soup)
+    year_built = _year_built(sub_content_soup)
+    return (sale_date, link, neighborhood, land_acres, built_sq_ft,
+            bedroom, bathroom, year_built)
@@ -0,0 +1,316 @@
+"""Typed, column-projected loaders for the project's datasets."""
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import pandas as pd
+
+from src.data.utils.validation import COERCERS
+
+
+# Column specs per dataset. Types are read_csv dtypes, or 'date', 'currency'
+# and 'measure', which are read as categoricals and converted with the schema
+# validation coercers. Date formats match the scraper schemas in config.yaml,
+# which the scrapers write dates back in; ISO dates are accepted as well.
+BELLINGHAM_CRIME_COLUMNS: Dict[str, Dict[str, Any]] = {
+    'Date': {'type': 'date', 'format': '%m/%d/%Y'},
+    'Location': {'type': 'category'},
+    'Offence': {'type': 'category'},
+    'Crime Category': {'type': 'category'},
+    'Case Details': {'type': 'string'},
+}
+
+SEATTLE_CRIME_COLUMNS: Dict[str, Dict[str, Any]] = {
+    'offense_id': {'type': 'Int64'},
+    'report_number': {'type': 'string'},
+    'occurred_date_or_date_range_start': {
+        'type': 'date', 'format': '%Y-%m-%dT%H:%M:%S.%f'
+    },
+    'offense': {'type': 'category'},
+    'offense_parent_group': {'type': 'category'},
+    'crime_against_category': {'type': 'category'},
+    'mcpp': {'type': 'category'},
+    # float32 keeps coordinates to well under a meter
+    'latitude': {'type': 'float32'},
+    'longitude': {'type': 'float32'},
+}
+
+PROPERTY_SALES_COLUMNS: Dict[str, Dict[str, Any]] = {
+    'Assessor Link': {'type': 'string'},
+    'Address': {'type': 'string'},
+    'Sale Date': {'type': 'date', 'format': '%m/%d/%Y'},
+    'Sale Price': {'type': 'currency'},
+}
+
+# Bellingham_Property_Sale_Combined.csv, the input of the housing EDA
+PROPERTY_COMBINED_COLUMNS: Dict[str, Dict[str, Any]] = {
+    'Unique ID': {'type': 'string'},
+    'Address': {'type': 'string'},
+    'Sale Date_part1': {'type': 'date', 'format': '%m/%d/%Y'},
+    'Sale Price': {'type': 'currency'},
+    'assesors_link_part1': {'type': 'string'},
+    'Neighborhood_org': {'type': 'category'},
+    'Land Acres_org': {'type': 'float32'},
+    'Built Sq ft_org': {'type': 'measure'},
+    'bedroom_org': {'type': 'float32'},
+    'bathroom_org': {'type': 'float32'},
+    'year_built_org': {'type': 'Int16'},
+}
+
+DATASETS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    'bellingham_crime': BELLINGHAM_CRIME_COLUMNS,
+    'seattle_crime': SEATTLE_CRIME_COLUMNS,
+    'property_sales': PROPERTY_SALES_COLUMNS,
+    'property_combined': PROPERTY_COMBINED_COLUMNS,
+}
+
+# Types converted after reading rather than by read_csv
+_CONVERTED_TYPES = ('date', 'currency', 'measure')
+
+
+def _read_options(
+    path: Path,
+    spec: Dict[str, Dict[str, Any]],
+    columns: Optional[Sequence[str]]
+) -> Dict[str, Any]:
+    """read_csv arguments projecting and typing the spec's columns in path."""
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = list(columns) if columns is not None else list(spec)
+
+    unknown = [c for c in wanted if c not in spec]
+    if unknown:
+        raise ValueError(
+            f"Unknown columns {unknown}; known columns are {list(spec)}"
+        )
+    missing = []
+    if columns is not None:
+        missing = [c for c in wanted if c not in header]
+    if missing:
+        raise ValueError(f"Columns {missing} are not in {path}")
+
+    usecols = [c for c in wanted if c in header]
+    dtype = {
+        c: ('category' if spec[c]['type'] in _CONVERTED_TYPES
+            else spec[c]['type'])
+        for c in usecols
+    }
+    return {'usecols': usecols, 'dtype': dtype}
+
+
+def _convert(
+    df: pd.DataFrame,
+    spec: Dict[str, Dict[str, Any]],
+    usecols: List[str]
+) -> pd.DataFrame:
+    """Restore the requested column order and parse converted types."""
+    # read_csv returns usecols in file order
+    df = df[usecols]
+    for column in usecols:
+        column_spec = spec[column]
+        if column_spec['type'] in _CONVERTED_TYPES:
+            # Dates and prices repeat heavily, so only the distinct values
+            # are parsed
+            raw = df[column].cat
+            text = pd.Series(raw.categories.astype('string')).str.strip()
+            text = text.mask(text == '')
+            values = COERCERS[column_spec['type']](text, column_spec)
+            unparsed = text[text.notna() & values.isna()]
+            if not unparsed.empty:
+                warnings.warn(
+                    f"{len(unparsed)} distinct values of '{column}' are not "
+                    f"a valid {column_spec['type']} and were loaded as "
+                    f"missing, e.g. {unparsed.iloc[0]!r}",
+                    stacklevel=3
+                )
+            if column_spec['type'] == 'measure':
+                values = values.astype('float32')
+            df[column] = pd.Series(
+                pd.api.extensions.take(values.array, raw.codes.to_numpy(),
+                                       allow_fill=True),
+                index=df.index
+            )
+    return df
+
+
+def load(
+    name: str,
+    path: Path,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Load a dataset with explicit dtypes.
+
+    Args:
+        name: Dataset name in DATASETS
+        path: CSV file
+        columns: Columns to load. All known columns present in the file if None
+
+    Returns:
+        Typed DataFrame with the projected columns in the requested order
+    """
+    spec = DATASETS[name]
+    options = _read_options(path, spec, columns)
+    return _convert(pd.read_csv(path, **options), spec, options['usecols'])
+
+
+def iter_chunks(
+    name: str,
+    path: Path,
+    chunksize: int = 100000,
+    columns: Optional[Sequence[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a dataset in typed chunks.
+
+    Categorical columns get the categories present in each chunk; use
+    union_categoricals or astype(str) before combining chunks.
+
+    Args:
+        name: Dataset name in DATASETS
+        path: CSV file
+        chunksize: Rows per chunk
+        columns: Columns to load. All known columns present in the file if None
+
+    Yields:
+        Typed DataFrames of at most chunksize rows
+    """
+    spec = DATASETS[name]
+    options = _read_options(path, spec, columns)
+    with pd.read_csv(path, chunksize=chunksize, **options) as reader:
+        for chunk in reader:
+            yield _convert(chunk, spec, options['usecols'])
+
+
+def load_bellingham_crime(
+    path: Path,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Load COB_CrimeReport.csv.
+
+    Args:
+        path: CSV file
+        columns: Columns to load, from BELLINGHAM_CRIME_COLUMNS
+
+    Returns:
+        Typed DataFrame; Location, Offence and Crime Category are categorical
+    """
+    return load('bellingham_crime', path, columns)
+
+
+def load_seattle_crime(
+    path: Path,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Load Seattle_Crime_Data.csv.
+
+    Args:
+        path: CSV file
+        columns: Columns to load, from SEATTLE_CRIME_COLUMNS
+
+    Returns:
+        Typed DataFrame with categorical offenses and float32 coordinates
+    """
+    return load('seattle_crime', path, columns)
+
+
+def load_property_sales(
+    path: Path,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Load Bellingham_Property_Part1.csv.
+
+    Args:
+        path: CSV file
+        columns: Columns to load, from PROPERTY_SALES_COLUMNS
+
+    Returns:
+        Typed DataFrame with parsed sale dates and prices
+    """
+    return load('property_sales', path, columns)
+
+
+def load_property_combined(
+    path: Path,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Load Bellingham_Property_Sale_Combined.csv, the housing EDA input.
+
+    Args:
+        path: CSV file
+        columns: Columns to load, from PROPERTY_COMBINED_COLUMNS
+
+    Returns:
+        Typed DataFrame, accepted by src.features.cleaning.clean_housing_df
+    """
+    return load('property_combined', path, columns)
+
+
+def measure_load(load_fn: Callable[[], pd.DataFrame]) -> Dict[str, float]:
+    """
+    Time a load and trace its peak memory.
+
+    Args:
+        load_fn: Function performing the load
+
+    Returns:
+        Dictionary with seconds, peak_mb (traced allocations during the load)
+        and frame_mb (deep memory usage of the result)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        df = load_fn()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds': round(seconds, 3),
+        'peak_mb': round(peak / 2 ** 20, 1),
+        'frame_mb': round(
+            float(df.memory_usage(deep=True).sum()) / 2 ** 20, 1
+        ),
+    }
+
+
+def compare_with_naive(
+    name: str,
+    path: Path,
+    columns: Optional[Sequence[str]] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the typed loader against the notebooks' plain read_csv.
+
+    The naive read loads every column as inferred and parses dates with
+    format inference, as the notebooks do with pd.to_datetime.
+
+    Args:
+        name: Dataset name in DATASETS
+        path: CSV file
+        columns: Columns for the typed load
+
+    Returns:
+        Dictionary with 'naive' and 'typed' measurements from measure_load
+    """
+    spec = DATASETS[name]
+    dates: List[str] = [
+        c for c, column_spec in spec.items() if column_spec['type'] == 'date'
+    ]
+
+    def naive() -> pd.DataFrame:
+        df = pd.read_csv(path)
+        for column in dates:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], format='mixed')
+        return df
+
+    return {
+        'naive': measure_load(naive),
+        'typed': measure_load(lambda: load(name, path, columns)),
+    }
@@ -0,0 +1 @@
+"""Local stand-in servers and load-test harness for the scrapers."""
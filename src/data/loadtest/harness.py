@@ -0,0 +1,349 @@
+"""Load-test harness running the real scrapers against local stand-ins."""
+import json
+import multiprocessing
+import queue
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from urllib.request import urlopen
+
+import click
+
+from src.data.config_manager import ConfigManager
+from src.data.loadtest.stub_servers import (
+    STATS_PATH, AspNetFormServer, SalesGridServer, SocrataServer, percentile
+)
+
+
+SOURCES = ('bellingham_crime', 'seattle_crime', 'property_sales')
+
+# Dataset sizes at --scale 1, roughly matching one full production run
+BASELINE_SIZES = {
+    'bellingham_crime': {'rows_per_month': 1000},
+    'seattle_crime': {'total_rows': 100000},
+    'property_sales': {'total_sales': 10000, 'page_size': 50},
+}
+
+STUB_CLASSES = {
+    'bellingham_crime': AspNetFormServer,
+    'seattle_crime': SocrataServer,
+    'property_sales': SalesGridServer,
+}
+
+
+def build_stub(source: str, scale: float = 1.0, **options) -> Any:
+    """
+    Create (but do not start) the stand-in server for a source.
+
+    Args:
+        source: Scraper name
+        scale: Multiplier applied to the baseline dataset size
+        **options: latency_ms, jitter_ms, error_rate, seed
+
+    Returns:
+        Stub server instance
+    """
+    sizes = dict(BASELINE_SIZES[source])
+    for key in ('rows_per_month', 'total_rows', 'total_sales'):
+        if key in sizes:
+            sizes[key] = max(int(sizes[key] * scale), 1)
+
+    return STUB_CLASSES[source](**sizes, **options)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return peak / divisor
+
+
+def _serve_stub(source, scale, options, ready, stop):
+    """Child process target: run a stub server until told to stop."""
+    stub = build_stub(source, scale, **options).start()
+    pages = getattr(stub, 'page_count', None)
+    ready.put({
+        'url': stub.url,
+        'base_url': f"http://{stub.host}:{stub.port}",
+        'pages': pages,
+    })
+    stop.wait()
+    stub.stop()
+
+
+def _run_scrapers(source, config, concurrency, work_dir, results):
+    """Child process target: run `concurrency` scrapers in parallel threads."""
+    from src.data.cli import load_scraper_class
+
+    scraper_class = load_scraper_class(source)
+
+    def run_one(index):
+        scraper = scraper_class(
+            name=source,
+            config=dict(config),
+            project_root=str(Path(work_dir) / f"{source}-{index}")
+        )
+        success = scraper.run()
+        metrics = scraper.metrics.to_dict()
+        return {
+            'success': success,
+            'rows': metrics['rows'],
+            'seconds': metrics['duration_seconds'],
+            'retries': metrics['retries'],
+            'parse_seconds': metrics['parse_seconds'],
+        }
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        runs = list(pool.map(run_one, range(concurrency)))
+    wall = time.perf_counter() - started
+
+    results.put({
+        'runs': runs, 'wall_seconds': wall, 'peak_rss_mb': peak_rss_mb()
+    })
+
+
+def _wait_for_result(
+    results,
+    worker,
+    source: str,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Wait for the scraper worker's result without hanging on a dead worker.
+
+    Args:
+        results: Queue the worker puts its result on
+        worker: Worker process
+        source: Scraper name, for error messages
+        timeout: Seconds to wait in total. No limit while the worker is
+            alive if None
+
+    Returns:
+        The worker's result
+
+    Raises:
+        RuntimeError: If the worker exited (crashed, OOM-killed) without a
+            result
+        TimeoutError: If the timeout passed first
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except queue.Empty:
+            pass
+        if worker.exitcode is not None:
+            # The result may still be in flight from a worker that just exited
+            try:
+                return results.get(timeout=1.0)
+            except queue.Empty:
+                raise RuntimeError(
+                    f"Load-test worker for {source} exited with code "
+                    f"{worker.exitcode} without a result"
+                )
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(
+                f"Load-test worker for {source} gave no result within "
+                f"{timeout}s"
+            )
+
+
+def _scraper_config(
+    config_manager: ConfigManager,
+    source: str,
+    url: str,
+    pages: Optional[int]
+) -> Dict:
+    """Production scraper configuration pointed at the stand-in server."""
+    config = dict(config_manager.get_scraper_config(source))
+    config['url'] = url
+    config['rate_limit_seconds'] = 0
+    if pages is not None:
+        config['max_pages'] = pages
+    return config
+
+
+def run_source(
+    source: str,
+    config_manager: ConfigManager,
+    work_dir: str,
+    scale: float = 1.0,
+    concurrency: int = 1,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Load-test one scraper against its stand-in server.
+
+    The stub server and the scrapers run in separate spawned processes so that
+    the reported peak RSS belongs to the scrapers alone. A worker that dies
+    (crash, OOM kill) or exceeds timeout seconds fails the run instead of
+    hanging it.
+
+    Returns:
+        Report with throughput, server-side latency percentiles and peak RSS
+    """
+    ctx = multiprocessing.get_context('spawn')
+    ready, stop, results = ctx.Queue(), ctx.Event(), ctx.Queue()
+    options = {
+        'latency_ms': latency_ms,
+        'jitter_ms': jitter_ms,
+        'error_rate': error_rate,
+        'seed': seed,
+    }
+
+    server = ctx.Process(target=_serve_stub,
+                         args=(source, scale, options, ready, stop),
+                         daemon=True)
+    server.start()
+    worker = None
+
+    try:
+        endpoint = ready.get(timeout=120)
+        config = _scraper_config(config_manager, source, endpoint['url'],
+                                 endpoint['pages'])
+
+        worker = ctx.Process(
+            target=_run_scrapers,
+            args=(source, config, concurrency, work_dir, results)
+        )
+        worker.start()
+        outcome = _wait_for_result(results, worker, source, timeout)
+        worker.join()
+
+        with urlopen(endpoint['base_url'] + STATS_PATH) as response:
+            server_stats = json.loads(response.read().decode('utf-8'))
+    finally:
+        if worker is not None and worker.is_alive():
+            worker.terminate()
+            worker.join()
+        stop.set()
+        server.join(timeout=30)
+
+    runs = outcome['runs']
+    rows = sum(run['rows'] for run in runs)
+    run_seconds = [run['seconds'] for run in runs]
+    wall = outcome['wall_seconds']
+
+    return {
+        'source': source,
+        'scale': scale,
+        'concurrency': concurrency,
+        'successful_runs': sum(1 for run in runs if run['success']),
+        'rows': rows,
+        'wall_seconds': round(wall, 3),
+        'rows_per_second': round(rows / wall, 1) if wall else 0.0,
+        'run_seconds_p50': round(percentile(run_seconds, 50), 3),
+        'run_seconds_max': round(max(run_seconds), 3) if run_seconds else 0.0,
+        'parse_seconds': round(sum(run['parse_seconds'] for run in runs), 3),
+        'retries': sum(run['retries'] for run in runs),
+        'requests': server_stats['requests'],
+        'server_errors': server_stats['errors'],
+        'bytes_sent': server_stats['bytes_sent'],
+        'latency_p50_ms': round(server_stats['latency_p50_ms'], 2),
+        'latency_p95_ms': round(server_stats['latency_p95_ms'], 2),
+        'latency_p99_ms': round(server_stats['latency_p99_ms'], 2),
+        'latency_max_ms': round(server_stats['latency_max_ms'], 2),
+        'peak_rss_mb': round(outcome['peak_rss_mb'], 1),
+    }
+
+
+def run_load_test(
+    sources: Iterable[str],
+    config_path: Optional[str] = None,
+    **options
+) -> Dict[str, Dict]:
+    """
+    Load-test several scrapers one after another.
+
+    Args:
+        sources: Scraper names to exercise
+        config_path: Scraper configuration file. Defaults to
+            src/data/config.yaml
+        **options: Passed to run_source
+
+    Returns:
+        Dictionary mapping scraper name to its report
+    """
+    config_manager = ConfigManager(config_path=config_path)
+    reports = {}
+
+    with tempfile.TemporaryDirectory(prefix='cov2_loadtest_') as work_dir:
+        for source in sources:
+            reports[source] = run_source(source, config_manager, work_dir,
+                                         **options)
+
+    return reports
+
+
+@click.command()
+@click.option('--source', 'sources', multiple=True, type=click.Choice(SOURCES),
+              help='Scraper to load-test (repeatable). Defaults to all')
+@click.option('--scale', type=float, default=1.0,
+              help='Dataset size multiplier over the baseline')
+@click.option('--concurrency', type=int, default=1,
+              help='Concurrent scraper instances per source')
+@click.option('--latency-ms', type=float, default=0.0,
+              help='Fixed server latency per request')
+@click.option('--jitter-ms', type=float, default=0.0,
+              help='Random extra latency per request')
+@click.option('--error-rate', type=float, default=0.0,
+              help='Probability of an HTTP 503 per request')
+@click.option('--seed', type=int, default=0,
+              help='Seed for generated data and injected faults')
+@click.option('--timeout', type=float,
+              help='Seconds each source may run before it is failed')
+@click.option('--config', type=click.Path(exists=True),
+              help='Path to config file')
+@click.option('--output', type=click.Path(),
+              help='Write the JSON report to this file')
+def main(sources, scale, concurrency, latency_ms, jitter_ms, error_rate,
+         seed, timeout, config, output):
+    """Run the scrapers against local stand-in servers and report."""
+    reports = run_load_test(
+        sources or SOURCES,
+        config_path=config,
+        scale=scale,
+        concurrency=concurrency,
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        error_rate=error_rate,
+        seed=seed,
+        timeout=timeout,
+    )
+
+    for source, report in reports.items():
+        click.echo(f"\n{'=' * 60}")
+        click.echo(f"{source} (scale {scale}, concurrency {concurrency})")
+        click.echo('=' * 60)
+        click.echo(f"  Runs OK:      "
+                   f"{report['successful_runs']}/{concurrency}")
+        click.echo(f"  Rows:         {report['rows']} in "
+                   f"{report['wall_seconds']}s "
+                   f"({report['rows_per_second']} rows/s)")
+        click.echo(f"  Requests:     {report['requests']} "
+                   f"({report['server_errors']} errors, "
+                   f"{report['retries']} retries)")
+        click.echo(f"  Parse time:   {report['parse_seconds']}s")
+        click.echo(f"  Latency ms:   p50 {report['latency_p50_ms']}  "
+                   f"p95 {report['latency_p95_ms']}  "
+                   f"p99 {report['latency_p99_ms']}  "
+                   f"max {report['latency_max_ms']}")
+        click.echo(f"  Peak RSS:     {report['peak_rss_mb']} MB")
+
+    if output:
+        Path(output).write_text(json.dumps(reports, indent=2))
+        click.echo(f"\nReport written to {output}")
+
+
+if __name__ == '__main__':
+    main()
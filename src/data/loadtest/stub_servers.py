@@ -0,0 +1,557 @@
+"""Local stand-in HTTP servers emulating the scraped data sources."""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+
+STATS_PATH = '/__stats'
+
+OFFENCES = [
+    'Theft', 'Burglary', 'Robbery', 'Assault', 'Drug Violation',
+    'Traffic Accident', 'DUI', 'Vandalism', 'Trespass', 'Noise Complaint'
+]
+
+STREETS = [
+    'STATE ST', 'HOLLY ST', 'MERIDIAN ST', 'CORNWALL AVE', 'ELLIS ST',
+    'JAMES ST', 'GUIDE MERIDIAN', 'LAKEWAY DR', 'SAMISH WAY',
+    'BILL MCDONALD PKWY'
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Compute a percentile using nearest-rank on a list of values.
+
+    Args:
+        values: Sample values
+        pct: Percentile in the range 0-100
+
+    Returns:
+        Percentile value, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class StubServer(ABC):
+    """Base class for local stand-in servers with injectable faults.
+
+    Every response can be delayed by a fixed latency plus jitter, and a
+    share of requests can be answered with HTTP 503.
+    """
+
+    path = '/'
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        host: str = '127.0.0.1',
+        port: int = 0
+    ):
+        """
+        Initialize stub server.
+
+        Args:
+            latency_ms: Fixed delay added to every response
+            jitter_ms: Maximum random delay added on top of latency_ms
+            error_rate: Probability (0-1) of answering with HTTP 503
+            seed: Seed for the latency/error random generator
+            host: Interface to bind
+            port: Port to bind. 0 picks a free port
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._bytes_sent = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Full URL of the emulated endpoint."""
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    @abstractmethod
+    def handle(self, method: str, path: str, query: Dict[str, List[str]],
+               form: Dict[str, List[str]]) -> Tuple[int, str, bytes]:
+        """
+        Produce a response for a request.
+
+        Args:
+            method: HTTP method
+            path: Request path without query string
+            query: Parsed query string
+            form: Parsed urlencoded request body
+
+        Returns:
+            Tuple of (status code, content type, body)
+        """
+        pass
+
+    def start(self) -> 'StubServer':
+        """Start serving on a background thread."""
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub._dispatch(self, 'GET')
+
+            def do_POST(self):
+                stub._dispatch(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={'poll_interval': 0.05},
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for the serving thread to exit."""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarize served requests.
+
+        Returns:
+            Dictionary with request, error and byte counts plus latency
+            percentiles in ms
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            errors = self._errors
+            bytes_sent = self._bytes_sent
+
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'bytes_sent': bytes_sent,
+            'latency_p50_ms': percentile(latencies, 50) * 1000,
+            'latency_p95_ms': percentile(latencies, 95) * 1000,
+            'latency_p99_ms': percentile(latencies, 99) * 1000,
+            'latency_max_ms': max(latencies) * 1000 if latencies else 0.0,
+        }
+
+    def _dispatch(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        """Apply latency/error injection and write the response."""
+        started = time.perf_counter()
+        parts = urlsplit(request.path)
+
+        length = int(request.headers.get('Content-Length') or 0)
+        body = request.rfile.read(length).decode('utf-8') if length else ''
+
+        if parts.path == STATS_PATH:
+            self._write(request, 200, 'application/json',
+                        json.dumps(self.stats()).encode('utf-8'))
+            return
+
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if fail:
+            status, content_type = 503, 'text/plain'
+            payload = b'Service Unavailable'
+        else:
+            try:
+                status, content_type, payload = self.handle(
+                    method, parts.path, parse_qs(parts.query), parse_qs(body)
+                )
+            except Exception as e:
+                status, content_type = 500, 'text/plain'
+                payload = str(e).encode('utf-8')
+
+        self._write(request, status, content_type, payload)
+
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+            self._bytes_sent += len(payload)
+            if status >= 400:
+                self._errors += 1
+
+    @staticmethod
+    def _write(
+        request: BaseHTTPRequestHandler,
+        status: int,
+        content_type: str,
+        payload: bytes
+    ) -> None:
+        """Write a complete HTTP response."""
+        request.send_response(status)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+
+class AspNetFormServer(StubServer):
+    """Emulates the Bellingham police activity ASP.NET release form."""
+
+    path = '/PIRPressSummary/ReleaseForm.aspx'
+    generator = 'C2EE9ABB'
+    max_tokens = 10000
+
+    def __init__(self, rows_per_month: int = 1000, **kwargs):
+        """
+        Initialize ASP.NET form emulator.
+
+        Args:
+            rows_per_month: Number of activity rows returned per month of
+                the date range
+            **kwargs: Passed to StubServer
+        """
+        super().__init__(**kwargs)
+        self.rows_per_month = rows_per_month
+        self._issued: 'OrderedDict[str, str]' = OrderedDict()
+        self._counter = 0
+
+    def _issue_tokens(self) -> Tuple[str, str]:
+        """Issue a fresh viewstate and its matching event validation value."""
+        with self._lock:
+            self._counter += 1
+            seed = f"vs-{self._counter}-{self._random.random()}"
+            viewstate = hashlib.sha1(seed.encode()).hexdigest()
+            validation = hashlib.sha1(
+                f"ev-{viewstate}".encode()
+            ).hexdigest()[:16]
+            self._issued[viewstate] = validation
+            while len(self._issued) > self.max_tokens:
+                self._issued.popitem(last=False)
+
+        return viewstate, validation
+
+    def _form_page(self) -> str:
+        """Render the empty search form."""
+        viewstate, validation = self._issue_tokens()
+        return (
+            '<html><body><form method="post">'
+            '<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" '
+            f'value="{viewstate}" />'
+            '<input type="hidden" name="__VIEWSTATEGENERATOR" '
+            f'id="__VIEWSTATEGENERATOR" value="{self.generator}" />'
+            '<input type="hidden" name="__EVENTVALIDATION" '
+            f'id="__EVENTVALIDATION" value="{validation}" />'
+            '<input name="ctl00$ContentPlaceHolder1$txtStartDate" />'
+            '<input name="ctl00$ContentPlaceHolder1$txtEndDate" />'
+            '<input type="submit" name="ctl00$ContentPlaceHolder1$btnSubmit" '
+            'value="Submit" />'
+            '</form></body></html>'
+        )
+
+    def _valid_tokens(self, form: Dict[str, List[str]]) -> bool:
+        """Check the posted viewstate was issued here and is consistent."""
+        viewstate = form.get('__VIEWSTATE', [''])[0]
+        validation = form.get('__EVENTVALIDATION', [''])[0]
+        generator = form.get('__VIEWSTATEGENERATOR', [''])[0]
+
+        with self._lock:
+            expected = self._issued.get(viewstate)
+
+        return (expected is not None and expected == validation
+                and generator == self.generator)
+
+    def _result_rows(self, start: datetime, end: datetime) -> str:
+        """Render deterministic activity rows for months in [start, end]."""
+        rows = []
+        year, month = start.year, start.month
+
+        while (year, month) <= (end.year, end.month):
+            for i in range(self.rows_per_month):
+                day = i % 28 + 1
+                street = STREETS[(i * 7 + month) % len(STREETS)]
+                block = (i * 13 % 40 + 1) * 100
+                offence = OFFENCES[(i + year + month) % len(OFFENCES)]
+                rows.append(
+                    f'<tr><td>{month:02d}/{day:02d}/{year}</td>'
+                    f'<td>{block} BLK {street}</td>'
+                    f'<td>{offence} - Case #{year}{month:02d}-{i:06d}</td>'
+                    '</tr>'
+                )
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+
+        return ''.join(rows)
+
+    def handle(self, method, path, query, form):
+        """Serve the form on GET and the results table on a valid POST."""
+        if path != self.path:
+            return 404, 'text/plain', b'Not Found'
+
+        if method == 'GET':
+            return 200, 'text/html', self._form_page().encode('utf-8')
+
+        if not self._valid_tokens(form):
+            return 500, 'text/html', b'Validation of viewstate MAC failed.'
+
+        start = datetime.strptime(
+            form['ctl00$ContentPlaceHolder1$txtStartDate'][0], '%m/%d/%Y'
+        )
+        end = datetime.strptime(
+            form['ctl00$ContentPlaceHolder1$txtEndDate'][0], '%m/%d/%Y'
+        )
+
+        html = (
+            '<html><body><table>'
+            '<tr><th>Date</th><th>Location</th><th>Offence</th></tr>'
+            f'{self._result_rows(start, end)}'
+            '</table></body></html>'
+        )
+        return 200, 'text/html', html.encode('utf-8')
+
+
+class SocrataServer(StubServer):
+    """Emulates a Socrata SODA resource endpoint.
+
+    Supports the $limit, $offset, $where and $order parameters.
+    """
+
+    path = '/resource/tazs-3rd5.json'
+    default_limit = 1000
+
+    _where_clause = re.compile(
+        r"^\s*(\w+)\s*(>=|<=|!=|=|>|<)\s*('([^']*)'|[-\d.]+)\s*$"
+    )
+
+    def __init__(self, total_rows: int = 100000, **kwargs):
+        """
+        Initialize Socrata emulator.
+
+        Args:
+            total_rows: Number of rows in the emulated dataset
+            **kwargs: Passed to StubServer
+        """
+        super().__init__(**kwargs)
+        self.total_rows = total_rows
+
+        rng = np.random.default_rng(kwargs.get('seed', 0))
+        start = np.datetime64('2008-01-01T00:00:00')
+        span_minutes = 60 * 24 * 365 * 15
+
+        self._columns = {
+            'offense_id': np.arange(1, total_rows + 1, dtype=np.int64),
+            'occurred_date_or_date_range_start': start + rng.integers(
+                0, span_minutes, total_rows).astype('timedelta64[m]'),
+            'offense_code': rng.integers(0, len(OFFENCES), total_rows),
+            'latitude': 47.5 + rng.random(total_rows) * 0.25,
+            'longitude': -122.45 + rng.random(total_rows) * 0.2,
+        }
+        self._order_cache: Dict[str, np.ndarray] = {}
+
+    def _coerce(self, field: str, raw: str):
+        """Convert a literal from a $where clause to the column's type."""
+        if raw.startswith("'"):
+            raw = raw[1:-1]
+        column = self._columns[field]
+        if np.issubdtype(column.dtype, np.datetime64):
+            return np.datetime64(raw.replace('Z', ''))
+        return column.dtype.type(raw)
+
+    def _where_mask(self, where: str) -> np.ndarray:
+        """Evaluate a conjunction of simple comparisons into a boolean mask."""
+        mask = np.ones(self.total_rows, dtype=bool)
+        operators = {
+            '=': np.equal, '!=': np.not_equal, '>': np.greater,
+            '>=': np.greater_equal, '<': np.less, '<=': np.less_equal,
+        }
+
+        for clause in re.split(r'\s+AND\s+', where, flags=re.IGNORECASE):
+            match = self._where_clause.match(clause)
+            if not match or match.group(1) not in self._columns:
+                raise ValueError(f"Unsupported $where clause: {clause}")
+            field, op, literal = match.group(1), match.group(2), match.group(3)
+            mask &= operators[op](self._columns[field],
+                                  self._coerce(field, literal))
+
+        return mask
+
+    def _ordering(self, order: str) -> np.ndarray:
+        """Return row positions sorted by a comma separated $order."""
+        if order in self._order_cache:
+            return self._order_cache[order]
+
+        keys = []
+        for term in reversed(order.split(',')):
+            parts = term.split()
+            field = parts[0]
+            if field not in self._columns:
+                raise ValueError(f"Unknown $order field: {field}")
+            values = self._columns[field]
+            if len(parts) > 1 and parts[1].upper() == 'DESC':
+                if np.issubdtype(values.dtype, np.datetime64):
+                    values = values.astype(np.int64)
+                values = -values
+            keys.append(values)
+
+        positions = np.lexsort(keys)
+        self._order_cache[order] = positions
+        return positions
+
+    def _record(self, i: int) -> Dict[str, str]:
+        """Render one row as Socrata would serialize it."""
+        offence = OFFENCES[self._columns['offense_code'][i]]
+        occurred = str(
+            self._columns['occurred_date_or_date_range_start'][i]
+            .astype('datetime64[s]')
+        )
+        return {
+            'report_number': f"{occurred[:4]}-{i:06d}",
+            'offense_id': str(self._columns['offense_id'][i]),
+            'occurred_date_or_date_range_start': occurred + '.000',
+            'offense': offence,
+            'offense_parent_group': offence.upper(),
+            'latitude': f"{self._columns['latitude'][i]:.6f}",
+            'longitude': f"{self._columns['longitude'][i]:.6f}",
+        }
+
+    def handle(self, method, path, query, form):
+        """Serve a JSON page of rows for the SoQL parameters."""
+        if path != self.path or method != 'GET':
+            return 404, 'text/plain', b'Not Found'
+
+        try:
+            limit = int(query.get('$limit', [self.default_limit])[0])
+            offset = int(query.get('$offset', [0])[0])
+            if '$order' in query:
+                positions = self._ordering(query['$order'][0])
+            else:
+                positions = np.arange(self.total_rows)
+            if '$where' in query:
+                mask = self._where_mask(query['$where'][0])
+                positions = positions[mask[positions]]
+        except (ValueError, KeyError) as e:
+            body = json.dumps(
+                {'error': True, 'message': str(e)}
+            ).encode('utf-8')
+            return 400, 'application/json', body
+
+        page = positions[offset:offset + limit]
+        body = json.dumps([self._record(i) for i in page]).encode('utf-8')
+        return 200, 'application/json', body
+
+
+class SalesGridServer(StubServer):
+    """Emulates the paged Whatcom County property sales grid."""
+
+    path = '/PropertyAccess/SearchResultsSales.aspx'
+    # Page links rendered either side of the current page, like the
+    # GridView pager; first and last are always linked
+    pager_window = 10
+
+    def __init__(
+        self,
+        total_sales: int = 10000,
+        page_size: int = 50,
+        **kwargs
+    ):
+        """
+        Initialize sales grid emulator.
+
+        Args:
+            total_sales: Number of sales in the emulated result set
+            page_size: Sales rendered per grid page
+            **kwargs: Passed to StubServer
+        """
+        super().__init__(**kwargs)
+        self.total_sales = total_sales
+        self.page_size = page_size
+
+    @property
+    def page_count(self) -> int:
+        """Number of grid pages."""
+        pages = (self.total_sales + self.page_size - 1) // self.page_size
+        return max(pages, 1)
+
+    def _page_html(self, page: int) -> str:
+        """Render one grid page with its pager links."""
+        first = (page - 1) * self.page_size
+        last = min(first + self.page_size, self.total_sales)
+        base_date = datetime(2015, 1, 1)
+
+        rows = []
+        for i in range(first, last):
+            sale_date = base_date + timedelta(days=i % 2500)
+            street = STREETS[i % len(STREETS)]
+            rows.append(
+                f'<tr><td><a href="Property.aspx?cid={i + 1}">View</a></td>'
+                f'<td>{(i * 37) % 4000 + 100} {street} BELLINGHAM</td>'
+                f'<td>{sale_date.month}/{sale_date.day}/{sale_date.year}</td>'
+                f'<td>${250000 + (i * 7919) % 500000:,}</td></tr>'
+            )
+
+        window = range(max(page - self.pager_window, 1),
+                       min(page + self.pager_window, self.page_count) + 1)
+        pager = ''.join(
+            f'<a href="{self.path}?page={n}">{n}</a> ' if n != page
+            else f'<span>{n}</span> '
+            for n in sorted({1, *window, self.page_count})
+        )
+
+        return (
+            '<html><body><table id="GridView1">'
+            '<tr><th>Link</th><th>Address</th><th>Sale Date</th>'
+            '<th>Sale Price</th></tr>'
+            f'{"".join(rows)}'
+            '</table>'
+            f'<div class="pager">{pager}</div>'
+            '</body></html>'
+        )
+
+    def handle(self, method, path, query, form):
+        """Serve the requested grid page."""
+        if path != self.path:
+            return 404, 'text/plain', b'Not Found'
+
+        try:
+            page = int(query.get('page', ['1'])[0])
+        except ValueError:
+            page = 1
+
+        if page < 1 or page > self.page_count:
+            return 404, 'text/plain', b'Not Found'
+
+        return 200, 'text/html', self._page_html(page).encode('utf-8')
@@ -1,23 +1,781 @@
+"""Build the datasets as a DAG of stages, rebuilding only the stale ones.
+
+Stages run raw -> interim -> processed: the scrapers, the property detail
+enrichment, crime and housing cleaning, the housing-crime join and the
+model design matrix. Each stage declares the files it reads and writes;
+a stage depends on the stages that write its inputs. A stage is rebuilt
+when the content hash of an input, its parameters, or its outputs
+changed since its last successful run, as recorded in a state file.
+Independent stages run in parallel.
+"""
 import json
-import requests
-import pandas as pd
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+)
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+)
+import click
 
-#Seattle Crime data
-url = "https://data.seattle.gov/resource/tazs-3rd5.json?$limit=900000&$offset=0&$order=offense_id"
+from src.data.config_manager import ConfigManager
+from src.data.utils.manifest import (
+    file_sha256, manifest_age_days, read_manifest
+)
 
-output_folder = 'D:\\OneDrive - PACCAR Inc\\Current_Projects\\Personal\\Courses\\DataScientist\\Project 1\\cov2_crimerate\\data\\raw\\'
 
-def api_json_to_pandas(url):
-    r = requests.get(url)
-    json_data = r.json()
-    df = pd.json_normalize(json_data)
-    return df
+STATE_VERSION = 1
+DEFAULT_STATE_FILE = 'data/3_processed/pipeline.state.json'
+DEFAULT_FEATURES_DIR = 'data/3_processed/features'
+DEFAULT_HOUSING_FILE = 'Bellingham_Property_Sale_Combined.csv'
+# Legacy enrichment script; reads Bellingham_Property_Part1.csv and writes
+# the combined sales file in its working directory
+PROPERTY_DETAILS_SCRIPT = (
+    Path(__file__).parent / 'WhatcomCtyProperty_parallelScraper.py'
+)
 
-if __name__ == '__main__':
-   seattle_crime_data=api_json_to_pandas(url)
-   seattle_crime_data.to_csv(output_folder+'Seattle_Crime_Data.csv')
+# Run outcomes
+BUILT = 'built'
+FRESH = 'fresh'
+MANUAL = 'manual'
+FAILED = 'failed'
+BLOCKED = 'blocked'
+# Dry-run prediction for stages that would run
+REBUILD = 'rebuild'
+
+
+class Stage:
+    """A pipeline step: an action that turns input files into output files."""
+
+    def __init__(
+        self,
+        name: str,
+        action: Callable[[], Any],
+        inputs: Sequence[Path] = (),
+        outputs: Sequence[Path] = (),
+        params: Optional[Dict[str, Any]] = None,
+        max_age_days: Optional[float] = None,
+        manual: bool = False
+    ):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Unique stage name
+            action: Called without arguments to build the outputs
+            inputs: Files the stage reads
+            outputs: Files the stage writes
+            params: Settings that change the outputs; a change makes the
+                stage stale
+            max_age_days: For stages without inputs (scrapers), rebuild when
+                the output is older than this
+            manual: Only run when forced or requested by name, e.g. slow
+                scrapes that are triggered by hand
+        """
+        self.name = name
+        self.action = action
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.params = params or {}
+        self.max_age_days = max_age_days
+        self.manual = manual
+
+
+class Pipeline:
+    """
+    Schedules stages by their file dependencies and tracks their inputs.
+
+    The state file keeps, per stage, the content hashes of its inputs and
+    outputs and its parameters at the last successful run, plus a cache of
+    file hashes keyed by size and modification time so unchanged files are
+    not re-read on every run.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        state_path: Path,
+        root: Optional[Path] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in any order
+            state_path: JSON state file
+            root: Paths in the state file are stored relative to this
+                directory. Defaults to the current working directory
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+
+        self.producers: Dict[Path, str] = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(
+                        f"{output} is written by both "
+                        f"{self.producers[output]} and {stage.name}"
+                    )
+                self.producers[output] = stage.name
+
+        self.state_path = Path(state_path)
+        self.root = Path(root) if root else Path.cwd()
+        self.state = self._load_state()
+        self.order = self._topological_order()
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Read the state file, starting over if missing or outdated."""
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            state = {}
+        if state.get('version') != STATE_VERSION:
+            state = {'version': STATE_VERSION, 'stages': {}, 'hashes': {}}
+        return state
+
+    def _save_state(self) -> None:
+        """Write the state file atomically."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + '.tmp')
+        tmp.write_text(json.dumps(self.state, indent=2, sort_keys=True))
+        os.replace(tmp, self.state_path)
+
+    def _label(self, path: Path) -> str:
+        """Path as recorded in the state file."""
+        try:
+            resolved = Path(path).resolve()
+            return resolved.relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def dependencies(self, name: str) -> List[str]:
+        """
+        Stages that write the inputs of a stage.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Names of the upstream stages
+        """
+        producers = (
+            self.producers.get(path) for path in self.stages[name].inputs
+        )
+        return sorted({
+            producer for producer in producers
+            if producer and producer != name
+        })
+
+    def _topological_order(self) -> List[str]:
+        """
+        Stage names with every stage after its dependencies.
+
+        Otherwise stages keep their definition order.
+        """
+        order: List[str] = []
+        visiting: Set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle through {name}")
+            visiting.add(name)
+            for dependency in self.dependencies(name):
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def select(self, targets: Iterable[str] = ()) -> List[str]:
+        """
+        Stages needed for the targets, in run order.
+
+        Args:
+            targets: Stage names. Every stage if empty
+
+        Returns:
+            The targets and all their upstream stages
+        """
+        targets = list(targets)
+        unknown = [name for name in targets if name not in self.stages]
+        if unknown:
+            raise ValueError(
+                f"Unknown stages {unknown}; stages are {self.order}"
+            )
+        if not targets:
+            return list(self.order)
+
+        needed: Set[str] = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.dependencies(name))
+        return [name for name in self.order if name in needed]
+
+    def file_hash(self, path: Path) -> Optional[str]:
+        """
+        Content hash of a file.
+
+        The recorded hash is reused while size and mtime are unchanged.
+
+        Args:
+            path: File to hash
+
+        Returns:
+            Hex SHA-256, or None if the file does not exist
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        label = self._label(path)
+        cached = self.state['hashes'].get(label)
+        if (cached and cached['size'] == stat.st_size
+                and cached['mtime_ns'] == stat.st_mtime_ns):
+            return cached['sha256']
+
+        digest = file_sha256(path)
+        self.state['hashes'][label] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+        }
+        return digest
+
+    def stale_reason(self, name: str, force: bool = False) -> Optional[str]:
+        """
+        Why a stage needs to run, judged from the files as they are now.
+
+        Args:
+            name: Stage name
+            force: Rebuild regardless of the state
+
+        Returns:
+            Reason such as 'input changed: COB_CrimeReport.csv', or None if
+            the stage is fresh
+        """
+        stage = self.stages[name]
+        record = self.state['stages'].get(name)
+
+        if force:
+            return 'forced'
+        missing = [path.name for path in stage.outputs if not path.exists()]
+        if missing:
+            if record is None and len(missing) == len(stage.outputs):
+                return 'never built'
+            return f"output missing: {', '.join(missing)}"
+
+        if not stage.inputs:
+            return self._source_age_reason(stage)
+
+        if record is None:
+            return 'never built'
+        if record['params'] != _jsonable(stage.params):
+            return 'parameters changed'
+        changed = self._changed(stage.inputs, record['inputs'])
+        if changed:
+            return f"input changed: {', '.join(changed)}"
+        modified = self._changed(stage.outputs, record['outputs'])
+        if modified:
+            return f"output modified: {', '.join(modified)}"
+        return None
+
+    def _changed(
+        self,
+        paths: Sequence[Path],
+        recorded: Dict[str, Optional[str]]
+    ) -> List[str]:
+        """Names of the files whose hash differs from the recorded one."""
+        return [
+            path.name for path in paths
+            if self.file_hash(path) != recorded.get(self._label(path))
+        ]
+
+    def _source_age_reason(self, stage: Stage) -> Optional[str]:
+        """Staleness of a stage without inputs, from the age of its outputs."""
+        if stage.max_age_days is None:
+            return None
+        for path in stage.outputs:
+            manifest = read_manifest(path)
+            age = manifest_age_days(manifest) if manifest else None
+            if age is None:
+                age = (time.time() - path.stat().st_mtime) / 86400
+            if age > stage.max_age_days:
+                return f"{path.name} older than {stage.max_age_days:g} days"
+        return None
+
+    def _missing_inputs(self, name: str) -> List[str]:
+        """Inputs of a stage that do not exist."""
+        return [
+            path.name for path in self.stages[name].inputs
+            if not path.exists()
+        ]
+
+    def plan(
+        self,
+        targets: Iterable[str] = (),
+        force: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict what a run would do without running anything.
+
+        A stage is predicted to rebuild when it is stale now or when a stage
+        it depends on would rebuild. The real run re-checks each stage after
+        its dependencies finish, so a rebuilt upstream that produced
+        identical files does not rebuild its dependents.
+
+        Args:
+            targets: Stage names. Every stage if empty
+            force: Stage names to rebuild regardless of the state
+
+        Returns:
+            One entry per selected stage with stage, action and reason
+        """
+        targets, force = list(targets), set(force)
+        actions: Dict[str, str] = {}
+        entries = []
+
+        for name in self.select(targets):
+            stage = self.stages[name]
+            dependencies = self.dependencies(name)
+            rebuilding = [d for d in dependencies if actions[d] == REBUILD]
+            blocked = [d for d in dependencies if actions[d] == BLOCKED]
+            missing = [
+                path.name for path in stage.inputs
+                if not path.exists()
+                and self.producers.get(path) not in rebuilding
+            ]
+
+            if blocked:
+                action = BLOCKED
+                reason = f"upstream {', '.join(blocked)} blocked"
+            elif missing:
+                action = BLOCKED
+                reason = f"missing input: {', '.join(missing)}"
+            else:
+                reason = self.stale_reason(name, force=name in force)
+                if reason is None and rebuilding:
+                    reason = f"upstream {', '.join(rebuilding)} rebuilds"
+                action = FRESH if reason is None \
+                    else self._run_or_manual(stage, targets, force)
+
+            actions[name] = action
+            entries.append(
+                {'stage': name, 'action': action, 'reason': reason or ''}
+            )
+        return entries
+
+    @staticmethod
+    def _run_or_manual(
+        stage: Stage,
+        targets: Sequence[str],
+        force: Set[str]
+    ) -> str:
+        """Whether a stale stage runs or waits to be triggered by hand."""
+        requested = stage.name in targets or stage.name in force
+        return MANUAL if stage.manual and not requested else REBUILD
+
+    def run(
+        self,
+        targets: Iterable[str] = (),
+        force: Iterable[str] = (),
+        jobs: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Rebuild the stale stages, running independent stages in parallel.
+
+        Staleness is checked when a stage's dependencies have finished, and
+        the state is saved after every successful stage, so an interrupted
+        run resumes where it stopped. A failed stage blocks its dependents
+        but not unrelated stages.
 
+        Args:
+            targets: Stage names. Every stage if empty
+            force: Stage names to rebuild regardless of the state
+            jobs: Stages run at the same time
 
+        Returns:
+            One entry per selected stage with stage, status, reason and
+            seconds, in run order
+        """
+        targets, force = list(targets), set(force)
+        selected = self.select(targets)
+        run = _Run(
+            selected, {name: set(self.dependencies(name)) for name in selected}
+        )
 
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while len(run.results) < len(selected):
+                for name in run.ready():
+                    self._start(name, run, pool, targets, force)
+                if not run.running:
+                    continue
 
+                done, _ = wait(list(run.running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect(future, run)
 
+        return [run.results[name] for name in selected]
+
+    def _start(
+        self,
+        name: str,
+        run: '_Run',
+        pool: ThreadPoolExecutor,
+        targets: Sequence[str],
+        force: Set[str]
+    ) -> None:
+        """Submit a stage whose dependencies finished, or settle it."""
+        stage = self.stages[name]
+        failed = [
+            d for d in self.dependencies(name)
+            if run.results[d]['status'] in (FAILED, BLOCKED)
+        ]
+        missing = self._missing_inputs(name)
+        if failed:
+            run.finish(name, BLOCKED,
+                       f"upstream {', '.join(failed)} did not build")
+            return
+        if missing:
+            run.finish(name, BLOCKED, f"missing input: {', '.join(missing)}")
+            return
+
+        reason = self.stale_reason(name, force=name in force)
+        if reason is None:
+            run.finish(name, FRESH)
+        elif self._run_or_manual(stage, targets, force) == MANUAL:
+            run.finish(name, MANUAL, reason)
+        else:
+            inputs = {
+                self._label(path): self.file_hash(path)
+                for path in stage.inputs
+            }
+            future = pool.submit(_timed, stage.action)
+            run.running[future] = (name, reason, inputs)
+
+    def _collect(self, future: Future, run: '_Run') -> None:
+        """Record the outcome of a stage that stopped running."""
+        name, reason, inputs = run.running.pop(future)
+        try:
+            seconds = future.result()
+        except Exception as e:
+            run.finish(name, FAILED, f"{reason}; {type(e).__name__}: {e}")
+            return
+
+        missing = [
+            path.name for path in self.stages[name].outputs
+            if not path.exists()
+        ]
+        if missing:
+            run.finish(name, FAILED, f"did not write {', '.join(missing)}",
+                       seconds)
+            return
+        self._record(name, inputs, seconds)
+        run.finish(name, BUILT, reason, seconds)
+
+    def _record(
+        self,
+        name: str,
+        inputs: Dict[str, Optional[str]],
+        seconds: float
+    ) -> None:
+        """Save what a stage was built from after a successful run."""
+        stage = self.stages[name]
+        self.state['stages'][name] = {
+            'params': _jsonable(stage.params),
+            'inputs': inputs,
+            'outputs': {
+                self._label(path): self.file_hash(path)
+                for path in stage.outputs
+            },
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(seconds, 3),
+        }
+        self._save_state()
+
+
+class _Run:
+    """Progress of one Pipeline.run: finished, waiting and running stages."""
+
+    def __init__(self, selected: List[str], waiting: Dict[str, Set[str]]):
+        """
+        Initialize the run.
+
+        Args:
+            selected: Stage names to settle, in run order
+            waiting: Unfinished dependencies per stage
+        """
+        self.selected = selected
+        self.waiting = waiting
+        self.results: Dict[str, Dict[str, Any]] = {}
+        # Future -> (stage name, stale reason, input hashes at submission)
+        self.running: Dict[
+            Future, Tuple[str, str, Dict[str, Optional[str]]]
+        ] = {}
+
+    def ready(self) -> List[str]:
+        """Stages not yet started whose dependencies have all finished."""
+        started = {entry[0] for entry in self.running.values()}
+        return [
+            name for name in self.selected
+            if name not in self.results and name not in started
+            and not self.waiting[name]
+        ]
+
+    def finish(
+        self,
+        name: str,
+        status: str,
+        reason: str = '',
+        seconds: float = 0.0
+    ) -> None:
+        """Record a stage's outcome and release the stages waiting on it."""
+        self.results[name] = {
+            'stage': name,
+            'status': status,
+            'reason': reason,
+            'seconds': round(seconds, 3),
+        }
+        for dependencies in self.waiting.values():
+            dependencies.discard(name)
+
+
+def _timed(action: Callable[[], Any]) -> float:
+    """Run an action and return its duration in seconds."""
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def _jsonable(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Parameters as they compare after a JSON round trip.
+
+    Tuples become lists, so they compare equal to the recorded lists.
+    """
+    return json.loads(json.dumps(params, sort_keys=True, default=str))
+
+
+def _scrape(
+    scraper_name: str,
+    config_manager: ConfigManager
+) -> Callable[[], None]:
+    """Action running a registered scraper."""
+    def action() -> None:
+        from src.data.cli import build_scraper
+
+        scraper = build_scraper(
+            scraper_name, config_manager,
+            project_root=str(config_manager.project_root)
+        )
+        if scraper is None:
+            raise RuntimeError(f"Scraper not implemented: {scraper_name}")
+        if not scraper.run():
+            raise RuntimeError(f"Scraper {scraper_name} failed")
+    return action
+
+
+def _property_details(work_dir: Path) -> Callable[[], None]:
+    """Action running the legacy property detail enrichment script.
+
+    The script runs in the interim directory.
+    """
+    def action() -> None:
+        env = dict(os.environ)
+        # The script imports helper_functions from its own directory
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [
+            str(PROPERTY_DETAILS_SCRIPT.parent), env.get('PYTHONPATH')
+        ]))
+        subprocess.run(
+            [sys.executable, str(PROPERTY_DETAILS_SCRIPT)],
+            cwd=work_dir, env=env, check=True
+        )
+    return action
+
+
+def build_pipeline(config_manager: ConfigManager) -> Pipeline:
+    """
+    Define the project's stages from the configuration.
+
+    One scrape stage per configured scraper with a registered class
+    (disabled scrapers become manual stages), the property detail
+    enrichment, then crime_clean, housing_clean, crime_join and
+    design_matrix in the feature cache directory.
+
+    Args:
+        config_manager: Loaded configuration
+
+    Returns:
+        Pipeline with its state file from pipeline.state_file
+    """
+    root = config_manager.project_root
+    features_dir = root / config_manager.get(
+        'pipeline.features_dir', DEFAULT_FEATURES_DIR
+    )
+    windows = sorted(set(config_manager.get('pipeline.windows', [6])))
+    case_column = config_manager.get('pipeline.case_column')
+
+    stages, scraper_outputs = _scrape_stages(config_manager)
+
+    interim = config_manager.get_data_dir('interim')
+    sales_path = scraper_outputs.get(
+        'property_sales', interim / 'Bellingham_Property_Part1.csv'
+    )
+    housing_path = interim / config_manager.get(
+        'pipeline.housing_file', DEFAULT_HOUSING_FILE
+    )
+    crime_path = scraper_outputs.get(
+        'bellingham_crime', interim / 'COB_CrimeReport.csv'
+    )
+    crime_date_column = config_manager.get(
+        'scrapers.bellingham_crime.date_column', 'Date'
+    )
+
+    stages.append(Stage(
+        'property_details', _property_details(interim),
+        inputs=[sales_path], outputs=[housing_path],
+        manual=not config_manager.get(
+            'scrapers.property_details.enabled', False
+        )
+    ))
+
+    def crime_clean() -> None:
+        from src.features.cache import FeatureCache, build_crime_clean
+        build_crime_clean(crime_path, FeatureCache(features_dir),
+                          date_column=crime_date_column)
+
+    def housing_clean() -> None:
+        from src.features.cache import FeatureCache, build_housing_clean
+        build_housing_clean(housing_path, FeatureCache(features_dir))
+
+    def crime_join() -> None:
+        from src.features.cache import FeatureCache, build_crime_join
+        build_crime_join(FeatureCache(features_dir), windows=windows,
+                         case_column=case_column)
+
+    def design_matrix() -> None:
+        from src.features.cache import FeatureCache, build_design_matrix
+        build_design_matrix(FeatureCache(features_dir))
+
+    # File names follow FeatureCache.data_path and src.features.matrix
+    stages += [
+        Stage('crime_clean', crime_clean, inputs=[crime_path],
+              outputs=[features_dir / 'crime_clean.parquet'],
+              params={'date_column': crime_date_column}),
+        Stage('housing_clean', housing_clean, inputs=[housing_path],
+              outputs=[features_dir / 'housing_clean.parquet']),
+        Stage('crime_join', crime_join,
+              inputs=[features_dir / 'crime_clean.parquet',
+                      features_dir / 'housing_clean.parquet'],
+              outputs=[features_dir / 'crime_join.parquet'],
+              params={'windows': windows, 'case_column': case_column}),
+        Stage('design_matrix', design_matrix,
+              inputs=[features_dir / 'crime_join.parquet'],
+              outputs=[features_dir / 'design_matrix.npy',
+                       features_dir / 'design_matrix.json']),
+    ]
+
+    state_path = root / config_manager.get(
+        'pipeline.state_file', DEFAULT_STATE_FILE
+    )
+    return Pipeline(stages, state_path, root=root)
+
+
+def _scrape_stages(
+    config_manager: ConfigManager
+) -> Tuple[List[Stage], Dict[str, Path]]:
+    """
+    One scrape stage per configured scraper with a registered class.
+
+    Args:
+        config_manager: Loaded configuration
+
+    Returns:
+        The stages, and the output path of every scraper with an output
+        file, registered or not
+    """
+    from src.data.cli import get_scraper_registry
+
+    default_stale_days = config_manager.get('status.stale_after_days', 7)
+    registry = get_scraper_registry()
+
+    stages: List[Stage] = []
+    outputs: Dict[str, Path] = {}
+    for name, scraper_config in config_manager.get_all_scrapers().items():
+        if 'output_file' not in scraper_config:
+            continue
+        output_dir = config_manager.get_data_dir(
+            scraper_config.get('output_dir', 'raw')
+        )
+        outputs[name] = output_dir / scraper_config['output_file']
+        if name not in registry:
+            continue
+        stages.append(Stage(
+            f'scrape_{name}', _scrape(name, config_manager),
+            outputs=[outputs[name]],
+            max_age_days=scraper_config.get(
+                'stale_after_days', default_stale_days
+            ),
+            manual=not scraper_config.get('enabled', False)
+        ))
+    return stages, outputs
+
+
+@click.command()
+@click.argument('stages', nargs=-1)
+@click.option('--config', type=click.Path(exists=True),
+              help='Path to config file')
+@click.option('--dry-run', is_flag=True,
+              help='Show what would rebuild and why, without running anything')
+@click.option('--force', multiple=True,
+              help='Rebuild this stage even if it is fresh (repeatable)')
+@click.option('--jobs', type=int, default=None,
+              help='Stages run in parallel. Defaults to pipeline.jobs or 4')
+def main(stages, config, dry_run, force, jobs):
+    """Rebuild the stale stages needed for STAGES (all if none are given)."""
+    config_manager = ConfigManager(config_path=config)
+    pipeline = build_pipeline(config_manager)
+
+    unknown = [
+        name for name in list(stages) + list(force)
+        if name not in pipeline.stages
+    ]
+    if unknown:
+        raise click.ClickException(
+            f"Unknown stages {unknown}; "
+            f"stages are {', '.join(pipeline.order)}"
+        )
+
+    if dry_run:
+        for entry in pipeline.plan(stages, force):
+            line = f"{entry['stage']:<24} {entry['action']:<8} "
+            click.echo((line + entry['reason']).rstrip())
+        return
+
+    jobs = jobs or config_manager.get('pipeline.jobs', 4)
+    report = pipeline.run(stages, force, jobs=jobs)
+    for entry in report:
+        seconds = f"{entry['seconds']:.1f}s" \
+            if entry['status'] in (BUILT, FAILED) else ''
+        line = f"{entry['stage']:<24} {entry['status']:<8} {seconds:>8} "
+        click.echo((line + entry['reason']).rstrip())
+
+    if any(entry['status'] == FAILED for entry in report):
+        raise click.ClickException("Some stages failed")
+
+
+if __name__ == '__main__':
+    main()
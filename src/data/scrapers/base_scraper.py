@@ -6,7 +6,26 @@ import time
 import logging
 import pandas as pd
 
+from src.data.utils.key_index import KeyIndex, key_strings
 from src.data.utils.logger import get_logger
+from src.data.utils.manifest import (
+    build_manifest, read_manifest, write_manifest
+)
+from src.data.utils.metrics import ScraperMetrics
+from src.data.utils.store import AnalyticalStore
+from src.data.utils.validation import COERCERS, format_dates, validate_frame
+
+
+def count_retry(retry_state) -> None:
+    """
+    tenacity before_sleep callback counting retries on the scraper instance.
+
+    Args:
+        retry_state: tenacity RetryCallState of a decorated scraper method
+    """
+    scraper = retry_state.args[0] if retry_state.args else None
+    if isinstance(scraper, BaseScraper):
+        scraper.metrics.increment('retries')
 
 
 class BaseScraper(ABC):
@@ -37,6 +56,21 @@ class BaseScraper(ABC):
         self.rate_limit_seconds = config.get('rate_limit_seconds', 2)
         self.max_retries = config.get('max_retries', 3)
         self.timeout = config.get('timeout', 30)
+        self.metrics_dir = config.get('metrics_dir', 'logs/metrics')
+        self.date_column = config.get('date_column')
+        self.date_format = config.get('date_format')
+        self.schema = config.get('schema')
+        self.dedup_keys = config.get('dedup_keys')
+        self.incremental = config.get('incremental', False)
+        self.store_path = config.get('store_path')
+        self.store_table = config.get('store_table', name)
+        self.store_indexes = config.get(
+            'store_indexes', [self.date_column] if self.date_column else []
+        )
+
+        # Per-run metrics
+        self.metrics = ScraperMetrics(name)
+        self.scrape_duration_seconds: Optional[float] = None
 
         # Set up logging
         self.logger = get_logger(f'scraper.{name}')
@@ -75,16 +109,237 @@ class BaseScraper(ABC):
 
         return output_dir / self.output_file
 
-    def save_data(self, df: pd.DataFrame) -> None:
+    def validate(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Save DataFrame to CSV file.
+        Coerce scraped data to the configured schema before it is saved.
+
+        Rows failing validation are written to <output>.rejected.csv with the
+        reason; exact duplicates are dropped. Without a schema the data is
+        returned unchanged.
+
+        Args:
+            df: Raw scraped data
+
+        Returns:
+            Valid rows with real dtypes
+        """
+        if not self.schema:
+            return df
+
+        with self.metrics.timer('validate_seconds'):
+            valid, rejected = validate_frame(df, self.schema)
+
+        duplicates = len(df) - len(valid) - len(rejected)
+        self.logger.info(
+            f"Validated {len(df)} records: {len(valid)} valid, "
+            f"{len(rejected)} rejected, {duplicates} duplicates dropped"
+        )
+
+        if not rejected.empty:
+            rejected_path = self.get_rejected_path()
+            rejected.to_csv(rejected_path, index=False)
+            self.logger.warning(
+                f"Wrote {len(rejected)} rejected records to {rejected_path}"
+            )
+
+        return valid
+
+    def get_rejected_path(self) -> Path:
+        """
+        Get the path for rows rejected by validation.
+
+        Returns:
+            Path next to the output file with a .rejected.csv suffix
+        """
+        output_path = self.get_output_path()
+        return output_path.with_name(f"{output_path.stem}.rejected.csv")
+
+    def get_key_index_path(self) -> Path:
+        """
+        Get the path of the persistent dedup key index.
+
+        Returns:
+            Path next to the output file with a .keys.sqlite suffix
+        """
+        output_path = self.get_output_path()
+        return output_path.with_name(f"{output_path.stem}.keys.sqlite")
+
+    def save_data(self, df: pd.DataFrame) -> int:
+        """
+        Save DataFrame to CSV file with a metadata sidecar manifest.
+
+        With dedup_keys configured, the keys of written rows are kept in a
+        persistent index. In incremental mode rows are appended to the
+        existing file, and rows whose key is already indexed (or missing)
+        are dropped by looking up only the new batch. An append with no new
+        rows still refreshes the manifest, recording that the source was
+        read.
 
         Args:
             df: DataFrame to save
+
+        Returns:
+            Number of rows written
+        """
+        output_path = self.get_output_path()
+        append = self.incremental and output_path.exists()
+        previous = read_manifest(output_path) if append else None
+        # How far the source was read, whether or not its rows are new
+        watermark = self.get_source_watermark(df)
+
+        if not self.dedup_keys:
+            self._write_output(df, output_path, append)
+        else:
+            if append and not self.get_key_index_path().exists():
+                # Output written before the index existed: without its keys
+                # every record of the batch would look new
+                self.logger.info(f"No key index for {output_path}, "
+                                 f"rebuilding it from the file")
+                self.rebuild_key_index()
+
+            keys = key_strings(df, self.dedup_keys)
+
+            with KeyIndex(self.get_key_index_path()) as index:
+                if append:
+                    missing = keys.isna()
+                    if missing.any():
+                        self.logger.warning(
+                            f"Skipping {int(missing.sum())} records without "
+                            f"a complete key {self.dedup_keys}"
+                        )
+                    new = ~missing & ~keys.duplicated()
+                    new[new] = [
+                        not found for found in index.contains(keys[new])
+                    ]
+
+                    self.logger.info(
+                        f"{int(new.sum())} of {len(df)} records are new"
+                    )
+                    df, keys = df[new], keys[new]
+                else:
+                    index.clear()
+
+                index.add(keys.dropna())
+                if df.empty and not append:
+                    return 0
+
+                if not df.empty:
+                    # The index commits only after the file write succeeded
+                    self._write_output(df, output_path, append)
+
+        manifest = build_manifest(
+            df,
+            output_path,
+            scraper=self.name,
+            date_column=self.date_column,
+            date_format=self.date_format,
+            scrape_duration_seconds=self.scrape_duration_seconds,
+            source_watermark=watermark,
+            previous=previous
+        )
+        write_manifest(output_path, manifest)
+        if not df.empty:
+            self.after_save(df, append)
+
+        return len(df)
+
+    def after_save(self, df: pd.DataFrame, appended: bool) -> None:
+        """
+        Hook called with the records save_data wrote, after the output and
+        its manifest are on disk. Subclasses maintain derived data here.
+
+        Args:
+            df: Records written (only the new ones when appending)
+            appended: True if df was appended to an existing output file
         """
+
+    def _write_output(
+        self,
+        df: pd.DataFrame,
+        output_path: Path,
+        append: bool
+    ) -> None:
+        """
+        Write or append df to the output CSV.
+
+        When appending, columns follow the existing header.
+        """
+        if self.schema:
+            df = format_dates(df, self.schema)
+        if append:
+            header = pd.read_csv(output_path, nrows=0).columns.tolist()
+            if set(header) != set(df.columns):
+                raise ValueError(
+                    f"Columns of new records do not match {output_path}: "
+                    f"{header}"
+                )
+            df[header].to_csv(output_path, mode='a', header=False, index=False)
+            self.logger.info(f"Appended {len(df)} records to {output_path}")
+        else:
+            df.to_csv(output_path, index=False)
+            self.logger.info(f"Saved {len(df)} records to {output_path}")
+
+    def rebuild_key_index(self, chunk_size: int = 100000) -> Dict[str, int]:
+        """
+        Rebuild the dedup key index from the output file.
+
+        Use when the index and the data have drifted apart, e.g. after the
+        CSV was edited by hand or a write was interrupted. The file is read
+        in chunks and only the key columns are loaded.
+
+        Args:
+            chunk_size: Rows read per chunk
+
+        Returns:
+            Dictionary with 'rows' read, 'keys' indexed and 'duplicates' found
+        """
+        if not self.dedup_keys:
+            raise ValueError(f"No dedup_keys configured for {self.name}")
+
         output_path = self.get_output_path()
-        df.to_csv(output_path, index=False)
-        self.logger.info(f"Saved {len(df)} records to {output_path}")
+        columns = (self.schema or {}).get('columns', {})
+        date_columns = {
+            column: columns[column] for column in self.dedup_keys
+            if isinstance(columns.get(column), dict)
+            and columns[column].get('type') == 'date'
+        }
+
+        rows = 0
+        with KeyIndex(self.get_key_index_path()) as index:
+            index.clear()
+            if output_path.exists():
+                chunks = pd.read_csv(output_path, dtype=str,
+                                     usecols=self.dedup_keys,
+                                     chunksize=chunk_size)
+                for chunk in chunks:
+                    for column, spec in date_columns.items():
+                        # Parsed as validation does, so keys match those of
+                        # new batches
+                        chunk[column] = COERCERS['date'](
+                            chunk[column].str.strip(), spec
+                        )
+                    index.add(key_strings(chunk, self.dedup_keys).dropna())
+                    rows += len(chunk)
+            keys = len(index)
+
+        self.logger.info(f"Rebuilt key index for {self.name}: "
+                         f"{keys} keys from {rows} rows")
+        return {'rows': rows, 'keys': keys, 'duplicates': rows - keys}
+
+    def get_source_watermark(self, df: pd.DataFrame) -> Optional[str]:
+        """
+        Describe how far the source has been read, recorded in the manifest.
+
+        Defaults to the latest value of the date column; override for sources
+        with a better cursor (e.g. a monotonically increasing id).
+
+        Args:
+            df: Scraped DataFrame
+
+        Returns:
+            Watermark string, or None to fall back to the manifest's max date
+        """
+        return None
 
     def run(self) -> bool:
         """
@@ -93,28 +348,96 @@ class BaseScraper(ABC):
         Returns:
             True if successful, False otherwise
         """
+        self.metrics.start()
+        rows = 0
+        success = False
+
         try:
             self.logger.info(f"Starting scraper: {self.scraper_name}")
 
             # Scrape data
+            scrape_started = time.perf_counter()
             df = self.scrape()
+            self.scrape_duration_seconds = time.perf_counter() - scrape_started
 
             # Validate data
             if df is None or df.empty:
                 self.logger.warning("No data scraped")
                 return False
 
+            # Coerce to schema
+            df = self.validate(df)
+            if df.empty:
+                self.logger.warning("No valid data after validation")
+                return False
+
             # Save data
-            self.save_data(df)
+            rows = self.save_data(df)
+            if rows == 0:
+                self.logger.info("No new records to save")
+
+            # Optional analytical store sink
+            self.store_data(df)
 
-            self.logger.info(f"Successfully completed scraper: {self.scraper_name}")
+            self.logger.info(
+                f"Successfully completed scraper: {self.scraper_name}"
+            )
+            success = True
             return True
 
         except Exception as e:
-            self.logger.error(f"Error in scraper {self.name}: {e}", exc_info=True)
+            self.logger.error(f"Error in scraper {self.name}: {e}",
+                              exc_info=True)
             return False
 
+        finally:
+            self.metrics.finish(rows, success)
+            self.write_metrics()
+
+    def store_data(self, df: pd.DataFrame) -> int:
+        """
+        Upsert records into the analytical store, if one is configured.
+
+        Records are keyed on dedup_keys and the store_indexes columns are
+        indexed. A failing store is logged and does not fail the run, since
+        the CSV output has already been written.
+
+        Args:
+            df: Validated records
+
+        Returns:
+            Number of rows written to the store
+        """
+        if not self.store_path:
+            return 0
+
+        try:
+            with AnalyticalStore(self.project_root / self.store_path) as store:
+                written = store.upsert(self.store_table, df, self.dedup_keys,
+                                       self.store_indexes)
+        except Exception as e:
+            self.logger.error(
+                f"Could not write to analytical store {self.store_path}: {e}"
+            )
+            return 0
+
+        self.logger.info(f"Upserted {written} records into "
+                         f"{self.store_path}:{self.store_table}")
+        return written
+
+    def write_metrics(self) -> None:
+        """Write the run's metrics as JSON and as a Prometheus textfile."""
+        if not self.metrics_dir:
+            return
+
+        try:
+            paths = self.metrics.write(self.project_root / self.metrics_dir)
+            self.logger.info(f"Wrote run metrics to {paths['json']}")
+        except OSError as e:
+            self.logger.warning(f"Could not write metrics: {e}")
+
     def apply_rate_limit(self) -> None:
         """Apply rate limiting delay."""
         if self.rate_limit_seconds > 0:
-            time.sleep(self.rate_limit_seconds)
+            with self.metrics.timer('rate_limit_seconds'):
+                time.sleep(self.rate_limit_seconds)
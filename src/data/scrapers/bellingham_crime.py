@@ -1,13 +1,61 @@
 """Bellingham Police Activity scraper."""
 import re
 from datetime import datetime
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Mapping, Sequence
+import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from src.data.scrapers.base_scraper import BaseScraper
+from src.data.scrapers.base_scraper import BaseScraper, count_retry
+from src.data.utils.validation import COERCERS
+from src.features.crime_cube import CrimeCube
+
+
+# Offence keyword taxonomy; categories are checked in order, the first match
+# wins.
+# Overridden by crime_categories in the scraper configuration.
+DEFAULT_CRIME_CATEGORIES = {
+    'Property': ['theft', 'burglary', 'robbery', 'stolen'],
+    'Violent': ['assault', 'battery', 'homicide', 'violence'],
+    'Drug': ['drug', 'narcotic', 'controlled substance'],
+    'Traffic': ['traffic', 'dui', 'driving'],
+}
+DEFAULT_CRIME_CATEGORY = 'Other'
+
+# Splits "Theft - Case #2020-001" into offence and case details
+OFFENCE_CASE_PATTERN = r'^(?P<offence>.*?)\s*-\s*Case\s*#?\s*(?P<case>.+)'
+
+
+def compile_category_matcher(
+    categories: Mapping[str, Sequence[str]]
+) -> re.Pattern:
+    """
+    Compile a crime taxonomy into a single case-insensitive regex.
+
+    Each category becomes one anchored lookahead alternative, tried in
+    taxonomy order, so a single match both tests every keyword and keeps
+    the first-category-wins priority. The matching alternative is reported
+    through match.lastgroup as 'c<position>'.
+
+    Args:
+        categories: Category name to keywords, in priority order
+
+    Returns:
+        Compiled pattern
+    """
+    alternatives = [
+        f"(?=.*?(?:{'|'.join(re.escape(keyword) for keyword in keywords)}))"
+        f"(?P<c{i}>)"
+        for i, keywords in enumerate(categories.values())
+        if keywords
+    ]
+    if not alternatives:
+        return re.compile(r'(?!)')
+    return re.compile('^(?:' + '|'.join(alternatives) + ')',
+                      re.IGNORECASE | re.DOTALL)
 
 
 class BellinghamCrimeScraper(BaseScraper):
@@ -21,29 +69,44 @@ class BellinghamCrimeScraper(BaseScraper):
         self.start_year = config.get('start_year', 2015)
         self.end_year = config.get('end_year', datetime.now().year)
 
+        self.crime_categories = config.get('crime_categories',
+                                           DEFAULT_CRIME_CATEGORIES)
+        self.default_category = config.get('default_category',
+                                           DEFAULT_CRIME_CATEGORY)
+        self._category_names = list(self.crime_categories)
+        self._category_matcher = compile_category_matcher(
+            self.crime_categories
+        )
+        self.crime_cube = config.get('crime_cube', False)
+
         self.session = requests.Session()
+        self.session.hooks['response'].append(self.metrics.response_hook)
 
     def _get_form_tokens(self) -> Dict[str, str]:
         """
         Extract ASP.NET form tokens from the page.
 
         Returns:
-            Dictionary containing __VIEWSTATE, __VIEWSTATEGENERATOR, __EVENTVALIDATION
+            Dictionary containing __VIEWSTATE, __VIEWSTATEGENERATOR and
+            __EVENTVALIDATION
         """
         response = self.session.get(self.base_url, timeout=self.timeout)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with self.metrics.timer('parse_seconds'):
+            soup = BeautifulSoup(response.text, 'html.parser')
 
-        tokens = {
-            '__VIEWSTATE': soup.find('input', {'name': '__VIEWSTATE'})['value'],
-            '__VIEWSTATEGENERATOR': soup.find('input', {'name': '__VIEWSTATEGENERATOR'})['value'],
-            '__EVENTVALIDATION': soup.find('input', {'name': '__EVENTVALIDATION'})['value']
-        }
+            tokens = {
+                name: soup.find('input', {'name': name})['value']
+                for name in ('__VIEWSTATE', '__VIEWSTATEGENERATOR',
+                             '__EVENTVALIDATION')
+            }
 
         return tokens
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    @retry(stop=stop_after_attempt(3),
+           wait=wait_exponential(multiplier=1, min=2, max=10),
+           before_sleep=count_retry)
     def _scrape_month(self, year: int, month: int) -> pd.DataFrame:
         """
         Scrape crime data for a specific month.
@@ -66,7 +129,7 @@ class BellinghamCrimeScraper(BaseScraper):
             end_date = f"12/31/{year}"
         else:
             # Last day of month
-            next_month = datetime(year, month + 1, 1) if month < 12 else datetime(year + 1, 1, 1)
+            next_month = datetime(year, month + 1, 1)
             last_day = (next_month - pd.Timedelta(days=1)).day
             end_date = f"{month}/{last_day}/{year}"
 
@@ -81,45 +144,29 @@ class BellinghamCrimeScraper(BaseScraper):
         }
 
         # Submit form
-        response = self.session.post(self.base_url, data=form_data, timeout=self.timeout)
+        response = self.session.post(self.base_url, data=form_data,
+                                     timeout=self.timeout)
         response.raise_for_status()
 
         # Parse results
-        soup = BeautifulSoup(response.text, 'html.parser')
-        records = []
-
-        # Find table rows
-        table = soup.find('table')
-        if table:
-            rows = table.find_all('tr')[1:]  # Skip header row
-
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 3:
-                    # Extract data
-                    date_str = cols[0].get_text(strip=True)
-                    location = cols[1].get_text(strip=True)
-                    offence_full = cols[2].get_text(strip=True)
-
-                    # Parse offence and case details
-                    match = re.match(r'(.*?)\s*-\s*Case\s*#?\s*(.+)', offence_full)
-                    if match:
-                        offence = match.group(1).strip()
-                        case_details = match.group(2).strip()
-                    else:
-                        offence = offence_full
-                        case_details = ''
-
-                    # Categorize crime (simple categorization)
-                    crime_category = self._categorize_crime(offence)
-
-                    records.append({
-                        'Date': date_str,
-                        'Location': location,
-                        'Offence': offence,
-                        'Crime Category': crime_category,
-                        'Case Details': case_details
-                    })
+        with self.metrics.timer('parse_seconds'):
+            soup = BeautifulSoup(response.text, 'html.parser')
+            records = []
+
+            # Find table rows; splitting and categorizing happen column-wise
+            # in postprocess
+            table = soup.find('table')
+            if table:
+                rows = table.find_all('tr')[1:]  # Skip header row
+
+                for row in rows:
+                    cols = row.find_all('td')
+                    if len(cols) >= 3:
+                        records.append({
+                            'Date': cols[0].get_text(strip=True),
+                            'Location': cols[1].get_text(strip=True),
+                            'Offence': cols[2].get_text(strip=True)
+                        })
 
         # Apply rate limiting
         self.apply_rate_limit()
@@ -136,18 +183,114 @@ class BellinghamCrimeScraper(BaseScraper):
         Returns:
             Crime category
         """
-        offence_lower = offence.lower()
+        match = self._category_matcher.match(offence)
+        if match is None:
+            return self.default_category
+        return self._category_names[int(match.lastgroup[1:])]
 
-        if any(word in offence_lower for word in ['theft', 'burglary', 'robbery', 'stolen']):
-            return 'Property'
-        elif any(word in offence_lower for word in ['assault', 'battery', 'homicide', 'violence']):
-            return 'Violent'
-        elif any(word in offence_lower for word in ['drug', 'narcotic', 'controlled substance']):
-            return 'Drug'
-        elif any(word in offence_lower for word in ['traffic', 'dui', 'driving']):
-            return 'Traffic'
-        else:
-            return 'Other'
+    def categorize(self, offences: pd.Series) -> pd.Series:
+        """
+        Categorize a column of offences.
+
+        Offence strings repeat heavily, so each distinct value is matched
+        once and the result is broadcast back through the factorized codes.
+
+        Args:
+            offences: Offence descriptions
+
+        Returns:
+            Crime categories aligned with offences
+        """
+        codes, uniques = pd.factorize(offences.fillna(''))
+        categories = np.array(
+            [self._categorize_crime(offence) for offence in uniques],
+            dtype=object
+        )
+        return pd.Series(categories[codes], index=offences.index)
+
+    def postprocess(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Split offence and case details and add the crime category, column-wise.
+
+        Args:
+            df: Concatenated rows with Date, Location and full Offence text
+
+        Returns:
+            DataFrame with Date, Location, Offence, Crime Category and Case
+            Details
+        """
+        offence_full = df['Offence'].fillna('').astype(str)
+        parts = offence_full.str.extract(OFFENCE_CASE_PATTERN)
+        matched = parts['offence'].notna()
+
+        offence = parts['offence'].str.strip().where(matched, offence_full)
+        case_details = parts['case'].str.strip().where(matched, '')
+
+        return pd.DataFrame({
+            'Date': df['Date'],
+            'Location': df['Location'],
+            'Offence': offence,
+            'Crime Category': self.categorize(offence),
+            'Case Details': case_details
+        })
+
+    def get_cube_path(self) -> Path:
+        """
+        Get the path of the crime count cube.
+
+        Returns:
+            Path next to the output file with a .cube.npz suffix
+        """
+        output_path = self.get_output_path()
+        return output_path.with_name(f"{output_path.stem}.cube.npz")
+
+    def after_save(self, df: pd.DataFrame, appended: bool) -> None:
+        """
+        Count the saved records into the crime cube, if crime_cube is enabled.
+
+        Appended records are added to the existing cube. A full rewrite of
+        the output, or an append with no cube to add to (first run with
+        crime_cube, or a previous update failed), rebuilds it from the whole
+        output. A failing update is logged and removes the cube, so the next
+        run rebuilds it instead of adding to a cube with a gap.
+
+        Args:
+            df: Records written
+            appended: True if df was appended to an existing output file
+        """
+        if not self.crime_cube:
+            return
+
+        cube_path = self.get_cube_path()
+        date_column = self.date_column or 'Date'
+        try:
+            if appended and cube_path.exists():
+                cube = CrimeCube.load(cube_path)
+                counted = cube.add(df, date_column=date_column)
+            else:
+                records = self._read_output() if appended else df
+                cube = CrimeCube.from_records(records, date_column=date_column)
+                counted = cube.total
+            cube.save(cube_path)
+        except Exception as e:
+            self.logger.error(
+                f"Could not update crime cube {cube_path}, removing it: {e}"
+            )
+            cube_path.unlink(missing_ok=True)
+            return
+
+        self.logger.info(f"Added {counted} records to crime cube "
+                         f"{cube_path} ({cube.months} months)")
+
+    def _read_output(self) -> pd.DataFrame:
+        """Read the columns the crime cube counts from the output file."""
+        date_column = self.date_column or 'Date'
+        df = pd.read_csv(self.get_output_path(),
+                         usecols=[date_column, 'Location', 'Crime Category'],
+                         dtype=str)
+        df[date_column] = COERCERS['date'](df[date_column].str.strip(),
+                                           {'format': self.date_format})
+        return df
 
     def scrape(self) -> pd.DataFrame:
         """
@@ -165,10 +308,13 @@ class BellinghamCrimeScraper(BaseScraper):
                     if not month_data.empty:
                         all_data.append(month_data)
                 except Exception as e:
-                    self.logger.error(f"Error scraping {year}-{month:02d}: {e}")
+                    self.logger.error(
+                        f"Error scraping {year}-{month:02d}: {e}"
+                    )
                     continue
 
         if all_data:
-            return pd.concat(all_data, ignore_index=True)
+            with self.metrics.timer('parse_seconds'):
+                return self.postprocess(pd.concat(all_data, ignore_index=True))
         else:
             return pd.DataFrame()
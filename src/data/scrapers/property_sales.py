@@ -1,4 +1,5 @@
 """Whatcom County property sales scraper using Selenium."""
+import time
 from typing import Dict
 import pandas as pd
 from bs4 import BeautifulSoup
@@ -8,7 +9,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from src.data.scrapers.base_scraper import BaseScraper
+from src.data.scrapers.base_scraper import BaseScraper, count_retry
 from src.data.utils.selenium_helper import create_driver, quit_driver
 
 
@@ -23,52 +24,66 @@ class PropertySalesScraper(BaseScraper):
         self.max_pages = config.get('max_pages', 200)
         self.headless = config.get('headless', True)
 
-    def _scrape_page(self, driver, page_num: int) -> pd.DataFrame:
+    def _scrape_page(
+        self,
+        driver,
+        page_num: int,
+        load_seconds: float = 0.0
+    ) -> pd.DataFrame:
         """
         Scrape a single page of property sales.
 
         Args:
             driver: Selenium WebDriver instance
             page_num: Page number to scrape
+            load_seconds: Time the page took to load, recorded as request
+                latency
 
         Returns:
             DataFrame containing property sales from the page
         """
         self.logger.info(f"Scraping page {page_num}")
 
-        # Parse page source
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        records = []
+        page_source = driver.page_source
+        self.metrics.record_request(self.base_url, load_seconds,
+                                    len(page_source))
 
-        # Find sales table
-        table = soup.find('table', {'id': 'GridView1'})
-        if not table:
-            return pd.DataFrame()
+        with self.metrics.timer('parse_seconds'):
+            # Parse page source
+            soup = BeautifulSoup(page_source, 'html.parser')
+            records = []
 
-        rows = table.find_all('tr')[1:]  # Skip header
+            # Find sales table
+            table = soup.find('table', {'id': 'GridView1'})
+            if not table:
+                return pd.DataFrame()
+
+            rows = table.find_all('tr')[1:]  # Skip header
 
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) >= 4:
-                # Extract link
-                link_tag = cols[0].find('a')
-                link = link_tag['href'] if link_tag else ''
+            for row in rows:
+                cols = row.find_all('td')
+                if len(cols) >= 4:
+                    # Extract link
+                    link_tag = cols[0].find('a')
+                    link = link_tag['href'] if link_tag else ''
 
-                # Extract fields
-                address = cols[1].get_text(strip=True)
-                sale_date = cols[2].get_text(strip=True)
-                sale_price = cols[3].get_text(strip=True)
+                    # Extract fields
+                    address = cols[1].get_text(strip=True)
+                    sale_date = cols[2].get_text(strip=True)
+                    sale_price = cols[3].get_text(strip=True)
 
-                records.append({
-                    'Assessor Link': link,
-                    'Address': address,
-                    'Sale Date': sale_date,
-                    'Sale Price': sale_price
-                })
+                    records.append({
+                        'Assessor Link': link,
+                        'Address': address,
+                        'Sale Date': sale_date,
+                        'Sale Price': sale_price
+                    })
 
-        return pd.DataFrame(records)
+            return pd.DataFrame(records)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    @retry(stop=stop_after_attempt(3),
+           wait=wait_exponential(multiplier=1, min=2, max=10),
+           before_sleep=count_retry)
     def scrape(self) -> pd.DataFrame:
         """
         Scrape property sales data.
@@ -82,6 +97,7 @@ class PropertySalesScraper(BaseScraper):
         try:
             # Create WebDriver
             driver = create_driver(headless=self.headless)
+            started = time.perf_counter()
             driver.get(self.base_url)
 
             # Wait for page to load
@@ -90,7 +106,8 @@ class PropertySalesScraper(BaseScraper):
             )
 
             # Scrape first page
-            page_data = self._scrape_page(driver, 1)
+            page_data = self._scrape_page(driver, 1,
+                                          time.perf_counter() - started)
             if not page_data.empty:
                 all_data.append(page_data)
 
@@ -98,7 +115,9 @@ class PropertySalesScraper(BaseScraper):
             for page_num in range(2, self.max_pages + 1):
                 try:
                     # Find and click next page button
-                    next_button = driver.find_element(By.LINK_TEXT, str(page_num))
+                    next_button = driver.find_element(By.LINK_TEXT,
+                                                      str(page_num))
+                    started = time.perf_counter()
                     next_button.click()
 
                     # Wait for page to load
@@ -107,7 +126,9 @@ class PropertySalesScraper(BaseScraper):
                     )
 
                     # Scrape page
-                    page_data = self._scrape_page(driver, page_num)
+                    page_data = self._scrape_page(
+                        driver, page_num, time.perf_counter() - started
+                    )
                     if not page_data.empty:
                         all_data.append(page_data)
 
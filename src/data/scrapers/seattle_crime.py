@@ -1,10 +1,10 @@
 """Seattle Police crime data scraper via Socrata API."""
-from typing import Dict
+from typing import Dict, Optional
 import pandas as pd
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from src.data.scrapers.base_scraper import BaseScraper
+from src.data.scrapers.base_scraper import BaseScraper, count_retry
 
 
 class SeattleCrimeScraper(BaseScraper):
@@ -17,7 +17,9 @@ class SeattleCrimeScraper(BaseScraper):
         self.api_url = config['url']
         self.limit = config.get('limit', 1000000)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    @retry(stop=stop_after_attempt(3),
+           wait=wait_exponential(multiplier=1, min=2, max=10),
+           before_sleep=count_retry)
     def scrape(self) -> pd.DataFrame:
         """
         Scrape crime data from Seattle Open Data API.
@@ -25,7 +27,9 @@ class SeattleCrimeScraper(BaseScraper):
         Returns:
             DataFrame containing crime records
         """
-        self.logger.info(f"Fetching up to {self.limit} records from Seattle API")
+        self.logger.info(
+            f"Fetching up to {self.limit} records from Seattle API"
+        )
 
         # Build query parameters
         params = {
@@ -37,20 +41,40 @@ class SeattleCrimeScraper(BaseScraper):
         response = requests.get(
             self.api_url,
             params=params,
-            timeout=self.timeout
+            timeout=self.timeout,
+            hooks={'response': self.metrics.response_hook}
         )
         response.raise_for_status()
 
-        # Parse JSON response
-        data = response.json()
+        with self.metrics.timer('parse_seconds'):
+            # Parse JSON response
+            data = response.json()
 
-        if not data:
-            self.logger.warning("No data returned from API")
-            return pd.DataFrame()
+            if not data:
+                self.logger.warning("No data returned from API")
+                return pd.DataFrame()
 
-        # Convert to DataFrame
-        df = pd.json_normalize(data)
+            # Convert to DataFrame
+            df = pd.json_normalize(data)
 
         self.logger.info(f"Successfully fetched {len(df)} records")
 
         return df
+
+    def get_source_watermark(self, df: pd.DataFrame) -> Optional[str]:
+        """
+        Use the highest offense_id as the watermark when the API returned one.
+
+        Args:
+            df: Scraped DataFrame
+
+        Returns:
+            Highest offense_id, or None to fall back to the latest date
+        """
+        if 'offense_id' not in df.columns:
+            return None
+
+        ids = pd.to_numeric(df['offense_id'], errors='coerce')
+        if ids.notna().any():
+            return f"offense_id={int(ids.max())}"
+        return None
@@ -0,0 +1,133 @@
+"""Persistent index of record keys already written to a data file."""
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+
+# Joins the parts of a composite key; cannot occur in scraped text
+KEY_SEPARATOR = '\x1f'
+
+
+def key_strings(df, columns: Sequence[str]):
+    """
+    Build one key string per row from the key columns.
+
+    Dates are rendered in a fixed ISO form so keys built from freshly
+    validated data and from the CSV read back match.
+
+    Args:
+        df: DataFrame containing the key columns
+        columns: Key column names
+
+    Returns:
+        String Series aligned with df; <NA> where any key part is missing
+    """
+    import pandas as pd
+
+    keys = None
+    for column in columns:
+        values = df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            text = values.dt.strftime('%Y-%m-%dT%H:%M:%S').astype('string')
+        else:
+            text = values.astype('string').str.strip()
+            text = text.mask(text == '')
+
+        keys = text if keys is None else keys + KEY_SEPARATOR + text
+
+    return keys
+
+
+class KeyIndex:
+    """
+    SQLite-backed set of keys with a unique primary key.
+
+    Lookups and inserts cost O(batch size * log index size), so checking a
+    new batch never requires reading the data file. Use as a context
+    manager: changes are committed on a clean exit and rolled back if the
+    block raises, so a failed write leaves the index untouched.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open or create the index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY) '
+            'WITHOUT ROWID'
+        )
+
+    def __enter__(self) -> 'KeyIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self._conn.commit()
+        else:
+            self._conn.rollback()
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM keys').fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection without committing."""
+        self._conn.close()
+
+    def commit(self) -> None:
+        """Commit pending inserts."""
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all keys."""
+        self._conn.execute('DELETE FROM keys')
+
+    def contains(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Check which keys are already in the index.
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            List of flags aligned with keys
+        """
+        keys = list(keys)
+        self._conn.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS batch '
+            '(pos INTEGER PRIMARY KEY, key TEXT)'
+        )
+        self._conn.execute('DELETE FROM batch')
+        self._conn.executemany('INSERT INTO batch VALUES (?, ?)',
+                               enumerate(keys))
+
+        found = [False] * len(keys)
+        rows = self._conn.execute(
+            'SELECT pos FROM batch JOIN keys USING (key)'
+        )
+        for (pos,) in rows:
+            found[pos] = True
+
+        self._conn.execute('DELETE FROM batch')
+        return found
+
+    def add(self, keys: Iterable[str]) -> int:
+        """
+        Insert keys, ignoring those already present.
+
+        Args:
+            keys: Keys to insert
+
+        Returns:
+            Number of keys that were new
+        """
+        before = self._conn.total_changes
+        self._conn.executemany('INSERT OR IGNORE INTO keys VALUES (?)',
+                               ((key,) for key in keys))
+        return self._conn.total_changes - before
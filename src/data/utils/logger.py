@@ -1,9 +1,48 @@
 """Logging utilities for unified web scraper."""
+import atexit
+import json
 import logging
+import multiprocessing
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional
+
+
+# Background listeners and their queues, keyed by logger name
+_listeners: Dict[str, QueueListener] = {}
+_queues: Dict[str, Any] = {}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record as a JSON line.
+
+        Args:
+            record: Log record
+
+        Returns:
+            Single-line JSON string
+        """
+        entry = {
+            'time': self.formatTime(record),
+            'name': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+
+        return json.dumps(entry, default=str)
 
 
 def setup_logger(
@@ -12,11 +51,18 @@ def setup_logger(
     level: int = logging.INFO,
     format_string: Optional[str] = None,
     max_bytes: int = 10485760,  # 10MB
-    backup_count: int = 5
+    backup_count: int = 5,
+    use_queue: bool = False,
+    json_lines: bool = False,
+    process_safe: bool = False
 ) -> logging.Logger:
     """
     Set up a logger with file and console handlers.
 
+    In queue mode the logger only gets a QueueHandler; formatting, console
+    output, file writes and rotation run on a background QueueListener
+    thread, so logging calls never block on disk I/O or the handler lock.
+
     Args:
         name: Logger name
         log_file: Path to log file. If None, only console logging is enabled
@@ -24,6 +70,10 @@ def setup_logger(
         format_string: Custom format string. Uses default if None
         max_bytes: Maximum size of log file before rotation
         backup_count: Number of backup log files to keep
+        use_queue: Hand records to a background listener thread
+        json_lines: Write the log file as JSON lines instead of plain text
+        process_safe: In queue mode, use a multiprocessing queue so worker
+            processes can log through setup_worker_logger
 
     Returns:
         Configured logger instance
@@ -41,12 +91,13 @@ def setup_logger(
         format_string = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
     formatter = logging.Formatter(format_string)
+    handlers = []
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler with rotation
     if log_file:
@@ -59,12 +110,96 @@ def setup_logger(
             backupCount=backup_count
         )
         file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(
+            JsonLinesFormatter() if json_lines else formatter
+        )
+        handlers.append(file_handler)
+
+    if not use_queue:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
+
+    if process_safe:
+        log_queue = multiprocessing.Queue(-1)
+    else:
+        log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    _listeners[name] = listener
+    _queues[name] = log_queue
+    logger.addHandler(QueueHandler(log_queue))
 
     return logger
 
 
+def get_log_queue(name: str) -> Optional[Any]:
+    """
+    Get the queue feeding a queue-mode logger's background listener.
+
+    Pass it to worker processes and call setup_worker_logger there.
+
+    Args:
+        name: Logger name given to setup_logger
+
+    Returns:
+        Queue instance, or None if the logger is not in queue mode
+    """
+    return _queues.get(name)
+
+
+def setup_worker_logger(
+    name: str,
+    log_queue: Any,
+    level: int = logging.INFO
+) -> logging.Logger:
+    """
+    Route a worker process's logger into the parent's log queue.
+
+    Args:
+        name: Logger name in the worker
+        log_queue: Queue from get_log_queue (created with process_safe=True)
+        level: Logging level
+
+    Returns:
+        Logger that only enqueues records
+    """
+    logger = logging.getLogger(name)
+    logger.handlers = [QueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def stop_queue_logging(name: Optional[str] = None) -> None:
+    """
+    Flush and stop background listeners.
+
+    Args:
+        name: Logger whose listener to stop. Stops all listeners if None
+    """
+    names = [name] if name is not None else list(_listeners)
+
+    for listener_name in names:
+        listener = _listeners.pop(listener_name, None)
+        log_queue = _queues.pop(listener_name, None)
+        if listener is None:
+            continue
+
+        listener.stop()
+
+        # Detach the queue handler so nothing piles up in an unread queue
+        logger = logging.getLogger(listener_name)
+        for handler in list(logger.handlers):
+            if (isinstance(handler, QueueHandler)
+                    and handler.queue is log_queue):
+                logger.removeHandler(handler)
+
+
+atexit.register(stop_queue_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get an existing logger by name.
@@ -0,0 +1,171 @@
+"""Metadata sidecar manifests written next to every data output."""
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+MANIFEST_SUFFIX = '.meta.json'
+
+
+def manifest_path(data_path: Path) -> Path:
+    """
+    Get the sidecar manifest path for a data file.
+
+    Args:
+        data_path: Path to the data file
+
+    Returns:
+        Path of the form <data file>.meta.json
+    """
+    data_path = Path(data_path)
+    return data_path.with_name(data_path.name + MANIFEST_SUFFIX)
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file's contents without loading it into memory.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(
+    df,
+    data_path: Path,
+    scraper: Optional[str] = None,
+    date_column: Optional[str] = None,
+    date_format: Optional[str] = None,
+    scrape_duration_seconds: Optional[float] = None,
+    source_watermark: Optional[str] = None,
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Describe a DataFrame that has just been written to data_path.
+
+    When df was appended to an existing file, pass that file's previous
+    manifest so row count and date range cover the whole file. An empty
+    append keeps the previous column types.
+
+    Args:
+        df: DataFrame that was written
+        data_path: File it was written to
+        scraper: Name of the scraper that produced it
+        date_column: Column holding the record date, if any
+        date_format: strptime format of date_column. Inferred if None
+        scrape_duration_seconds: Time the scrape took
+        source_watermark: Marker of how far the source has been read
+        previous: Manifest of the file before df was appended to it
+
+    Returns:
+        Manifest dictionary
+    """
+    import pandas as pd
+
+    data_path = Path(data_path)
+    min_date = max_date = None
+
+    if date_column and date_column in df.columns:
+        dates = df[date_column]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, format=date_format, errors='coerce')
+        if dates.notna().any():
+            min_date = dates.min().isoformat()
+            max_date = dates.max().isoformat()
+
+    row_count = int(len(df))
+    columns = {str(name): str(dtype) for name, dtype in df.dtypes.items()}
+    if previous:
+        if df.empty:
+            columns = previous.get('columns', columns)
+        row_count += previous.get('row_count', 0)
+        min_date = min(filter(None, [min_date, previous.get('min_date')]),
+                       default=None)
+        max_date = max(filter(None, [max_date, previous.get('max_date')]),
+                       default=None)
+
+    return {
+        'file': data_path.name,
+        'scraper': scraper,
+        'row_count': row_count,
+        'columns': columns,
+        'date_column': date_column,
+        'min_date': min_date,
+        'max_date': max_date,
+        'source_watermark': (
+            source_watermark if source_watermark is not None else max_date
+        ),
+        'content_sha256': file_sha256(data_path),
+        'size_bytes': data_path.stat().st_size,
+        'scrape_duration_seconds': scrape_duration_seconds,
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def write_manifest(data_path: Path, manifest: Dict[str, Any]) -> Path:
+    """
+    Atomically write the sidecar manifest for a data file.
+
+    Args:
+        data_path: Path to the data file
+        manifest: Manifest dictionary
+
+    Returns:
+        Path of the written manifest
+    """
+    path = manifest_path(data_path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_manifest(data_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read the sidecar manifest for a data file.
+
+    Args:
+        data_path: Path to the data file
+
+    Returns:
+        Manifest dictionary, or None if missing or unreadable
+    """
+    path = manifest_path(data_path)
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def manifest_age_days(
+    manifest: Dict[str, Any],
+    now: Optional[datetime] = None
+) -> Optional[float]:
+    """
+    Days since the manifest's data file was written.
+
+    Args:
+        manifest: Manifest dictionary
+        now: Reference time. Defaults to the current time
+
+    Returns:
+        Age in days, or None if the manifest has no timestamp
+    """
+    written_at = manifest.get('written_at')
+    if not written_at:
+        return None
+
+    now = now or datetime.now()
+    return (now - datetime.fromisoformat(written_at)).total_seconds() / 86400
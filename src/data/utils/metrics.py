@@ -0,0 +1,284 @@
+"""Per-run scraper metrics with JSON and Prometheus textfile export."""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Sequence
+from urllib.parse import urlsplit
+
+
+# Upper bounds (seconds) of the per-host request latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+class ScraperMetrics:
+    """Collects structured metrics for a single scraper run."""
+
+    def __init__(
+        self,
+        scraper: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        """
+        Initialize metrics collector.
+
+        Args:
+            scraper: Scraper identifier used as the metric label
+            buckets: Latency histogram bucket upper bounds in seconds
+        """
+        self.scraper = scraper
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all values ahead of a new run."""
+        with self._lock:
+            self.requests = 0
+            self.bytes_received = 0
+            self.retries = 0
+            self.rows = 0
+            self.parse_seconds = 0.0
+            self.validate_seconds = 0.0
+            self.rate_limit_seconds = 0.0
+            self.duration_seconds = 0.0
+            self.success = False
+            self.started_at = None
+            self.latency: Dict[str, Dict[str, Any]] = {}
+        self._started = None
+
+    def start(self) -> None:
+        """Reset and mark the start of a run."""
+        self.reset()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._started = time.perf_counter()
+
+    def finish(self, rows: int, success: bool) -> None:
+        """
+        Mark the end of a run.
+
+        Args:
+            rows: Number of rows produced
+            success: Whether the run succeeded
+        """
+        with self._lock:
+            self.rows = rows
+            self.success = success
+            if self._started is not None:
+                self.duration_seconds = time.perf_counter() - self._started
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows produced per second of run time."""
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.rows / self.duration_seconds
+
+    def record_request(
+        self,
+        url: str,
+        latency_seconds: float,
+        nbytes: int
+    ) -> None:
+        """
+        Record one completed request.
+
+        Args:
+            url: Requested URL; its host is used as the histogram label
+            latency_seconds: Time until the response arrived
+            nbytes: Size of the response body
+        """
+        host = urlsplit(url).netloc or url
+
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += nbytes
+
+            histogram = self.latency.get(host)
+            if histogram is None:
+                histogram = {
+                    'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0
+                }
+                self.latency[host] = histogram
+
+            histogram['count'] += 1
+            histogram['sum'] += latency_seconds
+            for i, bound in enumerate(self.buckets):
+                if latency_seconds <= bound:
+                    histogram['buckets'][i] += 1
+
+    def response_hook(self, response, *args, **kwargs):
+        """requests response hook recording latency and size of responses."""
+        self.record_request(response.url, response.elapsed.total_seconds(),
+                            len(response.content))
+        return response
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Add elapsed time to a timer attribute.
+
+        Args:
+            name: Timer attribute, e.g. 'parse_seconds'
+            seconds: Elapsed seconds to add
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Context manager adding its block's elapsed time to a timer."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter attribute.
+
+        Args:
+            name: Counter attribute, e.g. 'retries'
+            value: Amount to add
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot metrics as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary of run metrics
+        """
+        with self._lock:
+            latency = {
+                host: {
+                    'count': h['count'],
+                    'sum_seconds': round(h['sum'], 6),
+                    'buckets': {
+                        str(b): c for b, c in zip(self.buckets, h['buckets'])
+                    },
+                }
+                for host, h in self.latency.items()
+            }
+
+            return {
+                'scraper': self.scraper,
+                'started_at': self.started_at,
+                'success': self.success,
+                'duration_seconds': round(self.duration_seconds, 6),
+                'requests': self.requests,
+                'bytes_received': self.bytes_received,
+                'retries': self.retries,
+                'parse_seconds': round(self.parse_seconds, 6),
+                'validate_seconds': round(self.validate_seconds, 6),
+                'rate_limit_seconds': round(self.rate_limit_seconds, 6),
+                'rows': self.rows,
+                'rows_per_second': round(self.rows_per_second, 3),
+                'latency': latency,
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Returns:
+            Text suitable for the node_exporter textfile collector
+        """
+        snapshot = self.to_dict()
+        label = f'scraper="{self.scraper}"'
+        lines = []
+
+        gauges = [
+            ('scraper_last_run_success',
+             'Whether the last run succeeded (1) or failed (0)',
+             int(snapshot['success'])),
+            ('scraper_last_run_duration_seconds',
+             'Wall time of the last run',
+             snapshot['duration_seconds']),
+            ('scraper_last_run_requests',
+             'HTTP requests issued in the last run',
+             snapshot['requests']),
+            ('scraper_last_run_bytes_received',
+             'Response bytes received in the last run',
+             snapshot['bytes_received']),
+            ('scraper_last_run_retries',
+             'Retried attempts in the last run',
+             snapshot['retries']),
+            ('scraper_last_run_parse_seconds',
+             'Time spent parsing responses in the last run',
+             snapshot['parse_seconds']),
+            ('scraper_last_run_validate_seconds',
+             'Time spent validating records in the last run',
+             snapshot['validate_seconds']),
+            ('scraper_last_run_rate_limit_seconds',
+             'Time spent in rate limiting in the last run',
+             snapshot['rate_limit_seconds']),
+            ('scraper_last_run_rows',
+             'Rows produced in the last run',
+             snapshot['rows']),
+            ('scraper_last_run_rows_per_second',
+             'Rows produced per second in the last run',
+             snapshot['rows_per_second']),
+            ('scraper_last_run_timestamp_seconds',
+             'Unix time the last run finished',
+             round(time.time(), 3)),
+        ]
+
+        for name, help_text, value in gauges:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name}{{{label}}} {value}')
+
+        name = 'scraper_last_run_request_latency_seconds'
+        lines.append(f'# HELP {name} Request latency per host in the last run')
+        lines.append(f'# TYPE {name} histogram')
+        with self._lock:
+            for host, histogram in sorted(self.latency.items()):
+                host_label = f'{label},host="{host}"'
+                for bound, count in zip(self.buckets, histogram['buckets']):
+                    lines.append(
+                        f'{name}_bucket{{{host_label},le="{bound}"}} {count}'
+                    )
+                observed = histogram['count']
+                total = round(histogram['sum'], 6)
+                lines.append(
+                    f'{name}_bucket{{{host_label},le="+Inf"}} {observed}'
+                )
+                lines.append(f'{name}_sum{{{host_label}}} {total}')
+                lines.append(f'{name}_count{{{host_label}}} {observed}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, metrics_dir: Path) -> Dict[str, Path]:
+        """
+        Write the run's JSON report and the Prometheus textfile.
+
+        The JSON file is timestamped so every run is kept; the .prom file is
+        replaced atomically so a collector never reads a partial file.
+
+        Args:
+            metrics_dir: Directory to write into
+
+        Returns:
+            Dictionary with the 'json' and 'prometheus' paths written
+        """
+        metrics_dir = Path(metrics_dir)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+        json_path = metrics_dir / f'{self.scraper}-{stamp}.json'
+        json_path.write_text(json.dumps(self.to_dict(), indent=2))
+
+        prom_path = metrics_dir / f'{self.scraper}.prom'
+        tmp_path = metrics_dir / f'.{self.scraper}.prom.{os.getpid()}'
+        tmp_path.write_text(self.to_prometheus())
+        os.replace(tmp_path, prom_path)
+
+        return {'json': json_path, 'prometheus': prom_path}
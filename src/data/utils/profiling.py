@@ -0,0 +1,123 @@
+"""CPU and memory profiling of scraper runs."""
+import cProfile
+import io
+import pstats
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def _function_label(key: Tuple[str, int, str]) -> str:
+    """Format a pstats function key as file:line(function)."""
+    filename, line, function = key
+    if filename == '~':
+        return function
+    return f"{Path(filename).name}:{line}({function})"
+
+
+def hotspots(stats: pstats.Stats, limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    Extract the functions with the highest own time.
+
+    Args:
+        stats: Collected profile statistics
+        limit: Number of functions to return
+
+    Returns:
+        List of dictionaries with function label, call count, own and
+        cumulative time
+    """
+    rows = []
+    for key, (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': _function_label(key),
+            'calls': ncalls,
+            'tottime': tottime,
+            'cumtime': cumtime,
+        })
+
+    rows.sort(key=lambda row: row['tottime'], reverse=True)
+    return rows[:limit]
+
+
+def profile_call(
+    name: str,
+    func: Callable[[], Any],
+    output_dir: Path,
+    top_n: int = 25,
+    summary_size: int = 5
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run a callable under cProfile and tracemalloc and write reports.
+
+    Writes into output_dir:
+        <name>-<timestamp>.pstats      raw stats, loadable with pstats/snakeviz
+        <name>-<timestamp>.txt         stats sorted by cumulative time
+        <name>-<timestamp>-memory.txt  top-N allocation sites still live at
+                                       the end
+
+    Args:
+        name: Label used in file names, usually the scraper name
+        func: Zero-argument callable to profile
+        output_dir: Directory for the reports
+        top_n: Entries listed in the sorted stats and memory reports
+        summary_size: Hotspots returned in the summary
+
+    Returns:
+        Tuple of (func's return value, summary dictionary)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{name}-{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+
+    stats_path = output_dir / f"{stem}.pstats"
+    profiler.dump_stats(str(stats_path))
+
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    text_path = output_dir / f"{stem}.txt"
+    text_path.write_text(text.getvalue())
+
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ])
+    memory_lines = [
+        f"Peak traced memory: {peak_bytes / (1024 * 1024):.1f} MB", ''
+    ]
+    for index, stat in enumerate(snapshot.statistics('lineno')[:top_n], 1):
+        frame = stat.traceback[0]
+        memory_lines.append(
+            f"#{index}: {frame.filename}:{frame.lineno} "
+            f"{stat.size / 1024:.1f} KiB in {stat.count} blocks"
+        )
+    memory_path = output_dir / f"{stem}-memory.txt"
+    memory_path.write_text('\n'.join(memory_lines) + '\n')
+
+    summary = {
+        'name': name,
+        'total_seconds': stats.total_tt,
+        'peak_memory_mb': peak_bytes / (1024 * 1024),
+        'hotspots': hotspots(stats, summary_size),
+        'stats_file': stats_path,
+        'text_file': text_path,
+        'memory_file': memory_path,
+    }
+
+    return result, summary
@@ -0,0 +1,208 @@
+"""Embedded SQLite analytical store that scrapers upsert their records into."""
+import sqlite3
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Union
+
+
+# Dates are stored as ISO text so range filters and strftime() work in SQL
+STORE_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _quote(identifier: str) -> str:
+    """Quote a table or column name for SQL."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _sql_type(dtype) -> str:
+    """Map a pandas dtype to an SQLite column affinity."""
+    import pandas as pd
+
+    if (pd.api.types.is_bool_dtype(dtype)
+            or pd.api.types.is_integer_dtype(dtype)):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+class AnalyticalStore:
+    """
+    SQLite database holding one table per scraper.
+
+    Records are upserted on the scraper's key columns, and the columns
+    analysts filter on (date, location/block, category) are indexed, so
+    typical slices are index lookups rather than full scans of a CSV.
+    An index entry may also be a list of columns, e.g. [Location, Date],
+    for slices that filter on several of them together.
+    """
+
+    def __init__(self, path: Path, read_only: bool = False):
+        """
+        Open or create the store.
+
+        Args:
+            path: SQLite database file
+            read_only: Open an existing file without write access, so
+                ad-hoc queries cannot modify it
+        """
+        self.path = Path(path)
+        if read_only:
+            uri = f'{self.path.resolve().as_uri()}?mode=ro'
+            self._conn = sqlite3.connect(uri, uri=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+
+    def __enter__(self) -> 'AnalyticalStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def table_columns(self, table: str) -> List[str]:
+        """
+        Get the column names of a table.
+
+        Args:
+            table: Table name
+
+        Returns:
+            Column names, empty if the table does not exist
+        """
+        rows = self._conn.execute(f'PRAGMA table_info({_quote(table)})')
+        return [row[1] for row in rows]
+
+    def _ensure_table(
+        self,
+        table: str,
+        df,
+        key_columns: Sequence[str],
+        index_columns: Sequence[Union[str, Sequence[str]]]
+    ) -> None:
+        """Create the table, add new columns and create missing indexes."""
+        existing = self.table_columns(table)
+
+        if not existing:
+            columns = ', '.join(f'{_quote(name)} {_sql_type(dtype)}'
+                                for name, dtype in df.dtypes.items())
+            self._conn.execute(f'CREATE TABLE {_quote(table)} ({columns})')
+        else:
+            for name, dtype in df.dtypes.items():
+                if name not in existing:
+                    self._conn.execute(
+                        f'ALTER TABLE {_quote(table)} '
+                        f'ADD COLUMN {_quote(name)} {_sql_type(dtype)}'
+                    )
+
+        if key_columns:
+            keys = ', '.join(_quote(c) for c in key_columns)
+            self._conn.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS '
+                f'{_quote(f"ux_{table}_key")} ON {_quote(table)} ({keys})'
+            )
+
+        for entry in index_columns:
+            columns = [entry] if isinstance(entry, str) else list(entry)
+            if columns and all(c in df.columns for c in columns):
+                name = f'ix_{table}_{"_".join(columns)}'
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS {_quote(name)} '
+                    f'ON {_quote(table)} '
+                    f'({", ".join(_quote(c) for c in columns)})'
+                )
+
+    def upsert(
+        self,
+        table: str,
+        df,
+        key_columns: Optional[Sequence[str]] = None,
+        index_columns: Sequence[Union[str, Sequence[str]]] = ()
+    ) -> int:
+        """
+        Insert records, replacing existing rows with the same key.
+
+        Rows with a missing key part cannot be matched and are skipped.
+        Without key columns every row is appended.
+
+        Args:
+            table: Table name
+            df: Records to write
+            key_columns: Columns identifying a record
+            index_columns: Columns to index for filtering. A list entry
+                creates one composite index over its columns, in order
+
+        Returns:
+            Number of rows written
+        """
+        import pandas as pd
+
+        key_columns = list(key_columns or [])
+        if key_columns:
+            df = df[df[key_columns].notna().all(axis=1)]
+        if df.empty:
+            return 0
+
+        values = df.copy()
+        for column in values.columns:
+            if pd.api.types.is_datetime64_any_dtype(values[column]):
+                values[column] = values[column].dt.strftime(STORE_DATE_FORMAT)
+        values = values.astype(object).where(values.notna(), None)
+
+        columns = [str(c) for c in values.columns]
+        insert = (
+            f'INSERT INTO {_quote(table)} '
+            f'({", ".join(_quote(c) for c in columns)}) '
+            f'VALUES ({", ".join("?" * len(columns))})'
+        )
+        if key_columns:
+            updates = [c for c in columns if c not in key_columns]
+            conflict = ', '.join(_quote(c) for c in key_columns)
+            if updates:
+                assignments = ', '.join(
+                    f'{_quote(c)} = excluded.{_quote(c)}' for c in updates
+                )
+                insert += (f' ON CONFLICT ({conflict}) '
+                           f'DO UPDATE SET {assignments}')
+            else:
+                insert += f' ON CONFLICT ({conflict}) DO NOTHING'
+
+        with self._conn:
+            self._ensure_table(table, df, key_columns, index_columns)
+            self._conn.executemany(
+                insert, values.itertuples(index=False, name=None)
+            )
+
+        return len(values)
+
+    def query(self, sql: str, params: Sequence[Any] = ()):
+        """
+        Run a SQL query.
+
+        Args:
+            sql: Query text
+            params: Positional query parameters
+
+        Returns:
+            DataFrame of results
+        """
+        import pandas as pd
+
+        return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    def explain(self, sql: str, params: Sequence[Any] = ()) -> List[str]:
+        """
+        Show how SQLite will execute a query, e.g. which index it uses.
+
+        Args:
+            sql: Query text
+            params: Positional query parameters
+
+        Returns:
+            Query plan lines
+        """
+        rows = self._conn.execute(f'EXPLAIN QUERY PLAN {sql}', list(params))
+        return [row[-1] for row in rows]
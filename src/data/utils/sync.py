@@ -0,0 +1,979 @@
+"""Content-hash differential sync of the data directory.
+
+The data directory is mirrored to a directory or an S3 target.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+MANIFEST_NAME = '.sync-manifest.json'
+# Local hash cache and pending multipart uploads, kept in the synced directory
+LOCAL_STATE_NAME = '.sync-state.json'
+UPLOADS_DIR = '.sync-uploads'
+PARTIAL_SUFFIX = '.sync-partial'
+MANIFEST_VERSION = 1
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+# S3 rejects multipart parts below 5 MiB, except the last one
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+_EXCLUDED_NAMES = {MANIFEST_NAME, LOCAL_STATE_NAME, UPLOADS_DIR}
+_EXCLUDED_SUFFIXES = ('.tmp', PARTIAL_SUFFIX)
+
+
+def part_ranges(size: int, part_size: int) -> List[Tuple[int, int]]:
+    """
+    Byte ranges of a file's parts.
+
+    Args:
+        size: File size in bytes
+        part_size: Bytes per part
+
+    Returns:
+        (start, end) pairs, end exclusive; one empty range for an empty file
+    """
+    if size == 0:
+        return [(0, 0)]
+    return [
+        (start, min(start + part_size, size))
+        for start in range(0, size, part_size)
+    ]
+
+
+def hash_file(path: Path, part_size: int) -> Dict[str, Any]:
+    """
+    Hash a file as a whole and part by part in one read.
+
+    Args:
+        path: File to hash
+        part_size: Bytes per part
+
+    Returns:
+        Dictionary with size, sha256 and parts (SHA-256 of each part)
+    """
+    whole = hashlib.sha256()
+    parts = []
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(part_size), b''):
+            whole.update(chunk)
+            parts.append(hashlib.sha256(chunk).hexdigest())
+            size += len(chunk)
+    if not parts:
+        parts.append(hashlib.sha256(b'').hexdigest())
+    return {'size': size, 'sha256': whole.hexdigest(), 'parts': parts}
+
+
+def _read_range(path: Path, start: int, end: int) -> bytes:
+    """Bytes start..end of a file."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON atomically."""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+class LocalIndex:
+    """
+    Content-hash manifest of a local directory.
+
+    Hashes are cached in the state file by size and modification time, so
+    only new or modified files are read. The state file also remembers
+    multipart uploads in progress so an interrupted push can resume them.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Open the index of a directory.
+
+        Args:
+            root: Directory to sync
+        """
+        self.root = Path(root)
+        self.state_path = self.root / LOCAL_STATE_NAME
+        try:
+            self.state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            self.state = {}
+        self.state.setdefault('hashes', {})
+        self.state.setdefault('uploads', {})
+
+    def save(self) -> None:
+        """Write the state file."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        _write_json(self.state_path, self.state)
+
+    def files(self) -> List[str]:
+        """
+        Files to sync, as sorted POSIX paths relative to the root.
+
+        Returns:
+            Relative paths, excluding sync bookkeeping and temporary files
+        """
+        if not self.root.exists():
+            return []
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(
+                d for d in dirnames if d not in _EXCLUDED_NAMES
+            )
+            for name in filenames:
+                if (name in _EXCLUDED_NAMES
+                        or name.endswith(_EXCLUDED_SUFFIXES)):
+                    continue
+                path = (Path(dirpath) / name).relative_to(self.root)
+                found.append(path.as_posix())
+        return sorted(found)
+
+    def entry(self, rel: str, part_size: int) -> Dict[str, Any]:
+        """
+        Hashes of one file.
+
+        The cached hashes are used while size and mtime are unchanged.
+
+        Args:
+            rel: Path relative to the root
+            part_size: Bytes per part
+
+        Returns:
+            Dictionary with size, sha256 and parts
+        """
+        stat = os.stat(self.root / rel)
+        cached = self.state['hashes'].get(rel)
+        if (cached and cached['size'] == stat.st_size
+                and cached['mtime_ns'] == stat.st_mtime_ns
+                and cached['part_size'] == part_size):
+            return {key: cached[key] for key in ('size', 'sha256', 'parts')}
+
+        entry = hash_file(self.root / rel, part_size)
+        self.remember(rel, entry, part_size)
+        return entry
+
+    def remember(
+        self,
+        rel: str,
+        entry: Dict[str, Any],
+        part_size: int
+    ) -> None:
+        """
+        Cache the hashes of a file as it is on disk now.
+
+        Args:
+            rel: Path relative to the root
+            entry: Hashes of the file's current content
+            part_size: Bytes per part the hashes were computed with
+        """
+        stat = os.stat(self.root / rel)
+        self.state['hashes'][rel] = dict(
+            entry, mtime_ns=stat.st_mtime_ns, part_size=part_size
+        )
+
+    def scan(self, part_size: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Hashes of every file to sync.
+
+        Args:
+            part_size: Bytes per part
+
+        Returns:
+            Dictionary mapping relative path to its hashes
+        """
+        manifest = {rel: self.entry(rel, part_size) for rel in self.files()}
+        # Forget files that no longer exist
+        self.state['hashes'] = {
+            rel: self.state['hashes'][rel] for rel in manifest
+        }
+        return manifest
+
+
+class SyncTarget(ABC):
+    """
+    Storage holding a mirror of the data directory and its manifest.
+
+    Objects are addressed by their path relative to the data directory.
+    Large files are written as multipart uploads whose parts are either
+    sent or copied from the object's current content, so unchanged byte
+    ranges are never transferred again.
+    """
+
+    url: str
+
+    @abstractmethod
+    def read_manifest(self) -> Dict[str, Any]:
+        """Manifest written by the last sync, or an empty dict."""
+
+    @abstractmethod
+    def write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Replace the manifest."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Write a whole object."""
+
+    @abstractmethod
+    def start_upload(self, key: str) -> str:
+        """Begin a multipart upload and return its id."""
+
+    @abstractmethod
+    def upload_part(
+        self,
+        key: str,
+        upload_id: str,
+        number: int,
+        data: bytes
+    ) -> str:
+        """Send one part; returns its ETag (MD5 hex of the data)."""
+
+    @abstractmethod
+    def copy_part(
+        self,
+        key: str,
+        upload_id: str,
+        number: int,
+        start: int,
+        end: int
+    ) -> str:
+        """Fill one part from bytes start..end of the current object.
+
+        Returns its ETag.
+        """
+
+    @abstractmethod
+    def list_parts(
+        self,
+        key: str,
+        upload_id: str
+    ) -> Optional[Dict[int, str]]:
+        """ETags of the parts already stored.
+
+        None if the upload no longer exists.
+        """
+
+    @abstractmethod
+    def complete_upload(
+        self,
+        key: str,
+        upload_id: str,
+        etags: Dict[int, str]
+    ) -> None:
+        """Assemble the parts into the object."""
+
+    @abstractmethod
+    def abort_upload(self, key: str, upload_id: str) -> None:
+        """Discard a multipart upload and its stored parts."""
+
+    @abstractmethod
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        """Bytes start..end of an object."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an object."""
+
+    def validate_part_size(self, part_size: int) -> None:
+        """
+        Check that the target accepts parts of this size.
+
+        Args:
+            part_size: Bytes per part
+        """
+        if part_size < 1:
+            raise ValueError(f"Part size must be positive, got {part_size}")
+
+
+class DirectoryTarget(SyncTarget):
+    """A plain directory, e.g. a mounted share or a backup disk."""
+
+    def __init__(self, root: Path):
+        """
+        Initialize the target.
+
+        Args:
+            root: Target directory, created if missing
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.url = str(self.root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        return self.root / UPLOADS_DIR / upload_id
+
+    def read_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.root / MANIFEST_NAME).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def write_manifest(self, manifest: Dict[str, Any]) -> None:
+        _write_json(self.root / MANIFEST_NAME, manifest)
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def start_upload(self, key: str) -> str:
+        upload_id = uuid.uuid4().hex
+        self._upload_dir(upload_id).mkdir(parents=True)
+        return upload_id
+
+    def _write_part(self, upload_id: str, number: int, data: bytes) -> str:
+        part = self._upload_dir(upload_id) / f'{number:05d}.part'
+        tmp = part.with_name(part.name + '.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, part)
+        return hashlib.md5(data).hexdigest()
+
+    def upload_part(
+        self,
+        key: str,
+        upload_id: str,
+        number: int,
+        data: bytes
+    ) -> str:
+        return self._write_part(upload_id, number, data)
+
+    def copy_part(
+        self,
+        key: str,
+        upload_id: str,
+        number: int,
+        start: int,
+        end: int
+    ) -> str:
+        data = _read_range(self._path(key), start, end)
+        return self._write_part(upload_id, number, data)
+
+    def list_parts(
+        self,
+        key: str,
+        upload_id: str
+    ) -> Optional[Dict[int, str]]:
+        upload_dir = self._upload_dir(upload_id)
+        if not upload_dir.is_dir():
+            return None
+        return {
+            int(part.stem): hashlib.md5(part.read_bytes()).hexdigest()
+            for part in upload_dir.glob('*.part')
+        }
+
+    def complete_upload(
+        self,
+        key: str,
+        upload_id: str,
+        etags: Dict[int, str]
+    ) -> None:
+        upload_dir = self._upload_dir(upload_id)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as out:
+            for number in sorted(etags):
+                with open(upload_dir / f'{number:05d}.part', 'rb') as part:
+                    shutil.copyfileobj(part, out)
+        os.replace(tmp, path)
+        shutil.rmtree(upload_dir)
+
+    def abort_upload(self, key: str, upload_id: str) -> None:
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        return _read_range(self._path(key), start, end)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class S3Target(SyncTarget):
+    """An S3 bucket prefix, or any S3-compatible store via endpoint_url."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = '',
+        client: Any = None,
+        profile: Optional[str] = None,
+        endpoint_url: Optional[str] = None
+    ):
+        """
+        Initialize the target.
+
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix of the mirrored directory
+            client: boto3 S3 client. Created from profile and endpoint_url
+                if None
+            profile: AWS profile name
+            endpoint_url: S3-compatible endpoint, e.g. a local MinIO or moto
+                server
+        """
+        if client is None:
+            import boto3
+
+            client = boto3.Session(profile_name=profile).client(
+                's3', endpoint_url=endpoint_url
+            )
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.url = f"s3://{bucket}/{self.prefix}"
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def validate_part_size(self, part_size: int) -> None:
+        if part_size < S3_MIN_PART_SIZE:
+            raise ValueError(
+                f"S3 parts must be at least {S3_MIN_PART_SIZE} bytes, "
+                f"got {part_size}"
+            )
+
+    def _is_missing(self, error: Exception, codes: Tuple[str, ...]) -> bool:
+        response = getattr(error, 'response', None) or {}
+        return response.get('Error', {}).get('Code') in codes
+
+    def read_manifest(self) -> Dict[str, Any]:
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._key(MANIFEST_NAME)
+            )
+            body = response['Body'].read()
+        except Exception as e:
+            if self._is_missing(e, ('NoSuchKey', '404')):
+                return {}
+            raise
+        return json.loads(body)
+
+    def write_manifest(self, manifest: Dict[str, Any]) -> None:
+        data = json.dumps(manifest, indent=2, sort_keys=True)
+        self.put(MANIFEST_NAME, data.encode('utf-8'))
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=self._key(key), Body=data
+        )
+
+    def start_upload(self, key: str) -> str:
+        response = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=self._key(key)
+        )
+        return response['UploadId']
+
+    def upload_part(
+        self,
+        key: str,
+        upload_id: str,
+        number: int,
+        data: bytes
+    ) -> str:
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self._key(key), UploadId=upload_id,
+            PartNumber=number, Body=data
+        )
+        return response['ETag'].strip('"')
+
+    def copy_part(
+        self,
+        key: str,
+        upload_id: str,
+        number: int,
+        start: int,
+        end: int
+    ) -> str:
+        response = self.client.upload_part_copy(
+            Bucket=self.bucket, Key=self._key(key), UploadId=upload_id,
+            PartNumber=number,
+            CopySource={'Bucket': self.bucket, 'Key': self._key(key)},
+            CopySourceRange=f'bytes={start}-{end - 1}'
+        )
+        return response['CopyPartResult']['ETag'].strip('"')
+
+    def list_parts(
+        self,
+        key: str,
+        upload_id: str
+    ) -> Optional[Dict[int, str]]:
+        etags = {}
+        paginator = self.client.get_paginator('list_parts')
+        try:
+            for page in paginator.paginate(
+                    Bucket=self.bucket, Key=self._key(key),
+                    UploadId=upload_id):
+                for part in page.get('Parts', []):
+                    etags[part['PartNumber']] = part['ETag'].strip('"')
+        except Exception as e:
+            if self._is_missing(e, ('NoSuchUpload', '404')):
+                return None
+            raise
+        return etags
+
+    def complete_upload(
+        self,
+        key: str,
+        upload_id: str,
+        etags: Dict[int, str]
+    ) -> None:
+        parts = [
+            {'PartNumber': n, 'ETag': f'"{etags[n]}"'} for n in sorted(etags)
+        ]
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=self._key(key), UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+
+    def abort_upload(self, key: str, upload_id: str) -> None:
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self._key(key), UploadId=upload_id
+            )
+        except Exception as e:
+            if not self._is_missing(e, ('NoSuchUpload', '404')):
+                raise
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        if end <= start:
+            return b''
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=self._key(key),
+            Range=f'bytes={start}-{end - 1}'
+        )
+        return response['Body'].read()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+def open_target(
+    url: str,
+    profile: Optional[str] = None,
+    endpoint_url: Optional[str] = None
+) -> SyncTarget:
+    """
+    Open a sync target from its URL.
+
+    Args:
+        url: s3://bucket/prefix, file:///path or a directory path
+        profile: AWS profile for S3 targets
+        endpoint_url: S3-compatible endpoint for S3 targets
+
+    Returns:
+        S3Target or DirectoryTarget
+    """
+    if url.startswith('s3://'):
+        bucket, _, prefix = url[len('s3://'):].partition('/')
+        if not bucket:
+            raise ValueError(f"No bucket in {url}")
+        return S3Target(
+            bucket, prefix, profile=profile, endpoint_url=endpoint_url
+        )
+    if url.startswith('file://'):
+        url = url[len('file://'):]
+    return DirectoryTarget(Path(url))
+
+
+def _reusable(
+    old: Optional[Dict[str, Any]],
+    new: Dict[str, Any],
+    index: int
+) -> bool:
+    """Whether part index has the same content in both versions of a file."""
+    return (old is not None and index < len(old['parts'])
+            and old['parts'][index] == new['parts'][index])
+
+
+def _check_keys(files: Dict[str, Any], target: SyncTarget) -> None:
+    """Reject manifest paths that would resolve outside the local root."""
+    for rel in files:
+        path = PurePosixPath(rel)
+        if not rel or path.is_absolute() or '..' in path.parts or '\\' in rel:
+            raise ValueError(
+                f"Unsafe path {rel!r} in the manifest of {target.url}"
+            )
+
+
+def _abort_stale_uploads(
+    index: LocalIndex,
+    target: SyncTarget,
+    local: Dict[str, Dict[str, Any]]
+) -> None:
+    """
+    Abort recorded uploads to target whose file was deleted or changed since.
+
+    Their stored parts would otherwise stay on the target forever. Uploads
+    that cannot be aborted now stay recorded and are retried next push.
+    """
+    prefix = f"{target.url}|"
+    for upload_key, upload in list(index.state['uploads'].items()):
+        if not upload_key.startswith(prefix):
+            continue
+        rel = upload_key[len(prefix):]
+        if rel in local and local[rel]['sha256'] == upload['sha256']:
+            continue
+        try:
+            target.abort_upload(rel, upload['upload_id'])
+        except Exception:
+            continue
+        del index.state['uploads'][upload_key]
+
+
+def _estimate(
+    report: Dict[str, Any],
+    changed: List[str],
+    new: Dict[str, Dict[str, Any]],
+    old: Dict[str, Dict[str, Any]],
+    part_size: int
+) -> None:
+    """Add the bytes a dry run would transfer and reuse to its report."""
+    for rel in changed:
+        ranges = part_ranges(new[rel]['size'], part_size)
+        for i, (first, last) in enumerate(ranges):
+            reused = _reusable(old.get(rel), new[rel], i)
+            key = 'bytes_reused' if reused else 'bytes_transferred'
+            report[key] += last - first
+
+
+def _new_report() -> Dict[str, Any]:
+    return {'transferred': [], 'deleted': [], 'unchanged': 0, 'failed': {},
+            'bytes_transferred': 0, 'bytes_reused': 0, 'seconds': 0.0}
+
+
+def push(
+    root: Path,
+    target: SyncTarget,
+    part_size: int = DEFAULT_PART_SIZE,
+    jobs: int = 8,
+    delete: bool = False,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Upload the files whose content differs from the target's manifest.
+
+    Files of more than one part are sent as multipart uploads in which
+    parts identical to the target's current object are copied on the
+    target side, so an appended CSV only sends its changed tail. Parts of
+    all files are transferred in parallel. An interrupted upload is
+    resumed on the next push; parts already stored are not sent again.
+
+    Args:
+        root: Local data directory
+        target: Target to update
+        part_size: Bytes per part. A target manifest's part size takes
+            precedence so its part hashes stay comparable
+        jobs: Parallel part transfers
+        delete: Remove target files that no longer exist locally
+        dry_run: Only report what would be transferred
+
+    Returns:
+        Report with transferred, deleted, unchanged, failed,
+        bytes_transferred, bytes_reused and seconds
+    """
+    start = time.perf_counter()
+    remote = target.read_manifest()
+    part_size = remote.get('part_size', part_size)
+    target.validate_part_size(part_size)
+    remote_files: Dict[str, Dict[str, Any]] = remote.get('files', {})
+
+    index = LocalIndex(root)
+    local = index.scan(part_size)
+    changed = [
+        rel for rel, entry in local.items()
+        if remote_files.get(rel, {}).get('sha256') != entry['sha256']
+    ]
+    removed = sorted(set(remote_files) - set(local)) if delete else []
+
+    report = _new_report()
+    report['unchanged'] = len(local) - len(changed)
+    if dry_run:
+        report['transferred'], report['deleted'] = changed, removed
+        _estimate(report, changed, local, remote_files, part_size)
+        return report
+
+    _abort_stale_uploads(index, target, local)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'part_size': part_size,
+        'files': dict(remote_files),
+    }
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        pending = [
+            (rel, _submit_push(pool, index, target, rel, local[rel],
+                               remote_files.get(rel), part_size))
+            for rel in changed
+        ]
+        index.save()
+
+        for rel, finish in pending:
+            try:
+                sent, reused = finish()
+            except Exception as e:
+                report['failed'][rel] = f"{type(e).__name__}: {e}"
+                continue
+            manifest['files'][rel] = local[rel]
+            # Record each file as soon as it is complete so an interrupted
+            # push keeps its progress
+            target.write_manifest(manifest)
+            index.save()
+            report['transferred'].append(rel)
+            report['bytes_transferred'] += sent
+            report['bytes_reused'] += reused
+
+    for rel in removed:
+        target.delete(rel)
+        manifest['files'].pop(rel, None)
+        report['deleted'].append(rel)
+    if removed:
+        target.write_manifest(manifest)
+
+    index.save()
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def _submit_push(
+    pool: ThreadPoolExecutor,
+    index: LocalIndex,
+    target: SyncTarget,
+    rel: str,
+    entry: Dict[str, Any],
+    old: Optional[Dict[str, Any]],
+    part_size: int
+) -> Callable[[], Tuple[int, int]]:
+    """
+    Queue one file's transfers.
+
+    Returns a function that completes the file and returns
+    (bytes sent, bytes reused).
+    """
+    path = index.root / rel
+    ranges = part_ranges(entry['size'], part_size)
+
+    if len(ranges) == 1:
+        future = pool.submit(lambda: target.put(rel, path.read_bytes()))
+
+        def finish_put() -> Tuple[int, int]:
+            future.result()
+            return entry['size'], 0
+
+        return finish_put
+
+    upload_key = f"{target.url}|{rel}"
+    upload_id, stored = _resume_upload(index, target, rel, entry)
+
+    def transfer(number: int, first: int, last: int) -> Tuple[str, int, int]:
+        if number in stored:
+            data = _read_range(path, first, last)
+            if hashlib.md5(data).hexdigest() == stored[number]:
+                return stored[number], 0, last - first
+        else:
+            data = None
+        if _reusable(old, entry, number - 1):
+            etag = target.copy_part(rel, upload_id, number, first, last)
+            return etag, 0, last - first
+        data = data if data is not None else _read_range(path, first, last)
+        etag = target.upload_part(rel, upload_id, number, data)
+        return etag, last - first, 0
+
+    futures: List[Tuple[int, Future]] = [
+        (number, pool.submit(transfer, number, first, last))
+        for number, (first, last) in enumerate(ranges, start=1)
+    ]
+
+    def finish() -> Tuple[int, int]:
+        etags, sent, reused = {}, 0, 0
+        for number, future in futures:
+            etags[number], part_sent, part_reused = future.result()
+            sent += part_sent
+            reused += part_reused
+        target.complete_upload(rel, upload_id, etags)
+        index.state['uploads'].pop(upload_key, None)
+        return sent, reused
+
+    return finish
+
+
+def _resume_upload(
+    index: LocalIndex,
+    target: SyncTarget,
+    rel: str,
+    entry: Dict[str, Any]
+) -> Tuple[str, Dict[int, str]]:
+    """
+    Multipart upload for a file, resuming the recorded one if possible.
+
+    Args:
+        index: Local index recording uploads in progress
+        target: Target to upload to
+        rel: Path relative to the root
+        entry: Hashes of the file's current content
+
+    Returns:
+        Upload id and the ETags of the parts already stored
+    """
+    upload_key = f"{target.url}|{rel}"
+    upload = index.state['uploads'].get(upload_key)
+    stored = None
+    if upload and upload['sha256'] == entry['sha256']:
+        stored = target.list_parts(rel, upload['upload_id'])
+    if stored is None:
+        upload = {
+            'upload_id': target.start_upload(rel),
+            'sha256': entry['sha256'],
+        }
+        index.state['uploads'][upload_key] = upload
+        stored = {}
+    return upload['upload_id'], stored
+
+
+def pull(
+    root: Path,
+    target: SyncTarget,
+    jobs: int = 8,
+    delete: bool = False,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Download the files whose content differs from the local copy.
+
+    Each file is assembled in a partial file next to it: parts identical
+    to the local version are copied locally, the others are fetched with
+    range requests, in parallel, and every part is checked against the
+    manifest hash. An interrupted download resumes from its partial file.
+
+    Args:
+        root: Local data directory
+        target: Target to read
+        jobs: Parallel part transfers
+        delete: Remove local files that are not in the target's manifest
+        dry_run: Only report what would be transferred
+
+    Returns:
+        Report with transferred, deleted, unchanged, failed,
+        bytes_transferred, bytes_reused and seconds
+
+    Raises:
+        FileNotFoundError: If the target has no manifest, e.g. it was filled
+            by another tool; pulling would silently transfer nothing
+        ValueError: If a manifest path would resolve outside root
+    """
+    start = time.perf_counter()
+    remote = target.read_manifest()
+    if not remote:
+        raise FileNotFoundError(
+            f"No {MANIFEST_NAME} at {target.url}. Push once from a "
+            f"complete copy of the data to create it (see "
+            f"docs/SCRAPER_CLI.md)"
+        )
+    remote_files: Dict[str, Dict[str, Any]] = remote.get('files', {})
+    _check_keys(remote_files, target)
+    part_size = remote.get('part_size', DEFAULT_PART_SIZE)
+
+    index = LocalIndex(root)
+    local = index.scan(part_size)
+    changed = [
+        rel for rel, entry in remote_files.items()
+        if local.get(rel, {}).get('sha256') != entry['sha256']
+    ]
+    removed = sorted(set(local) - set(remote_files)) if delete else []
+
+    report = _new_report()
+    report['unchanged'] = len(remote_files) - len(changed)
+    if dry_run:
+        report['transferred'], report['deleted'] = changed, removed
+        _estimate(report, changed, remote_files, local, part_size)
+        return report
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for rel in changed:
+            try:
+                received, reused = _pull_file(
+                    pool, index, target, rel, remote_files[rel],
+                    local.get(rel), part_size
+                )
+            except Exception as e:
+                report['failed'][rel] = f"{type(e).__name__}: {e}"
+                continue
+            index.remember(rel, remote_files[rel], part_size)
+            report['transferred'].append(rel)
+            report['bytes_transferred'] += received
+            report['bytes_reused'] += reused
+
+    for rel in removed:
+        (index.root / rel).unlink(missing_ok=True)
+        index.state['hashes'].pop(rel, None)
+        report['deleted'].append(rel)
+
+    index.save()
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def _pull_file(
+    pool: ThreadPoolExecutor,
+    index: LocalIndex,
+    target: SyncTarget,
+    rel: str,
+    entry: Dict[str, Any],
+    old: Optional[Dict[str, Any]],
+    part_size: int
+) -> Tuple[int, int]:
+    """
+    Download one file through its partial file.
+
+    Returns (bytes received, bytes reused).
+    """
+    path = index.root / rel
+    partial = path.with_name(path.name + PARTIAL_SUFFIX)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    resumable = partial.exists() and partial.stat().st_size == entry['size']
+
+    fd = os.open(partial, os.O_RDWR | os.O_CREAT)
+    try:
+        os.ftruncate(fd, entry['size'])
+
+        def transfer(i: int, first: int, last: int) -> Tuple[int, int]:
+            expected = entry['parts'][i]
+            if resumable:
+                data = os.pread(fd, last - first, first)
+                if hashlib.sha256(data).hexdigest() == expected:
+                    return 0, last - first
+            if _reusable(old, entry, i):
+                os.pwrite(fd, _read_range(path, first, last), first)
+                return 0, last - first
+
+            data = target.read_range(rel, first, last)
+            if hashlib.sha256(data).hexdigest() != expected:
+                raise ValueError(
+                    f"Part {i + 1} of {rel} does not match the manifest"
+                )
+            os.pwrite(fd, data, first)
+            return last - first, 0
+
+        ranges = part_ranges(entry['size'], part_size)
+        futures = [
+            pool.submit(transfer, i, first, last)
+            for i, (first, last) in enumerate(ranges)
+        ]
+        results = [future.result() for future in futures]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    os.replace(partial, path)
+    return sum(r[0] for r in results), sum(r[1] for r in results)
@@ -0,0 +1,195 @@
+"""Declarative schema validation and vectorized coercion for scraped data."""
+from typing import Any, Callable, Dict, Tuple
+import pandas as pd
+
+
+REJECT_REASON_COLUMN = '_reject_reason'
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """Convert to trimmed strings with empty values as missing."""
+    text = series.astype('string').str.strip()
+    return text.mask(text == '')
+
+
+# Coercers take trimmed text (missing as <NA>) and return typed values,
+# with NA wherever the text could not be converted
+
+
+def _to_string(text: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    return text
+
+
+def _to_category(text: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    return text.astype('category')
+
+
+def _to_float(text: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    return pd.to_numeric(text.str.replace(',', '', regex=False),
+                         errors='coerce').astype('float64')
+
+
+def _to_integer(text: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    values = _to_float(text, spec)
+    # Values with a fractional part are not valid integers
+    values = values.mask(values % 1 != 0)
+    return values.astype('Int64')
+
+
+def _to_currency(text: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    text = text.str.replace(r'[\$,\s]', '', regex=True)
+    return pd.to_numeric(text, errors='coerce').astype('float64')
+
+
+def _to_measure(text: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    # Leading number of values like "1,850 sqft" or "0.25 acres"
+    number = text.str.extract(r'([-+]?\d[\d,]*\.?\d*)', expand=False)
+    return pd.to_numeric(number.str.replace(',', '', regex=False),
+                         errors='coerce').astype('float64')
+
+
+def _to_date(text: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    date_format = spec.get('format')
+    values = pd.to_datetime(text, format=date_format, errors='coerce')
+    if date_format:
+        # Files written before the format was configured hold ISO dates
+        retry = values.isna() & text.notna()
+        if retry.any():
+            values[retry] = pd.to_datetime(text[retry], format='ISO8601',
+                                           errors='coerce')
+    return values
+
+
+COERCERS: Dict[str, Callable[[pd.Series, Dict[str, Any]], pd.Series]] = {
+    'string': _to_string,
+    'category': _to_category,
+    'integer': _to_integer,
+    'float': _to_float,
+    'currency': _to_currency,
+    'measure': _to_measure,
+    'date': _to_date,
+}
+
+
+def _strftime(
+    values: pd.Series,
+    date_format: str,
+    fraction_digits: int = 6
+) -> pd.Series:
+    """Format dates, writing %f with fraction_digits digits."""
+    if fraction_digits >= 6 or '%f' not in date_format:
+        return values.dt.strftime(date_format)
+
+    before, after = date_format.split('%f', 1)
+    fraction = values.dt.microsecond.astype('Int64')
+    fraction = fraction // 10 ** (6 - fraction_digits)
+    fraction = fraction.astype('string').str.zfill(fraction_digits)
+    text = values.dt.strftime(before) + fraction
+    if after:
+        text = text + _strftime(values, after, fraction_digits)
+    return text
+
+
+def format_dates(df: pd.DataFrame, schema: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Render validated date columns as text in their configured format.
+
+    Used before writing, so output files keep the source's date format
+    and appended rows match the rows already on disk. strftime writes %f
+    as microseconds; a column spec with fraction_digits (e.g. 3 for
+    sources with milliseconds like '.000') writes that many digits.
+
+    Args:
+        df: Validated data
+        schema: Schema dictionary
+
+    Returns:
+        Copy of df with formatted date columns (df itself if there are none)
+    """
+    formatted = df
+    for column, spec in schema.get('columns', {}).items():
+        if (not isinstance(spec, dict) or spec.get('type') != 'date'
+                or not spec.get('format')):
+            continue
+        if (column in df.columns
+                and pd.api.types.is_datetime64_any_dtype(df[column])):
+            if formatted is df:
+                formatted = df.copy()
+            formatted[column] = _strftime(
+                df[column], spec['format'], spec.get('fraction_digits', 6)
+            )
+    return formatted
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    schema: Dict[str, Any]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Coerce columns to their declared types and split off invalid rows.
+
+    Every step works on whole columns, so cost grows with the number of
+    columns in the schema rather than with Python work per row.
+
+    Schema format::
+
+        dedupe: true            # drop exact duplicate rows after coercion
+        columns:
+          Sale Date: {type: date, format: '%m/%d/%Y', required: true}
+          Sale Price: {type: currency}
+          Reported: {type: date, format: '%Y-%m-%dT%H:%M:%S.%f',
+                     fraction_digits: 3}
+
+    Column types: string, category, integer, float, currency, measure, date.
+    Columns not listed in the schema are passed through unchanged; listed
+    columns missing from df are skipped.
+
+    Args:
+        df: Raw scraped data
+        schema: Schema dictionary
+
+    Returns:
+        Tuple of (valid rows with coerced dtypes, rejected raw rows with a
+        _reject_reason column)
+    """
+    columns = schema.get('columns', {})
+    coerced = df.copy()
+    reasons = pd.Series('', index=df.index, dtype='object')
+
+    for column, spec in columns.items():
+        if column not in df.columns:
+            continue
+
+        if isinstance(spec, str):
+            spec = {'type': spec}
+
+        col_type = spec.get('type', 'string')
+        if col_type not in COERCERS:
+            raise ValueError(
+                f"Unknown schema type for column {column}: {col_type}"
+            )
+
+        text = _as_text(df[column])
+        values = COERCERS[col_type](text, spec)
+        present = text.notna()
+
+        invalid = present & values.isna()
+        reasons = reasons.mask(invalid,
+                               reasons + f"; {column}: invalid {col_type}")
+
+        if spec.get('required', False):
+            missing = ~present
+            reasons = reasons.mask(missing, reasons + f"; {column}: missing")
+
+        coerced[column] = values
+
+    rejected_mask = reasons != ''
+
+    rejected = df[rejected_mask].copy()
+    rejected[REJECT_REASON_COLUMN] = reasons[rejected_mask].str[2:]
+
+    valid = coerced[~rejected_mask]
+    if schema.get('dedupe', False):
+        valid = valid[~valid.duplicated(keep='first')]
+
+    return valid.reset_index(drop=True), rejected.reset_index(drop=True)
@@ -0,0 +1,247 @@
+"""Address normalization and block-key parsing for the housing-crime join."""
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Callable, Optional
+import pandas as pd
+
+
+# Bump when parsing changes so cached results are re-parsed
+PARSER_VERSION = 1
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# First house number in an address, as in "1234 STATE ST"
+HOUSE_NUMBER_PATTERN = re.compile(r'(\d+) ')
+# Crime locations carry a "BLK" marker, as in "1200 BLK STATE ST"
+BLOCK_MARKER_PATTERN = re.compile(r'BLK ')
+# First word and the rest of a whitespace-collapsed address
+FIRST_WORD_PATTERN = re.compile(r'^(?P<first>[^ ]*) ?(?P<rest>.*)$')
+
+
+def _collapse_whitespace(text: pd.Series) -> pd.Series:
+    """Trim and collapse runs of whitespace to single spaces."""
+    return text.str.replace(WHITESPACE_PATTERN, ' ', regex=True).str.strip()
+
+
+def address_key(addresses: pd.Series) -> pd.Series:
+    """
+    Normalize addresses into exact keys for grouping sales of one property.
+
+    Args:
+        addresses: Short addresses (house number and street name)
+
+    Returns:
+        Upper-case keys with collapsed whitespace
+    """
+    return _collapse_whitespace(addresses.astype('string')).str.upper()
+
+
+def parse_sale_addresses(raw: pd.Series) -> pd.DataFrame:
+    """
+    Parse raw sale addresses, one vectorized pass over the given values.
+
+    Args:
+        raw: Address strings, possibly multi-line
+            ("1234 STATE ST\\nBELLINGHAM")
+
+    Returns:
+        DataFrame with Address, Streetnumber (0 if none) and StreetName
+    """
+    address = _collapse_whitespace(raw.astype(str).str.split('\n').str[0])
+    house_number = address.str.extract(HOUSE_NUMBER_PATTERN, expand=False)
+    has_number = house_number.notna()
+
+    rest = address.str.extract(FIRST_WORD_PATTERN)['rest']
+    street_name = address.where(~has_number, rest)
+    number = pd.to_numeric(house_number, errors='coerce')
+    return pd.DataFrame({
+        'Address': address,
+        'Streetnumber': number.fillna(0).astype(int),
+        'StreetName': street_name.str.split('#').str[0],
+    })
+
+
+def parse_crime_locations(raw: pd.Series) -> pd.DataFrame:
+    """
+    Parse raw crime locations, one vectorized pass over the given values.
+
+    Args:
+        raw: Location strings such as "1200 BLK STATE ST"
+
+    Returns:
+        DataFrame with Location, StreetBLK (missing if no block number) and
+        StreetName
+    """
+    location = _collapse_whitespace(
+        raw.astype(str).str.replace(BLOCK_MARKER_PATTERN, '', regex=True)
+    )
+    parts = location.str.extract(FIRST_WORD_PATTERN)
+    block = pd.to_numeric(parts['first'], errors='coerce')
+    return pd.DataFrame({
+        'Location': location,
+        'StreetBLK': block.astype('Int64'),
+        'StreetName': parts['rest'],
+    })
+
+
+class AddressCache:
+    """
+    Persistent cache of parsed addresses keyed by the raw string.
+
+    The same addresses recur across sales and across years of crime
+    reports, so later runs only parse strings they have not seen. Entries
+    written by an older PARSER_VERSION are treated as misses.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open or create the cache.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS parsed (kind TEXT, raw TEXT, '
+            'version INTEGER, fields TEXT, PRIMARY KEY (kind, raw)) '
+            'WITHOUT ROWID'
+        )
+
+    def __enter__(self) -> 'AddressCache':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def parse(
+        self,
+        kind: str,
+        raw: pd.Series,
+        parser: Callable[[pd.Series], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Parse distinct raw strings, using cached results where available.
+
+        Args:
+            kind: Namespace of the parser, e.g. 'sale' or 'crime'
+            raw: Distinct raw strings
+            parser: Vectorized parser for the misses
+
+        Returns:
+            Parsed DataFrame aligned with raw
+        """
+        raw = pd.Series(raw, dtype=object).reset_index(drop=True)
+
+        self._conn.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS lookup '
+            '(pos INTEGER PRIMARY KEY, raw TEXT)'
+        )
+        self._conn.execute('DELETE FROM lookup')
+        self._conn.executemany(
+            'INSERT INTO lookup VALUES (?, ?)', enumerate(raw)
+        )
+        hits = {
+            pos: json.loads(fields)
+            for pos, fields in self._conn.execute(
+                'SELECT lookup.pos, parsed.fields FROM lookup JOIN parsed '
+                'ON parsed.kind = ? AND parsed.raw = lookup.raw '
+                'AND parsed.version = ?',
+                (kind, PARSER_VERSION)
+            )
+        }
+        self._conn.execute('DELETE FROM lookup')
+
+        misses = raw[~raw.index.isin(list(hits))]
+        parsed_misses = parser(misses)
+
+        if len(misses):
+            records = parsed_misses.astype(object).where(
+                parsed_misses.notna(), None
+            ).to_dict('records')
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?)',
+                    ((kind, value, PARSER_VERSION,
+                      json.dumps(record, default=int))
+                     for value, record in zip(misses, records))
+                )
+
+        if not hits:
+            return parsed_misses.reset_index(drop=True)
+
+        cached = pd.DataFrame.from_dict(
+            hits, orient='index', columns=parsed_misses.columns
+        )
+        combined = pd.concat([cached, parsed_misses]).sort_index()
+        combined = combined.astype(parsed_misses.dtypes.to_dict())
+        return combined.reset_index(drop=True)
+
+
+def _parse_distinct(
+    values: pd.Series,
+    kind: str,
+    parser: Callable[[pd.Series], pd.DataFrame],
+    cache: Optional[AddressCache]
+) -> pd.DataFrame:
+    """Parse each distinct value once and map the results back to every row."""
+    codes, uniques = pd.factorize(values.astype(str))
+    uniques = pd.Series(uniques, dtype=object)
+    if cache is not None:
+        parsed = cache.parse(kind, uniques, parser)
+    else:
+        parsed = parser(uniques).reset_index(drop=True)
+    result = parsed.take(codes)
+    result.index = values.index
+    return result
+
+
+def normalize_sale_addresses(
+    addresses: pd.Series,
+    cache: Optional[AddressCache] = None
+) -> pd.DataFrame:
+    """
+    Derive the address keys the housing-crime join depends on.
+
+    Args:
+        addresses: Raw sale addresses
+        cache: Persistent cache of parsed addresses
+
+    Returns:
+        DataFrame aligned with addresses with Address, Streetnumber,
+        StreetBLK, StreetName, Address Block and ShortAddress
+    """
+    df = _parse_distinct(addresses, 'sale', parse_sale_addresses, cache)
+    df['StreetBLK'] = df['Streetnumber'] // 100 * 100
+    df['Address Block'] = (df['StreetBLK'].astype(str) + ' '
+                           + df['StreetName'])
+    df['ShortAddress'] = (df['Streetnumber'].astype(str) + ' '
+                          + df['StreetName'])
+    return df[['Address', 'Streetnumber', 'StreetBLK', 'StreetName',
+               'Address Block', 'ShortAddress']]
+
+
+def normalize_crime_locations(
+    locations: pd.Series,
+    cache: Optional[AddressCache] = None
+) -> pd.DataFrame:
+    """
+    Derive block keys from crime locations.
+
+    Location is the block key matched against a sale's Address Block.
+
+    Args:
+        locations: Raw crime locations
+        cache: Persistent cache of parsed addresses
+
+    Returns:
+        DataFrame aligned with locations with Location, StreetBLK and
+        StreetName
+    """
+    return _parse_distinct(locations, 'crime', parse_crime_locations, cache)
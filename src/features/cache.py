@@ -0,0 +1,673 @@
+"""Content-hash keyed Parquet cache for the feature-building stages."""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+
+from src.features.address import AddressCache, normalize_sale_addresses
+from src.features.build_features import (
+    CrimeWindowIndex, add_crime_window_features
+)
+from src.features.cleaning import (
+    HOUSING_DATE_COLUMN, NEIGHBORHOOD_COLUMN, address_key, clean_crime_df,
+    clean_housing_df
+)
+from src.features.encoding import NeighborhoodEncoder, tokenize
+from src.features.matrix import FeatureMatrix, export_design_matrix
+
+
+# Bump when a stage's output changes for the same inputs so old entries are
+# recomputed
+CACHE_VERSION = 1
+
+HIT = 'hit'
+INCREMENTAL = 'incremental'
+MISS = 'miss'
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_fingerprint(
+    path: Path,
+    prefix_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Hash a file in one streaming pass.
+
+    Args:
+        path: Input file
+        prefix_size: Also hash the first prefix_size bytes, to check
+            whether the file is an earlier version of size prefix_size with
+            rows appended
+
+    Returns:
+        Dictionary with size, sha256 and, if requested and the file is large
+        enough, prefix_sha256
+    """
+    digest = hashlib.sha256()
+    fingerprint: Dict[str, Any] = {'size': 0}
+
+    with open(path, 'rb') as f:
+        while True:
+            limit = _HASH_CHUNK_BYTES
+            if (prefix_size is not None
+                    and 'prefix_sha256' not in fingerprint):
+                limit = min(limit, prefix_size - fingerprint['size'])
+                if limit == 0:
+                    fingerprint['prefix_sha256'] = digest.copy().hexdigest()
+                    limit = _HASH_CHUNK_BYTES
+
+            chunk = f.read(limit)
+            if not chunk:
+                break
+            digest.update(chunk)
+            fingerprint['size'] += len(chunk)
+
+    if prefix_size is not None and fingerprint['size'] == prefix_size:
+        fingerprint['prefix_sha256'] = digest.hexdigest()
+    fingerprint['sha256'] = digest.hexdigest()
+    return fingerprint
+
+
+def stage_key(
+    stage: str,
+    inputs: Dict[str, str],
+    params: Dict[str, Any]
+) -> str:
+    """
+    Cache key of a stage run.
+
+    Args:
+        stage: Stage name
+        inputs: Content hash of each input (file hashes or upstream stage
+            keys)
+        params: Parameters affecting the output, e.g. the crime windows
+
+    Returns:
+        Hex SHA-256 of the stage, CACHE_VERSION, inputs and parameters
+    """
+    payload = json.dumps(
+        {'stage': stage, 'version': CACHE_VERSION, 'inputs': inputs,
+         'params': params},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def is_append(
+    fingerprint: Dict[str, Any],
+    previous: Optional[Dict[str, Any]]
+) -> bool:
+    """
+    Check whether a file only grew since a previous fingerprint.
+
+    Args:
+        fingerprint: Current fingerprint, hashed with
+            prefix_size=previous['size']
+        previous: Fingerprint recorded by the previous run
+
+    Returns:
+        True if the previous content is an exact prefix of the current file
+    """
+    return (
+        previous is not None
+        and fingerprint['size'] >= previous['size']
+        and fingerprint.get('prefix_sha256') == previous['sha256']
+    )
+
+
+class FeatureCache:
+    """
+    One Parquet file per stage plus a JSON manifest with its cache key.
+
+    Only the latest result of each stage is kept. The manifest records the
+    key, the input fingerprints and row counts so the next run can tell an
+    unchanged input (cache hit) from one with rows appended (incremental
+    recompute) or anything else (full recompute). Sparse columns are stored
+    dense and restored on load, since Parquet has no sparse type. Every
+    stage run is recorded in report.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Open or create the cache.
+
+        Args:
+            root: Cache directory
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.report: List[Dict[str, Any]] = []
+
+    def data_path(self, stage: str) -> Path:
+        """Parquet file of a stage."""
+        return self.root / f'{stage}.parquet'
+
+    def manifest_path(self, stage: str) -> Path:
+        """Manifest file of a stage."""
+        return self.root / f'{stage}.json'
+
+    def manifest(self, stage: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a stage's manifest.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Manifest dictionary, or None if the stage has no usable cache
+            entry
+        """
+        path = self.manifest_path(stage)
+        if not path.exists() or not self.data_path(stage).exists():
+            return None
+        try:
+            manifest = json.loads(path.read_text())
+        except ValueError:
+            return None
+        return manifest if manifest.get('version') == CACHE_VERSION else None
+
+    def load(self, stage: str, manifest: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Load a stage's cached frame.
+
+        Args:
+            stage: Stage name
+            manifest: The stage's manifest
+
+        Returns:
+            Cached DataFrame with sparse columns restored
+        """
+        df = pd.read_parquet(self.data_path(stage))
+        for column in manifest.get('sparse_columns', []):
+            dtype = pd.SparseDtype(df[column].dtype, 0)
+            df[column] = df[column].astype(dtype)
+        return df
+
+    def save(
+        self,
+        stage: str,
+        df: pd.DataFrame,
+        manifest: Dict[str, Any]
+    ) -> None:
+        """
+        Write a stage's frame and manifest, replacing the previous entry.
+
+        The old manifest is removed first and the new one written last, so
+        an interrupted write leaves no manifest and the next run is a miss.
+
+        Args:
+            stage: Stage name
+            df: Stage output
+            manifest: Key, input fingerprints and stage metadata
+        """
+        sparse_columns = [
+            c for c in df.columns if isinstance(df[c].dtype, pd.SparseDtype)
+        ]
+        if sparse_columns:
+            df = df.copy()
+            for column in sparse_columns:
+                df[column] = df[column].sparse.to_dense()
+
+        self.manifest_path(stage).unlink(missing_ok=True)
+        tmp = self.data_path(stage).with_suffix('.parquet.tmp')
+        df.to_parquet(tmp)
+        os.replace(tmp, self.data_path(stage))
+
+        manifest = dict(manifest, version=CACHE_VERSION, rows=len(df),
+                        sparse_columns=sparse_columns)
+        self.manifest_path(stage).write_text(
+            json.dumps(manifest, indent=2, default=str)
+        )
+
+    def record(
+        self,
+        stage: str,
+        status: str,
+        rows: int,
+        computed: int
+    ) -> None:
+        """
+        Add a stage run to the report.
+
+        Args:
+            stage: Stage name
+            status: HIT, INCREMENTAL or MISS
+            rows: Rows in the stage output
+            computed: Rows recomputed in this run
+        """
+        self.report.append({
+            'stage': stage, 'status': status, 'rows': rows,
+            'computed': computed
+        })
+
+    def format_report(self) -> str:
+        """
+        Format the report, one line per stage run.
+
+        Returns:
+            Text such as 'crime_clean  hit          12000 rows, 0 recomputed'
+        """
+        return '\n'.join(
+            f"{entry['stage']:<14} {entry['status']:<12} "
+            f"{entry['rows']} rows, {entry['computed']} recomputed"
+            for entry in self.report
+        )
+
+
+def _read_input(path: Path) -> pd.DataFrame:
+    """Read a raw CSV input.
+
+    Its positional index stays stable under appends.
+    """
+    return pd.read_csv(path).reset_index(drop=True)
+
+
+def _cached_crime(
+    cache: FeatureCache,
+    crime_path: Path,
+    date_column: str,
+    address_cache: Optional[AddressCache]
+) -> Tuple[pd.DataFrame, str]:
+    """Clean crimes row by row, so appended rows are cleaned on their own."""
+    stage = 'crime_clean'
+    previous = cache.manifest(stage)
+    prior_input = previous['inputs']['crime'] if previous else None
+    fingerprint = file_fingerprint(
+        crime_path, prior_input['size'] if prior_input else None
+    )
+
+    params = {'date_column': date_column}
+    key = stage_key(stage, {'crime': fingerprint['sha256']}, params)
+
+    if previous and previous['key'] == key:
+        df = cache.load(stage, previous)
+        cache.record(stage, HIT, len(df), 0)
+        return df, key
+
+    raw = _read_input(crime_path)
+    manifest = {
+        'key': key,
+        'params': params,
+        'inputs': {'crime': _input_record(fingerprint, len(raw))},
+    }
+    if (previous and previous['params'] == params
+            and is_append(fingerprint, prior_input)):
+        cached = cache.load(stage, previous)
+        new = clean_crime_df(raw.iloc[prior_input['rows']:],
+                             date_column=date_column,
+                             address_cache=address_cache)
+        df = pd.concat([cached, new])
+        # Lets crime_join tell an append of the crimes it counted from an edit
+        manifest['appended_to'] = previous['key']
+        cache.save(stage, df, manifest)
+        cache.record(stage, INCREMENTAL, len(df), len(new))
+        return df, key
+
+    df = clean_crime_df(raw, date_column=date_column,
+                        address_cache=address_cache)
+    cache.save(stage, df, manifest)
+    cache.record(stage, MISS, len(df), len(df))
+    return df, key
+
+
+def _cached_housing(
+    cache: FeatureCache,
+    housing_path: Path,
+    date_column: str,
+    address_cache: Optional[AddressCache]
+) -> Tuple[pd.DataFrame, str]:
+    """
+    Clean sales. Appended rows are cleaned together with the earlier sales
+    of the same address and date, since those are averaged together; a
+    neighborhood word outside the cached vocabulary forces a full rebuild.
+    """
+    stage = 'housing_clean'
+    previous = cache.manifest(stage)
+    prior_input = previous['inputs']['housing'] if previous else None
+    fingerprint = file_fingerprint(
+        housing_path, prior_input['size'] if prior_input else None
+    )
+
+    params = {'date_column': date_column}
+    key = stage_key(stage, {'housing': fingerprint['sha256']}, params)
+
+    if previous and previous['key'] == key:
+        df = cache.load(stage, previous)
+        cache.record(stage, HIT, len(df), 0)
+        return df, key
+
+    raw = _read_input(housing_path)
+    if (previous and previous['params'] == params
+            and is_append(fingerprint, prior_input)):
+        encoder = NeighborhoodEncoder(previous['vocabulary'])
+        new_raw = raw.iloc[prior_input['rows']:]
+        new_tokens = set()
+        if NEIGHBORHOOD_COLUMN in new_raw.columns:
+            for value in new_raw[NEIGHBORHOOD_COLUMN].dropna().unique():
+                new_tokens.update(tokenize(value))
+
+        if new_tokens <= set(encoder.vocabulary):
+            cached = cache.load(stage, previous)
+            # Earlier sales sharing an (address, sale date) group with a
+            # new sale
+            keys = (address_key(cached['ShortAddress']) + '|'
+                    + cached[date_column].astype(str))
+            new_addresses = normalize_sale_addresses(
+                new_raw['Address'], cache=address_cache
+            )
+            new_keys = (address_key(new_addresses['ShortAddress']) + '|'
+                        + new_raw[date_column].astype(str))
+            affected = cached.index[keys.isin(new_keys)]
+
+            subset = raw.loc[affected.union(new_raw.index)]
+            recomputed = clean_housing_df(subset, date_column,
+                                          encoder=encoder,
+                                          address_cache=address_cache)
+            df = pd.concat(
+                [cached.drop(index=affected), recomputed]
+            ).sort_index()
+
+            manifest = {
+                'key': key,
+                'params': params,
+                'vocabulary': encoder.vocabulary,
+                'inputs': {
+                    'housing': _input_record(fingerprint, len(raw))
+                },
+            }
+            cache.save(stage, df, manifest)
+            cache.record(stage, INCREMENTAL, len(df), len(subset))
+            return df, key
+
+    if NEIGHBORHOOD_COLUMN in raw.columns:
+        encoder = NeighborhoodEncoder().fit(raw[NEIGHBORHOOD_COLUMN])
+    else:
+        encoder = NeighborhoodEncoder([])
+    df = clean_housing_df(raw, date_column, encoder=encoder,
+                          address_cache=address_cache)
+    manifest = {
+        'key': key,
+        'params': params,
+        'vocabulary': encoder.vocabulary,
+        'inputs': {'housing': _input_record(fingerprint, len(raw))},
+    }
+    cache.save(stage, df, manifest)
+    cache.record(stage, MISS, len(df), len(raw))
+    return df, key
+
+
+def _cached_join(
+    cache: FeatureCache,
+    housing_df: pd.DataFrame,
+    crime_df: pd.DataFrame,
+    housing_key: str,
+    crime_key: str,
+    windows: List[int],
+    case_column: Optional[str],
+    crime_appended_to: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Join crime windows onto sales. When the crimes are the ones last joined
+    or those with rows appended (crime_clean's appended_to is the crime key
+    the join last used), only sales that are new or re-cleaned, or whose
+    block had a new crime inside one of their windows, are recounted. Any
+    other change to the crimes recounts every sale.
+    """
+    stage = 'crime_join'
+    previous = cache.manifest(stage)
+
+    params = {'windows': windows, 'case_column': case_column}
+    key = stage_key(
+        stage, {'housing': housing_key, 'crime': crime_key}, params
+    )
+    manifest = {
+        'key': key,
+        'params': params,
+        'crime_key': crime_key,
+        'crime_rows': len(crime_df),
+    }
+
+    if previous and previous['key'] == key:
+        df = cache.load(stage, previous)
+        cache.record(stage, HIT, len(df), 0)
+        return df
+
+    join_args = dict(windows=windows, case_column=case_column)
+    index = CrimeWindowIndex(crime_df, case_column=case_column)
+
+    usable = (
+        previous is not None
+        and previous['params'] == params
+        and previous.get('crime_key') is not None
+        and previous['crime_key'] in (crime_key, crime_appended_to)
+        and previous['crime_rows'] <= len(crime_df)
+        and previous.get('categories') == index.categories
+    )
+    if usable:
+        cached = cache.load(stage, previous)
+        new_crime = crime_df.iloc[previous['crime_rows']:]
+
+        # Sales that are new, or whose block or month changed when re-cleaned
+        same = housing_df.index.isin(cached.index)
+        reference = cached.reindex(housing_df.index)
+        moved = reference['Address Block'] != housing_df['Address Block']
+        redated = reference['Month'] != housing_df['Month']
+        changed = ~same | moved.to_numpy() | redated.to_numpy()
+
+        # Sales with a new crime on their block in the longest window
+        if len(new_crime):
+            new_index = CrimeWindowIndex(new_crime, case_column=case_column)
+            new_counts = new_index.window_counts(
+                housing_df['Address Block'], housing_df['Month'], max(windows)
+            )
+            changed |= new_counts.sum(axis=1) > 0
+
+        recomputed = add_crime_window_features(
+            housing_df[changed], crime_df, **join_args
+        )
+        kept = cached.loc[housing_df.index[~changed],
+                          _feature_columns(cached, housing_df)]
+        unchanged = housing_df[~changed].join(kept)
+        df = pd.concat([unchanged, recomputed]).sort_index()
+        df = df[recomputed.columns]
+        manifest['categories'] = index.categories
+        cache.save(stage, df, manifest)
+        cache.record(stage, INCREMENTAL, len(df), int(changed.sum()))
+        return df
+
+    df = add_crime_window_features(housing_df, crime_df, **join_args)
+    manifest['categories'] = index.categories
+    cache.save(stage, df, manifest)
+    cache.record(stage, MISS, len(df), len(df))
+    return df
+
+
+def _exported_matrix(cache: FeatureCache, joined: pd.DataFrame) -> None:
+    """Export the joined features' design matrix unless it is current."""
+    stage = 'design_matrix'
+    key = cache.manifest('crime_join')['key']
+    matrix = FeatureMatrix.open(cache.root, source_key=key)
+    if matrix is not None:
+        cache.record(stage, HIT, len(matrix.X), 0)
+        return
+
+    index = export_design_matrix(joined, cache.root, source_key=key)
+    cache.record(stage, MISS, index['rows'], index['rows'])
+
+
+def _feature_columns(
+    joined: pd.DataFrame,
+    housing_df: pd.DataFrame
+) -> List[str]:
+    """Columns the join added to the housing frame."""
+    return [c for c in joined.columns if c not in housing_df.columns]
+
+
+def _input_record(
+    fingerprint: Dict[str, Any],
+    rows: Optional[int] = None
+) -> Dict[str, Any]:
+    """Fingerprint fields kept in a manifest."""
+    record = {'size': fingerprint['size'], 'sha256': fingerprint['sha256']}
+    if rows is not None:
+        record['rows'] = rows
+    return record
+
+
+def build_cached_features(
+    housing_path: Path,
+    crime_path: Path,
+    cache: FeatureCache,
+    windows: Iterable[int] = (6,),
+    housing_date_column: str = HOUSING_DATE_COLUMN,
+    crime_date_column: str = 'Date',
+    case_column: Optional[str] = None,
+    address_cache: Optional[AddressCache] = None,
+    export_matrix: bool = True
+) -> pd.DataFrame:
+    """
+    Clean housing and crime data and join crime windows, reusing the cache.
+
+    Each stage (crime_clean, housing_clean, crime_join) is keyed by the
+    content hash of its inputs and its parameters, with windows playing the
+    role of the notebook's months_to_integrate. Unchanged stages are loaded
+    from Parquet; when the raw files only had rows appended, only the new
+    rows and the sales they affect are recomputed. cache.report lists what
+    each stage did.
+
+    Args:
+        housing_path: Raw property sales CSV
+        crime_path: Raw crime CSV
+        cache: Feature cache
+        windows: Look-back window lengths in months
+        housing_date_column: Sale date column
+        crime_date_column: Crime date column
+        case_column: If given, only crimes with a case number are counted
+        address_cache: Persistent cache of parsed addresses
+        export_matrix: Also export the model design matrix as a
+            memory-mapped float32 array (see src.features.matrix) when the
+            join changed
+
+    Returns:
+        Cleaned sales with the crime window feature columns
+    """
+    windows = sorted(set(windows))
+    crime_df, crime_key = _cached_crime(
+        cache, Path(crime_path), crime_date_column, address_cache
+    )
+    housing_df, housing_key = _cached_housing(
+        cache, Path(housing_path), housing_date_column, address_cache
+    )
+    joined = _cached_join(
+        cache, housing_df, crime_df, housing_key, crime_key, windows,
+        case_column, cache.manifest('crime_clean').get('appended_to')
+    )
+    if export_matrix:
+        _exported_matrix(cache, joined)
+    return joined
+
+
+# Single-stage entry points, for runners that schedule the stages themselves
+
+
+def build_crime_clean(
+    crime_path: Path,
+    cache: FeatureCache,
+    date_column: str = 'Date',
+    address_cache: Optional[AddressCache] = None
+) -> pd.DataFrame:
+    """
+    Run the crime_clean stage of build_cached_features on its own.
+
+    Args:
+        crime_path: Raw crime CSV
+        cache: Feature cache
+        date_column: Crime date column
+        address_cache: Persistent cache of parsed addresses
+
+    Returns:
+        Cleaned crimes
+    """
+    return _cached_crime(
+        cache, Path(crime_path), date_column, address_cache
+    )[0]
+
+
+def build_housing_clean(
+    housing_path: Path,
+    cache: FeatureCache,
+    date_column: str = HOUSING_DATE_COLUMN,
+    address_cache: Optional[AddressCache] = None
+) -> pd.DataFrame:
+    """
+    Run the housing_clean stage of build_cached_features on its own.
+
+    Args:
+        housing_path: Raw property sales CSV
+        cache: Feature cache
+        date_column: Sale date column
+        address_cache: Persistent cache of parsed addresses
+
+    Returns:
+        Cleaned sales
+    """
+    return _cached_housing(
+        cache, Path(housing_path), date_column, address_cache
+    )[0]
+
+
+def build_crime_join(
+    cache: FeatureCache,
+    windows: Iterable[int] = (6,),
+    case_column: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Run the crime_join stage on the cached crime_clean and housing_clean.
+
+    Args:
+        cache: Feature cache holding both clean stages
+        windows: Look-back window lengths in months
+        case_column: If given, only crimes with a case number are counted
+
+    Returns:
+        Cleaned sales with the crime window feature columns
+    """
+    crime_manifest = cache.manifest('crime_clean')
+    housing_manifest = cache.manifest('housing_clean')
+    if crime_manifest is None or housing_manifest is None:
+        raise ValueError(
+            f"crime_join needs cached crime_clean and housing_clean stages "
+            f"in {cache.root}"
+        )
+
+    return _cached_join(
+        cache,
+        cache.load('housing_clean', housing_manifest),
+        cache.load('crime_clean', crime_manifest),
+        housing_manifest['key'], crime_manifest['key'],
+        sorted(set(windows)), case_column,
+        crime_manifest.get('appended_to')
+    )
+
+
+def build_design_matrix(cache: FeatureCache) -> FeatureMatrix:
+    """
+    Export the design matrix of the cached crime_join, unless current.
+
+    Args:
+        cache: Feature cache holding the crime_join stage
+
+    Returns:
+        The exported matrix, memory-mapped
+    """
+    manifest = cache.manifest('crime_join')
+    if manifest is None:
+        raise ValueError(
+            f"design_matrix needs a cached crime_join stage in {cache.root}"
+        )
+
+    _exported_matrix(cache, cache.load('crime_join', manifest))
+    return FeatureMatrix.open(cache.root, source_key=manifest['key'])
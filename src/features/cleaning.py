@@ -0,0 +1,154 @@
+"""Vectorized cleaning of the scraped housing and crime data."""
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+from src.features.address import (
+    AddressCache, address_key, normalize_crime_locations,
+    normalize_sale_addresses
+)
+from src.features.encoding import NeighborhoodEncoder
+
+
+HOUSING_DROP_COLUMNS = ['Unique ID', 'assesors_link_part1']
+HOUSING_DATE_COLUMN = 'Sale Date_part1'
+NEIGHBORHOOD_COLUMN = 'Neighborhood_org'
+
+
+def average_repeat_sales(
+    df: pd.DataFrame,
+    key_column: str,
+    date_column: str,
+    collapse: bool = False
+) -> pd.DataFrame:
+    """
+    Average the float columns of sales of the same property on the same day.
+
+    Float columns (price, square feet) are averaged; integer columns such
+    as street number, year built and dummies keep their values.
+
+    Args:
+        df: Sales
+        key_column: Normalized address key
+        date_column: Sale date
+        collapse: Keep one row per (address, sale date) instead of all of them
+
+    Returns:
+        DataFrame with same-day duplicate sales averaged
+    """
+    float_cols = df.select_dtypes(include='floating').columns
+    groups = df.groupby([key_column, date_column], sort=False, dropna=False)
+
+    if collapse:
+        first = groups.head(1).index
+        df = df.loc[first].copy()
+        df[float_cols] = groups[float_cols].transform('mean').loc[first]
+        return df
+
+    df = df.copy()
+    df[float_cols] = groups[float_cols].transform('mean')
+    return df
+
+
+def clean_housing_df(
+    df: pd.DataFrame,
+    date_column: str = HOUSING_DATE_COLUMN,
+    neighborhood_dummies: bool = True,
+    collapse_repeat_sales: bool = False,
+    encoder: Optional[NeighborhoodEncoder] = None,
+    address_cache: Optional[AddressCache] = None
+) -> pd.DataFrame:
+    """
+    Clean scraped property sales.
+
+    This is the vectorized clean_Housing_df of the EDA notebook.
+
+    Steps: property type, drop unused columns, parse address, price, square
+    feet and year built, derive street block, street number, street name,
+    address block and short address, neighborhood dummies, sale month, and
+    average same-day repeat sales. Repeat sales are grouped on an exact
+    normalized address key rather than the notebook's substring match, which
+    merged unrelated addresses such as "12 MAIN ST" and "112 MAIN ST".
+
+    Args:
+        df: Raw property sales
+        date_column: Sale date column
+        neighborhood_dummies: Add a sparse 0/1 column per neighborhood word
+        collapse_repeat_sales: Keep one row per (address, sale date)
+        encoder: Fitted neighborhood encoder to reuse, e.g. at prediction time.
+            A new one is fitted on df if None
+        address_cache: Persistent cache of parsed addresses
+
+    Returns:
+        Cleaned DataFrame
+    """
+    df = df.drop(columns=[c for c in HOUSING_DROP_COLUMNS if c in df.columns])
+
+    year_built = df['year_built_org'].astype('string').str.strip()
+    df['type'] = np.where(year_built == '0', 'Land', 'Residential')
+    df['year_built_org'] = pd.to_numeric(
+        year_built, errors='coerce'
+    ).fillna(0).astype(int)
+
+    price = df['Sale Price'].astype('string')
+    df['Sale Price'] = pd.to_numeric(
+        price.str.replace(r'[\$,]', '', regex=True), errors='coerce'
+    ).astype(float)
+    square_feet = df['Built Sq ft_org'].astype('string')
+    df['Built Sq ft_org'] = pd.to_numeric(
+        square_feet.str.replace('sqft', '', regex=False).str.strip(),
+        errors='coerce'
+    ).astype(float)
+
+    addresses = normalize_sale_addresses(df['Address'], cache=address_cache)
+    for column in addresses.columns:
+        df[column] = addresses[column]
+
+    if neighborhood_dummies and NEIGHBORHOOD_COLUMN in df.columns:
+        if encoder is None:
+            encoder = NeighborhoodEncoder().fit(df[NEIGHBORHOOD_COLUMN])
+        dummies = encoder.to_frame(df[NEIGHBORHOOD_COLUMN])
+        new_columns = [c for c in dummies.columns if c not in df.columns]
+        df = pd.concat([df, dummies[new_columns]], axis=1)
+
+    df['Month'] = pd.to_datetime(
+        df[date_column], errors='coerce'
+    ).dt.to_period('M')
+
+    df['_address_key'] = address_key(df['ShortAddress'])
+    df = average_repeat_sales(df, '_address_key', date_column,
+                              collapse=collapse_repeat_sales)
+    return df.drop(columns='_address_key')
+
+
+def clean_crime_df(
+    df: pd.DataFrame,
+    date_column: str = 'Date',
+    address_cache: Optional[AddressCache] = None
+) -> pd.DataFrame:
+    """
+    Clean scraped crime records.
+
+    This is the vectorized clean_Crime_df of the EDA notebook.
+
+    Adds the month, strips the 'BLK ' marker from locations and splits them
+    into street block and street name.
+
+    Args:
+        df: Raw crime records
+        date_column: Date column
+        address_cache: Persistent cache of parsed addresses
+
+    Returns:
+        Cleaned DataFrame; StreetBLK is missing where the location has no
+        block number
+    """
+    df = df.copy()
+    df['Month'] = pd.to_datetime(
+        df[date_column], errors='coerce'
+    ).dt.to_period('M')
+
+    locations = normalize_crime_locations(df['Location'], cache=address_cache)
+    for column in locations.columns:
+        df[column] = locations[column]
+    return df
@@ -0,0 +1,316 @@
+"""Materialized crime counts by month, block and category."""
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from src.features.address import normalize_crime_locations
+from src.features.build_features import month_ordinal
+
+
+# Months per roll-up level; month ordinals are year * 12 + month - 1
+LEVEL_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+LEVEL_FREQ = {'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+# pandas period ordinals count from the first period of 1970
+EPOCH_YEAR = 1970
+
+DIMENSIONS = ('block', 'category')
+
+
+class CrimeCube:
+    """
+    Dense array of crime counts indexed by (month, block, category).
+
+    Months cover a contiguous range starting at first_month; blocks and
+    categories are stored in order of first appearance and the axes grow
+    as new data arrives, so adding a month of crimes only touches that
+    month's rows. Roll-ups to quarter or year and top-N queries read the
+    array alone, never the raw records. Persisted as a compressed .npz.
+    """
+
+    def __init__(self):
+        """Create an empty cube."""
+        self.first_month = 0
+        self.blocks: List[str] = []
+        self.categories: List[str] = []
+        self.counts = np.zeros((0, 0, 0), dtype=np.int32)
+
+    @property
+    def months(self) -> int:
+        """Number of months covered."""
+        return self.counts.shape[0]
+
+    @property
+    def total(self) -> int:
+        """Number of crimes counted."""
+        return int(self.counts.sum())
+
+    @classmethod
+    def from_records(cls, crime_df: pd.DataFrame, **columns) -> 'CrimeCube':
+        """
+        Build a cube from crime records.
+
+        Args:
+            crime_df: Crime records
+            **columns: Column names passed to add
+
+        Returns:
+            New cube
+        """
+        cube = cls()
+        cube.add(crime_df, **columns)
+        return cube
+
+    def add(
+        self,
+        crime_df: pd.DataFrame,
+        date_column: str = 'Date',
+        location_column: str = 'Location',
+        category_column: str = 'Crime Category',
+        normalize_locations: bool = True
+    ) -> int:
+        """
+        Count new crime records into the cube.
+
+        Args:
+            crime_df: New crime records only; records added twice are
+                counted twice
+            date_column: Crime date or month
+            location_column: Crime location
+            category_column: Crime category
+            normalize_locations: Reduce raw locations such as
+                "1200 BLK STATE ST" to the block keys of the housing-crime
+                join ("1200 STATE ST")
+
+        Returns:
+            Number of records counted (rows with a date, location and
+            category)
+        """
+        months = month_ordinal(crime_df[date_column]).to_numpy()
+        locations = crime_df[location_column]
+        if normalize_locations:
+            normalized = normalize_crime_locations(locations)['Location']
+            locations = normalized.where(locations.notna())
+
+        valid = (~np.isnan(months) & locations.notna().to_numpy()
+                 & crime_df[category_column].notna().to_numpy())
+        if not valid.any():
+            return 0
+
+        months = months[valid].astype(np.int64)
+        block_codes = self._codes(self.blocks, locations[valid].astype(str))
+        category_codes = self._codes(
+            self.categories, crime_df.loc[valid, category_column].astype(str)
+        )
+
+        first, last = int(months.min()), int(months.max())
+        if self.months:
+            first = min(first, self.first_month)
+            last = max(last, self.first_month + self.months - 1)
+        self._grow(first, last)
+
+        np.add.at(
+            self.counts,
+            (months - self.first_month, block_codes, category_codes),
+            1
+        )
+        return int(valid.sum())
+
+    @staticmethod
+    def _codes(labels: List[str], values: pd.Series) -> np.ndarray:
+        """Positions of values in labels, appending labels not seen before."""
+        index = pd.Index(labels)
+        codes = index.get_indexer(values)
+        unseen = pd.unique(values[codes < 0])
+        if len(unseen):
+            labels.extend(unseen)
+            codes = pd.Index(labels).get_indexer(values)
+        return codes
+
+    def _grow(self, first: int, last: int) -> None:
+        """
+        Extend the month axis to first..last.
+
+        The block and category axes grow to the known labels.
+        """
+        before = self.first_month - first if self.months else 0
+        after = last - first + 1 - before - self.months
+        self.counts = np.pad(self.counts, (
+            (before, after),
+            (0, len(self.blocks) - self.counts.shape[1]),
+            (0, len(self.categories) - self.counts.shape[2]),
+        ))
+        self.first_month = first
+
+    def _period_index(self, level: str, periods: np.ndarray) -> pd.PeriodIndex:
+        """Period labels of period numbers at a roll-up level."""
+        epoch = EPOCH_YEAR * 12 // LEVEL_MONTHS[level]
+        return pd.PeriodIndex.from_ordinals(
+            periods - epoch, freq=LEVEL_FREQ[level]
+        )
+
+    def _select(
+        self,
+        blocks: Optional[Sequence[str]],
+        categories: Optional[Sequence[str]]
+    ) -> np.ndarray:
+        """Counts restricted to the given blocks and categories.
+
+        None selects all of them.
+        """
+        counts = self.counts
+        if blocks is not None:
+            codes = pd.Index(self.blocks).get_indexer(list(blocks))
+            counts = counts[:, [i for i in codes if i >= 0], :]
+        if categories is not None:
+            codes = pd.Index(self.categories).get_indexer(list(categories))
+            counts = counts[:, :, [i for i in codes if i >= 0]]
+        return counts
+
+    def _rolled(
+        self,
+        level: str,
+        counts: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Sum the month axis into periods of the level."""
+        if level not in LEVEL_MONTHS:
+            raise ValueError(
+                f"Unknown level '{level}', expected one of "
+                f"{sorted(LEVEL_MONTHS)}"
+            )
+
+        months = self.first_month + np.arange(self.months)
+        periods = months // LEVEL_MONTHS[level]
+        if self.months:
+            starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        else:
+            starts = np.array([], int)
+        if not len(starts):
+            return periods[:0], counts[:0]
+        return periods[starts], np.add.reduceat(counts, starts, axis=0)
+
+    def rollup(
+        self,
+        level: str = 'quarter',
+        by: str = 'category',
+        blocks: Optional[Sequence[str]] = None,
+        categories: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Crime counts per period and block or category.
+
+        Answers e.g. the EDA's groupby(['Quarter', 'Crime Category']).count().
+
+        Args:
+            level: 'month', 'quarter' or 'year'
+            by: 'category' or 'block'
+            blocks: Only count these blocks
+            categories: Only count these categories
+
+        Returns:
+            DataFrame indexed by period with one column per block or category
+        """
+        if by not in DIMENSIONS:
+            raise ValueError(
+                f"Unknown dimension '{by}', expected one of {DIMENSIONS}"
+            )
+
+        periods, counts = self._rolled(
+            level, self._select(blocks, categories)
+        )
+        if by == 'category':
+            known, selected = self.categories, categories
+        else:
+            known, selected = self.blocks, blocks
+        known_set = set(known)
+        labels = known if selected is None \
+            else [label for label in selected if label in known_set]
+        values = counts.sum(axis=1 if by == 'category' else 2)
+        index = self._period_index(level, periods).rename(level.capitalize())
+        return pd.DataFrame(values, index=index, columns=labels)
+
+    def top(
+        self,
+        n: int = 5,
+        level: str = 'quarter',
+        by: str = 'block',
+        categories: Optional[Sequence[str]] = None,
+        smallest: bool = False
+    ) -> pd.Series:
+        """
+        Largest (or smallest) counts over (period, block or category) pairs.
+
+        Equivalent to the EDA's groupby(['Quarter', 'Location'])['Case']
+        .count().nlargest(n); as there, only pairs with at least one crime
+        are ranked.
+
+        Args:
+            n: Number of pairs
+            level: 'month', 'quarter' or 'year'
+            by: 'block' or 'category'
+            categories: Only count these categories
+            smallest: Rank ascending, like nsmallest
+
+        Returns:
+            Series of counts indexed by (period, block or category)
+        """
+        table = self.rollup(level, by, categories=categories)
+        values = table.to_numpy()
+        rows, cols = np.nonzero(values)
+        counts = values[rows, cols]
+
+        # Stable sort on count, then on flattened position, like
+        # nlargest/nsmallest keep='first'
+        order = np.lexsort((
+            rows * values.shape[1] + cols, counts if smallest else -counts
+        ))[:n]
+        label = 'Location' if by == 'block' else 'Crime Category'
+        index = pd.MultiIndex.from_arrays(
+            [table.index[rows[order]], table.columns[cols[order]]],
+            names=[table.index.name, label]
+        )
+        return pd.Series(counts[order], index=index, name='Count')
+
+    def save(self, path: Path) -> Path:
+        """
+        Write the cube as a compressed .npz, replacing the file atomically.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(
+                f,
+                counts=self.counts,
+                first_month=np.int64(self.first_month),
+                blocks=np.array(self.blocks, dtype=str),
+                categories=np.array(self.categories, dtype=str),
+            )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> 'CrimeCube':
+        """
+        Load a cube written by save.
+
+        Args:
+            path: Cube file
+
+        Returns:
+            Loaded cube
+        """
+        cube = cls()
+        with np.load(path) as data:
+            cube.counts = data['counts']
+            cube.first_month = int(data['first_month'])
+            cube.blocks = data['blocks'].tolist()
+            cube.categories = data['categories'].tolist()
+        return cube
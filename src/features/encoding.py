@@ -0,0 +1,170 @@
+"""Sparse one-hot encoding of neighborhood classification tokens."""
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# Neighborhood classifications are words joined by spaces or hyphens,
+# e.g. "Fairhaven-Res"
+TOKEN_PATTERN = re.compile(r'[ -]')
+
+
+def tokenize(value) -> List[str]:
+    """
+    Split a neighborhood classification into its distinct non-empty words.
+
+    Args:
+        value: Classification string; missing values have no tokens
+
+    Returns:
+        Tokens in order of first appearance
+    """
+    if not isinstance(value, str):
+        return []
+    tokens = (token for token in TOKEN_PATTERN.split(value) if token)
+    return list(dict.fromkeys(tokens))
+
+
+class NeighborhoodEncoder:
+    """
+    One-hot encoder from neighborhood tokens to a sparse indicator matrix.
+
+    Each distinct classification string is tokenized once and rows are
+    gathered from the resulting small matrix, so encoding cost does not
+    grow with the vocabulary size. The vocabulary is fitted on training
+    data and persisted as JSON so prediction reproduces the same columns;
+    tokens not in the vocabulary are ignored.
+
+    A row is 1 for a token when the token is one of the value's words. The
+    EDA notebook tested substrings instead, so e.g. "Res" also matched
+    "Resort"; whole-word matching avoids those false positives.
+    """
+
+    def __init__(self, vocabulary: Optional[Iterable[str]] = None):
+        """
+        Initialize the encoder.
+
+        Args:
+            vocabulary: Known tokens in column order. Set by fit if None
+        """
+        self.vocabulary: Optional[List[str]] = (
+            list(vocabulary) if vocabulary is not None else None
+        )
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Column position of each vocabulary token."""
+        if self.vocabulary is None:
+            raise ValueError("NeighborhoodEncoder is not fitted")
+        return {token: i for i, token in enumerate(self.vocabulary)}
+
+    def fit(self, values: pd.Series) -> 'NeighborhoodEncoder':
+        """
+        Learn the sorted token vocabulary.
+
+        Args:
+            values: Neighborhood classifications
+
+        Returns:
+            self
+        """
+        tokens = set()
+        for value in pd.unique(values.dropna()):
+            tokens.update(tokenize(value))
+        self.vocabulary = sorted(tokens)
+        return self
+
+    def transform(self, values: pd.Series) -> sparse.csr_matrix:
+        """
+        Encode values as a CSR indicator matrix.
+
+        Args:
+            values: Neighborhood classifications
+
+        Returns:
+            uint8 matrix of shape (len(values), len(vocabulary))
+        """
+        index = self.index
+        codes, uniques = pd.factorize(values)
+
+        # One row per distinct value, then gathered for every input row
+        indptr = [0]
+        indices = []
+        for value in uniques:
+            columns = sorted(
+                index[token] for token in tokenize(value) if token in index
+            )
+            indices.extend(columns)
+            indptr.append(len(indices))
+
+        # Missing values (code -1) map to an extra empty row
+        indptr.append(len(indices))
+        distinct = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.uint8),
+             np.array(indices, dtype=np.int32),
+             np.array(indptr)),
+            shape=(len(uniques) + 1, len(index))
+        )
+        return distinct[np.where(codes < 0, len(uniques), codes)]
+
+    def fit_transform(self, values: pd.Series) -> sparse.csr_matrix:
+        """
+        Fit the vocabulary and encode values.
+
+        Args:
+            values: Neighborhood classifications
+
+        Returns:
+            CSR indicator matrix
+        """
+        return self.fit(values).transform(values)
+
+    def to_frame(self, values: pd.Series) -> pd.DataFrame:
+        """
+        Encode values as a sparse DataFrame with one column per token.
+
+        Args:
+            values: Neighborhood classifications
+
+        Returns:
+            DataFrame of Sparse[uint8] columns aligned with values
+        """
+        return pd.DataFrame.sparse.from_spmatrix(
+            self.transform(values), index=values.index,
+            columns=self.vocabulary
+        )
+
+    def save(self, path: Path) -> Path:
+        """
+        Persist the vocabulary as JSON.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Path written
+        """
+        if self.vocabulary is None:
+            raise ValueError("NeighborhoodEncoder is not fitted")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'vocabulary': self.vocabulary}, indent=2))
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> 'NeighborhoodEncoder':
+        """
+        Load an encoder saved with save.
+
+        Args:
+            path: Vocabulary file
+
+        Returns:
+            Fitted encoder
+        """
+        return cls(json.loads(Path(path).read_text())['vocabulary'])
@@ -0,0 +1,319 @@
+"""Model design matrix, exported as a memory-mapped float32 array.
+
+A JSON sidecar next to the array indexes its columns.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+
+TARGET_COLUMN = 'Sale Price'
+# Identifier and raw text columns the notebook drops before modelling
+DROP_COLUMNS = [
+    'Address', 'type', 'StreetBLK', 'StreetName', 'Address Block',
+    'Sale Date_part1', 'Neighborhood_org', 'ShortAddress',
+]
+MONTH_COLUMN = 'Month'
+
+MATRIX_FILE = 'design_matrix.npy'
+TARGET_FILE = 'design_target.npy'
+# Bump when the export layout changes so existing exports are rewritten
+MATRIX_VERSION = 1
+# Rows converted to float32 per write, bounding the temporary copy
+_EXPORT_CHUNK_ROWS = 65536
+
+
+def design_matrix(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    fill_values: Optional[Dict[str, float]] = None
+) -> Tuple[pd.DataFrame, Optional[pd.Series]]:
+    """
+    Build the model inputs from joined housing and crime features.
+
+    Follows the notebook's create_ML_df: land sales are dropped, the sale
+    month is one-hot encoded and identifier columns are removed. With
+    columns given (at prediction time) the result is aligned to them:
+    unseen dummy columns are dropped and missing ones filled with 0.
+
+    Args:
+        df: Output of build_cached_features or add_crime_window_features
+        columns: Feature columns of a trained model. Derived from df if None
+        fill_values: Values for missing numeric entries. Column means of df
+            if None
+
+    Returns:
+        Float feature frame and log1p sale price (None if df has no prices)
+    """
+    if 'type' in df.columns:
+        df = df[df['type'] != 'Land']
+
+    y = None
+    if TARGET_COLUMN in df.columns:
+        if columns is None:
+            df = df[df[TARGET_COLUMN].notna()]
+        y = np.log1p(df[TARGET_COLUMN].astype(float))
+
+    X = df.drop(columns=[
+        c for c in DROP_COLUMNS + [TARGET_COLUMN] if c in df.columns
+    ])
+    for column in X.columns:
+        if isinstance(X[column].dtype, pd.SparseDtype):
+            X[column] = X[column].sparse.to_dense()
+
+    if MONTH_COLUMN in X.columns:
+        months = pd.get_dummies(X.pop(MONTH_COLUMN).astype(str),
+                                prefix=MONTH_COLUMN, dtype=float)
+        X = pd.concat([X, months], axis=1)
+
+    X = X.select_dtypes(include=['number', 'bool']).astype(float)
+
+    if columns is None:
+        # Constant columns carry no information
+        X = X.loc[:, X.nunique(dropna=False) > 1]
+        columns = list(X.columns)
+    X = X.reindex(columns=columns, fill_value=0.0)
+
+    if fill_values is None:
+        fill_values = X.mean().fillna(0.0).to_dict()
+    return X.fillna(fill_values), y
+
+
+def index_path(matrix_path: Path) -> Path:
+    """
+    Column index sidecar of a matrix file.
+
+    Args:
+        matrix_path: .npy matrix file
+
+    Returns:
+        Path such as design_matrix.json next to design_matrix.npy
+    """
+    return Path(matrix_path).with_suffix('.json')
+
+
+def _write_npy(
+    path: Path,
+    values: Union[pd.DataFrame, pd.Series],
+    dtype: type
+) -> None:
+    """
+    Write a frame or series as .npy, replacing the file atomically.
+
+    Rows are converted to dtype one chunk at a time, so no full-size
+    array is built in memory.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=dtype,
+                                    shape=values.shape)
+    for start in range(0, len(values), _EXPORT_CHUNK_ROWS):
+        stop = start + _EXPORT_CHUNK_ROWS
+        out[start:stop] = values.iloc[start:stop].to_numpy(dtype)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+
+
+def export_design_matrix(
+    df: pd.DataFrame,
+    output_dir: Path,
+    source_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Write the design matrix of df as float32 .npy files with a column index.
+
+    Writes design_matrix.npy (rows x features, float32, C order),
+    design_target.npy (log1p sale price, float64) and design_matrix.json
+    with the column names in array order, the fill values and the row
+    count. The sidecar is written last, so a matrix without one is
+    incomplete and is ignored.
+
+    Args:
+        df: Joined housing and crime features
+        output_dir: Directory for the three files
+        source_key: Cache key of the features df came from, recorded so
+            stale exports can be detected
+
+    Returns:
+        Sidecar dictionary as written
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    matrix_path = output_dir / MATRIX_FILE
+    index_path(matrix_path).unlink(missing_ok=True)
+
+    X, y = design_matrix(df)
+    _write_npy(matrix_path, X, np.float32)
+    if y is not None:
+        _write_npy(output_dir / TARGET_FILE, y, np.float64)
+    else:
+        (output_dir / TARGET_FILE).unlink(missing_ok=True)
+
+    index = {
+        'version': MATRIX_VERSION,
+        'source_key': source_key,
+        'rows': len(X),
+        'dtype': 'float32',
+        'columns': list(X.columns),
+        'fill_values': X.mean().fillna(0.0).to_dict(),
+        'target': TARGET_FILE if y is not None else None,
+    }
+    index_path(matrix_path).write_text(json.dumps(index, indent=2))
+    return index
+
+
+class FeatureMatrix:
+    """
+    A design matrix exported by export_design_matrix, opened read-only.
+
+    X and y are memory maps: opening costs no parsing or copying, and the
+    OS pages in only the rows and columns that are touched, sharing them
+    between processes that map the same file.
+    """
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        y: Optional[np.ndarray],
+        index: Dict[str, Any],
+        path: Path
+    ):
+        """
+        Initialize the matrix.
+
+        Args:
+            X: Memory-mapped feature array
+            y: Memory-mapped target, or None
+            index: Sidecar dictionary
+            path: Matrix file
+        """
+        self.X = X
+        self.y = y
+        self.index = index
+        self.path = Path(path)
+        self.columns: List[str] = index['columns']
+        self.fill_values: Dict[str, float] = index['fill_values']
+        self._positions = {
+            column: i for i, column in enumerate(self.columns)
+        }
+
+    @classmethod
+    def open(
+        cls,
+        directory: Path,
+        source_key: Optional[str] = None
+    ) -> Optional['FeatureMatrix']:
+        """
+        Open the matrix exported to a directory.
+
+        Args:
+            directory: Directory passed to export_design_matrix
+            source_key: If given, only an export of these features is
+                accepted
+
+        Returns:
+            The matrix, or None if there is no complete, current export
+        """
+        return cls.open_file(Path(directory) / MATRIX_FILE, source_key)
+
+    @classmethod
+    def open_file(
+        cls,
+        path: Path,
+        source_key: Optional[str] = None
+    ) -> Optional['FeatureMatrix']:
+        """
+        Open a matrix file that has a column index sidecar.
+
+        Args:
+            path: .npy matrix file
+            source_key: If given, only an export of these features is accepted
+
+        Returns:
+            The matrix, or None if the file or its sidecar is missing or stale
+        """
+        path = Path(path)
+        sidecar = index_path(path)
+        if not path.exists() or not sidecar.exists():
+            return None
+        try:
+            index = json.loads(sidecar.read_text())
+        except ValueError:
+            return None
+        if index.get('version') != MATRIX_VERSION:
+            return None
+        if source_key is not None and index.get('source_key') != source_key:
+            return None
+
+        X = np.load(path, mmap_mode='r')
+        if X.shape != (index['rows'], len(index['columns'])):
+            return None
+        matrix = cls(X, None, index, path)
+        if matrix.target_path is not None:
+            matrix.y = np.load(matrix.target_path, mmap_mode='r')
+        return matrix
+
+    @property
+    def target_path(self) -> Optional[Path]:
+        """Target file, or None if the export has no target."""
+        if not self.index.get('target'):
+            return None
+        return self.path.parent / self.index['target']
+
+    def position(self, column: str) -> int:
+        """
+        Position of a column in X.
+
+        Args:
+            column: Feature column name
+
+        Returns:
+            Column position
+        """
+        if column not in self._positions:
+            raise KeyError(f"Column '{column}' is not in {self.path}")
+        return self._positions[column]
+
+    def column(self, column: str) -> np.ndarray:
+        """
+        One feature column as a strided view of the map, without copying.
+
+        Args:
+            column: Feature column name
+
+        Returns:
+            Array of length rows
+        """
+        return self.X[:, self.position(column)]
+
+    def aligned(self, rows: np.ndarray, columns: Sequence[str]) -> np.ndarray:
+        """
+        Reorder a block of rows to another column order.
+
+        This matches design_matrix(columns=...).
+
+        Columns missing from this matrix (e.g. month dummies unseen here)
+        are filled with 0; columns not requested are dropped.
+
+        Args:
+            rows: Rows of X, e.g. a chunk X[start:stop]
+            columns: Target column order, such as a trained model's columns
+
+        Returns:
+            Array of shape (len(rows), len(columns)); rows itself if the
+            orders match
+        """
+        if list(columns) == self.columns:
+            return rows
+        out = np.zeros((len(rows), len(columns)), dtype=rows.dtype)
+        present = [
+            (i, self._positions[c]) for i, c in enumerate(columns)
+            if c in self._positions
+        ]
+        if present:
+            target, source = (list(p) for p in zip(*present))
+            out[:, target] = rows[:, source]
+        return out
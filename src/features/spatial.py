@@ -0,0 +1,260 @@
+"""Radius-based crime aggregation over latitude/longitude with KD-trees."""
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from src.features.build_features import TOTAL_CRIME, month_ordinal
+
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def radius_column(months: int, radius_m: float, category: str) -> str:
+    """
+    Name of the feature column for a window, radius and crime category.
+
+    Args:
+        months: Window length in months
+        radius_m: Radius in meters
+        category: Crime category, or TOTAL_CRIME
+
+    Returns:
+        Column name such as '6M_500m_ASSAULT'
+    """
+    return f'{months}M_{radius_m:g}m_{category}'
+
+
+def _coordinates(values: pd.Series) -> np.ndarray:
+    """Degrees as a float array, NaN where not numeric."""
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+
+
+class CrimeRadiusIndex:
+    """
+    Time-partitioned KD-trees over crime coordinates for radius and
+    time-window counts.
+
+    Coordinates are projected once to a local equirectangular plane in
+    meters (accurate to well under 1% across a city). Crimes are split into
+    buckets of bucket_months consecutive months with one tree each, all
+    built once, so a query only visits the buckets its look-back window
+    overlaps rather than the whole multi-year history. Query points are
+    processed in vectorized chunks: each tree returns the crimes within the
+    radius, and month windows and categories are then counted with bincount
+    for all windows at once.
+    """
+
+    def __init__(
+        self,
+        crime_df: pd.DataFrame,
+        lat_column: str = 'latitude',
+        lon_column: str = 'longitude',
+        month_column: str = 'occurred_date_or_date_range_start',
+        category_column: str = 'offense_parent_group',
+        bucket_months: int = 6,
+        leafsize: int = 32
+    ):
+        """
+        Build the index.
+
+        Args:
+            crime_df: Crime records with coordinates
+            lat_column: Latitude column in degrees
+            lon_column: Longitude column in degrees
+            month_column: Date or month of the crime
+            category_column: Crime category
+            bucket_months: Months of crimes per tree
+            leafsize: KD-tree leaf size
+        """
+        self.categories: List[str] = [
+            str(c) for c in crime_df[category_column].value_counts().index
+        ]
+
+        lat = _coordinates(crime_df[lat_column])
+        lon = _coordinates(crime_df[lon_column])
+        months = month_ordinal(crime_df[month_column]).to_numpy()
+
+        # Redacted records carry missing or 0/0 coordinates
+        valid = (~np.isnan(lat) & ~np.isnan(lon) & ~np.isnan(months)
+                 & crime_df[category_column].notna().to_numpy()
+                 & ~((lat == 0) & (lon == 0)))
+
+        self.origin_lat = float(lat[valid].mean()) if valid.any() else 0.0
+        self.bucket_months = bucket_months
+
+        # Crimes ordered by month so each bucket is a contiguous slice
+        months = months[valid].astype(np.int64)
+        order = np.argsort(months, kind='stable')
+        self.months = months[order]
+        self.category_codes = pd.Index(self.categories).get_indexer(
+            crime_df.loc[valid, category_column].astype(str)
+        ).astype(np.int64)[order]
+        self.points = self.project(lat[valid][order], lon[valid][order])
+
+        # bucket -> (first crime position, KD-tree of the bucket's crimes)
+        self.buckets: Dict[int, tuple] = {}
+        bucket_ids = self.months // bucket_months
+        for bucket in np.unique(bucket_ids):
+            start, end = np.searchsorted(bucket_ids, [bucket, bucket + 1])
+            self.buckets[int(bucket)] = (
+                int(start),
+                cKDTree(self.points[start:end], leafsize=leafsize,
+                        balanced_tree=False, compact_nodes=False)
+            )
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    def project(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """
+        Project degrees to local planar meters.
+
+        Args:
+            lat: Latitudes in degrees
+            lon: Longitudes in degrees
+
+        Returns:
+            Array of shape (n, 2) with x and y in meters
+        """
+        scale = np.cos(np.radians(self.origin_lat)) * EARTH_RADIUS_M
+        x = np.radians(lon) * scale
+        y = np.radians(lat) * EARTH_RADIUS_M
+        return np.column_stack([x, y])
+
+    def counts(
+        self,
+        lat: Iterable[float],
+        lon: Iterable[float],
+        months: pd.Series,
+        radius_m: float,
+        windows: Iterable[int] = (6,),
+        chunk_size: int = 20000,
+        workers: int = -1
+    ) -> Dict[int, np.ndarray]:
+        """
+        Count crimes within radius_m of each point, per category, in the
+        months strictly between month - N and month for each window N.
+
+        Args:
+            lat: Query latitudes in degrees
+            lon: Query longitudes in degrees
+            months: Query dates or months
+            radius_m: Search radius in meters
+            windows: Look-back window lengths in months
+            chunk_size: Query points per batch; bounds memory of the neighbor
+                lists
+            workers: Threads used by the tree query (-1 for all cores)
+
+        Returns:
+            Dictionary from window length to an array of shape
+            (n, len(categories))
+        """
+        windows = list(windows)
+        if any(n < 1 for n in windows):
+            raise ValueError(
+                f"Window lengths must be at least 1, got {windows}"
+            )
+
+        lat = _coordinates(pd.Series(lat))
+        lon = _coordinates(pd.Series(lon))
+        query_months = month_ordinal(pd.Series(months)).to_numpy()
+        n_categories = len(self.categories)
+
+        results = {
+            n: np.zeros((len(lat), n_categories), dtype=np.int64)
+            for n in windows
+        }
+        valid = np.flatnonzero(
+            ~np.isnan(lat) & ~np.isnan(lon) & ~np.isnan(query_months)
+        )
+        if len(self) == 0 or len(valid) == 0:
+            return results
+
+        longest = max(windows)
+        point_months = np.nan_to_num(query_months).astype(np.int64)
+
+        for bucket, (offset, tree) in self.buckets.items():
+            first_month = bucket * self.bucket_months
+            last_month = first_month + self.bucket_months - 1
+            # Points whose window (month - longest, month) overlaps this bucket
+            overlaps = valid[
+                (point_months[valid] > first_month)
+                & (point_months[valid] - longest < last_month)
+            ]
+
+            for start in range(0, len(overlaps), chunk_size):
+                rows = overlaps[start:start + chunk_size]
+                neighbors = tree.query_ball_point(
+                    self.project(lat[rows], lon[rows]), r=radius_m,
+                    workers=workers
+                )
+
+                lengths = np.fromiter((len(n) for n in neighbors),
+                                      dtype=np.int64, count=len(rows))
+                total = int(lengths.sum())
+                if total == 0:
+                    continue
+
+                crime = offset + np.fromiter(
+                    chain.from_iterable(neighbors), dtype=np.int64,
+                    count=total
+                )
+                point = np.repeat(np.arange(len(rows)), lengths)
+                age = point_months[rows][point] - self.months[crime]
+                cell = point * n_categories + self.category_codes[crime]
+
+                for n in windows:
+                    in_window = (age > 0) & (age < n)
+                    results[n][rows] += np.bincount(
+                        cell[in_window], minlength=len(rows) * n_categories
+                    ).reshape(len(rows), n_categories)
+
+        return results
+
+
+def add_radius_crime_features(
+    points_df: pd.DataFrame,
+    crime_df: pd.DataFrame,
+    radius_m: float = 500,
+    windows: Iterable[int] = (6,),
+    lat_column: str = 'latitude',
+    lon_column: str = 'longitude',
+    month_column: str = 'Month',
+    index: Optional[CrimeRadiusIndex] = None,
+    **index_kwargs
+) -> pd.DataFrame:
+    """
+    Add crime counts within a radius of each point for several windows.
+
+    Adds '<N>M_<R>m_<category>' per category and '<N>M_<R>m_TotalCrime'
+    for each window length N.
+
+    Args:
+        points_df: Query points, e.g. sales with coordinates and a month
+        crime_df: Crime records with coordinates; ignored if index is given
+        radius_m: Search radius in meters
+        windows: Look-back window lengths in months
+        lat_column: Latitude column in points_df
+        lon_column: Longitude column in points_df
+        month_column: Month column in points_df
+        index: Prebuilt index to reuse across calls
+        **index_kwargs: Column names passed to CrimeRadiusIndex
+
+    Returns:
+        Copy of points_df with the crime feature columns added
+    """
+    if index is None:
+        index = CrimeRadiusIndex(crime_df, **index_kwargs)
+
+    counts = index.counts(points_df[lat_column], points_df[lon_column],
+                          points_df[month_column], radius_m, windows)
+
+    result = points_df.copy()
+    for months, values in counts.items():
+        for i, category in enumerate(index.categories):
+            result[radius_column(months, radius_m, category)] = values[:, i]
+        total = radius_column(months, radius_m, TOTAL_CRIME)
+        result[total] = values.sum(axis=1)
+    return result
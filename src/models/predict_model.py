@@ -0,0 +1,263 @@
+"""Score feature inputs in fixed-size chunks with a trained model artifact."""
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import click
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.features.matrix import FeatureMatrix, design_matrix
+from src.models.train_model import FEATURES_FILE, MODEL_FILE
+
+
+PREDICTION_COLUMN = 'Predicted Price'
+DEFAULT_CHUNK_SIZE = 100000
+
+
+class ModelArtifact:
+    """
+    A trained model with the feature columns and fill values it expects.
+
+    Loaded once and reused for every chunk or request.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        columns: List[str],
+        fill_values: Dict[str, float],
+        neighborhoods: Optional[List[str]] = None
+    ):
+        """
+        Initialize the artifact.
+
+        Args:
+            model: Fitted estimator predicting log1p sale price
+            columns: Feature columns in training order
+            fill_values: Values for missing numeric entries
+            neighborhoods: Neighborhood encoder vocabulary used in training
+        """
+        self.model = model
+        self.columns = columns
+        self.fill_values = fill_values
+        self.neighborhoods = neighborhoods
+
+    @classmethod
+    def load(cls, model_dir: Path) -> 'ModelArtifact':
+        """
+        Load an artifact written by train_model.train.
+
+        Args:
+            model_dir: Directory with model.joblib and features.json
+
+        Returns:
+            Loaded artifact
+        """
+        model_dir = Path(model_dir)
+        features = json.loads((model_dir / FEATURES_FILE).read_text())
+        return cls(joblib.load(model_dir / MODEL_FILE), features['columns'],
+                   features['fill_values'], features.get('neighborhoods'))
+
+    def predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict sale prices from a design matrix in training column order.
+
+        Args:
+            X: Array of shape (n, len(columns))
+
+        Returns:
+            Predicted prices in dollars
+        """
+        if X.shape[1] != len(self.columns):
+            raise ValueError(
+                f"Expected {len(self.columns)} feature columns, "
+                f"got {X.shape[1]}"
+            )
+        return np.expm1(self.model.predict(np.asarray(X, dtype=np.float64)))
+
+    def predict_frame(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Predict sale prices for joined housing and crime features.
+
+        Args:
+            df: Features as produced by build_cached_features
+
+        Returns:
+            Predicted prices indexed like the scored rows of df (land sales
+            are skipped)
+        """
+        X, _ = design_matrix(df, self.columns, self.fill_values)
+        return pd.Series(self.predict_matrix(X.to_numpy()), index=X.index,
+                         name=PREDICTION_COLUMN)
+
+
+def iter_chunks(
+    path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Stream an input file in chunks of at most chunk_size rows.
+
+    Args:
+        path: CSV, Parquet or .npy file. A .npy design matrix is
+            memory-mapped; see predict_file for its column order
+
+    Yields:
+        DataFrames for CSV and Parquet, array slices for .npy
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix == '.csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif suffix == '.parquet':
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif suffix == '.npy':
+        array = np.load(path, mmap_mode='r')
+        for start in range(0, len(array), chunk_size):
+            yield array[start:start + chunk_size]
+    else:
+        raise ValueError(
+            f"Unsupported input format: {path.suffix} "
+            f"(expected .csv, .parquet or .npy)"
+        )
+
+
+class _ChunkWriter:
+    """Append prediction chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.format = self.path.suffix.lower()
+        if self.format not in ('.csv', '.parquet'):
+            raise ValueError(
+                f"Unsupported output format: {self.path.suffix} "
+                f"(expected .csv or .parquet)"
+            )
+        self._parquet: Optional[pq.ParquetWriter] = None
+        self._started = False
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.format == '.csv':
+            df.to_csv(self.path, mode='a' if self._started else 'w',
+                      header=not self._started, index=False)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            else:
+                # Keep the first chunk's types, e.g. when a later chunk has
+                # an all-null column
+                table = table.cast(self._parquet.schema)
+            self._parquet.write_table(table)
+        self._started = True
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def predict_file(
+    artifact: ModelArtifact,
+    input_path: Path,
+    output_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    keep_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """
+    Score an input file chunk by chunk, writing predictions as it goes.
+
+    Only one chunk is held in memory at a time, so memory use depends on
+    chunk_size rather than on the input size.
+
+    Args:
+        artifact: Loaded model artifact
+        input_path: Features as CSV, Parquet or a .npy design matrix. A
+            matrix exported by src.features.matrix is realigned to the
+            model's columns through its sidecar; any other .npy must
+            already be in the model's column order
+        output_path: Predictions as CSV or Parquet
+        chunk_size: Rows per chunk
+        keep_columns: Input columns copied to the output next to the
+            prediction, e.g. an address or parcel id. Not available for .npy
+
+    Returns:
+        Report with rows, chunks, seconds and rows_per_second
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+    matrix = None
+    if Path(input_path).suffix.lower() == '.npy':
+        matrix = FeatureMatrix.open_file(input_path)
+    writer = _ChunkWriter(output_path)
+    rows = chunks = 0
+    start = time.perf_counter()
+
+    try:
+        for chunk in iter_chunks(input_path, chunk_size):
+            if isinstance(chunk, np.ndarray):
+                if keep_columns:
+                    raise ValueError(
+                        "keep_columns needs a CSV or Parquet input"
+                    )
+                if matrix is not None:
+                    chunk = matrix.aligned(chunk, artifact.columns)
+                result = pd.DataFrame(
+                    {PREDICTION_COLUMN: artifact.predict_matrix(chunk)}
+                )
+            else:
+                predictions = artifact.predict_frame(chunk)
+                result = chunk.loc[
+                    predictions.index, list(keep_columns)
+                ].reset_index(drop=True)
+                result[PREDICTION_COLUMN] = predictions.to_numpy()
+
+            writer.write(result)
+            rows += len(result)
+            chunks += 1
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds else 0.0,
+    }
+
+
+@click.command()
+@click.argument('model_dir', type=click.Path(exists=True, file_okay=False))
+@click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('output_path', type=click.Path(dir_okay=False))
+@click.option('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+              show_default=True, help='Rows per chunk')
+@click.option('--keep', 'keep_columns', multiple=True,
+              help='Input column to copy to the output (repeatable)')
+def main(model_dir, input_path, output_path, chunk_size, keep_columns):
+    """Score INPUT_PATH with the model in MODEL_DIR.
+
+    Predictions are written to OUTPUT_PATH.
+    """
+    artifact = ModelArtifact.load(model_dir)
+    try:
+        report = predict_file(artifact, input_path, output_path, chunk_size,
+                              keep_columns)
+    except (KeyError, ValueError) as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"Scored {report['rows']} rows in {report['chunks']} chunks, "
+               f"{report['seconds']}s ({report['rows_per_second']} rows/s)")
+    click.echo(f"Predictions written to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
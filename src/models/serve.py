@@ -0,0 +1,596 @@
+"""Local HTTP prediction service.
+
+Requests are micro-batched and feature vectors are cached.
+"""
+import json
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import click
+import numpy as np
+import pandas as pd
+
+from src.data.loadtest.stub_servers import percentile
+from src.features.address import normalize_sale_addresses
+from src.features.build_features import (
+    TOTAL_CRIME, CrimeWindowIndex, window_column
+)
+from src.features.cache import FeatureCache
+from src.features.cleaning import HOUSING_DATE_COLUMN, NEIGHBORHOOD_COLUMN
+from src.features.encoding import NeighborhoodEncoder
+from src.features.matrix import MONTH_COLUMN, design_matrix
+from src.models.predict_model import ModelArtifact
+
+
+PREDICT_PATH = '/predict'
+STATS_PATH = '/stats'
+HEALTH_PATH = '/health'
+
+# Crime window lengths are recovered from the model's '<N>M_TotalCrime'
+# columns
+WINDOW_TOTAL_PATTERN = re.compile(rf'^(\d+)M_{TOTAL_CRIME}$')
+
+# Request latencies kept for the percentiles
+LATENCY_SAMPLES = 10000
+
+# A queued record and the future its prediction resolves
+_Pending = Tuple[Dict[str, Any], Future]
+
+
+class LRUCache:
+    """Thread-safe least-recently-used mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries; 0 disables caching
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value and mark it recently used, or None."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used beyond maxsize."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a JSON value converts to a float, e.g. "12.5" or 3."""
+    if isinstance(value, bool):
+        return False
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _has_date(value: Any) -> bool:
+    """Whether a JSON value parses as a date or month."""
+    if not isinstance(value, str):
+        return False
+    parsed = pd.to_datetime(value, errors='coerce', format='mixed')
+    return not pd.isna(parsed)
+
+
+def validate_records(
+    payload: Any,
+    columns: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Check a /predict payload before its records join a batch.
+
+    Records are built into one frame per batch, so a record with a bad
+    value must be rejected here rather than change the batch's columns.
+
+    Args:
+        payload: Decoded JSON body, one record or a list of them
+        columns: Model feature columns; record fields named like one must be
+            numeric
+
+    Returns:
+        List of records
+
+    Raises:
+        ValueError: If a record lacks an 'Address' or a parseable Month or
+            sale date, or has a non-numeric value for a model column
+    """
+    records = payload if isinstance(payload, list) else [payload]
+    if not records:
+        raise ValueError("Expected a sale record or a list of records")
+
+    numeric = set(columns)
+    for i, record in enumerate(records):
+        if (not isinstance(record, dict)
+                or not isinstance(record.get('Address'), str)):
+            raise ValueError(
+                f"Record {i} is not a sale record with an 'Address'"
+            )
+        dates = (record.get(MONTH_COLUMN), record.get(HOUSING_DATE_COLUMN))
+        if not any(_has_date(value) for value in dates):
+            raise ValueError(
+                f"Record {i} has no parseable '{MONTH_COLUMN}' or "
+                f"'{HOUSING_DATE_COLUMN}'"
+            )
+        bad = [
+            c for c, v in record.items()
+            if c in numeric and v is not None and not _is_number(v)
+        ]
+        if bad:
+            raise ValueError(f"Record {i} has non-numeric values for {bad}")
+    return records
+
+
+class FeatureBuilder:
+    """
+    Build model feature vectors for sale records from warm in-memory state.
+
+    The crime-window index and the neighborhood encoder are built once.
+    A batch of records is turned into vectors in one vectorized pass, and
+    vectors of recently seen records come from an LRU cache.
+    """
+
+    def __init__(
+        self,
+        artifact: ModelArtifact,
+        crime_index: CrimeWindowIndex,
+        cache_size: int = 10000
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            artifact: Model artifact whose columns the vectors follow
+            crime_index: Crime-window index over the cleaned crime data
+            cache_size: Feature vectors kept in the LRU cache
+        """
+        self.artifact = artifact
+        self.crime_index = crime_index
+        matches = map(WINDOW_TOTAL_PATTERN.match, artifact.columns)
+        self.windows = sorted(
+            int(match.group(1)) for match in matches if match
+        )
+        self.encoder = None
+        if artifact.neighborhoods:
+            self.encoder = NeighborhoodEncoder(artifact.neighborhoods)
+        self.cache = LRUCache(cache_size)
+
+    def build(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Build feature vectors for sale records.
+
+        Args:
+            records: Sales with 'Address', a 'Month' (YYYY-MM) or sale date,
+                and optionally numeric fields such as 'Built Sq ft_org' and
+                'year_built_org' and a 'Neighborhood_org' classification
+
+        Returns:
+            Array of shape (len(records), len(artifact.columns))
+        """
+        keys = [
+            json.dumps(record, sort_keys=True, default=str)
+            for record in records
+        ]
+        vectors: List[Optional[np.ndarray]] = [
+            self.cache.get(key) for key in keys
+        ]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            built = self._build_uncached([records[i] for i in missing])
+            for row, i in enumerate(missing):
+                vectors[i] = built[row]
+                self.cache.put(keys[i], built[row])
+
+        if not vectors:
+            return np.empty((0, len(self.artifact.columns)))
+        return np.vstack(vectors)
+
+    def _build_uncached(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Build vectors for records in one vectorized pass."""
+        df = pd.DataFrame.from_records(records)
+        df = df.drop(columns=['type'], errors='ignore')
+        # Per value, so one record's bad value cannot turn the column to
+        # object dtype, which design_matrix would drop for every record of
+        # the batch
+        for column in df.columns.intersection(self.artifact.columns):
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+        # Records give either a month or a sale date
+        dates = pd.Series(pd.NaT, index=df.index)
+        for column in (MONTH_COLUMN, HOUSING_DATE_COLUMN):
+            if column in df.columns:
+                dates = dates.fillna(pd.to_datetime(
+                    df[column], errors='coerce', format='mixed'
+                ))
+        df[MONTH_COLUMN] = dates.dt.to_period('M')
+
+        blocks = normalize_sale_addresses(df['Address'])['Address Block']
+        for months in self.windows:
+            counts = self.crime_index.window_counts(
+                blocks, df[MONTH_COLUMN], months
+            )
+            for i, category in enumerate(self.crime_index.categories):
+                df[window_column(months, category)] = counts[:, i]
+            df[window_column(months, TOTAL_CRIME)] = counts.sum(axis=1)
+
+        if self.encoder is not None and NEIGHBORHOOD_COLUMN in df.columns:
+            dummies = self.encoder.to_frame(df[NEIGHBORHOOD_COLUMN])
+            dummies = dummies.sparse.to_dense()
+            new_columns = [c for c in dummies.columns if c not in df.columns]
+            df = pd.concat([df, dummies[new_columns]], axis=1)
+
+        X, _ = design_matrix(df, self.artifact.columns,
+                             self.artifact.fill_values)
+        return X.to_numpy()
+
+
+class MicroBatcher:
+    """
+    Collect concurrent requests into batches for one vectorized call.
+
+    A background thread waits for the first pending record, then gathers
+    more for up to max_wait_ms or until max_batch records, and resolves
+    every record's future from a single predict_batch call.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[Dict[str, Any]]], np.ndarray],
+        max_batch: int = 64,
+        max_wait_ms: float = 2.0
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            predict_batch: Function from a list of records to one
+                prediction per record
+            max_batch: Largest batch
+            max_wait_ms: Longest time the first record of a batch waits for
+                more
+        """
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.batched_records = 0
+        self._queue: 'queue.Queue[Optional[_Pending]]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'MicroBatcher':
+        """Start the batching thread."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the batching thread after the pending records are served."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, record: Dict[str, Any]) -> Future:
+        """
+        Queue a record for the next batch.
+
+        Args:
+            record: Sale record
+
+        Returns:
+            Future resolving to the record's prediction
+        """
+        future: Future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, stopping = self._gather(item)
+            self._serve(batch)
+
+    def _gather(self, first: _Pending) -> Tuple[List[_Pending], bool]:
+        """
+        Collect more records after the first, until the batch is due.
+
+        Returns:
+            The batch, and whether stop was requested meanwhile
+        """
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _serve(self, batch: List[_Pending]) -> None:
+        """Predict a batch and resolve its futures."""
+        self.batches += 1
+        self.batched_records += len(batch)
+        try:
+            predictions = self.predict_batch([record for record, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), prediction in zip(batch, predictions):
+            future.set_result(float(prediction))
+
+
+class PredictionService:
+    """
+    HTTP service answering price estimates from a warm model.
+
+    POST /predict takes one sale record or a list of them as JSON and
+    returns {"predictions": [...]}. GET /stats reports request latency
+    percentiles, batching and feature cache counters. GET /health answers
+    once the model is loaded.
+    """
+
+    def __init__(
+        self,
+        artifact: ModelArtifact,
+        crime_index: CrimeWindowIndex,
+        host: str = '127.0.0.1',
+        port: int = 8000,
+        max_batch: int = 64,
+        max_wait_ms: float = 2.0,
+        cache_size: int = 10000,
+        timeout: float = 30.0
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            artifact: Loaded model artifact
+            crime_index: Crime-window index over the cleaned crime data
+            host: Interface to bind
+            port: Port to bind. 0 picks a free port
+            max_batch: Largest micro-batch
+            max_wait_ms: Longest time a request waits for others to batch
+                with
+            cache_size: Feature vectors kept in the LRU cache
+            timeout: Seconds a request waits for its prediction
+        """
+        self.artifact = artifact
+        self.builder = FeatureBuilder(artifact, crime_index, cache_size)
+        self.batcher = MicroBatcher(self._predict_batch, max_batch,
+                                    max_wait_ms)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._latencies: 'deque[float]' = deque(maxlen=LATENCY_SAMPLES)
+        self._requests = 0
+        self._errors = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the service."""
+        return f"http://{self.host}:{self.port}"
+
+    def _predict_batch(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        return self.artifact.predict_matrix(self.builder.build(records))
+
+    def predict(self, records: List[Dict[str, Any]]) -> List[float]:
+        """
+        Predict prices through the micro-batcher.
+
+        Args:
+            records: Sale records
+
+        Returns:
+            One predicted price per record
+        """
+        futures = [self.batcher.submit(record) for record in records]
+        return [future.result(timeout=self.timeout) for future in futures]
+
+    def start(self) -> 'PredictionService':
+        """Start the batcher and serve HTTP on a background thread."""
+        service = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                service._dispatch(self, 'GET')
+
+            def do_POST(self):
+                service._dispatch(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self.batcher.start()
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and wait for the server and batcher threads."""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self.batcher.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize served prediction requests.
+
+        Returns:
+            Dictionary with request and error counts, latency percentiles in
+            ms, batch counts and feature cache hits and misses
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            requests, errors = self._requests, self._errors
+
+        batches = self.batcher.batches
+        mean_batch = self.batcher.batched_records / batches if batches else 0.0
+        return {
+            'requests': requests,
+            'errors': errors,
+            'latency_p50_ms': percentile(latencies, 50) * 1000,
+            'latency_p99_ms': percentile(latencies, 99) * 1000,
+            'latency_max_ms': max(latencies) * 1000 if latencies else 0.0,
+            'batches': batches,
+            'mean_batch_size': mean_batch,
+            'cache_hits': self.builder.cache.hits,
+            'cache_misses': self.builder.cache.misses,
+            'cache_entries': len(self.builder.cache),
+        }
+
+    def _dispatch(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        """Route a request and record the latency of predictions."""
+        started = time.perf_counter()
+        path = request.path.split('?', 1)[0]
+
+        if method == 'GET' and path == STATS_PATH:
+            self._write(request, 200, self.stats())
+            return
+        if method == 'GET' and path == HEALTH_PATH:
+            self._write(request, 200, {
+                'status': 'ok', 'features': len(self.artifact.columns)
+            })
+            return
+        if method != 'POST' or path != PREDICT_PATH:
+            self._write(request, 404, {
+                'error': f'Unknown endpoint: {method} {path}'
+            })
+            return
+
+        length = int(request.headers.get('Content-Length') or 0)
+        try:
+            body = request.rfile.read(length).decode('utf-8')
+            payload = json.loads(body or 'null')
+            records = validate_records(payload, self.artifact.columns)
+        except ValueError as e:
+            status, body = 400, {'error': str(e)}
+        else:
+            try:
+                status, body = 200, {'predictions': self.predict(records)}
+            except Exception as e:
+                status, body = 500, {'error': str(e)}
+
+        self._write(request, status, body)
+
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+            self._requests += 1
+            if status >= 400:
+                self._errors += 1
+
+    @staticmethod
+    def _write(
+        request: BaseHTTPRequestHandler,
+        status: int,
+        body: Dict[str, Any]
+    ) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+
+@click.command()
+@click.argument('model_dir', type=click.Path(exists=True, file_okay=False))
+@click.argument('features_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--host', default='127.0.0.1', show_default=True,
+              help='Interface to bind')
+@click.option('--port', type=int, default=8000, show_default=True,
+              help='Port to bind')
+@click.option('--max-batch', type=int, default=64, show_default=True,
+              help='Largest micro-batch')
+@click.option('--max-wait-ms', type=float, default=2.0, show_default=True,
+              help='Longest time a request waits for others to batch with')
+@click.option('--cache-size', type=int, default=10000, show_default=True,
+              help='Cached feature vectors')
+def main(model_dir, features_dir, host, port, max_batch, max_wait_ms,
+         cache_size):
+    """Serve price predictions from MODEL_DIR.
+
+    Crime features come from the cleaned crimes cached in FEATURES_DIR.
+    """
+    cache = FeatureCache(features_dir)
+    manifest = cache.manifest('crime_clean')
+    if manifest is None:
+        raise click.ClickException(
+            f"No cached 'crime_clean' stage in {features_dir}"
+        )
+
+    crime_index = CrimeWindowIndex(cache.load('crime_clean', manifest))
+    service = PredictionService(
+        ModelArtifact.load(model_dir), crime_index, host, port, max_batch,
+        max_wait_ms, cache_size
+    ).start()
+    click.echo(f"Serving predictions on {service.url}{PREDICT_PATH} "
+               f"(stats at {STATS_PATH})")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
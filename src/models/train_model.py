@@ -0,0 +1,399 @@
+"""Train sale price models with a parallel cross-validated grid search."""
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import click
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.model_selection import KFold, ParameterGrid
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import RobustScaler
+from threadpoolctl import threadpool_limits
+
+from src.features.cache import FeatureCache
+from src.features.matrix import FeatureMatrix, design_matrix
+
+
+FEATURE_STAGE = 'crime_join'
+
+MODEL_FILE = 'model.joblib'
+METRICS_FILE = 'metrics.json'
+FEATURES_FILE = 'features.json'
+
+# Linear models are fitted on robustly scaled features, as in the EDA notebook
+ESTIMATORS = {
+    'linear': lambda **params: make_pipeline(
+        RobustScaler(), LinearRegression(**params)
+    ),
+    'ridge': lambda **params: make_pipeline(RobustScaler(), Ridge(**params)),
+    'lasso': lambda **params: make_pipeline(
+        RobustScaler(), Lasso(max_iter=5000, **params)
+    ),
+    'elasticnet': lambda **params: make_pipeline(
+        RobustScaler(), ElasticNet(max_iter=5000, **params)
+    ),
+    'gbr': lambda **params: GradientBoostingRegressor(
+        random_state=42, **params
+    ),
+}
+
+DEFAULT_GRID = {
+    'linear': {},
+    'ridge': {'alpha': [0.1, 1.0, 10.0, 100.0]},
+    'lasso': {'alpha': [0.0001, 0.001, 0.01]},
+    'gbr': {
+        'n_estimators': [200, 400],
+        'max_depth': [2, 3],
+        'learning_rate': [0.05, 0.1],
+    },
+}
+
+# Per-worker state set by _init_worker: memory-mapped data and CV folds
+_worker: Dict[str, Any] = {}
+
+
+def candidates(
+    grid: Dict[str, Dict[str, list]]
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Expand a hyperparameter grid.
+
+    Args:
+        grid: Parameter lists per estimator name in ESTIMATORS
+
+    Returns:
+        (estimator name, parameters) for every combination
+    """
+    unknown = set(grid) - set(ESTIMATORS)
+    if unknown:
+        raise ValueError(f"Unknown estimators: {sorted(unknown)}")
+    return [
+        (name, params)
+        for name, space in grid.items()
+        for params in ParameterGrid(space)
+    ]
+
+
+def _init_worker(x_path: str, y_path: str, n_splits: int, seed: int) -> None:
+    """Map the shared arrays read-only and compute the folds, per worker."""
+    _worker['X'] = np.load(x_path, mmap_mode='r')
+    _worker['y'] = np.load(y_path, mmap_mode='r')
+    kfold = KFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    _worker['folds'] = list(kfold.split(_worker['y']))
+    # One BLAS thread per process; the pool already uses every core
+    _worker['limits'] = threadpool_limits(limits=1)
+
+
+def _fit_fold(
+    task: Tuple[int, str, Dict[str, Any], int]
+) -> Tuple[int, int, float, float, float]:
+    """Fit one candidate on one fold and score it on the held-out part."""
+    candidate, name, params, fold = task
+    X, y = _worker['X'], _worker['y']
+    train, test = _worker['folds'][fold]
+
+    start = time.perf_counter()
+    model = ESTIMATORS[name](**params).fit(X[train], y[train])
+    predicted = model.predict(X[test])
+
+    residual = y[test] - predicted
+    rmse = float(np.sqrt(np.mean(residual ** 2)))
+    error = np.sum(residual ** 2)
+    total = np.sum((y[test] - y[test].mean()) ** 2)
+    if total > 0:
+        r2 = float(1 - error / total)
+    else:
+        # Constant target: scored as sklearn's r2_score does
+        r2 = 1.0 if error == 0 else 0.0
+    return candidate, fold, rmse, r2, time.perf_counter() - start
+
+
+def search(
+    X: np.ndarray,
+    y: np.ndarray,
+    grid: Dict[str, Dict[str, list]],
+    n_splits: int = 5,
+    n_jobs: Optional[int] = None,
+    seed: int = 42
+) -> List[Dict[str, Any]]:
+    """
+    Cross-validate every grid candidate, one task per (candidate, fold).
+
+    X and y are written once to .npy files that every worker memory-maps
+    read-only, so the data is shared through the page cache instead of
+    being pickled into each task.
+
+    Args:
+        X: Feature matrix
+        y: Target
+        grid: Parameter lists per estimator name
+        n_splits: Cross-validation folds
+        n_jobs: Worker processes. All cores if None
+        seed: Fold shuffling seed
+
+    Returns:
+        One result per candidate with its mean/std RMSE and mean R^2, best
+        first
+    """
+    with tempfile.TemporaryDirectory(prefix='cov2_train_') as work_dir:
+        x_path = os.path.join(work_dir, 'X.npy')
+        y_path = os.path.join(work_dir, 'y.npy')
+        np.save(x_path, np.ascontiguousarray(X, dtype=np.float64))
+        np.save(y_path, np.ascontiguousarray(y, dtype=np.float64))
+        return search_files(x_path, y_path, grid, n_splits, n_jobs, seed)
+
+
+def search_files(
+    x_path: Path,
+    y_path: Path,
+    grid: Dict[str, Dict[str, list]],
+    n_splits: int = 5,
+    n_jobs: Optional[int] = None,
+    seed: int = 42
+) -> List[Dict[str, Any]]:
+    """
+    Cross-validate every grid candidate on .npy files.
+
+    The files can be an exported FeatureMatrix.
+
+    Workers memory-map the files directly, so nothing is copied or
+    re-serialized before the search starts.
+
+    Args:
+        x_path: Feature matrix .npy
+        y_path: Target .npy
+        grid: Parameter lists per estimator name
+        n_splits: Cross-validation folds
+        n_jobs: Worker processes. All cores if None
+        seed: Fold shuffling seed
+
+    Returns:
+        One result per candidate with its mean/std RMSE and mean R^2, best
+        first
+    """
+    tasks = candidates(grid)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    scores: Dict[int, List[Tuple[float, float, float]]] = {
+        i: [] for i in range(len(tasks))
+    }
+
+    ctx = multiprocessing.get_context('spawn')
+    initargs = (str(x_path), str(y_path), n_splits, seed)
+    with ProcessPoolExecutor(max_workers=n_jobs, mp_context=ctx,
+                             initializer=_init_worker,
+                             initargs=initargs) as pool:
+        jobs = [
+            (i, name, params, fold)
+            for i, (name, params) in enumerate(tasks)
+            for fold in range(n_splits)
+        ]
+        for candidate, _, rmse, r2, seconds in pool.map(_fit_fold, jobs):
+            scores[candidate].append((rmse, r2, seconds))
+
+    results = []
+    for i, (name, params) in enumerate(tasks):
+        rmse, r2, seconds = (np.array(values) for values in zip(*scores[i]))
+        results.append({
+            'estimator': name,
+            'params': params,
+            'rmse': float(rmse.mean()),
+            'rmse_std': float(rmse.std()),
+            'r2': float(r2.mean()),
+            'fit_seconds': float(seconds.sum()),
+        })
+    return sorted(results, key=lambda result: result['rmse'])
+
+
+def train(
+    df: pd.DataFrame,
+    output_dir: Path,
+    grid: Optional[Dict[str, Dict[str, list]]] = None,
+    n_splits: int = 5,
+    n_jobs: Optional[int] = None,
+    seed: int = 42,
+    neighborhoods: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Search the grid, refit the best candidate on all data and save it.
+
+    Writes model.joblib, metrics.json (best candidate and the full
+    leaderboard) and features.json (feature columns, fill values and the
+    neighborhood vocabulary) to output_dir.
+
+    Args:
+        df: Joined housing and crime features
+        output_dir: Model artifact directory
+        grid: Parameter lists per estimator name. DEFAULT_GRID if None
+        n_splits: Cross-validation folds
+        n_jobs: Worker processes. All cores if None
+        seed: Fold shuffling seed
+        neighborhoods: Neighborhood encoder vocabulary used to build df
+
+    Returns:
+        Metrics dictionary as written to metrics.json
+    """
+    X, y = design_matrix(df)
+    if len(X) < n_splits:
+        raise ValueError(
+            f"Need at least {n_splits} sales to train, got {len(X)}"
+        )
+
+    start = time.perf_counter()
+    leaderboard = search(X.to_numpy(), y.to_numpy(), grid or DEFAULT_GRID,
+                         n_splits, n_jobs, seed)
+    return _save_best(leaderboard, X.to_numpy(), y.to_numpy(),
+                      list(X.columns), X.mean().to_dict(), Path(output_dir),
+                      n_splits, neighborhoods, start)
+
+
+def train_matrix(
+    matrix: FeatureMatrix,
+    output_dir: Path,
+    grid: Optional[Dict[str, Dict[str, list]]] = None,
+    n_splits: int = 5,
+    n_jobs: Optional[int] = None,
+    seed: int = 42,
+    neighborhoods: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Like train, on an exported design matrix instead of a feature frame.
+
+    The search workers memory-map the exported files directly, so no
+    design matrix is rebuilt and nothing is copied before the search.
+
+    Args:
+        matrix: Exported matrix with a target
+        output_dir: Model artifact directory
+        grid: Parameter lists per estimator name. DEFAULT_GRID if None
+        n_splits: Cross-validation folds
+        n_jobs: Worker processes. All cores if None
+        seed: Fold shuffling seed
+        neighborhoods: Neighborhood encoder vocabulary used to build the
+            features
+
+    Returns:
+        Metrics dictionary as written to metrics.json
+    """
+    if matrix.y is None:
+        raise ValueError(f"{matrix.path} was exported without a target")
+    if len(matrix.X) < n_splits:
+        raise ValueError(
+            f"Need at least {n_splits} sales to train, got {len(matrix.X)}"
+        )
+
+    start = time.perf_counter()
+    leaderboard = search_files(matrix.path, matrix.target_path,
+                               grid or DEFAULT_GRID, n_splits, n_jobs, seed)
+    return _save_best(leaderboard, matrix.X, matrix.y, matrix.columns,
+                      matrix.fill_values, Path(output_dir), n_splits,
+                      neighborhoods, start)
+
+
+def _save_best(
+    leaderboard: List[Dict[str, Any]],
+    X: np.ndarray,
+    y: np.ndarray,
+    columns: List[str],
+    fill_values: Dict[str, float],
+    output_dir: Path,
+    n_splits: int,
+    neighborhoods: Optional[Iterable[str]],
+    start: float
+) -> Dict[str, Any]:
+    """Refit the best candidate on all rows.
+
+    Writes the model, its features and the metrics.
+    """
+    best = leaderboard[0]
+    model = ESTIMATORS[best['estimator']](**best['params']).fit(X, y)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, output_dir / MODEL_FILE)
+
+    features = {
+        'columns': columns,
+        'fill_values': fill_values,
+        'neighborhoods': (
+            list(neighborhoods) if neighborhoods is not None else None
+        ),
+    }
+    (output_dir / FEATURES_FILE).write_text(json.dumps(features, indent=2))
+
+    metrics = {
+        'best': best,
+        'rows': len(X),
+        'features': X.shape[1],
+        'n_splits': n_splits,
+        'search_seconds': round(time.perf_counter() - start, 3),
+        'leaderboard': leaderboard,
+    }
+    (output_dir / METRICS_FILE).write_text(json.dumps(metrics, indent=2))
+    return metrics
+
+
+@click.command()
+@click.argument('features_dir',
+                type=click.Path(exists=True, file_okay=False))
+@click.argument('output_dir', type=click.Path(file_okay=False),
+                default='models')
+@click.option('--estimator', 'estimators', multiple=True,
+              type=click.Choice(sorted(ESTIMATORS)),
+              help='Estimator to search (repeatable). '
+                   'Defaults to all in the default grid')
+@click.option('--folds', type=int, default=5, show_default=True,
+              help='Cross-validation folds')
+@click.option('--jobs', type=int, default=None,
+              help='Worker processes. Defaults to all cores')
+@click.option('--seed', type=int, default=42, show_default=True,
+              help='Fold shuffling seed')
+def main(features_dir, output_dir, estimators, folds, jobs, seed):
+    """Train on the cached feature matrix in FEATURES_DIR.
+
+    The best model is saved to OUTPUT_DIR.
+    """
+    cache = FeatureCache(features_dir)
+    manifest = cache.manifest(FEATURE_STAGE)
+    if manifest is None:
+        raise click.ClickException(
+            f"No cached '{FEATURE_STAGE}' features in {features_dir}"
+        )
+
+    housing = cache.manifest('housing_clean')
+    grid = None
+    if estimators:
+        grid = {name: DEFAULT_GRID.get(name, {}) for name in estimators}
+    options = dict(
+        grid=grid, n_splits=folds, n_jobs=jobs, seed=seed,
+        neighborhoods=housing.get('vocabulary') if housing else None
+    )
+
+    # Prefer the exported matrix of these exact features; it needs no
+    # parsing or design step
+    matrix = FeatureMatrix.open(features_dir, source_key=manifest['key'])
+    if matrix is not None and matrix.y is not None:
+        click.echo(f"Using exported design matrix {matrix.path}")
+        metrics = train_matrix(matrix, Path(output_dir), **options)
+    else:
+        metrics = train(cache.load(FEATURE_STAGE, manifest),
+                        Path(output_dir), **options)
+
+    best = metrics['best']
+    click.echo(f"Searched {len(metrics['leaderboard'])} candidates x "
+               f"{folds} folds on {metrics['rows']} sales in "
+               f"{metrics['search_seconds']}s")
+    click.echo(f"Best: {best['estimator']} {best['params']}  "
+               f"RMSE {best['rmse']:.4f} (+/- {best['rmse_std']:.4f})  "
+               f"R^2 {best['r2']:.3f}")
+    click.echo(f"Model written to {output_dir}")
+
+
+if __name__ == '__main__':
+    main()
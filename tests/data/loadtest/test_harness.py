@@ -0,0 +1,43 @@
+import multiprocessing
+import sys
+import time
+import pytest
+from src.data.loadtest.harness import _wait_for_result
+
+
+class TestWaitForResult:
+    """Test waiting on the load-test worker process."""
+
+    @pytest.fixture
+    def ctx(self):
+        return multiprocessing.get_context('spawn')
+
+    def test_returns_result(self, ctx):
+        """Test a delivered result is returned even after the worker exited."""
+        results = ctx.Queue()
+        worker = ctx.Process(target=sys.exit, args=(0,))
+        worker.start()
+        worker.join()
+        results.put({'runs': []})
+
+        assert _wait_for_result(results, worker, 'seattle_crime') == {'runs': []}
+
+    def test_dead_worker_fails(self, ctx):
+        """Test a worker that died without a result fails instead of hanging."""
+        worker = ctx.Process(target=sys.exit, args=(3,))
+        worker.start()
+        worker.join()
+
+        with pytest.raises(RuntimeError, match='exited with code 3'):
+            _wait_for_result(ctx.Queue(), worker, 'seattle_crime')
+
+    def test_timeout(self, ctx):
+        """Test a worker still running past the timeout fails the run."""
+        worker = ctx.Process(target=time.sleep, args=(30,))
+        worker.start()
+        try:
+            with pytest.raises(TimeoutError):
+                _wait_for_result(ctx.Queue(), worker, 'seattle_crime', timeout=0.5)
+        finally:
+            worker.terminate()
+            worker.join()
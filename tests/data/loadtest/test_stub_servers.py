@@ -0,0 +1,131 @@
+import json
+import re
+import pytest
+import pandas as pd
+import requests
+from src.data.loadtest.stub_servers import AspNetFormServer, SalesGridServer, SocrataServer, StubServer
+from src.data.loadtest.harness import build_stub
+from src.data.scrapers.bellingham_crime import BellinghamCrimeScraper
+from src.data.scrapers.seattle_crime import SeattleCrimeScraper
+
+
+class TestStubServers:
+    """Test local stand-in servers used for load testing."""
+
+    @pytest.fixture
+    def aspnet_server(self):
+        """Provide a running ASP.NET form emulator."""
+        server = AspNetFormServer(rows_per_month=5).start()
+        yield server
+        server.stop()
+
+    @pytest.fixture
+    def socrata_server(self):
+        """Provide a running Socrata emulator."""
+        server = SocrataServer(total_rows=500).start()
+        yield server
+        server.stop()
+
+    def test_bellingham_scraper_against_aspnet_stub(self, aspnet_server, tmp_path):
+        """Test that the real scraper can page through the form emulator."""
+        config = {
+            'url': aspnet_server.url,
+            'output_file': 'COB_CrimeReport.csv',
+            'output_dir': 'interim',
+            'rate_limit_seconds': 0
+        }
+        scraper = BellinghamCrimeScraper('bellingham_crime', config, str(tmp_path))
+
+        df = scraper._scrape_month(2020, 2)
+
+        assert len(df) == 5
+        assert df['Date'].str.startswith('02/').all()
+        assert aspnet_server.stats()['requests'] == 2
+
+    def test_aspnet_rejects_unknown_viewstate(self, aspnet_server):
+        """Test that posts without an issued viewstate fail like ASP.NET does."""
+        response = requests.post(aspnet_server.url, data={
+            '__VIEWSTATE': 'forged',
+            '__VIEWSTATEGENERATOR': AspNetFormServer.generator,
+            '__EVENTVALIDATION': 'forged',
+            'ctl00$ContentPlaceHolder1$txtStartDate': '1/01/2020',
+            'ctl00$ContentPlaceHolder1$txtEndDate': '1/31/2020',
+        })
+
+        assert response.status_code == 500
+        assert 'viewstate' in response.text
+
+    def test_socrata_limit_offset_where_order(self, socrata_server):
+        """Test SoQL paging, filtering and ordering."""
+        params = {
+            '$limit': 10,
+            '$offset': 5,
+            '$where': "offense_id > 100 AND offense_id <= 300",
+            '$order': 'offense_id DESC'
+        }
+        rows = requests.get(socrata_server.url, params=params).json()
+
+        assert [int(r['offense_id']) for r in rows] == list(range(295, 285, -1))
+
+    def test_socrata_rejects_unknown_field(self, socrata_server):
+        """Test that unsupported SoQL returns HTTP 400."""
+        response = requests.get(socrata_server.url, params={'$order': 'nope'})
+
+        assert response.status_code == 400
+
+    def test_seattle_scraper_against_socrata_stub(self, socrata_server, tmp_path):
+        """Test that the real scraper reads the emulated API."""
+        config = {'url': socrata_server.url, 'output_file': 'seattle.csv', 'limit': 200}
+        scraper = SeattleCrimeScraper('seattle_crime', config, str(tmp_path))
+
+        df = scraper.scrape()
+
+        assert len(df) == 200
+        dates = df['occurred_date_or_date_range_start'].tolist()
+        assert dates == sorted(dates, reverse=True)
+        assert pd.to_datetime(pd.Series(dates), format='%Y-%m-%dT%H:%M:%S.%f').notna().all()
+
+    def test_sales_grid_pages(self):
+        """Test that the sales grid renders pages and pager links."""
+        server = SalesGridServer(total_sales=120, page_size=50).start()
+        try:
+            page = requests.get(server.url, params={'page': 3}).text
+            missing = requests.get(server.url, params={'page': 4})
+        finally:
+            server.stop()
+
+        assert server.page_count == 3
+        assert page.count('<tr><td>') == 20
+        assert missing.status_code == 404
+
+    def test_sales_grid_pager_is_bounded(self):
+        """Test that the pager links a window around the page plus first and last."""
+        server = SalesGridServer(total_sales=10000, page_size=50)
+        html = server._page_html(100)
+        linked = [int(n) for n in re.findall(r'\?page=(\d+)">', html)]
+
+        assert linked == [1] + list(range(90, 100)) + list(range(101, 111)) + [200]
+        assert '<span>100</span>' in html
+
+    def test_stub_server_requires_handle(self):
+        """Test that the base class cannot be served without a handler."""
+        with pytest.raises(TypeError):
+            StubServer()
+
+    def test_error_injection(self):
+        """Test that error_rate=1 answers every request with 503."""
+        server = SocrataServer(total_rows=10, error_rate=1.0).start()
+        try:
+            status = requests.get(server.url).status_code
+            stats = json.loads(requests.get(f"http://{server.host}:{server.port}/__stats").text)
+        finally:
+            server.stop()
+
+        assert status == 503
+        assert stats['errors'] == 1
+
+    def test_build_stub_scales_dataset(self):
+        """Test that the harness scales baseline dataset sizes."""
+        stub = build_stub('property_sales', scale=10)
+
+        assert stub.total_sales == 100000
@@ -1,8 +1,10 @@
+import json
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch
 import pandas as pd
 from src.data.scrapers.base_scraper import BaseScraper
+from src.data.utils.store import AnalyticalStore
 
 
 class ConcreteScraper(BaseScraper):
@@ -127,3 +129,195 @@ class TestBaseScraper:
 
         scraper.apply_rate_limit()
         mock_sleep.assert_called_once_with(2)
+
+    def test_run_writes_metrics(self, tmp_path):
+        """Test that run() records and writes per-run metrics."""
+        config = {
+            'name': 'Test Scraper',
+            'output_file': 'test.csv',
+            'output_dir': 'raw'
+        }
+
+        scraper = ConcreteScraper(
+            name='test_scraper',
+            config=config,
+            project_root=str(tmp_path)
+        )
+
+        scraper.run()
+
+        assert scraper.metrics.rows == 3
+        assert scraper.metrics.success is True
+        metrics_dir = tmp_path / 'logs' / 'metrics'
+        assert (metrics_dir / 'test_scraper.prom').exists()
+        assert len(list(metrics_dir.glob('test_scraper-*.json'))) == 1
+
+    def test_save_data_writes_manifest(self, tmp_path):
+        """Test that save_data writes a metadata sidecar."""
+        config = {
+            'name': 'Test Scraper',
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'date_column': 'date'
+        }
+
+        scraper = ConcreteScraper(
+            name='test_scraper',
+            config=config,
+            project_root=str(tmp_path)
+        )
+
+        df = pd.DataFrame({'date': ['2021-01-01', '2021-02-01'], 'b': [3, 4]})
+        scraper.save_data(df)
+
+        manifest = json.loads((tmp_path / 'data' / '1_raw' / 'test.csv.meta.json').read_text())
+        assert manifest['row_count'] == 2
+        assert manifest['scraper'] == 'test_scraper'
+        assert manifest['max_date'].startswith('2021-02-01')
+
+    def test_run_validates_and_writes_rejects(self, tmp_path):
+        """Test that run() coerces to the schema and writes rejected rows."""
+        config = {
+            'name': 'Test Scraper',
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'schema': {'columns': {'col1': {'type': 'integer'}}}
+        }
+
+        scraper = ConcreteScraper(
+            name='test_scraper',
+            config=config,
+            project_root=str(tmp_path)
+        )
+        scraper.scrape = Mock(return_value=pd.DataFrame({'col1': ['1', 'x', '3']}))
+
+        assert scraper.run() is True
+
+        raw_dir = tmp_path / 'data' / '1_raw'
+        assert pd.read_csv(raw_dir / 'test.csv')['col1'].tolist() == [1, 3]
+        rejected = pd.read_csv(raw_dir / 'test.rejected.csv')
+        assert rejected['_reject_reason'].tolist() == ['col1: invalid integer']
+
+    def test_dates_written_in_configured_format(self, tmp_path):
+        """Test that validated dates keep the source format on disk, also when appending."""
+        config = {
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'dedup_keys': ['id'],
+            'incremental': True,
+            'schema': {'columns': {'date': {'type': 'date', 'format': '%m/%d/%Y'}}}
+        }
+        scraper = ConcreteScraper(name='test_scraper', config=config, project_root=str(tmp_path))
+
+        scraper.save_data(scraper.validate(pd.DataFrame({'id': ['1'], 'date': ['3/14/2021']})))
+        scraper.save_data(scraper.validate(pd.DataFrame({'id': ['2'], 'date': ['12/01/2021']})))
+
+        saved = pd.read_csv(scraper.get_output_path(), dtype=str)
+        assert saved['date'].tolist() == ['03/14/2021', '12/01/2021']
+
+    def test_incremental_save_appends_only_new_keys(self, tmp_path):
+        """Test that incremental saves skip keys already written."""
+        config = {
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'dedup_keys': ['id'],
+            'incremental': True
+        }
+        scraper = ConcreteScraper(name='test_scraper', config=config, project_root=str(tmp_path))
+
+        assert scraper.save_data(pd.DataFrame({'id': [1, 2], 'v': ['a', 'b']})) == 2
+        assert scraper.save_data(pd.DataFrame({'v': ['b', 'c', 'c', 'd'], 'id': pd.array([2, 3, 3, None], dtype='Int64')})) == 1
+        assert scraper.save_data(pd.DataFrame({'id': [1, 3], 'v': ['a', 'c']})) == 0
+
+        output = tmp_path / 'data' / '1_raw' / 'test.csv'
+        saved = pd.read_csv(output)
+        assert saved['id'].tolist() == [1, 2, 3]
+        assert saved['v'].tolist() == ['a', 'b', 'c']
+        manifest = json.loads((tmp_path / 'data' / '1_raw' / 'test.csv.meta.json').read_text())
+        assert manifest['row_count'] == 3
+
+    def test_append_without_new_rows_refreshes_manifest(self, tmp_path):
+        """Test that an append with nothing new still records the read."""
+        class WatermarkScraper(ConcreteScraper):
+            def get_source_watermark(self, df):
+                return f"id={df['id'].max()}"
+
+        config = {
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'dedup_keys': ['id'],
+            'incremental': True
+        }
+        scraper = WatermarkScraper(name='test_scraper', config=config, project_root=str(tmp_path))
+        scraper.save_data(pd.DataFrame({'id': [1, 2], 'v': ['a', 'b']}))
+        output = tmp_path / 'data' / '1_raw' / 'test.csv'
+        manifest_file = tmp_path / 'data' / '1_raw' / 'test.csv.meta.json'
+        old = json.loads(manifest_file.read_text())
+        old['written_at'] = '2020-01-01T00:00:00'
+        old['source_watermark'] = 'id=0'
+        manifest_file.write_text(json.dumps(old))
+        content = output.read_bytes()
+
+        assert scraper.save_data(pd.DataFrame({'id': [1, 2], 'v': ['a', 'b']})) == 0
+
+        manifest = json.loads(manifest_file.read_text())
+        assert manifest['written_at'] > '2020-01-01T00:00:00'
+        assert manifest['source_watermark'] == 'id=2'
+        assert manifest['row_count'] == 2
+        assert manifest['columns'] == old['columns']
+        assert output.read_bytes() == content
+
+    def test_rebuild_key_index(self, tmp_path):
+        """Test that the index is rebuilt from the data file, matching validated keys."""
+        config = {
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'dedup_keys': ['link', 'date'],
+            'incremental': True,
+            'schema': {'columns': {'date': {'type': 'date', 'format': '%m/%d/%Y'}}}
+        }
+        scraper = ConcreteScraper(name='test_scraper', config=config, project_root=str(tmp_path))
+        output = scraper.get_output_path()
+        output.write_text('link,date\nL1,2020-01-05\nL1,2020-01-05\nL2,2021-02-03\n')
+
+        assert scraper.rebuild_key_index(chunk_size=2) == {'rows': 3, 'keys': 2, 'duplicates': 1}
+
+        batch = scraper.validate(pd.DataFrame({'link': ['L1', 'L3'], 'date': ['01/05/2020', '01/05/2020']}))
+        assert scraper.save_data(batch) == 1
+        assert pd.read_csv(output)['link'].tolist() == ['L1', 'L1', 'L2', 'L3']
+
+    def test_append_without_index_rebuilds_it(self, tmp_path):
+        """Test that an existing output without a key index is not duplicated on append."""
+        config = {
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'dedup_keys': ['link', 'date'],
+            'incremental': True,
+            'schema': {'columns': {'date': {'type': 'date', 'format': '%m/%d/%Y'}}}
+        }
+        scraper = ConcreteScraper(name='test_scraper', config=config, project_root=str(tmp_path))
+        output = scraper.get_output_path()
+        output.write_text('link,date\nL1,3/14/2021\nL2,12/01/2020\n')
+        assert not scraper.get_key_index_path().exists()
+
+        batch = scraper.validate(pd.DataFrame({'link': ['L1', 'L2', 'L3'],
+                                               'date': ['3/14/2021', '12/01/2020', '1/02/2022']}))
+        assert scraper.save_data(batch) == 1
+        assert pd.read_csv(output)['link'].tolist() == ['L1', 'L2', 'L3']
+
+    def test_run_upserts_into_store(self, tmp_path):
+        """Test that run() writes validated records to the analytical store."""
+        config = {
+            'output_file': 'test.csv',
+            'output_dir': 'raw',
+            'dedup_keys': ['col1'],
+            'store_path': 'data/store.sqlite',
+            'store_indexes': ['col1']
+        }
+        scraper = ConcreteScraper(name='test_scraper', config=config, project_root=str(tmp_path))
+
+        assert scraper.run() is True
+        assert scraper.run() is True
+
+        with AnalyticalStore(tmp_path / 'data' / 'store.sqlite') as store:
+            assert store.query('SELECT col1 FROM test_scraper')['col1'].tolist() == [1, 2, 3]
@@ -1,8 +1,48 @@
+import re
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import pandas as pd
 from datetime import datetime
 from src.data.scrapers.bellingham_crime import BellinghamCrimeScraper
+from src.features.crime_cube import CrimeCube
+
+
+def reference_categorize(offence):
+    """Row-wise categorization the compiled matcher must reproduce."""
+    offence_lower = offence.lower()
+
+    if any(word in offence_lower for word in ['theft', 'burglary', 'robbery', 'stolen']):
+        return 'Property'
+    elif any(word in offence_lower for word in ['assault', 'battery', 'homicide', 'violence']):
+        return 'Violent'
+    elif any(word in offence_lower for word in ['drug', 'narcotic', 'controlled substance']):
+        return 'Drug'
+    elif any(word in offence_lower for word in ['traffic', 'dui', 'driving']):
+        return 'Traffic'
+    else:
+        return 'Other'
+
+
+def reference_split(offence_full):
+    """Row-wise offence/case split the vectorized extract must reproduce."""
+    match = re.match(r'(.*?)\s*-\s*Case\s*#?\s*(.+)', offence_full)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return offence_full, ''
+
+
+OFFENCES = [
+    'Theft - Case #2020-001',
+    'ASSAULT 4TH DEGREE - Case # 2020-002',
+    'Drug Theft - Case 2020-003',
+    'Controlled Substance Violation',
+    'DUI-Case#2020-004',
+    'Hit and run driving - case #5',
+    'Stolen Vehicle Recovered - Case #2020-006 - Case #7',
+    'Noise Complaint',
+    'Domestic Violence - Case #',
+    '',
+]
 
 
 class TestBellinghamCrimeScraper:
@@ -135,3 +175,92 @@ class TestBellinghamCrimeScraper:
         # Should have called _scrape_month 12 times (12 months in 2020)
         assert mock_scrape_month.call_count == 12
         assert len(df) == 12  # 1 record per month
+
+    def test_postprocess_matches_row_wise_logic(self, mock_config, tmp_path):
+        """Test that the columnar split and categorization match the previous per-row code."""
+        scraper = BellinghamCrimeScraper(name='bellingham_crime', config=mock_config, project_root=str(tmp_path))
+        raw = pd.DataFrame({
+            'Date': ['01/15/2020'] * len(OFFENCES) * 2,
+            'Location': ['123 Main St'] * len(OFFENCES) * 2,
+            'Offence': OFFENCES * 2,
+        })
+
+        df = scraper.postprocess(raw)
+
+        expected = [reference_split(offence) for offence in OFFENCES * 2]
+        assert df['Offence'].tolist() == [offence for offence, _ in expected]
+        assert df['Case Details'].tolist() == [case for _, case in expected]
+        assert df['Crime Category'].tolist() == [reference_categorize(offence) for offence, _ in expected]
+        assert list(df.columns) == ['Date', 'Location', 'Offence', 'Crime Category', 'Case Details']
+
+    def test_crime_categories_from_config(self, mock_config, tmp_path):
+        """Test that the taxonomy and its priority order come from config."""
+        mock_config['crime_categories'] = {'Vehicle': ['vehicle', 'dui'], 'Property': ['stolen']}
+        mock_config['default_category'] = 'Unclassified'
+        scraper = BellinghamCrimeScraper(name='bellingham_crime', config=mock_config, project_root=str(tmp_path))
+
+        categories = scraper.categorize(pd.Series(['Stolen Vehicle', 'stolen bike', 'DUI', 'Theft']))
+
+        assert categories.tolist() == ['Vehicle', 'Property', 'Vehicle', 'Unclassified']
+
+    def test_crime_cube_follows_appended_months(self, mock_config, tmp_path):
+        """Test saved records are counted into the cube, appended batches only once."""
+        mock_config.update({'crime_cube': True, 'incremental': True, 'dedup_keys': ['Case Details'],
+                            'date_column': 'Date'})
+        scraper = BellinghamCrimeScraper(name='bellingham_crime', config=mock_config, project_root=str(tmp_path))
+        january = pd.DataFrame({
+            'Date': ['01/15/2020', '01/20/2020'],
+            'Location': ['1200 BLK STATE ST', '100 BLK MAIN ST'],
+            'Offence': ['Theft', 'Assault'],
+            'Crime Category': ['Property', 'Violent'],
+            'Case Details': ['2020-001', '2020-002'],
+        })
+        february = pd.DataFrame({
+            'Date': ['02/03/2020'],
+            'Location': ['1200 BLK STATE ST'],
+            'Offence': ['Burglary'],
+            'Crime Category': ['Property'],
+            'Case Details': ['2020-003'],
+        })
+
+        scraper.save_data(january)
+        scraper.save_data(pd.concat([january, february]))
+
+        cube = CrimeCube.load(scraper.get_cube_path())
+        assert cube.total == 3
+        monthly = cube.rollup('month', by='block')
+        assert monthly.loc[pd.Period('2020-02', 'M'), '1200 STATE ST'] == 1
+        assert monthly['1200 STATE ST'].sum() == 2
+
+        # A full rewrite rebuilds the cube from the written records
+        scraper.incremental = False
+        scraper.save_data(february)
+        assert CrimeCube.load(scraper.get_cube_path()).total == 1
+
+    def test_crime_cube_rebuilt_from_output_when_missing(self, mock_config, tmp_path, monkeypatch):
+        """Test an append without a cube, or after a failed update, counts the whole output."""
+        mock_config.update({'crime_cube': True, 'incremental': True, 'dedup_keys': ['Case Details'],
+                            'date_column': 'Date', 'date_format': '%m/%d/%Y'})
+        scraper = BellinghamCrimeScraper(name='bellingham_crime', config=mock_config, project_root=str(tmp_path))
+        scraper.get_output_path().write_text(
+            'Date,Location,Offence,Crime Category,Case Details\n'
+            '01/15/2020,1200 BLK STATE ST,Theft,Property,2020-001\n'
+            '01/20/2020,100 BLK MAIN ST,Assault,Violent,2020-002\n'
+        )
+
+        def record(case, date):
+            return pd.DataFrame({'Date': [date], 'Location': ['1200 BLK STATE ST'], 'Offence': ['Burglary'],
+                                 'Crime Category': ['Property'], 'Case Details': [case]})
+
+        scraper.save_data(record('2020-003', '02/03/2020'))
+        assert CrimeCube.load(scraper.get_cube_path()).total == 3
+
+        monkeypatch.setattr(CrimeCube, 'add', Mock(side_effect=RuntimeError('disk full')))
+        scraper.save_data(record('2020-004', '03/03/2020'))
+        assert not scraper.get_cube_path().exists()
+
+        monkeypatch.undo()
+        scraper.save_data(record('2020-005', '04/03/2020'))
+        cube = CrimeCube.load(scraper.get_cube_path())
+        assert cube.total == 5
+        assert cube.months == 4
@@ -0,0 +1,172 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from click.testing import CliRunner
+from src.data.cli import cli, load_scraper_class, get_scraper_registry, SCRAPER_CLASSES
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Wall-clock budget for `import src.data.cli` in a fresh interpreter
+CLI_IMPORT_BUDGET_SECONDS = 0.5
+
+HEAVY_MODULES = ['pandas', 'bs4', 'selenium', 'webdriver_manager', 'tenacity', 'requests']
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src.data.cli
+elapsed = time.perf_counter() - started
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+class TestCli:
+    """Test CLI startup and scraper registration."""
+
+    def _probe_import(self):
+        """Import the CLI in a fresh interpreter and report time and loaded modules."""
+        result = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE],
+            cwd=str(PROJECT_ROOT),
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_import_does_not_load_scraper_dependencies(self):
+        """Test that importing the CLI leaves heavy scraper dependencies unloaded."""
+        modules = set(self._probe_import()['modules'])
+
+        assert not modules & set(HEAVY_MODULES)
+        assert not any(m.startswith('src.data.scrapers') for m in modules)
+
+    def test_import_time_budget(self):
+        """Test that the CLI entry point imports within its time budget."""
+        # Best of three to smooth out cold file-system caches
+        seconds = min(self._probe_import()['seconds'] for _ in range(3))
+
+        assert seconds < CLI_IMPORT_BUDGET_SECONDS
+
+    def test_load_scraper_class(self):
+        """Test lazy resolution of registered scrapers."""
+        scraper_class = load_scraper_class('seattle_crime')
+
+        assert scraper_class.__name__ == 'SeattleCrimeScraper'
+        assert load_scraper_class('not_a_scraper') is None
+
+    def test_registry_includes_builtins(self):
+        """Test that the registry lists every built-in scraper."""
+        registry = get_scraper_registry()
+
+        for name, target in SCRAPER_CLASSES.items():
+            assert registry[name] == target
+
+    def test_help(self):
+        """Test that --help works."""
+        result = CliRunner().invoke(cli, ['--help'])
+
+        assert result.exit_code == 0
+        assert 'update' in result.output
+
+    def test_status_reads_manifests(self, tmp_path, monkeypatch):
+        """Test that status reports rows from sidecars and flags stale data."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text("""
+data_dirs:
+  raw: data/1_raw
+status:
+  stale_after_days: 7
+scrapers:
+  fresh:
+    stale_after_days: 7
+""")
+        raw_dir = tmp_path / 'data' / '1_raw'
+        raw_dir.mkdir(parents=True)
+        (raw_dir / 'fresh.csv').write_text('a\n1\n')
+        (raw_dir / 'fresh.csv.meta.json').write_text(json.dumps({
+            'scraper': 'fresh', 'row_count': 1234, 'size_bytes': 4,
+            'min_date': '2020-01-01T00:00:00', 'max_date': '2021-06-30T00:00:00',
+            'written_at': '2000-01-01T00:00:00'
+        }))
+        (raw_dir / 'other.csv').write_text('a\n')
+
+        monkeypatch.chdir(tmp_path)
+        result = CliRunner().invoke(cli, ['status', '--config', str(config_file)])
+
+        assert result.exit_code == 0
+        assert 'fresh.csv (0.00 MB) 1,234 rows [STALE]' in result.output
+        assert 'dates 2020-01-01 to 2021-06-30' in result.output
+        assert 'other.csv (0.00 MB) - no manifest' in result.output
+
+    def test_rebuild_index(self, tmp_path, monkeypatch):
+        """Test that rebuild-index rebuilds scrapers with dedup_keys from their data files."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text("""
+scrapers:
+  seattle_crime:
+    url: http://localhost/resource.json
+    output_file: seattle.csv
+    output_dir: raw
+    dedup_keys: [offense_id]
+""")
+        raw_dir = tmp_path / 'data' / '1_raw'
+        raw_dir.mkdir(parents=True)
+        (raw_dir / 'seattle.csv').write_text('offense_id,offense\n1,a\n2,b\n2,b\n')
+
+        monkeypatch.chdir(tmp_path)
+        result = CliRunner().invoke(cli, ['rebuild-index', '--config', str(config_file)])
+
+        assert result.exit_code == 0
+        assert 'seattle_crime: 2 keys from 3 rows (1 duplicate rows in data)' in result.output
+        assert (raw_dir / 'seattle.keys.sqlite').exists()
+
+        result = CliRunner().invoke(cli, ['rebuild-index', 'nope', '--config', str(config_file)])
+        assert result.exit_code == 1
+
+    def test_query(self, tmp_path):
+        """Test ad-hoc SQL against the analytical store."""
+        import pandas as pd
+        from src.data.utils.store import AnalyticalStore
+
+        db = tmp_path / 'store.sqlite'
+        with AnalyticalStore(db) as store:
+            store.upsert('crime', pd.DataFrame({'id': [1, 2], 'offense': ['THEFT', 'ASSAULT']}), ['id'], ['offense'])
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ['query', "SELECT offense FROM crime WHERE id = 2", '--db', str(db),
+                                     '--format', 'csv'])
+        plan = runner.invoke(cli, ['query', "SELECT * FROM crime WHERE offense = 'THEFT'", '--db', str(db),
+                                   '--explain'])
+        bad = runner.invoke(cli, ['query', 'SELECT * FROM nope', '--db', str(db)])
+        write = runner.invoke(cli, ['query', 'DELETE FROM crime', '--db', str(db)])
+
+        assert result.exit_code == 0
+        assert result.output == 'offense\nASSAULT\n'
+        assert 'ix_crime_offense' in plan.output
+        assert bad.exit_code == 1
+        assert 'Query failed' in bad.output
+        assert write.exit_code == 1
+        assert 'readonly' in write.output
+        with AnalyticalStore(db) as store:
+            assert len(store.query('SELECT * FROM crime')) == 2
+
+    def test_sync_directory_target(self, tmp_path):
+        """Test push and pull through the CLI with a directory target."""
+        data = tmp_path / 'data'
+        data.mkdir()
+        (data / 'crime.csv').write_text('Date,Location\n01/01/2020,100 BLOCK MAIN ST\n')
+        remote = tmp_path / 'remote'
+
+        runner = CliRunner()
+        pushed = runner.invoke(cli, ['sync', 'push', str(remote), '--root', str(data)])
+        again = runner.invoke(cli, ['sync', 'push', str(remote), '--root', str(data)])
+        pulled = runner.invoke(cli, ['sync', 'pull', str(remote), '--root', str(tmp_path / 'copy')])
+
+        assert pushed.exit_code == 0
+        assert 'Uploaded: crime.csv' in pushed.output
+        assert '0 transferred, 1 unchanged' in again.output
+        assert pulled.exit_code == 0
+        assert (tmp_path / 'copy' / 'crime.csv').read_text() == (data / 'crime.csv').read_text()
@@ -0,0 +1,46 @@
+import pytest
+import pandas as pd
+from src.data.utils.key_index import KEY_SEPARATOR, KeyIndex, key_strings
+
+
+class TestKeyIndex:
+    """Test the persistent dedup key index."""
+
+    def test_add_and_contains(self, tmp_path):
+        """Test that only new keys are inserted and lookups follow input order."""
+        with KeyIndex(tmp_path / 'keys.sqlite') as index:
+            assert index.add(['a', 'b']) == 2
+            assert index.add(['b', 'c']) == 1
+            assert index.contains(['c', 'x', 'a']) == [True, False, True]
+            assert len(index) == 3
+
+    def test_persists_on_clean_exit(self, tmp_path):
+        """Test that keys survive reopening the index."""
+        with KeyIndex(tmp_path / 'keys.sqlite') as index:
+            index.add(['a'])
+
+        with KeyIndex(tmp_path / 'keys.sqlite') as index:
+            assert index.contains(['a']) == [True]
+
+    def test_rolls_back_on_error(self, tmp_path):
+        """Test that keys added in a failing block are discarded."""
+        with pytest.raises(RuntimeError):
+            with KeyIndex(tmp_path / 'keys.sqlite') as index:
+                index.add(['a'])
+                raise RuntimeError('write failed')
+
+        with KeyIndex(tmp_path / 'keys.sqlite') as index:
+            assert len(index) == 0
+
+    def test_key_strings(self):
+        """Test composite keys, date rendering and missing parts."""
+        df = pd.DataFrame({
+            'link': ['L1', ' L2 ', None],
+            'date': pd.to_datetime(['2020-01-05', '2021-02-03', '2021-02-03']),
+        })
+
+        keys = key_strings(df, ['link', 'date'])
+
+        assert keys[0] == f'L1{KEY_SEPARATOR}2020-01-05T00:00:00'
+        assert keys[1] == f'L2{KEY_SEPARATOR}2021-02-03T00:00:00'
+        assert pd.isna(keys[2])
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.loaders import (
+    compare_with_naive,
+    iter_chunks,
+    load_bellingham_crime,
+    load_property_combined,
+    load_property_sales,
+    load_seattle_crime,
+)
+
+
+def write_crimes(path, n, seed=0):
+    rng = np.random.default_rng(seed)
+    blocks = [f"{b}00 BLK STATE ST" for b in range(1, 40)]
+    offences = ['THEFT', 'BURGLARY', 'ASSAULT', 'VANDALISM', 'DUI']
+    categories = ['property crime', 'violent crime', 'other']
+    dates = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3000, n), unit='D')
+    pd.DataFrame({
+        'Date': dates.strftime('%m/%d/%Y'),
+        'Location': rng.choice(blocks, n),
+        'Offence': rng.choice(offences, n),
+        'Crime Category': rng.choice(categories, n),
+        'Case Details': [f"Case {i}" for i in range(n)],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_bellingham_crime_types(tmp_path):
+    df = load_bellingham_crime(write_crimes(tmp_path / 'crime.csv', 50))
+
+    assert list(df.columns) == ['Date', 'Location', 'Offence', 'Crime Category', 'Case Details']
+    assert df['Date'].dtype == 'datetime64[ns]' or str(df['Date'].dtype).startswith('datetime64')
+    for column in ('Location', 'Offence', 'Crime Category'):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    assert df['Date'].notna().all()
+
+
+def test_column_projection(tmp_path):
+    df = load_bellingham_crime(write_crimes(tmp_path / 'crime.csv', 20), columns=['Crime Category', 'Date'])
+    assert list(df.columns) == ['Crime Category', 'Date']
+
+
+def test_unknown_and_missing_columns(tmp_path):
+    path = write_crimes(tmp_path / 'crime.csv', 5)
+    with pytest.raises(ValueError, match='Unknown columns'):
+        load_bellingham_crime(path, columns=['Nope'])
+
+    pd.read_csv(path).drop(columns='Offence').to_csv(path, index=False)
+    with pytest.raises(ValueError, match='not in'):
+        load_bellingham_crime(path, columns=['Offence'])
+    # Without an explicit projection, absent columns are skipped
+    assert 'Offence' not in load_bellingham_crime(path).columns
+
+
+def test_iter_chunks_matches_load(tmp_path):
+    path = write_crimes(tmp_path / 'crime.csv', 250)
+    chunks = list(iter_chunks('bellingham_crime', path, chunksize=100))
+
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    combined = pd.concat([c.astype({'Location': str, 'Offence': str, 'Crime Category': str}) for c in chunks],
+                         ignore_index=True)
+    full = load_bellingham_crime(path).astype({'Location': str, 'Offence': str, 'Crime Category': str})
+    pd.testing.assert_frame_equal(combined, full)
+
+
+def test_seattle_crime_types(tmp_path):
+    path = tmp_path / 'seattle.csv'
+    pd.DataFrame({
+        'report_number': ['2020-1', '2020-2'],
+        'offense_id': [11, 12],
+        'occurred_date_or_date_range_start': ['2020-02-05T10:21:00.000', '2020-03-01T00:00:00.000'],
+        'offense': ['Theft', 'Assault'],
+        'offense_parent_group': ['LARCENY', 'ASSAULT'],
+        'latitude': [47.61, 47.62],
+        'longitude': [-122.33, -122.34],
+        'beat': ['B1', 'B2'],
+    }).to_csv(path, index=False)
+
+    df = load_seattle_crime(path)
+    assert 'beat' not in df.columns
+    assert df['latitude'].dtype == np.float32
+    assert df['offense_id'].dtype == 'Int64'
+    assert df['occurred_date_or_date_range_start'].iloc[0] == pd.Timestamp('2020-02-05 10:21')
+
+
+def test_property_loaders_parse_currency_and_measures(tmp_path):
+    sales = tmp_path / 'part1.csv'
+    pd.DataFrame({
+        'Assessor Link': ['a', 'b'],
+        'Address': ['1 A ST', '2 B ST'],
+        'Sale Date': ['01/15/2019', ''],
+        'Sale Price': ['$350,000', '$1,200,000'],
+    }).to_csv(sales, index=False)
+    df = load_property_sales(sales)
+    assert df['Sale Price'].tolist() == [350000.0, 1200000.0]
+    assert df['Sale Date'].iloc[0] == pd.Timestamp('2019-01-15')
+    assert pd.isna(df['Sale Date'].iloc[1])
+
+    combined = tmp_path / 'combined.csv'
+    pd.DataFrame({
+        'Unique ID': ['x'],
+        'Address': ['1 A ST'],
+        'Sale Date_part1': ['01/15/2019'],
+        'Sale Price': ['$350,000'],
+        'Neighborhood_org': ['Fairhaven'],
+        'Built Sq ft_org': ['1,850 sqft'],
+        'year_built_org': [1998],
+    }).to_csv(combined, index=False)
+    df = load_property_combined(combined)
+    assert df['Built Sq ft_org'].iloc[0] == pytest.approx(1850)
+    assert df['year_built_org'].iloc[0] == 1998
+
+
+def test_typed_load_uses_less_memory_than_naive(tmp_path):
+    path = write_crimes(tmp_path / 'large.csv', 200000, seed=1)
+    report = compare_with_naive('bellingham_crime', path, columns=['Date', 'Location', 'Offence', 'Crime Category'])
+
+    assert report['typed']['frame_mb'] < report['naive']['frame_mb'] / 2
+    assert report['typed']['peak_mb'] < report['naive']['peak_mb']
+
+
+@pytest.mark.parametrize('scraper, loader, raw', [
+    ('bellingham_crime', load_bellingham_crime,
+     {'Date': ['3/14/2021', '12/01/2020'], 'Location': ['100 BLK STATE ST'] * 2,
+      'Offence': ['THEFT'] * 2, 'Case Details': ['Case 1', 'Case 2']}),
+    ('seattle_crime', load_seattle_crime,
+     {'offense_id': ['1', '2'], 'occurred_date_or_date_range_start': ['2021-03-14T10:30:00.000'] * 2}),
+])
+def test_loads_scraper_output(tmp_path, scraper, loader, raw):
+    from src.data.config_manager import ConfigManager
+    from src.data.utils.validation import format_dates, validate_frame
+
+    schema = ConfigManager().get_scraper_config(scraper)['schema']
+    valid, rejected = validate_frame(pd.DataFrame(raw), schema)
+    assert rejected.empty
+    format_dates(valid, schema).to_csv(tmp_path / 'out.csv', index=False)
+
+    df = loader(tmp_path / 'out.csv')
+    date_column = next(c for c, spec in schema['columns'].items() if spec['type'] == 'date')
+    assert df[date_column].tolist() == valid[date_column].tolist()
+
+
+def test_unparsed_dates_warn(tmp_path):
+    path = tmp_path / 'crime.csv'
+    pd.DataFrame({'Date': ['3/14/2021', 'soon'], 'Location': ['A', 'B']}).to_csv(path, index=False)
+
+    with pytest.warns(UserWarning, match="'Date'.*'soon'"):
+        df = load_bellingham_crime(path)
+    assert df['Date'].isna().tolist() == [False, True]
@@ -1,7 +1,16 @@
 import pytest
+import json
 import logging
+import multiprocessing
 from pathlib import Path
-from src.data.utils.logger import setup_logger, get_logger
+from src.data.utils.logger import (
+    setup_logger, get_logger, get_log_queue, setup_worker_logger, stop_queue_logging
+)
+
+
+def _worker_log(log_queue, message):
+    """Log one message from a worker process through the parent's queue."""
+    setup_worker_logger('test_worker_child', log_queue).info(message)
 
 
 class TestLogger:
@@ -65,3 +74,59 @@ class TestLogger:
         logger2 = get_logger('shared_logger')
 
         assert logger1 is logger2
+
+    def test_queue_mode_writes_on_background_thread(self, tmp_path):
+        """Test that queue mode attaches only a QueueHandler and still writes the file."""
+        log_file = tmp_path / "test.log"
+        logger = setup_logger(
+            name='test_queue',
+            log_file=str(log_file),
+            level=logging.INFO,
+            use_queue=True
+        )
+
+        assert [type(h).__name__ for h in logger.handlers] == ['QueueHandler']
+
+        logger.info("Queued message")
+        stop_queue_logging('test_queue')
+
+        assert "Queued message" in log_file.read_text()
+        assert logger.handlers == []
+
+    def test_json_lines_format(self, tmp_path):
+        """Test that the log file can be written as JSON lines."""
+        log_file = tmp_path / "test.jsonl"
+        logger = setup_logger(
+            name='test_json',
+            log_file=str(log_file),
+            level=logging.INFO,
+            use_queue=True,
+            json_lines=True
+        )
+
+        logger.warning("Value %d", 42)
+        stop_queue_logging('test_json')
+
+        entry = json.loads(log_file.read_text().splitlines()[0])
+        assert entry['message'] == "Value 42"
+        assert entry['level'] == "WARNING"
+        assert entry['name'] == "test_json"
+
+    def test_worker_process_logs_through_queue(self, tmp_path):
+        """Test that worker processes log into the parent's file via the queue."""
+        log_file = tmp_path / "test.log"
+        setup_logger(
+            name='test_worker',
+            log_file=str(log_file),
+            level=logging.INFO,
+            use_queue=True,
+            process_safe=True
+        )
+
+        ctx = multiprocessing.get_context('fork')
+        worker = ctx.Process(target=_worker_log, args=(get_log_queue('test_worker'), "From worker"))
+        worker.start()
+        worker.join()
+        stop_queue_logging('test_worker')
+
+        assert "From worker" in log_file.read_text()
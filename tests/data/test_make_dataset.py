@@ -0,0 +1,280 @@
+import json
+import os
+import threading
+import time
+import pytest
+from click.testing import CliRunner
+from src.data.config_manager import ConfigManager
+from src.data.make_dataset import (
+    BLOCKED, BUILT, FAILED, FRESH, MANUAL, REBUILD, Pipeline, Stage, build_pipeline, main
+)
+
+
+def copy_stage(name, source, target, calls, transform=str.upper, **kwargs):
+    """Stage writing a transformed copy of one file."""
+    def action():
+        calls.append(name)
+        target.write_text(transform(source.read_text()))
+    return Stage(name, action, inputs=[source], outputs=[target], **kwargs)
+
+
+def statuses(report):
+    return {entry['stage']: entry['status'] for entry in report}
+
+
+@pytest.fixture
+def chain(tmp_path):
+    """raw.txt -> clean.txt -> joined.txt, plus an unrelated other.txt."""
+    (tmp_path / 'raw.txt').write_text('a\n')
+    (tmp_path / 'side.txt').write_text('s\n')
+    calls = []
+    stages = [
+        copy_stage('clean', tmp_path / 'raw.txt', tmp_path / 'clean.txt', calls),
+        copy_stage('join', tmp_path / 'clean.txt', tmp_path / 'joined.txt', calls, transform=lambda t: t * 2),
+        copy_stage('other', tmp_path / 'side.txt', tmp_path / 'other.txt', calls),
+    ]
+    return tmp_path, stages, calls
+
+
+def pipeline(tmp_path, stages):
+    return Pipeline(stages, tmp_path / 'state.json', root=tmp_path)
+
+
+class TestPipeline:
+    """Test dependency scheduling and stale-stage detection."""
+
+    def test_order_and_selection(self, chain):
+        """Test stages follow their dependencies and targets pull in upstream stages."""
+        root, stages, _ = chain
+        p = pipeline(root, list(reversed(stages)))
+
+        assert p.order.index('clean') < p.order.index('join')
+        assert p.dependencies('join') == ['clean']
+        assert p.select(['join']) == ['clean', 'join']
+        with pytest.raises(ValueError, match='Unknown stages'):
+            p.select(['nope'])
+
+    def test_cycle_and_duplicate_outputs_are_rejected(self, tmp_path):
+        """Test invalid graphs fail on construction."""
+        a, b = tmp_path / 'a', tmp_path / 'b'
+        with pytest.raises(ValueError, match='cycle'):
+            pipeline(tmp_path, [Stage('x', print, inputs=[a], outputs=[b]), Stage('y', print, inputs=[b], outputs=[a])])
+        with pytest.raises(ValueError, match='written by both'):
+            pipeline(tmp_path, [Stage('x', print, outputs=[a]), Stage('y', print, outputs=[a])])
+
+    def test_second_run_is_fresh(self, chain):
+        """Test nothing rebuilds when no input changed."""
+        root, stages, calls = chain
+        assert statuses(pipeline(root, stages).run()) == {'clean': BUILT, 'join': BUILT, 'other': BUILT}
+        assert (root / 'joined.txt').read_text() == 'A\nA\n'
+
+        calls.clear()
+        assert statuses(pipeline(root, stages).run()) == {'clean': FRESH, 'join': FRESH, 'other': FRESH}
+        assert calls == []
+
+    def test_changed_input_rebuilds_downstream_only(self, chain):
+        """Test a changed file rebuilds the stages that read it, directly or indirectly."""
+        root, stages, calls = chain
+        pipeline(root, stages).run()
+        calls.clear()
+
+        (root / 'raw.txt').write_text('b\n')
+        report = pipeline(root, stages).run()
+
+        assert statuses(report) == {'clean': BUILT, 'join': BUILT, 'other': FRESH}
+        assert report[0]['reason'] == 'input changed: raw.txt'
+        assert (root / 'joined.txt').read_text() == 'B\nB\n'
+
+    def test_identical_rebuild_stops_propagation(self, chain):
+        """Test a rebuilt stage whose output did not change leaves its dependents fresh."""
+        root, stages, calls = chain
+        pipeline(root, stages).run()
+
+        # Same content after upper-casing, so clean.txt does not change
+        (root / 'raw.txt').write_text('A\n')
+        assert statuses(pipeline(root, stages).run()) == {'clean': BUILT, 'join': FRESH, 'other': FRESH}
+
+    def test_touch_without_change_is_fresh(self, chain):
+        """Test a new mtime with the same content is not a change."""
+        root, stages, _ = chain
+        pipeline(root, stages).run()
+
+        later = time.time() + 10
+        os.utime(root / 'raw.txt', (later, later))
+        assert statuses(pipeline(root, stages).run())['clean'] == FRESH
+
+    def test_params_and_modified_outputs(self, chain):
+        """Test parameter changes and edited outputs make a stage stale."""
+        root, stages, _ = chain
+        pipeline(root, stages).run()
+
+        (root / 'joined.txt').write_text('edited')
+        stages[0].params = {'version': 2}
+        report = {entry['stage']: entry for entry in pipeline(root, stages).run()}
+
+        assert report['clean']['reason'] == 'parameters changed'
+        assert report['join']['reason'] == 'output modified: joined.txt'
+
+    def test_dry_run_predicts_without_running(self, chain):
+        """Test the plan lists stale stages and their downstream without building."""
+        root, stages, calls = chain
+        pipeline(root, stages).run()
+        calls.clear()
+        (root / 'raw.txt').write_text('b\n')
+
+        plan = {entry['stage']: entry for entry in pipeline(root, stages).plan()}
+
+        assert {name: entry['action'] for name, entry in plan.items()} == \
+            {'clean': REBUILD, 'join': REBUILD, 'other': FRESH}
+        assert plan['join']['reason'] == 'upstream clean rebuilds'
+        assert calls == []
+
+    def test_force(self, chain):
+        """Test forced stages rebuild even when fresh."""
+        root, stages, _ = chain
+        pipeline(root, stages).run()
+
+        report = pipeline(root, stages).run(force=['other'])
+        assert statuses(report)['other'] == BUILT
+        assert report[2]['reason'] == 'forced'
+
+    def test_independent_stages_run_in_parallel(self, tmp_path):
+        """Test two stages without a dependency between them run at the same time."""
+        barrier = threading.Barrier(2, timeout=10)
+
+        def waiting_stage(name):
+            def action():
+                barrier.wait()
+                (tmp_path / name).write_text(name)
+            return Stage(name, action, outputs=[tmp_path / name])
+
+        report = pipeline(tmp_path, [waiting_stage('a'), waiting_stage('b')]).run(jobs=2)
+        assert statuses(report) == {'a': BUILT, 'b': BUILT}
+
+    def test_failure_blocks_dependents_only(self, chain):
+        """Test a failing stage blocks what reads its outputs and is retried next run."""
+        root, stages, calls = chain
+
+        def broken():
+            raise RuntimeError('boom')
+        stages[0].action = broken
+
+        report = pipeline(root, stages).run()
+        assert statuses(report) == {'clean': FAILED, 'join': BLOCKED, 'other': BUILT}
+        assert 'boom' in report[0]['reason']
+        assert 'clean' not in json.loads((root / 'state.json').read_text())['stages']
+
+    def test_manual_stages_run_only_on_request(self, chain):
+        """Test a stale manual stage waits unless named or forced."""
+        root, stages, calls = chain
+        stages[2].manual = True
+
+        assert statuses(pipeline(root, stages).run())['other'] == MANUAL
+        assert statuses(pipeline(root, stages).run(['other']))['other'] == BUILT
+
+    def test_source_stage_age(self, tmp_path):
+        """Test stages without inputs rebuild when their output is too old."""
+        output = tmp_path / 'scraped.csv'
+        calls = []
+        stage = Stage('scrape', lambda: calls.append(output.write_text('x')), outputs=[output], max_age_days=7)
+
+        pipeline(tmp_path, [stage]).run()
+        assert statuses(pipeline(tmp_path, [stage]).run()) == {'scrape': FRESH}
+
+        old = time.time() - 8 * 86400
+        os.utime(output, (old, old))
+        report = pipeline(tmp_path, [stage]).run()
+        assert report[0]['reason'] == 'scraped.csv older than 7 days'
+        assert len(calls) == 2
+
+
+CONFIG = """
+data_dirs:
+  raw: data/1_raw
+  interim: data/2_interim
+  processed: data/3_processed
+scrapers:
+  bellingham_crime:
+    enabled: true
+    output_file: COB_CrimeReport.csv
+    output_dir: interim
+    stale_after_days: 7
+  property_sales:
+    enabled: true
+    output_file: Bellingham_Property_Part1.csv
+    output_dir: interim
+  property_details:
+    enabled: false
+    output_file: Bellingham_Property_Complete.csv
+    output_dir: interim
+pipeline:
+  windows: [6]
+"""
+
+
+class TestProjectPipeline:
+    """Test the project's stage definitions."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        path = tmp_path / 'config.yaml'
+        path.write_text(CONFIG)
+        return path
+
+    def test_stages(self, config_file, tmp_path):
+        """Test scrapers feed cleaning, the join and the design matrix."""
+        p = build_pipeline(ConfigManager(config_path=str(config_file), project_root=str(tmp_path)))
+
+        assert p.order == ['scrape_bellingham_crime', 'scrape_property_sales', 'property_details',
+                           'crime_clean', 'housing_clean', 'crime_join', 'design_matrix']
+        assert p.dependencies('property_details') == ['scrape_property_sales']
+        assert p.dependencies('crime_join') == ['crime_clean', 'housing_clean']
+        assert p.stages['property_details'].manual
+        assert p.stages['scrape_bellingham_crime'].max_age_days == 7
+
+    def test_dry_run_cli(self, config_file, tmp_path, monkeypatch):
+        """Test --dry-run shows the plan with manual and blocked stages."""
+        monkeypatch.chdir(tmp_path)
+        result = CliRunner().invoke(main, ['--dry-run', '--config', str(config_file)])
+
+        assert result.exit_code == 0, result.output
+        lines = {line.split()[0]: line.split()[1] for line in result.output.splitlines()}
+        assert lines['scrape_bellingham_crime'] == REBUILD
+        assert lines['property_details'] == MANUAL
+        assert lines['housing_clean'] == BLOCKED
+        assert lines['crime_clean'] == REBUILD
+        assert not (tmp_path / 'data' / '3_processed').exists()
+
+    def test_unknown_stage(self, config_file, tmp_path, monkeypatch):
+        """Test unknown stage names are reported."""
+        monkeypatch.chdir(tmp_path)
+        result = CliRunner().invoke(main, ['nope', '--config', str(config_file)])
+
+        assert result.exit_code != 0
+        assert 'Unknown stages' in result.output
+
+    def test_feature_stages(self, config_file, tmp_path):
+        """Test the feature stages build from scraped files and rebuild only what a new crime touches."""
+        from src.features.matrix import FeatureMatrix
+        from tests.features.test_cache import synthetic_crimes
+        from tests.features.test_cleaning import synthetic_sales
+
+        interim = tmp_path / 'data' / '2_interim'
+        interim.mkdir(parents=True)
+        synthetic_crimes(500, seed=2).to_csv(interim / 'COB_CrimeReport.csv', index=False)
+        synthetic_sales(200, seed=1).to_csv(interim / 'Bellingham_Property_Sale_Combined.csv', index=False)
+        (interim / 'Bellingham_Property_Part1.csv').write_text('Assessor Link\n')
+
+        p = build_pipeline(ConfigManager(config_path=str(config_file), project_root=str(tmp_path)))
+        report = statuses(p.run(['design_matrix']))
+        assert report == {
+            'scrape_bellingham_crime': FRESH, 'scrape_property_sales': FRESH, 'property_details': MANUAL,
+            'crime_clean': BUILT, 'housing_clean': BUILT, 'crime_join': BUILT, 'design_matrix': BUILT,
+        }
+        assert FeatureMatrix.open(tmp_path / 'data' / '3_processed' / 'features') is not None
+
+        synthetic_crimes(600, seed=2).to_csv(interim / 'COB_CrimeReport.csv', index=False)
+        p = build_pipeline(ConfigManager(config_path=str(config_file), project_root=str(tmp_path)))
+        report = statuses(p.run(['design_matrix']))
+        assert report['housing_clean'] == FRESH
+        assert report['crime_clean'] == report['crime_join'] == BUILT
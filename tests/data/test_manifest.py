@@ -0,0 +1,48 @@
+import json
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+from src.data.utils.manifest import (
+    build_manifest, file_sha256, manifest_age_days, manifest_path, read_manifest, write_manifest
+)
+
+
+class TestManifest:
+    """Test metadata sidecar manifests."""
+
+    def test_manifest_path(self, tmp_path):
+        """Test that the sidecar sits next to the data file."""
+        assert manifest_path(tmp_path / 'a.csv') == tmp_path / 'a.csv.meta.json'
+
+    def test_build_manifest(self, tmp_path):
+        """Test that row count, schema, dates and hash are recorded."""
+        df = pd.DataFrame({'Date': ['01/15/2020', '03/02/2021', 'bad'], 'n': [1, 2, 3]})
+        data_file = tmp_path / 'data.csv'
+        df.to_csv(data_file, index=False)
+
+        manifest = build_manifest(df, data_file, scraper='test', date_column='Date',
+                                  date_format='%m/%d/%Y', scrape_duration_seconds=1.5)
+
+        assert manifest['row_count'] == 3
+        assert manifest['columns'] == {'Date': str(df['Date'].dtype), 'n': 'int64'}
+        assert manifest['min_date'].startswith('2020-01-15')
+        assert manifest['max_date'].startswith('2021-03-02')
+        assert manifest['source_watermark'] == manifest['max_date']
+        assert manifest['content_sha256'] == file_sha256(data_file)
+        assert manifest['scrape_duration_seconds'] == 1.5
+
+    def test_write_and_read_roundtrip(self, tmp_path):
+        """Test writing and reading a manifest."""
+        data_file = tmp_path / 'data.csv'
+        write_manifest(data_file, {'row_count': 5})
+
+        assert read_manifest(data_file) == {'row_count': 5}
+        assert read_manifest(tmp_path / 'missing.csv') is None
+
+    def test_manifest_age_days(self):
+        """Test manifest age calculation."""
+        written = datetime(2024, 1, 1, 12, 0, 0)
+        manifest = {'written_at': written.isoformat()}
+
+        assert manifest_age_days(manifest, now=written + timedelta(days=2)) == pytest.approx(2.0)
+        assert manifest_age_days({}) is None
@@ -0,0 +1,57 @@
+import json
+from src.data.utils.metrics import ScraperMetrics
+
+
+class TestScraperMetrics:
+    """Test per-run scraper metrics."""
+
+    def test_record_request_fills_host_histogram(self):
+        """Test that requests are counted per host into latency buckets."""
+        metrics = ScraperMetrics('test', buckets=(0.1, 1.0))
+        metrics.record_request('https://example.com/a', 0.05, 100)
+        metrics.record_request('https://example.com/b', 0.5, 200)
+        metrics.record_request('https://other.org/', 2.0, 50)
+
+        snapshot = metrics.to_dict()
+
+        assert snapshot['requests'] == 3
+        assert snapshot['bytes_received'] == 350
+        assert snapshot['latency']['example.com']['buckets'] == {'0.1': 1, '1.0': 2}
+        assert snapshot['latency']['other.org']['count'] == 1
+
+    def test_timer_and_rows_per_second(self):
+        """Test timers, counters and derived throughput."""
+        metrics = ScraperMetrics('test')
+        metrics.start()
+        with metrics.timer('parse_seconds'):
+            pass
+        metrics.increment('retries')
+        metrics.finish(rows=10, success=True)
+
+        assert metrics.parse_seconds >= 0
+        assert metrics.retries == 1
+        assert metrics.rows_per_second > 0
+
+    def test_prometheus_format(self):
+        """Test Prometheus text exposition output."""
+        metrics = ScraperMetrics('seattle', buckets=(1.0,))
+        metrics.record_request('https://data.seattle.gov/x', 0.2, 10)
+        metrics.finish(rows=5, success=True)
+
+        text = metrics.to_prometheus()
+
+        assert 'scraper_last_run_rows{scraper="seattle"} 5' in text
+        assert ('scraper_last_run_request_latency_seconds_bucket'
+                '{scraper="seattle",host="data.seattle.gov",le="+Inf"} 1') in text
+        assert '# TYPE scraper_last_run_request_latency_seconds histogram' in text
+
+    def test_write_creates_json_and_prom(self, tmp_path):
+        """Test that metrics are written as JSON and textfile."""
+        metrics = ScraperMetrics('test')
+        metrics.finish(rows=1, success=True)
+
+        paths = metrics.write(tmp_path / 'metrics')
+
+        assert json.loads(paths['json'].read_text())['rows'] == 1
+        assert paths['prometheus'].name == 'test.prom'
+        assert not list((tmp_path / 'metrics').glob('.*'))
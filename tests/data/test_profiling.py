@@ -0,0 +1,29 @@
+from src.data.utils.profiling import profile_call
+
+
+def _workload():
+    """Allocate and compute something measurable."""
+    data = [str(i) * 10 for i in range(20000)]
+    return sum(len(item) for item in data)
+
+
+class TestProfiling:
+    """Test profiling of scraper runs."""
+
+    def test_profile_call_returns_result_and_writes_reports(self, tmp_path):
+        """Test that profiling preserves the result and writes all reports."""
+        result, summary = profile_call('demo', _workload, tmp_path, top_n=10)
+
+        assert result == _workload()
+        assert summary['stats_file'].exists()
+        assert 'cumulative' in summary['text_file'].read_text()
+        assert summary['memory_file'].read_text().startswith('Peak traced memory')
+        assert summary['peak_memory_mb'] > 0
+
+    def test_hotspot_summary(self, tmp_path):
+        """Test that hotspots are ordered by own time."""
+        _, summary = profile_call('demo', _workload, tmp_path, summary_size=3)
+
+        spots = summary['hotspots']
+        assert 0 < len(spots) <= 3
+        assert spots == sorted(spots, key=lambda s: s['tottime'], reverse=True)
@@ -0,0 +1,102 @@
+import importlib
+from pathlib import Path
+from unittest.mock import Mock
+import pandas as pd
+import pytest
+from src.data.config_manager import ConfigManager
+from src.data.loadtest.stub_servers import SalesGridServer
+from src.data.scrapers.property_sales import PropertySalesScraper
+from src.features.cleaning import clean_housing_df
+
+SCRIPT_DIR = Path(__file__).parents[2] / 'src' / 'data'
+
+ASSESSOR_PAGE = """
+<html><body>
+<div id="propertyDetails"><table>
+<tr><td>Neighborhood:</td><td>SUNNYLAND</td></tr>
+<tr><td>Legal Acres:</td><td>0.15</td></tr>
+</table></div>
+<div id="improvementBuildingDetails"><table>
+<tr><td>State Code:</td><td>11</td><td>1450 sqft</td></tr>
+<tr><td>Number of Bedrooms:</td><td>3</td></tr>
+<tr><td>Full Baths</td><td>2</td></tr>
+</table></div>
+<table class="improvementDetails"><tr><td>Year Built</td><td>1978</td></tr>
+</table>
+</body></html>
+"""
+
+
+class FakeBrowser:
+    """Serves the same assessor page for every property link."""
+
+    def __init__(self):
+        self.visited = []
+        self.page_source = ASSESSOR_PAGE
+
+    def get(self, url):
+        self.visited.append(url)
+
+
+@pytest.fixture
+def legacy(monkeypatch):
+    """The enrichment script, imported as the pipeline stage runs it."""
+    monkeypatch.syspath_prepend(str(SCRIPT_DIR))
+    return importlib.import_module('WhatcomCtyProperty_parallelScraper')
+
+
+@pytest.fixture
+def sales_file(tmp_path):
+    """Bellingham_Property_Part1.csv as the property_sales scraper saves it."""
+    config = ConfigManager(str(SCRIPT_DIR / 'config.yaml'), str(tmp_path))
+    scraper = PropertySalesScraper(
+        'property_sales', config.get_scraper_config('property_sales'),
+        project_root=str(tmp_path)
+    )
+    driver = Mock(page_source=SalesGridServer(total_sales=5)._page_html(1))
+
+    df = scraper.validate(scraper._scrape_page(driver, 1))
+    assert scraper.save_data(df) == 5
+    return scraper.get_output_path()
+
+
+class TestPropertyDetails:
+    """The enrichment script on the property_sales scraper output."""
+
+    def test_read_sales_keys_each_sale(self, legacy, sales_file):
+        df = legacy.read_sales(sales_file)
+
+        assert df['Unique ID'].iloc[0] == '01/01/2015_sep_Property.aspx?cid=1'
+        assert df['Unique ID'].is_unique
+
+    def test_enrich_writes_the_housing_input(self, legacy, sales_file,
+                                             monkeypatch):
+        monkeypatch.chdir(sales_file.parent)
+        browser = FakeBrowser()
+        legacy.enrich(
+            scrape=lambda uid: legacy.helper_functions.scrape_website(
+                uid, browser),
+            total_chunks=2
+        )
+
+        assert browser.visited[0] == (legacy.helper_functions.ASSESSOR_URL
+                                      + 'Property.aspx?cid=1')
+        combined = pd.read_csv(legacy.COMBINED_FILE)
+        assert list(combined.columns) == legacy.COMBINED_COLUMNS
+        assert len(combined) == 5
+        assert combined['Neighborhood_org'].eq('SUNNYLAND').all()
+
+        cleaned = clean_housing_df(combined, date_column='Sale Date_part1')
+        assert cleaned['Sale Price'].iloc[0] == 250000
+        assert cleaned['Built Sq ft_org'].eq(1450).all()
+        assert cleaned['year_built_org'].eq(1978).all()
+        assert cleaned['type'].eq('Residential').all()
+
+    def test_unscraped_sales_are_kept(self, legacy, sales_file):
+        df_part1 = legacy.read_sales(sales_file)
+        df_part2 = pd.DataFrame(columns=legacy.COLUMNS + ['Unique ID'])
+
+        combined = legacy.combine(df_part1, df_part2)
+
+        assert len(combined) == len(df_part1)
+        assert combined['Built Sq ft_org'].isna().all()
@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+from src.data.utils.store import AnalyticalStore
+
+
+class TestAnalyticalStore:
+    """Test the embedded analytical store."""
+
+    def _records(self):
+        return pd.DataFrame({
+            'case': ['C1', 'C2', None],
+            'Date': pd.to_datetime(['2020-01-05', '2020-04-10', '2020-05-01']),
+            'Location': ['1200 BLOCK STATE ST', '100 BLOCK MAIN ST', '100 BLOCK MAIN ST'],
+            'Crime Category': pd.Categorical(['Property', 'Violent', 'Other']),
+            'count': pd.array([1, 2, None], dtype='Int64'),
+        })
+
+    def test_upsert_replaces_by_key(self, tmp_path):
+        """Test that rows are updated on key conflict and rows without a key are skipped."""
+        with AnalyticalStore(tmp_path / 'store.sqlite') as store:
+            assert store.upsert('crime', self._records(), ['case'], ['Date']) == 2
+
+            update = pd.DataFrame({'case': ['C2', 'C3'], 'Location': ['X', 'Y'], 'extra': [1.5, 2.5]})
+            assert store.upsert('crime', update, ['case']) == 2
+
+            result = store.query('SELECT "case", Date, Location, extra FROM crime ORDER BY "case"')
+
+        assert result['case'].tolist() == ['C1', 'C2', 'C3']
+        assert result['Date'].tolist()[:2] == ['2020-01-05 00:00:00', '2020-04-10 00:00:00']
+        assert result['Location'].tolist() == ['1200 BLOCK STATE ST', 'X', 'Y']
+        assert result['extra'].isna().tolist() == [True, False, False]
+
+    def test_filters_use_indexes(self, tmp_path):
+        """Test that date and location slices are index lookups."""
+        with AnalyticalStore(tmp_path / 'store.sqlite') as store:
+            store.upsert('crime', self._records(), ['case'], ['Date', 'Location', 'Crime Category'])
+
+            plan = ' '.join(store.explain(
+                "SELECT * FROM crime WHERE Location = ? AND Date BETWEEN ? AND ?",
+                ['100 BLOCK MAIN ST', '2020-01-01', '2020-06-30']
+            ))
+            result = store.query(
+                "SELECT strftime('%Y', Date) AS year, COUNT(*) AS n FROM crime "
+                "WHERE \"Crime Category\" = ? GROUP BY year", ['Property']
+            )
+
+        assert 'USING INDEX' in plan
+        assert result.to_dict('records') == [{'year': '2020', 'n': 1}]
+
+    def test_composite_index(self, tmp_path):
+        """Test that a list entry creates one index over its columns."""
+        with AnalyticalStore(tmp_path / 'store.sqlite') as store:
+            store.upsert('crime', self._records(), ['case'], ['Date', ['Location', 'Date'], ['Location', 'missing']])
+
+            indexes = store.query("SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name")
+            plan = ' '.join(store.explain(
+                "SELECT * FROM crime WHERE Location = ? AND Date BETWEEN ? AND ?",
+                ['100 BLOCK MAIN ST', '2020-01-01', '2020-06-30']
+            ))
+
+        assert indexes['name'].tolist() == ['ix_crime_Date', 'ix_crime_Location_Date', 'ux_crime_key']
+        assert 'ix_crime_Location_Date' in plan
+
+    def test_read_only(self, tmp_path):
+        """Test that a read-only store can query but not write."""
+        path = tmp_path / 'store.sqlite'
+        with AnalyticalStore(path) as store:
+            store.upsert('crime', self._records(), ['case'])
+
+        with AnalyticalStore(path, read_only=True) as store:
+            assert len(store.query('SELECT * FROM crime')) == 2
+            with pytest.raises(Exception, match='readonly'):
+                store.query('DELETE FROM crime')
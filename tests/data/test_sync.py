@@ -0,0 +1,268 @@
+import os
+import pytest
+from src.data.utils.sync import (
+    MANIFEST_NAME, PARTIAL_SUFFIX, S3_MIN_PART_SIZE, DirectoryTarget, LocalIndex, S3Target,
+    hash_file, open_target, part_ranges, pull, push
+)
+
+
+PART = 1024
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    root = tmp_path / 'data'
+    write(root / '1_raw_dir' / 'crime.csv', os.urandom(5 * PART + 100))
+    write(root / '3_processed' / 'small.json', b'{"a": 1}')
+    return root
+
+
+class FlakyTarget(DirectoryTarget):
+    """Directory target whose upload of one part fails once."""
+
+    def __init__(self, root, fail_part):
+        super().__init__(root)
+        self.fail_part = fail_part
+        self.uploaded = []
+
+    def upload_part(self, key, upload_id, number, data):
+        if number == self.fail_part:
+            self.fail_part = None
+            raise ConnectionError('connection reset')
+        self.uploaded.append(number)
+        return super().upload_part(key, upload_id, number, data)
+
+
+class TestSyncHelpers:
+    """Test part ranges, hashing and the local index."""
+
+    def test_part_ranges(self):
+        """Test that parts cover the file exactly."""
+        assert part_ranges(0, 4) == [(0, 0)]
+        assert part_ranges(10, 4) == [(0, 4), (4, 8), (8, 10)]
+
+    def test_hash_file(self, tmp_path):
+        """Test whole-file and per-part hashes."""
+        write(tmp_path / 'f', b'abcdefghij')
+        entry = hash_file(tmp_path / 'f', 4)
+        assert entry['size'] == 10
+        assert len(entry['parts']) == 3
+
+    def test_local_index_excludes_bookkeeping(self, data_dir):
+        """Test that manifests, state and temporary files are not synced."""
+        write(data_dir / MANIFEST_NAME, b'{}')
+        write(data_dir / 'x.csv.tmp', b'')
+        write(data_dir / ('y.csv' + PARTIAL_SUFFIX), b'')
+        assert LocalIndex(data_dir).files() == ['1_raw_dir/crime.csv', '3_processed/small.json']
+
+    def test_local_index_caches_hashes(self, data_dir, monkeypatch):
+        """Test that unchanged files are not re-hashed."""
+        index = LocalIndex(data_dir)
+        index.scan(PART)
+        index.save()
+
+        monkeypatch.setattr('src.data.utils.sync.hash_file', lambda *a: pytest.fail('re-hashed'))
+        assert set(LocalIndex(data_dir).scan(PART)) == {'1_raw_dir/crime.csv', '3_processed/small.json'}
+
+    def test_open_target(self, tmp_path):
+        """Test that URLs select the target type."""
+        assert isinstance(open_target(str(tmp_path / 't')), DirectoryTarget)
+        assert isinstance(open_target(f'file://{tmp_path}/t'), DirectoryTarget)
+        with pytest.raises(ValueError):
+            open_target('s3://')
+
+
+class TestDirectorySync:
+    """Test push and pull against a directory target."""
+
+    def test_push_then_noop(self, data_dir, tmp_path):
+        """Test that a second push of unchanged data transfers nothing."""
+        target = DirectoryTarget(tmp_path / 'remote')
+        report = push(data_dir, target, part_size=PART)
+
+        assert report['transferred'] == ['1_raw_dir/crime.csv', '3_processed/small.json']
+        assert report['bytes_transferred'] == 5 * PART + 100 + 8
+        assert (tmp_path / 'remote' / '1_raw_dir' / 'crime.csv').read_bytes() == \
+            (data_dir / '1_raw_dir' / 'crime.csv').read_bytes()
+        assert not (tmp_path / 'remote' / '.sync-uploads').exists() or \
+            not any((tmp_path / 'remote' / '.sync-uploads').iterdir())
+
+        again = push(data_dir, target, part_size=PART)
+        assert again['transferred'] == []
+        assert again['unchanged'] == 2
+        assert again['bytes_transferred'] == 0
+
+    def test_append_sends_only_tail(self, data_dir, tmp_path):
+        """Test that unchanged parts are copied on the target, not sent."""
+        target = DirectoryTarget(tmp_path / 'remote')
+        push(data_dir, target, part_size=PART)
+
+        crime = data_dir / '1_raw_dir' / 'crime.csv'
+        with open(crime, 'ab') as f:
+            f.write(os.urandom(PART))
+        report = push(data_dir, target, part_size=PART)
+
+        assert report['transferred'] == ['1_raw_dir/crime.csv']
+        # The last part grew and one new part follows it
+        assert report['bytes_transferred'] == 100 + PART
+        assert report['bytes_reused'] == 5 * PART
+        assert (tmp_path / 'remote' / '1_raw_dir' / 'crime.csv').read_bytes() == crime.read_bytes()
+
+    def test_push_resumes_upload(self, data_dir, tmp_path):
+        """Test that a failed multipart upload resumes without resending stored parts."""
+        target = FlakyTarget(tmp_path / 'remote', fail_part=4)
+        report = push(data_dir, target, part_size=PART, jobs=1)
+        assert '1_raw_dir/crime.csv' in report['failed']
+        assert '1_raw_dir/crime.csv' not in target.read_manifest()['files']
+
+        target.uploaded.clear()
+        report = push(data_dir, target, part_size=PART, jobs=1)
+        assert report['transferred'] == ['1_raw_dir/crime.csv']
+        assert target.uploaded == [4]
+        assert (tmp_path / 'remote' / '1_raw_dir' / 'crime.csv').read_bytes() == \
+            (data_dir / '1_raw_dir' / 'crime.csv').read_bytes()
+
+    def test_pull(self, data_dir, tmp_path):
+        """Test that a pull reproduces the pushed files and then fetches only changed parts."""
+        target = DirectoryTarget(tmp_path / 'remote')
+        push(data_dir, target, part_size=PART)
+
+        copy = tmp_path / 'copy'
+        report = pull(copy, target)
+        assert sorted(report['transferred']) == ['1_raw_dir/crime.csv', '3_processed/small.json']
+        assert (copy / '1_raw_dir' / 'crime.csv').read_bytes() == (data_dir / '1_raw_dir' / 'crime.csv').read_bytes()
+
+        crime = data_dir / '1_raw_dir' / 'crime.csv'
+        data = bytearray(crime.read_bytes())
+        data[2 * PART:2 * PART + 10] = b'x' * 10
+        crime.write_bytes(bytes(data))
+        push(data_dir, target, part_size=PART)
+
+        report = pull(copy, target)
+        assert report['transferred'] == ['1_raw_dir/crime.csv']
+        assert report['bytes_transferred'] == PART
+        assert (copy / '1_raw_dir' / 'crime.csv').read_bytes() == bytes(data)
+        assert pull(copy, target)['transferred'] == []
+
+    def test_pull_resumes_partial(self, data_dir, tmp_path, monkeypatch):
+        """Test that a pull keeps the verified parts of an interrupted download."""
+        target = DirectoryTarget(tmp_path / 'remote')
+        push(data_dir, target, part_size=PART)
+
+        source = (data_dir / '1_raw_dir' / 'crime.csv').read_bytes()
+        partial = tmp_path / 'copy' / '1_raw_dir' / ('crime.csv' + PARTIAL_SUFFIX)
+        write(partial, source[:3 * PART] + b'\0' * (len(source) - 3 * PART))
+
+        report = pull(tmp_path / 'copy', target)
+        assert report['bytes_transferred'] == 2 * PART + 100 + 8
+        assert (tmp_path / 'copy' / '1_raw_dir' / 'crime.csv').read_bytes() == source
+        assert not partial.exists()
+
+    def test_pull_rejects_corrupt_part(self, data_dir, tmp_path):
+        """Test that parts not matching the manifest are not written."""
+        target = DirectoryTarget(tmp_path / 'remote')
+        push(data_dir, target, part_size=PART)
+        write(tmp_path / 'remote' / '3_processed' / 'small.json', b'{"a": 2}')
+
+        report = pull(tmp_path / 'copy', target)
+        assert '3_processed/small.json' in report['failed']
+        assert not (tmp_path / 'copy' / '3_processed' / 'small.json').exists()
+
+    def test_pull_without_manifest_fails(self, tmp_path):
+        """Test a target filled by another tool is not mistaken for an empty one."""
+        write(tmp_path / 'remote' / 'crime.csv', b'a,b\n')
+        with pytest.raises(FileNotFoundError, match=MANIFEST_NAME):
+            pull(tmp_path / 'copy', DirectoryTarget(tmp_path / 'remote'))
+
+    @pytest.mark.parametrize('key', ['../escape.csv', '/etc/escape.csv', 'a/../../escape.csv'])
+    def test_pull_rejects_paths_outside_root(self, data_dir, tmp_path, key):
+        """Test manifest paths cannot write outside the local root."""
+        target = DirectoryTarget(tmp_path / 'remote')
+        push(data_dir, target, part_size=PART)
+        manifest = target.read_manifest()
+        manifest['files'][key] = manifest['files']['3_processed/small.json']
+        target.write_manifest(manifest)
+
+        with pytest.raises(ValueError, match='Unsafe path'):
+            pull(tmp_path / 'copy' / 'data', target)
+        assert not (tmp_path / 'copy' / 'escape.csv').exists()
+
+    def test_changed_file_aborts_recorded_upload(self, data_dir, tmp_path):
+        """Test an interrupted upload of a since-changed file is aborted, not orphaned."""
+        target = FlakyTarget(tmp_path / 'remote', fail_part=4)
+        push(data_dir, target, part_size=PART, jobs=1)
+        uploads = tmp_path / 'remote' / '.sync-uploads'
+        assert len(list(uploads.iterdir())) == 1
+
+        (data_dir / '1_raw_dir' / 'crime.csv').write_bytes(os.urandom(3 * PART))
+        report = push(data_dir, target, part_size=PART, jobs=1)
+
+        assert report['transferred'] == ['1_raw_dir/crime.csv']
+        assert list(uploads.iterdir()) == []
+        assert LocalIndex(data_dir).state['uploads'] == {}
+
+    def test_delete_and_dry_run(self, data_dir, tmp_path):
+        """Test that deletions need --delete and dry runs change nothing."""
+        target = DirectoryTarget(tmp_path / 'remote')
+        push(data_dir, target, part_size=PART)
+        (data_dir / '3_processed' / 'small.json').unlink()
+
+        assert push(data_dir, target, part_size=PART)['deleted'] == []
+        plan = push(data_dir, target, part_size=PART, delete=True, dry_run=True)
+        assert plan['deleted'] == ['3_processed/small.json']
+        assert (tmp_path / 'remote' / '3_processed' / 'small.json').exists()
+
+        push(data_dir, target, part_size=PART, delete=True)
+        assert not (tmp_path / 'remote' / '3_processed' / 'small.json').exists()
+        assert '3_processed/small.json' not in target.read_manifest()['files']
+
+
+class TestS3Sync:
+    """Test push and pull against moto's in-memory S3."""
+
+    @pytest.fixture
+    def s3_target(self):
+        boto3 = pytest.importorskip('boto3')
+        moto = pytest.importorskip('moto')
+        with moto.mock_aws():
+            client = boto3.client('s3', region_name='us-east-1')
+            client.create_bucket(Bucket='bucket')
+            yield S3Target('bucket', 'data/', client=client)
+
+    def test_rejects_small_parts(self, s3_target, data_dir):
+        """Test that S3's minimum part size is enforced."""
+        with pytest.raises(ValueError):
+            push(data_dir, s3_target, part_size=PART)
+
+    def test_push_append_and_pull(self, s3_target, tmp_path):
+        """Test multipart upload, server-side part copies and ranged downloads."""
+        root = tmp_path / 'data'
+        crime = root / 'crime.csv'
+        write(crime, os.urandom(2 * S3_MIN_PART_SIZE + 1000))
+
+        report = push(root, s3_target, part_size=S3_MIN_PART_SIZE)
+        assert report['transferred'] == ['crime.csv']
+        assert s3_target.read_manifest()['files']['crime.csv']['sha256'] == hash_file(crime, S3_MIN_PART_SIZE)['sha256']
+
+        with open(crime, 'ab') as f:
+            f.write(b'tail')
+        report = push(root, s3_target, part_size=S3_MIN_PART_SIZE)
+        assert report['bytes_transferred'] == 1004
+        assert report['bytes_reused'] == 2 * S3_MIN_PART_SIZE
+
+        upload_id = s3_target.start_upload('crime.csv')
+        s3_target.abort_upload('crime.csv', upload_id)
+        assert s3_target.list_parts('crime.csv', upload_id) is None
+        s3_target.abort_upload('crime.csv', upload_id)
+
+        body = s3_target.client.get_object(Bucket='bucket', Key='data/crime.csv')['Body'].read()
+        assert body == crime.read_bytes()
+
+        report = pull(tmp_path / 'copy', s3_target)
+        assert report['transferred'] == ['crime.csv']
+        assert (tmp_path / 'copy' / 'crime.csv').read_bytes() == crime.read_bytes()
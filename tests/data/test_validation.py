@@ -0,0 +1,109 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.data.utils.validation import format_dates, validate_frame, REJECT_REASON_COLUMN
+
+
+class TestValidation:
+    """Test schema validation and type coercion."""
+
+    @pytest.fixture
+    def schema(self):
+        """Provide a property sales style schema."""
+        return {
+            'dedupe': True,
+            'columns': {
+                'Sale Date': {'type': 'date', 'format': '%m/%d/%Y', 'required': True},
+                'Sale Price': {'type': 'currency'},
+                'Built Sq ft': {'type': 'measure'},
+                'Bedrooms': 'integer',
+                'Neighborhood': {'type': 'category'},
+            }
+        }
+
+    def test_coerces_types(self, schema):
+        """Test that columns are converted to real dtypes."""
+        df = pd.DataFrame({
+            'Sale Date': ['3/14/2021', '12/01/2020'],
+            'Sale Price': ['$425,000', '$1,250,500.50'],
+            'Built Sq ft': ['1,850 sqft', '960sqft'],
+            'Bedrooms': ['3', '2'],
+            'Neighborhood': ['Fairhaven', 'Sehome'],
+            'Other': ['x', 'y'],
+        })
+
+        valid, rejected = validate_frame(df, schema)
+
+        assert rejected.empty
+        assert valid['Sale Date'].tolist() == [pd.Timestamp('2021-03-14'), pd.Timestamp('2020-12-01')]
+        assert valid['Sale Price'].tolist() == [425000.0, 1250500.5]
+        assert valid['Built Sq ft'].tolist() == [1850.0, 960.0]
+        assert str(valid['Bedrooms'].dtype) == 'Int64'
+        assert isinstance(valid['Neighborhood'].dtype, pd.CategoricalDtype)
+        assert valid['Other'].tolist() == ['x', 'y']
+
+    def test_routes_invalid_rows_with_reasons(self, schema):
+        """Test that invalid and missing values are rejected with reasons."""
+        df = pd.DataFrame({
+            'Sale Date': ['3/14/2021', 'yesterday', ''],
+            'Sale Price': ['$1', 'call', '$5'],
+            'Bedrooms': ['1', '2', '2.5'],
+        })
+
+        valid, rejected = validate_frame(df, schema)
+
+        assert len(valid) == 1
+        assert rejected[REJECT_REASON_COLUMN].tolist() == [
+            'Sale Date: invalid date; Sale Price: invalid currency',
+            'Sale Date: missing; Bedrooms: invalid integer',
+        ]
+        # Rejected rows keep their raw values
+        assert rejected['Sale Date'].tolist() == ['yesterday', '']
+
+    def test_drops_exact_duplicates(self, schema):
+        """Test that exact duplicates are dropped after coercion."""
+        df = pd.DataFrame({
+            'Sale Date': ['3/14/2021', '03/14/2021', '3/15/2021'],
+            'Sale Price': ['$100', '$100', '$100'],
+        })
+
+        valid, rejected = validate_frame(df, schema)
+
+        assert len(valid) == 2
+        assert rejected.empty
+
+    def test_dates_accept_iso_and_format_back(self, schema):
+        """Test that ISO dates are read despite a format and written back in the format."""
+        df = pd.DataFrame({'Sale Date': ['3/14/2021', '2020-12-01'], 'Sale Price': ['1', '2']})
+        valid, rejected = validate_frame(df, schema)
+
+        assert rejected.empty
+        assert format_dates(valid, schema)['Sale Date'].tolist() == ['03/14/2021', '12/01/2020']
+
+    def test_dates_keep_millisecond_fraction(self):
+        """Test that fraction_digits writes %f as milliseconds, like the source."""
+        schema = {'columns': {'Reported': {'type': 'date', 'format': '%Y-%m-%dT%H:%M:%S.%f', 'fraction_digits': 3}}}
+        raw = ['2021-03-14T10:30:00.000', '2021-03-14T10:30:05.250', None]
+        valid, rejected = validate_frame(pd.DataFrame({'Reported': raw}), schema)
+
+        assert rejected.empty
+        assert format_dates(valid, schema)['Reported'].tolist()[:2] == raw[:2]
+        assert pd.isna(format_dates(valid, schema)['Reported'].iloc[2])
+
+    def test_unknown_type_raises(self):
+        """Test that an unknown schema type is an error."""
+        with pytest.raises(ValueError):
+            validate_frame(pd.DataFrame({'a': ['1']}), {'columns': {'a': 'money'}})
+
+    def test_large_frame(self, schema):
+        """Test that a large frame validates in column passes."""
+        n = 200000
+        df = pd.DataFrame({
+            'Sale Date': np.where(np.arange(n) % 1000 == 0, 'bad', '1/02/2020'),
+            'Sale Price': '$' + pd.Series(np.arange(n)).astype(str),
+        })
+
+        valid, rejected = validate_frame(df, schema)
+
+        assert len(rejected) == n // 1000
+        assert len(valid) == n - n // 1000
@@ -0,0 +1,64 @@
+import pandas as pd
+from unittest.mock import Mock
+from src.features.address import (
+    AddressCache, normalize_crime_locations, normalize_sale_addresses, parse_sale_addresses
+)
+
+
+class TestAddress:
+    """Test address normalization and block keys."""
+
+    def test_sale_address_keys(self):
+        """Test the keys the housing-crime join depends on."""
+        addresses = pd.Series(['1234  STATE ST #5\nBELLINGHAM', 'NO NUMBER RD', '1234 STATE ST #5'], index=[5, 6, 7])
+
+        df = normalize_sale_addresses(addresses)
+
+        assert list(df.index) == [5, 6, 7]
+        assert df['Address'].tolist() == ['1234 STATE ST #5', 'NO NUMBER RD', '1234 STATE ST #5']
+        assert df['StreetBLK'].tolist() == [1200, 0, 1200]
+        assert df['StreetName'].tolist() == ['STATE ST ', 'NO NUMBER RD', 'STATE ST ']
+        assert df['Address Block'].tolist() == ['1200 STATE ST ', '0 NO NUMBER RD', '1200 STATE ST ']
+        assert df['ShortAddress'].tolist() == ['1234 STATE ST ', '0 NO NUMBER RD', '1234 STATE ST ']
+
+    def test_crime_location_keys(self):
+        """Test block marker removal and block number parsing."""
+        df = normalize_crime_locations(pd.Series(['1200  BLK STATE ST', 'UNKNOWN', '1200 BLK STATE ST']))
+
+        assert df['Location'].tolist() == ['1200 STATE ST', 'UNKNOWN', '1200 STATE ST']
+        assert df['StreetBLK'].tolist()[0] == 1200
+        assert pd.isna(df['StreetBLK'][1])
+        assert df['StreetName'].tolist() == ['STATE ST', '', 'STATE ST']
+
+    def test_each_distinct_address_parsed_once(self, monkeypatch):
+        """Test dedupe-then-map."""
+        parser = Mock(side_effect=parse_sale_addresses)
+        monkeypatch.setattr('src.features.address.parse_sale_addresses', parser)
+
+        df = normalize_sale_addresses(pd.Series(['1 A ST', '2 B ST', '1 A ST'] * 1000))
+
+        assert len(df) == 3000
+        assert parser.call_count == 1
+        assert parser.call_args[0][0].tolist() == ['1 A ST', '2 B ST']
+
+    def test_cache_roundtrip(self, tmp_path):
+        """Test that a second run reads parsed results from the cache."""
+        addresses = pd.Series(['1234 STATE ST', '55 MAIN ST', '1234 STATE ST'])
+        crime = pd.Series(['1200 BLK STATE ST', 'UNKNOWN'])
+
+        with AddressCache(tmp_path / 'addresses.sqlite') as cache:
+            first = normalize_sale_addresses(addresses, cache=cache)
+            first_crime = normalize_crime_locations(crime, cache=cache)
+
+        parser = Mock(side_effect=parse_sale_addresses)
+        with AddressCache(tmp_path / 'addresses.sqlite') as cache:
+            second = normalize_sale_addresses(pd.concat([addresses, pd.Series(['9 NEW RD'])], ignore_index=True),
+                                              cache=cache)
+            cached = cache.parse('sale', pd.Series(['1234 STATE ST', '9 NEW RD']), parser)
+            second_crime = normalize_crime_locations(crime, cache=cache)
+
+        pd.testing.assert_frame_equal(second.iloc[:3], first)
+        assert second['ShortAddress'].tolist()[3] == '9 NEW RD'
+        assert parser.call_count == 1 and len(parser.call_args[0][0]) == 0
+        assert cached['Streetnumber'].tolist() == [1234, 9]
+        pd.testing.assert_frame_equal(second_crime, first_crime)
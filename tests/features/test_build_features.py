@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.features.build_features import CrimeWindowIndex, add_crime_window_features, month_ordinal
+
+
+def notebook_merge(housing_df, crime_df, months_to_integrate):
+    """merge_housingAndCrime_df from notebooks/HousingData_EDA.ipynb, without tqdm."""
+    for col in [str(months_to_integrate) + 'M_' + s for s in crime_df['Crime Category'].value_counts().index.tolist()]:
+        housing_df[col] = 0
+
+    housing_df[str(months_to_integrate) + 'M_TotalCrime'] = 0
+
+    for index, row in housing_df.iterrows():
+        all_crime_df = crime_df[crime_df.Location == row['Address Block']]
+        if len(all_crime_df) > 0:
+            begin = row['Month'] - months_to_integrate
+            end = row['Month']
+            crime_df_windowed = all_crime_df[((all_crime_df['Month'] > begin) & (all_crime_df['Month'] < end))]
+            crime_df_agg = crime_df_windowed.groupby(['Crime Category'])['Case'].count().reset_index()
+            crime_df_agg['Crime Category'] = str(months_to_integrate) + 'M_' + crime_df_agg['Crime Category'].astype(str)
+            housing_df.loc[index, str(months_to_integrate) + 'M_TotalCrime'] = crime_df_agg.Case.values.sum()
+            dictionary = dict(zip(crime_df_agg['Crime Category'].values.tolist(), crime_df_agg['Case'].values.tolist()))
+            for k, v in dictionary.items():
+                housing_df.loc[index, k] = v
+    return housing_df
+
+
+@pytest.fixture
+def sample_data():
+    """Random sales and crimes over a handful of blocks and a few years."""
+    rng = np.random.default_rng(7)
+    blocks = [f'{100 * i} STATE ST' for i in range(1, 9)]
+    months = pd.period_range('2016-01', '2019-12', freq='M')
+
+    crime = pd.DataFrame({
+        'Location': rng.choice(blocks, 3000),
+        'Month': months[rng.integers(0, len(months), 3000)],
+        'Crime Category': rng.choice(['Property', 'Violent', 'Drug', 'Traffic', 'Other'], 3000,
+                                     p=[0.4, 0.2, 0.15, 0.15, 0.1]),
+        'Case': np.where(rng.random(3000) < 0.9, 'C', None),
+    })
+    housing = pd.DataFrame({
+        'Address Block': rng.choice(blocks + ['9999 NOWHERE RD'], 300),
+        'Month': months[rng.integers(0, len(months), 300)],
+        'Sale Price': rng.integers(100000, 900000, 300),
+    })
+    return housing, crime
+
+
+class TestCrimeWindowFeatures:
+    """Test the vectorized housing-crime window join."""
+
+    @pytest.mark.parametrize('months', [1, 3, 6, 12])
+    def test_matches_notebook(self, sample_data, months):
+        """Test equivalence with the notebook's per-sale loop."""
+        housing, crime = sample_data
+
+        expected = notebook_merge(housing.copy(), crime, months)
+        result = add_crime_window_features(housing, crime, windows=[months], case_column='Case')
+
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_several_windows_in_one_pass(self, sample_data):
+        """Test that each window gets its own category and total columns."""
+        housing, crime = sample_data
+
+        result = add_crime_window_features(housing, crime, windows=[3, 12])
+
+        assert {'3M_Property', '3M_TotalCrime', '12M_Property', '12M_TotalCrime'} <= set(result.columns)
+        assert (result['12M_TotalCrime'] >= result['3M_TotalCrime']).all()
+        assert 'Property' not in housing.columns and '3M_Property' not in housing.columns
+
+    def test_window_bounds_are_exclusive(self):
+        """Test that crimes in the sale month and at month - N are not counted."""
+        crime = pd.DataFrame({
+            'Location': ['A'] * 4,
+            'Month': pd.to_datetime(['2020-01-15', '2020-02-01', '2020-03-31', '2020-04-02']),
+            'Crime Category': ['Property'] * 4,
+        })
+        index = CrimeWindowIndex(crime)
+
+        counts = index.window_counts(['A', 'A', 'B'], pd.Series(['2020-04-10', '2020-03-01', '2020-04-10']), 3)
+
+        assert counts[:, 0].tolist() == [2, 2, 0]
+        with pytest.raises(ValueError):
+            index.window_counts(['A'], pd.Series(['2020-04-10']), 0)
+
+    def test_month_ordinal(self):
+        """Test month numbering of periods, dates and missing values."""
+        values = month_ordinal(pd.Series(['2020-01-31', None]))
+        periods = month_ordinal(pd.Series(pd.period_range('2020-01', periods=1, freq='M')))
+
+        assert values[0] == periods[0] == 2020 * 12
+        assert np.isnan(values[1])
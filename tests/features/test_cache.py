@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.features.build_features import add_crime_window_features
+from src.features.cache import (
+    HIT, INCREMENTAL, MISS, FeatureCache, build_cached_features, file_fingerprint, is_append, stage_key
+)
+from src.features.cleaning import clean_crime_df, clean_housing_df
+from tests.features.test_cleaning import synthetic_sales
+
+
+BLOCKS = ['1200 STATE ST', '2300 MAIN ST', '100 N FOREST ST', '3400 ELLIS AVE']
+
+
+def synthetic_crimes(n, seed=0):
+    """Raw crimes shaped like the Bellingham scraper output."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Date': pd.Series(pd.date_range('2014-06-01', periods=2200, freq='D').strftime('%m/%d/%Y'))
+                .sample(n, replace=True, random_state=seed).to_numpy(),
+        'Location': [f'{b.split(" ", 1)[0]} BLK {b.split(" ", 1)[1]}' for b in rng.choice(BLOCKS, n)],
+        'Crime Category': rng.choice(['Property', 'Violent', 'Drug'], n, p=[0.6, 0.3, 0.1]),
+    })
+
+
+def statuses(cache):
+    return {entry['stage']: entry['status'] for entry in cache.report}
+
+
+def full_build(housing_path, crime_path, windows=(6,)):
+    """Uncached reference pipeline."""
+    crime = clean_crime_df(pd.read_csv(crime_path))
+    housing = clean_housing_df(pd.read_csv(housing_path))
+    return add_crime_window_features(housing, crime, windows=windows)
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    housing = synthetic_sales(2000, seed=1)
+    crime = synthetic_crimes(5000, seed=2)
+    housing_path, crime_path = tmp_path / 'housing.csv', tmp_path / 'crime.csv'
+    housing.to_csv(housing_path, index=False)
+    crime.to_csv(crime_path, index=False)
+    return housing_path, crime_path
+
+
+def append_csv(path, df):
+    df.to_csv(path, mode='a', header=False, index=False)
+
+
+class TestFingerprint:
+    """Test file hashing and append detection."""
+
+    def test_prefix_hash_detects_append(self, tmp_path):
+        """Test an appended file keeps the earlier content as its prefix."""
+        path = tmp_path / 'data.csv'
+        path.write_bytes(b'a,b\n1,2\n')
+        before = file_fingerprint(path)
+
+        path.write_bytes(b'a,b\n1,2\n3,4\n')
+        after = file_fingerprint(path, prefix_size=before['size'])
+        assert after['sha256'] != before['sha256']
+        assert is_append(after, before)
+
+        path.write_bytes(b'a,b\n9,2\n3,4\n')
+        assert not is_append(file_fingerprint(path, prefix_size=before['size']), before)
+
+        path.write_bytes(b'a,b\n')
+        assert not is_append(file_fingerprint(path, prefix_size=before['size']), before)
+
+    def test_stage_key_depends_on_params(self):
+        """Test the key changes with inputs and parameters."""
+        base = stage_key('crime_join', {'crime': 'x'}, {'windows': [6]})
+        assert base == stage_key('crime_join', {'crime': 'x'}, {'windows': [6]})
+        assert base != stage_key('crime_join', {'crime': 'x'}, {'windows': [12]})
+        assert base != stage_key('crime_join', {'crime': 'y'}, {'windows': [6]})
+
+
+class TestBuildCachedFeatures:
+    """Test cache hits and incremental recompute of the feature stages."""
+
+    def test_second_run_hits_every_stage(self, inputs, tmp_path):
+        """Test unchanged inputs load every stage from the cache."""
+        housing_path, crime_path = inputs
+        first = build_cached_features(housing_path, crime_path, FeatureCache(tmp_path / 'cache'))
+
+        cache = FeatureCache(tmp_path / 'cache')
+        second = build_cached_features(housing_path, crime_path, cache)
+
+        assert statuses(cache) == {'crime_clean': HIT, 'housing_clean': HIT, 'crime_join': HIT,
+                                   'design_matrix': HIT}
+        assert all(entry['computed'] == 0 for entry in cache.report)
+        pd.testing.assert_frame_equal(second, first, check_dtype=False)
+        assert isinstance(second['Res'].dtype, pd.SparseDtype)
+
+    def test_matches_uncached_pipeline(self, inputs, tmp_path):
+        """Test the cached build equals running the stages directly."""
+        housing_path, crime_path = inputs
+        cache = FeatureCache(tmp_path / 'cache')
+        result = build_cached_features(housing_path, crime_path, cache, windows=(3, 6))
+
+        assert statuses(cache) == {'crime_clean': MISS, 'housing_clean': MISS, 'crime_join': MISS,
+                                   'design_matrix': MISS}
+        expected = full_build(housing_path, crime_path, windows=(3, 6))
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_window_change_reruns_join_only(self, inputs, tmp_path):
+        """Test months to integrate is part of the join key only."""
+        housing_path, crime_path = inputs
+        build_cached_features(housing_path, crime_path, FeatureCache(tmp_path / 'cache'), windows=(6,))
+
+        cache = FeatureCache(tmp_path / 'cache')
+        result = build_cached_features(housing_path, crime_path, cache, windows=(12,))
+
+        assert statuses(cache) == {'crime_clean': HIT, 'housing_clean': HIT, 'crime_join': MISS,
+                                   'design_matrix': MISS}
+        assert '12M_TotalCrime' in result.columns and '6M_TotalCrime' not in result.columns
+
+    def test_appended_crimes_recompute_affected_sales(self, inputs, tmp_path):
+        """Test a new month of crimes recounts only sales on its blocks and months."""
+        housing_path, crime_path = inputs
+        build_cached_features(housing_path, crime_path, FeatureCache(tmp_path / 'cache'))
+
+        new = synthetic_crimes(50, seed=3)
+        new['Date'] = '03/15/2017'
+        new['Location'] = '1200 BLK STATE ST'
+        append_csv(crime_path, new)
+
+        cache = FeatureCache(tmp_path / 'cache')
+        result = build_cached_features(housing_path, crime_path, cache)
+
+        assert statuses(cache) == {'crime_clean': INCREMENTAL, 'housing_clean': HIT, 'crime_join': INCREMENTAL,
+                                   'design_matrix': MISS}
+        report = {entry['stage']: entry for entry in cache.report}
+        assert report['crime_clean']['computed'] == 50
+        assert 0 < report['crime_join']['computed'] < len(result) / 4
+        pd.testing.assert_frame_equal(result, full_build(housing_path, crime_path), check_dtype=False)
+
+    def test_crimes_edited_in_place_recount_every_sale(self, inputs, tmp_path):
+        """Test crimes rewritten with the same row count are not treated as an append by the join."""
+        housing_path, crime_path = inputs
+        build_cached_features(housing_path, crime_path, FeatureCache(tmp_path / 'cache'))
+
+        crime = pd.read_csv(crime_path)
+        crime['Location'] = crime['Location'].sample(frac=1, random_state=7).to_numpy()
+        crime.to_csv(crime_path, index=False)
+
+        cache = FeatureCache(tmp_path / 'cache')
+        result = build_cached_features(housing_path, crime_path, cache)
+
+        assert statuses(cache)['crime_clean'] == MISS
+        assert statuses(cache)['crime_join'] == MISS
+        pd.testing.assert_frame_equal(result, full_build(housing_path, crime_path), check_dtype=False)
+
+    def test_appended_sales_recompute_new_and_repeat_sales(self, inputs, tmp_path):
+        """Test new sales are cleaned with the earlier sales they are averaged with."""
+        housing_path, crime_path = inputs
+        build_cached_features(housing_path, crime_path, FeatureCache(tmp_path / 'cache'))
+
+        existing = pd.read_csv(housing_path)
+        new = synthetic_sales(100, seed=4)
+        # A repeat sale of an existing property on the same day
+        new.loc[0, ['Address', 'Sale Date_part1']] = existing.loc[5, ['Address', 'Sale Date_part1']].to_numpy()
+        append_csv(housing_path, new)
+
+        cache = FeatureCache(tmp_path / 'cache')
+        result = build_cached_features(housing_path, crime_path, cache)
+
+        assert statuses(cache) == {'crime_clean': HIT, 'housing_clean': INCREMENTAL, 'crime_join': INCREMENTAL,
+                                   'design_matrix': MISS}
+        report = {entry['stage']: entry for entry in cache.report}
+        assert 100 < report['housing_clean']['computed'] < 200
+        assert report['crime_join']['computed'] < 200
+        pd.testing.assert_frame_equal(result, full_build(housing_path, crime_path), check_dtype=False)
+
+    def test_new_neighborhood_word_rebuilds_housing(self, inputs, tmp_path):
+        """Test a vocabulary change falls back to a full rebuild."""
+        housing_path, crime_path = inputs
+        build_cached_features(housing_path, crime_path, FeatureCache(tmp_path / 'cache'))
+
+        new = synthetic_sales(10, seed=5)
+        new['Neighborhood_org'] = 'Edgemoor'
+        append_csv(housing_path, new)
+
+        cache = FeatureCache(tmp_path / 'cache')
+        result = build_cached_features(housing_path, crime_path, cache)
+
+        assert statuses(cache)['housing_clean'] == MISS
+        assert 'Edgemoor' in result.columns
+
+    def test_rewritten_input_is_a_miss(self, inputs, tmp_path):
+        """Test an edited (not appended) input recomputes from scratch."""
+        housing_path, crime_path = inputs
+        build_cached_features(housing_path, crime_path, FeatureCache(tmp_path / 'cache'))
+
+        crime = pd.read_csv(crime_path).iloc[100:]
+        crime.to_csv(crime_path, index=False)
+
+        cache = FeatureCache(tmp_path / 'cache')
+        result = build_cached_features(housing_path, crime_path, cache)
+
+        assert statuses(cache)['crime_clean'] == MISS
+        assert cache.format_report().splitlines()[0].startswith('crime_clean    miss')
+        pd.testing.assert_frame_equal(result, full_build(housing_path, crime_path), check_dtype=False)
@@ -0,0 +1,99 @@
+import time
+import numpy as np
+import pandas as pd
+from src.features.cleaning import address_key, clean_crime_df, clean_housing_df
+
+
+# Wall-clock budget for cleaning the synthetic 100k-sale set
+CLEAN_100K_BUDGET_SECONDS = 20.0
+
+
+def synthetic_sales(n, seed=0):
+    """Raw sales shaped like the property scraper output."""
+    rng = np.random.default_rng(seed)
+    numbers = rng.integers(1, 4000, n)
+    streets = rng.choice(['STATE ST', 'MAIN ST', 'N FOREST ST', 'ELLIS AVE'], n)
+    units = np.where(rng.random(n) < 0.1, ' #2', '')
+    return pd.DataFrame({
+        'Unique ID': np.arange(n),
+        'assesors_link_part1': 'link',
+        'Address': [f'{a}  {s}{u}\nBELLINGHAM WA' for a, s, u in zip(numbers, streets, units)],
+        'Sale Price': [f'${p:,}' for p in rng.integers(100, 900, n) * 1000],
+        'Built Sq ft_org': [f'{s} sqft' for s in rng.integers(600, 3500, n)],
+        'year_built_org': rng.choice(['0', '1950', '1999', '2010'], n).astype(object),
+        'Neighborhood_org': rng.choice(['Fairhaven-Res', 'Sunnyland Res', 'York'], n),
+        'Sale Date_part1': pd.Series(pd.date_range('2015-01-01', periods=2000, freq='D').strftime('%m/%d/%Y'))
+                           .sample(n, replace=True, random_state=seed).to_numpy(),
+    })
+
+
+class TestHousingCleaning:
+    """Test vectorized housing and crime cleaning."""
+
+    def test_clean_housing_fields(self):
+        """Test parsed values and derived address columns."""
+        raw = pd.DataFrame({
+            'Unique ID': [1, 2],
+            'assesors_link_part1': ['a', 'b'],
+            'Address': ['1234  STATE ST #5\nBELLINGHAM', 'NO NUMBER RD'],
+            'Sale Price': ['$425,000', '$1,000'],
+            'Built Sq ft_org': ['1850 sqft', '0 sqft'],
+            'year_built_org': ['1999', '0'],
+            'Neighborhood_org': ['Fairhaven-Res', 'York'],
+            'Sale Date_part1': ['01/15/2020', '02/01/2020'],
+        })
+
+        df = clean_housing_df(raw)
+
+        assert 'Unique ID' not in df.columns
+        assert df['type'].tolist() == ['Residential', 'Land']
+        assert df['Sale Price'].tolist() == [425000.0, 1000.0]
+        assert df['Built Sq ft_org'].tolist() == [1850.0, 0.0]
+        assert df['Address'].tolist() == ['1234 STATE ST #5', 'NO NUMBER RD']
+        assert df['StreetBLK'].tolist() == [1200, 0]
+        assert df['Address Block'].tolist() == ['1200 STATE ST ', '0 NO NUMBER RD']
+        assert df['ShortAddress'].tolist() == ['1234 STATE ST ', '0 NO NUMBER RD']
+        assert df[['Fairhaven', 'Res', 'York']].sparse.to_dense().values.tolist() == [[1, 1, 0], [0, 0, 1]]
+        assert str(df['Month'][0]) == '2020-01'
+
+    def test_repeat_sales_use_exact_address(self):
+        """Test that same-day sales of one address are averaged and similar addresses are not merged."""
+        raw = pd.DataFrame({
+            'Address': ['12 MAIN ST', '12  main st', '112 MAIN ST', '12 MAIN ST'],
+            'Sale Price': ['$100,000', '$200,000', '$900,000', '$400,000'],
+            'Built Sq ft_org': ['1000 sqft'] * 4,
+            'year_built_org': ['1990'] * 4,
+            'Sale Date_part1': ['01/15/2020', '01/15/2020', '01/15/2020', '03/01/2020'],
+        })
+
+        df = clean_housing_df(raw)
+        collapsed = clean_housing_df(raw, collapse_repeat_sales=True)
+
+        assert df['Sale Price'].tolist() == [150000.0, 150000.0, 900000.0, 400000.0]
+        assert collapsed['Sale Price'].tolist() == [150000.0, 900000.0, 400000.0]
+
+    def test_clean_crime_df(self):
+        """Test crime month and location split."""
+        raw = pd.DataFrame({'Date': ['01/15/2020'], 'Location': ['1200  BLK STATE ST']})
+
+        df = clean_crime_df(raw)
+
+        assert df['Location'].tolist() == ['1200 STATE ST']
+        assert df['StreetBLK'].tolist() == [1200]
+        assert df['StreetName'].tolist() == ['STATE ST']
+        assert str(df['Month'][0]) == '2020-01'
+
+    def test_address_key(self):
+        """Test address key normalization."""
+        assert address_key(pd.Series([' 12  Main st '])).tolist() == ['12 MAIN ST']
+
+    def test_100k_sales_benchmark(self):
+        """Test that cleaning 100k sales stays within the time budget."""
+        raw = synthetic_sales(100000)
+
+        started = time.perf_counter()
+        df = clean_housing_df(raw)
+        elapsed = time.perf_counter() - started
+
+        assert len(df) == 100000
+        assert elapsed < CLEAN_100K_BUDGET_SECONDS, f"cleaning 100k sales took {elapsed:.1f}s"
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.features.crime_cube import CrimeCube
+
+
+@pytest.fixture
+def crimes():
+    """Raw Bellingham-style crimes over several years."""
+    rng = np.random.default_rng(11)
+    n = 5000
+    blocks = [f'{100 * i} BLK STATE ST' for i in range(1, 30)]
+    return pd.DataFrame({
+        'Date': pd.date_range('2015-01-01', periods=2200, freq='D').strftime('%m/%d/%Y')[rng.integers(0, 2200, n)],
+        'Location': rng.choice(blocks, n),
+        'Crime Category': rng.choice(['Property', 'Violent', 'Drug', 'Other'], n, p=[0.5, 0.2, 0.2, 0.1]),
+        'Case': 'C',
+    })
+
+
+def with_periods(df, freq):
+    """The notebook's cleaned frame: locations without 'BLK ' and a period column."""
+    df = df.copy()
+    df['Location'] = df['Location'].str.replace('BLK ', '', regex=False)
+    df['Period'] = pd.to_datetime(df['Date']).dt.to_period(freq)
+    return df
+
+
+class TestCrimeCube:
+    """Test the materialized crime cube."""
+
+    def test_rollups_match_groupby(self, crimes):
+        """Test quarter and year roll-ups equal grouping the raw records."""
+        cube = CrimeCube.from_records(crimes)
+        assert cube.total == len(crimes)
+
+        for level, freq in (('quarter', 'Q'), ('year', 'Y'), ('month', 'M')):
+            expected = with_periods(crimes, freq).groupby(['Period', 'Crime Category'])['Case'].count()
+            rolled = cube.rollup(level, by='category').stack()
+            pd.testing.assert_series_equal(
+                rolled[rolled > 0].sort_index(), expected.sort_index(), check_names=False, check_index_type=False
+            )
+
+    def test_top_blocks_match_nlargest(self, crimes):
+        """Test top-N (period, block) pairs equal the EDA's nlargest and nsmallest."""
+        cube = CrimeCube.from_records(crimes)
+        grouped = with_periods(crimes, 'Q').groupby(['Period', 'Location'])['Case'].count()
+
+        largest = cube.top(5, 'quarter', by='block')
+        assert largest.tolist() == grouped.nlargest(5).tolist()
+        for (period, block), count in largest.items():
+            assert grouped[(period, block)] == count
+
+        assert cube.top(5, 'quarter', by='block', smallest=True).tolist() == grouped.nsmallest(5).tolist()
+
+    def test_incremental_add_equals_full_build(self, crimes):
+        """Test adding months one batch at a time, in any order, equals one build."""
+        months = pd.to_datetime(crimes['Date']).dt.to_period('M')
+        cube = CrimeCube()
+        for month in np.random.default_rng(0).permutation(months.unique()):
+            cube.add(crimes[months == month])
+
+        full = CrimeCube.from_records(crimes)
+        for by in ('category', 'block'):
+            pd.testing.assert_frame_equal(
+                cube.rollup('month', by=by).sort_index(axis=1), full.rollup('month', by=by).sort_index(axis=1)
+            )
+
+    def test_filters_and_missing_values(self):
+        """Test block and category filters and that incomplete records are skipped."""
+        cube = CrimeCube.from_records(pd.DataFrame({
+            'Date': ['01/15/2020', '04/01/2020', None, '05/01/2020'],
+            'Location': ['1200 BLK STATE ST', '1200 BLK STATE ST', '100 BLK MAIN ST', None],
+            'Crime Category': ['Property', 'Violent', 'Property', 'Property'],
+        }))
+
+        assert cube.total == 2
+        table = cube.rollup('quarter', by='category', categories=['Violent', 'Unknown'])
+        assert list(table.columns) == ['Violent']
+        assert table['Violent'].tolist() == [0, 1]
+        assert cube.rollup('year', by='block', blocks=['1200 STATE ST'])['1200 STATE ST'].tolist() == [2]
+
+        with pytest.raises(ValueError):
+            cube.rollup('week')
+
+    def test_save_load_round_trip(self, crimes, tmp_path):
+        """Test a persisted cube answers the same queries."""
+        cube = CrimeCube.from_records(crimes)
+        loaded = CrimeCube.load(cube.save(tmp_path / 'cube.npz'))
+
+        assert loaded.first_month == cube.first_month
+        assert loaded.blocks == cube.blocks and loaded.categories == cube.categories
+        pd.testing.assert_series_equal(loaded.top(10), cube.top(10))
+
+        loaded.add(crimes.head(10))
+        assert loaded.total == cube.total + 10
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from scipy import sparse
+from src.features.encoding import NeighborhoodEncoder, tokenize
+
+
+class TestNeighborhoodEncoder:
+    """Test sparse one-hot encoding of neighborhood tokens."""
+
+    def test_tokenize(self):
+        """Test splitting on spaces and hyphens."""
+        assert tokenize('Fairhaven-Res  Res') == ['Fairhaven', 'Res']
+        assert tokenize(None) == []
+
+    def test_fit_transform(self):
+        """Test the vocabulary and indicator matrix."""
+        values = pd.Series(['Fairhaven-Res', 'York', None, 'Resort Fairhaven', 'York'])
+        encoder = NeighborhoodEncoder()
+
+        matrix = encoder.fit_transform(values)
+
+        assert sparse.isspmatrix_csr(matrix)
+        assert encoder.vocabulary == ['Fairhaven', 'Res', 'Resort', 'York']
+        assert matrix.toarray().tolist() == [
+            [1, 1, 0, 0],
+            [0, 0, 0, 1],
+            [0, 0, 0, 0],
+            [1, 0, 1, 0],
+            [0, 0, 0, 1],
+        ]
+
+    def test_saved_vocabulary_reproduces_columns(self, tmp_path):
+        """Test that a reloaded encoder gives training's columns and ignores unseen tokens."""
+        encoder = NeighborhoodEncoder().fit(pd.Series(['York', 'Fairhaven-Res']))
+        path = encoder.save(tmp_path / 'features' / 'neighborhood_vocabulary.json')
+
+        loaded = NeighborhoodEncoder.load(path)
+        frame = loaded.to_frame(pd.Series(['Res-Downtown', 'York'], index=[10, 11]))
+
+        assert list(frame.columns) == ['Fairhaven', 'Res', 'York']
+        assert list(frame.index) == [10, 11]
+        assert frame.sparse.to_dense().values.tolist() == [[0, 1, 0], [0, 0, 1]]
+
+    def test_unfitted(self, tmp_path):
+        """Test that an unfitted encoder refuses to transform or save."""
+        with pytest.raises(ValueError):
+            NeighborhoodEncoder().transform(pd.Series(['York']))
+        with pytest.raises(ValueError):
+            NeighborhoodEncoder().save(tmp_path / 'vocab.json')
+
+    def test_memory_is_proportional_to_tokens(self):
+        """Test that 100k rows over hundreds of tokens stay small."""
+        values = pd.Series([f'Area{i % 400}-Res Zone{i % 7}' for i in range(100000)])
+
+        matrix = NeighborhoodEncoder().fit_transform(values)
+        nbytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+        assert matrix.shape == (100000, 408)
+        assert nbytes < 2 * 1024 * 1024  # the dense int64 equivalent is over 300 MB
@@ -0,0 +1,117 @@
+import json
+import numpy as np
+import pytest
+from src.features.cache import HIT, MISS, FeatureCache, build_cached_features
+from src.features.matrix import (
+    MATRIX_FILE, TARGET_FILE, FeatureMatrix, design_matrix, export_design_matrix, index_path
+)
+from tests.features.test_cache import synthetic_crimes
+from tests.features.test_cleaning import synthetic_sales
+from tests.models.test_predict_model import feature_frame
+
+
+class TestExport:
+    """Test exporting and opening design matrices."""
+
+    def test_round_trip(self, tmp_path):
+        """Test the export holds the design matrix as float32 with its column index."""
+        df = feature_frame(300)
+        index = export_design_matrix(df, tmp_path, source_key='abc')
+        X, y = design_matrix(df)
+
+        matrix = FeatureMatrix.open(tmp_path)
+        assert isinstance(matrix.X, np.memmap)
+        assert matrix.X.dtype == np.float32
+        assert matrix.columns == index['columns'] == list(X.columns)
+        assert index['rows'] == len(X)
+        np.testing.assert_allclose(matrix.X, X.to_numpy(), rtol=1e-6)
+        np.testing.assert_allclose(matrix.y, y.to_numpy())
+
+        sidecar = json.loads(index_path(tmp_path / MATRIX_FILE).read_text())
+        assert sidecar['source_key'] == 'abc'
+
+    def test_chunked_conversion(self, tmp_path, monkeypatch):
+        """Test rows converted chunk by chunk land in order, including a partial last chunk."""
+        monkeypatch.setattr('src.features.matrix._EXPORT_CHUNK_ROWS', 7)
+        df = feature_frame(50)
+        export_design_matrix(df, tmp_path)
+        X, y = design_matrix(df)
+
+        matrix = FeatureMatrix.open(tmp_path)
+        np.testing.assert_allclose(matrix.X, X.to_numpy(), rtol=1e-6)
+        np.testing.assert_allclose(matrix.y, y.to_numpy())
+
+    def test_open_rejects_incomplete_or_stale_exports(self, tmp_path):
+        """Test a missing sidecar or another source key is treated as no export."""
+        assert FeatureMatrix.open(tmp_path) is None
+
+        export_design_matrix(feature_frame(50), tmp_path, source_key='abc')
+        assert FeatureMatrix.open(tmp_path, source_key='other') is None
+        assert FeatureMatrix.open(tmp_path, source_key='abc') is not None
+
+        index_path(tmp_path / MATRIX_FILE).unlink()
+        assert FeatureMatrix.open(tmp_path) is None
+
+    def test_without_target(self, tmp_path):
+        """Test frames without prices export no target."""
+        export_design_matrix(feature_frame(50).drop(columns='Sale Price'), tmp_path)
+
+        matrix = FeatureMatrix.open(tmp_path)
+        assert matrix.y is None
+        assert not (tmp_path / TARGET_FILE).exists()
+
+
+class TestFeatureMatrix:
+    """Test column access on an opened matrix."""
+
+    @pytest.fixture
+    def matrix(self, tmp_path):
+        export_design_matrix(feature_frame(100), tmp_path)
+        return FeatureMatrix.open(tmp_path)
+
+    def test_column_is_a_view(self, matrix):
+        """Test a column is read from the map without a copy."""
+        column = matrix.column('6M_TotalCrime')
+
+        assert np.shares_memory(column, matrix.X)
+        np.testing.assert_array_equal(column, matrix.X[:, matrix.position('6M_TotalCrime')])
+        with pytest.raises(KeyError):
+            matrix.position('Unknown')
+
+    def test_aligned_reorders_and_fills(self, matrix):
+        """Test rows are reordered to another column list with unknown columns as 0."""
+        rows = matrix.X[:10]
+        aligned = matrix.aligned(rows, ['6M_TotalCrime', 'Month_2099-01', 'Built Sq ft_org'])
+
+        np.testing.assert_array_equal(aligned[:, 0], matrix.column('6M_TotalCrime')[:10])
+        assert (aligned[:, 1] == 0).all()
+        np.testing.assert_array_equal(aligned[:, 2], matrix.column('Built Sq ft_org')[:10])
+        assert matrix.aligned(rows, matrix.columns) is rows
+
+
+class TestFeaturePipeline:
+    """Test the export from build_cached_features."""
+
+    def test_exported_once_per_join(self, tmp_path):
+        """Test the matrix is exported with the join and reused while the join is unchanged."""
+        synthetic_sales(300, seed=1).to_csv(tmp_path / 'housing.csv', index=False)
+        synthetic_crimes(1000, seed=2).to_csv(tmp_path / 'crime.csv', index=False)
+
+        cache = FeatureCache(tmp_path / 'cache')
+        joined = build_cached_features(tmp_path / 'housing.csv', tmp_path / 'crime.csv', cache)
+        assert cache.report[-1]['stage'] == 'design_matrix'
+        assert cache.report[-1]['status'] == MISS
+
+        key = cache.manifest('crime_join')['key']
+        matrix = FeatureMatrix.open(cache.root, source_key=key)
+        X, _ = design_matrix(joined)
+        assert matrix.columns == list(X.columns)
+
+        cache = FeatureCache(tmp_path / 'cache')
+        build_cached_features(tmp_path / 'housing.csv', tmp_path / 'crime.csv', cache)
+        assert cache.report[-1]['status'] == HIT
+
+        cache = FeatureCache(tmp_path / 'cache')
+        build_cached_features(tmp_path / 'housing.csv', tmp_path / 'crime.csv', cache, windows=(3, 6))
+        assert cache.report[-1]['status'] == MISS
+        assert FeatureMatrix.open(cache.root, source_key=key) is None
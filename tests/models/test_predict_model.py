@@ -0,0 +1,146 @@
+import json
+import tracemalloc
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+from sklearn.linear_model import LinearRegression
+from src.features.matrix import MATRIX_FILE, export_design_matrix
+from src.models.predict_model import PREDICTION_COLUMN, ModelArtifact, iter_chunks, main, predict_file
+from src.models.train_model import FEATURES_FILE, MODEL_FILE
+
+
+def feature_frame(n, seed=0):
+    """Joined features with a known linear log-price relation."""
+    rng = np.random.default_rng(seed)
+    sqft = rng.integers(600, 3500, n).astype(float)
+    crime = rng.integers(0, 20, n).astype(float)
+    return pd.DataFrame({
+        'Address': [f'{i} STATE ST' for i in range(n)],
+        'type': np.where(np.arange(n) % 10 == 9, 'Land', 'Residential'),
+        'Built Sq ft_org': sqft,
+        '6M_TotalCrime': crime,
+        'Sale Price': np.expm1(11 + sqft / 1000 - crime / 100),
+    })
+
+
+@pytest.fixture
+def artifact():
+    df = feature_frame(500)
+    X = df[['Built Sq ft_org', '6M_TotalCrime']].to_numpy()
+    model = LinearRegression().fit(X, np.log1p(df['Sale Price']))
+    return ModelArtifact(model, ['Built Sq ft_org', '6M_TotalCrime'], {'Built Sq ft_org': 2000.0, '6M_TotalCrime': 0.0})
+
+
+class TestModelArtifact:
+    """Test loading and predicting with an artifact."""
+
+    def test_load_round_trip(self, artifact, tmp_path):
+        """Test an artifact saved like train_model loads with its columns."""
+        joblib.dump(artifact.model, tmp_path / MODEL_FILE)
+        (tmp_path / FEATURES_FILE).write_text(json.dumps(
+            {'columns': artifact.columns, 'fill_values': artifact.fill_values, 'neighborhoods': ['Res']}
+        ))
+
+        loaded = ModelArtifact.load(tmp_path)
+        assert loaded.columns == artifact.columns
+        assert loaded.neighborhoods == ['Res']
+
+    def test_predict_frame_skips_land(self, artifact):
+        """Test predictions recover prices for residential rows only."""
+        df = feature_frame(20, seed=1)
+        predictions = artifact.predict_frame(df)
+
+        residential = df[df['type'] != 'Land']
+        assert list(predictions.index) == list(residential.index)
+        np.testing.assert_allclose(predictions, residential['Sale Price'], rtol=1e-6)
+
+    def test_predict_matrix_checks_width(self, artifact):
+        """Test a design matrix of the wrong width is rejected."""
+        with pytest.raises(ValueError, match='Expected 2'):
+            artifact.predict_matrix(np.zeros((3, 5)))
+
+
+class TestPredictFile:
+    """Test chunked scoring."""
+
+    @pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+    def test_chunked_output_matches_single_pass(self, artifact, tmp_path, suffix):
+        """Test chunked predictions equal scoring the whole frame at once."""
+        df = feature_frame(1000, seed=2)
+        input_path = tmp_path / f'features{suffix}'
+        df.to_csv(input_path, index=False) if suffix == '.csv' else df.to_parquet(input_path)
+
+        report = predict_file(artifact, input_path, tmp_path / f'out{suffix}', chunk_size=64, keep_columns=['Address'])
+        output = pd.read_csv(tmp_path / 'out.csv') if suffix == '.csv' else pd.read_parquet(tmp_path / 'out.parquet')
+
+        expected = artifact.predict_frame(df)
+        assert report['chunks'] == 16
+        assert report['rows'] == len(expected) == 900
+        assert report['rows_per_second'] > 0
+        assert output['Address'].tolist() == df.loc[expected.index, 'Address'].tolist()
+        np.testing.assert_allclose(output[PREDICTION_COLUMN], expected)
+
+    def test_memmap_input(self, artifact, tmp_path):
+        """Test a .npy design matrix is memory-mapped and scored in slices."""
+        X = np.column_stack([np.linspace(600, 3000, 250), np.zeros(250)])
+        np.save(tmp_path / 'X.npy', X)
+
+        chunks = list(iter_chunks(tmp_path / 'X.npy', 100))
+        assert [len(c) for c in chunks] == [100, 100, 50]
+        assert isinstance(chunks[0], np.memmap)
+
+        report = predict_file(artifact, tmp_path / 'X.npy', tmp_path / 'out.csv', chunk_size=100)
+        output = pd.read_csv(tmp_path / 'out.csv')
+        assert report['rows'] == 250
+        np.testing.assert_allclose(output[PREDICTION_COLUMN], artifact.predict_matrix(X))
+
+    def test_exported_matrix_is_realigned(self, artifact, tmp_path):
+        """Test an exported matrix is scored in the model's column order via its sidecar."""
+        df = feature_frame(300)
+        export_design_matrix(df, tmp_path)
+        # The artifact expects the exported columns in the opposite order
+        artifact.columns = ['6M_TotalCrime', 'Built Sq ft_org']
+        artifact.model.coef_ = artifact.model.coef_[::-1]
+
+        predict_file(artifact, tmp_path / MATRIX_FILE, tmp_path / 'out.csv', chunk_size=64)
+        output = pd.read_csv(tmp_path / 'out.csv')
+        np.testing.assert_allclose(output[PREDICTION_COLUMN], artifact.predict_frame(df), rtol=1e-5)
+
+    def test_memory_is_flat_in_input_size(self, artifact, tmp_path):
+        """Test peak traced memory does not grow with the number of rows."""
+        peaks = []
+        for n in (20000, 80000):
+            input_path = tmp_path / f'features_{n}.csv'
+            feature_frame(n, seed=3).to_csv(input_path, index=False)
+
+            tracemalloc.start()
+            predict_file(artifact, input_path, tmp_path / f'out_{n}.csv', chunk_size=5000)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        assert peaks[1] < peaks[0] * 1.5
+
+    def test_unsupported_format(self, artifact, tmp_path):
+        """Test unknown input and output formats are rejected."""
+        (tmp_path / 'features.json').write_text('{}')
+        with pytest.raises(ValueError, match='Unsupported input'):
+            predict_file(artifact, tmp_path / 'features.json', tmp_path / 'out.csv')
+        with pytest.raises(ValueError, match='Unsupported output'):
+            predict_file(artifact, tmp_path / 'features.json', tmp_path / 'out.txt')
+
+    def test_cli(self, artifact, tmp_path):
+        """Test the command scores a file and reports throughput."""
+        joblib.dump(artifact.model, tmp_path / MODEL_FILE)
+        (tmp_path / FEATURES_FILE).write_text(json.dumps(
+            {'columns': artifact.columns, 'fill_values': artifact.fill_values}
+        ))
+        feature_frame(100).to_csv(tmp_path / 'features.csv', index=False)
+
+        result = CliRunner().invoke(main, [str(tmp_path), str(tmp_path / 'features.csv'),
+                                           str(tmp_path / 'out.csv'), '--chunk-size', '30', '--keep', 'Address'])
+
+        assert result.exit_code == 0, result.output
+        assert 'Scored 90 rows in 4 chunks' in result.output
+        assert list(pd.read_csv(tmp_path / 'out.csv').columns) == ['Address', PREDICTION_COLUMN]
@@ -0,0 +1,189 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from src.features.build_features import CrimeWindowIndex
+from src.models.predict_model import ModelArtifact
+from src.models.serve import FeatureBuilder, LRUCache, MicroBatcher, PredictionService
+
+
+COLUMNS = ['Built Sq ft_org', '6M_Property', '6M_Violent', '6M_TotalCrime', 'Res', 'York', 'Month_2020-03']
+
+
+@pytest.fixture
+def crime_index():
+    crime = pd.DataFrame({
+        'Location': ['1200 STATE ST'] * 3 + ['100 MAIN ST'],
+        'Month': pd.PeriodIndex(['2020-01', '2020-02', '2019-01', '2020-02'], freq='M'),
+        'Crime Category': ['Property', 'Violent', 'Property', 'Property'],
+    })
+    return CrimeWindowIndex(crime)
+
+
+@pytest.fixture
+def artifact():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, len(COLUMNS)))
+    y = 12 + X @ np.linspace(0.1, 0.7, len(COLUMNS))
+    return ModelArtifact(LinearRegression().fit(X, y), COLUMNS, {'Built Sq ft_org': 1500.0}, ['Res', 'York'])
+
+
+def post(url, payload):
+    request = Request(url, data=json.dumps(payload).encode('utf-8'), headers={'Content-Type': 'application/json'})
+    with urlopen(request) as response:
+        return json.loads(response.read())
+
+
+class TestLRUCache:
+    """Test the feature vector cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test reads refresh entries and the oldest entry is evicted."""
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        assert (cache.hits, cache.misses) == (3, 1)
+
+
+class TestFeatureBuilder:
+    """Test per-request feature vectors."""
+
+    def test_vectors_follow_model_columns(self, artifact, crime_index):
+        """Test crime windows, neighborhood words, month dummies and fill values."""
+        builder = FeatureBuilder(artifact, crime_index)
+        X = builder.build([
+            {'Address': '1234 STATE ST', 'Month': '2020-03', 'Built Sq ft_org': 1800, 'Neighborhood_org': 'York'},
+            {'Address': '150 MAIN ST\nBELLINGHAM', 'Sale Date_part1': '04/15/2020'},
+        ])
+
+        assert builder.windows == [6]
+        np.testing.assert_array_equal(X, [
+            [1800, 1, 1, 2, 0, 1, 1],
+            [1500, 1, 0, 1, 0, 0, 0],
+        ])
+
+    def test_bad_value_does_not_affect_other_records(self, artifact, crime_index):
+        """Test a non-numeric field only falls back to the fill value for its own record."""
+        builder = FeatureBuilder(artifact, crime_index)
+        honest = {'Address': '1234 STATE ST', 'Month': '2020-03', 'Built Sq ft_org': 1800}
+        alone = builder.build([honest])
+
+        builder = FeatureBuilder(artifact, crime_index)
+        batched = builder.build([honest, {'Address': '150 MAIN ST', 'Month': '2020-03', 'Built Sq ft_org': 'abc'}])
+
+        np.testing.assert_array_equal(batched[0], alone[0])
+        assert batched[1][0] == 1500
+
+    def test_repeated_records_hit_cache(self, artifact, crime_index):
+        """Test a record seen before is served from the cache."""
+        builder = FeatureBuilder(artifact, crime_index)
+        record = {'Address': '1234 STATE ST', 'Month': '2020-03'}
+        first = builder.build([record])
+        second = builder.build([dict(record)])
+
+        np.testing.assert_array_equal(first, second)
+        assert (builder.cache.hits, builder.cache.misses) == (1, 1)
+
+
+class TestMicroBatcher:
+    """Test request batching."""
+
+    def test_concurrent_submissions_share_batches(self):
+        """Test records arriving together are predicted in one call."""
+        calls = []
+
+        def predict_batch(records):
+            calls.append(len(records))
+            return np.array([record['x'] * 2 for record in records])
+
+        batcher = MicroBatcher(predict_batch, max_batch=16, max_wait_ms=50).start()
+        try:
+            futures = [batcher.submit({'x': i}) for i in range(40)]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            batcher.stop()
+
+        assert results == [i * 2.0 for i in range(40)]
+        assert max(calls) == 16
+        assert len(calls) < 40
+
+    def test_errors_reach_every_caller(self):
+        """Test a failing batch fails each of its futures."""
+        def predict_batch(records):
+            raise RuntimeError('model failed')
+
+        batcher = MicroBatcher(predict_batch).start()
+        try:
+            with pytest.raises(RuntimeError, match='model failed'):
+                batcher.submit({}).result(timeout=5)
+        finally:
+            batcher.stop()
+
+
+class TestPredictionService:
+    """Test the HTTP service."""
+
+    @pytest.fixture
+    def service(self, artifact, crime_index):
+        service = PredictionService(artifact, crime_index, port=0, max_wait_ms=20).start()
+        yield service
+        service.stop()
+
+    def test_predict_matches_artifact(self, service, artifact, crime_index):
+        """Test HTTP predictions equal building features and predicting directly."""
+        records = [{'Address': '1234 STATE ST', 'Month': '2020-03'}, {'Address': '150 MAIN ST', 'Month': '2020-04'}]
+        response = post(service.url + '/predict', records)
+
+        expected = artifact.predict_matrix(FeatureBuilder(artifact, crime_index).build(records))
+        np.testing.assert_allclose(response['predictions'], expected)
+        assert post(service.url + '/predict', records[0])['predictions'] == [response['predictions'][0]]
+
+    def test_concurrent_requests_are_batched(self, service):
+        """Test parallel clients are micro-batched and stats report latency percentiles."""
+        results = []
+
+        def client(i):
+            results.append(post(service.url + '/predict', {'Address': f'{i} STATE ST', 'Month': '2020-03'}))
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with urlopen(service.url + '/stats') as response:
+            stats = json.loads(response.read())
+
+        assert len(results) == 32
+        assert stats['requests'] == 32 and stats['errors'] == 0
+        assert stats['batches'] < 32
+        assert stats['mean_batch_size'] > 1
+        assert 0 < stats['latency_p50_ms'] <= stats['latency_p99_ms'] <= stats['latency_max_ms']
+
+    def test_invalid_requests(self, service):
+        """Test malformed bodies and unknown paths are rejected."""
+        with pytest.raises(HTTPError) as error:
+            post(service.url + '/predict', {'Month': '2020-03'})
+        assert error.value.code == 400
+
+        for record in ({'Address': '1 STATE ST'}, {'Address': '1 STATE ST', 'Month': 'someday'},
+                       {'Address': '1 STATE ST', 'Month': '2020-03', 'Built Sq ft_org': 'abc'}):
+            with pytest.raises(HTTPError) as error:
+                post(service.url + '/predict', [{'Address': '2 STATE ST', 'Month': '2020-03'}, record])
+            assert error.value.code == 400
+
+        with pytest.raises(HTTPError) as error:
+            urlopen(service.url + '/unknown')
+        assert error.value.code == 404
+
+        with urlopen(service.url + '/health') as response:
+            assert json.loads(response.read())['features'] == len(COLUMNS)
@@ -0,0 +1,137 @@
+import json
+import joblib
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from src.features.cache import FeatureCache, build_cached_features
+from src.features.matrix import FeatureMatrix
+from src.models.train_model import (
+    FEATURES_FILE, METRICS_FILE, MODEL_FILE, candidates, design_matrix, main, search, train, train_matrix
+)
+from tests.features.test_cache import synthetic_crimes
+from tests.features.test_cleaning import synthetic_sales
+
+
+SMALL_GRID = {'linear': {}, 'ridge': {'alpha': [1.0, 10.0]}}
+
+
+@pytest.fixture(scope='module')
+def features_dir(tmp_path_factory):
+    """Feature cache built from synthetic raw sales and crimes."""
+    root = tmp_path_factory.mktemp('features')
+    synthetic_sales(600, seed=1).to_csv(root / 'housing.csv', index=False)
+    synthetic_crimes(3000, seed=2).to_csv(root / 'crime.csv', index=False)
+    build_cached_features(root / 'housing.csv', root / 'crime.csv', FeatureCache(root / 'cache'))
+    return root / 'cache'
+
+
+@pytest.fixture(scope='module')
+def features(features_dir):
+    cache = FeatureCache(features_dir)
+    return cache.load('crime_join', cache.manifest('crime_join'))
+
+
+class TestDesignMatrix:
+    """Test model input construction."""
+
+    def test_drops_land_and_identifiers(self, features):
+        """Test land sales and text columns are removed and the target is log1p."""
+        X, y = design_matrix(features)
+        residential = features[features['type'] != 'Land']
+
+        assert len(X) == len(y) == len(residential)
+        assert not {'Address', 'Address Block', 'Sale Price'} & set(X.columns)
+        assert any(c.startswith('Month_') for c in X.columns)
+        assert X.dtypes.eq(float).all()
+        np.testing.assert_allclose(y, np.log1p(residential['Sale Price']))
+
+    def test_aligns_to_trained_columns(self, features):
+        """Test prediction inputs get exactly the training columns."""
+        X, _ = design_matrix(features)
+        columns = list(X.columns) + ['Month_2099-01']
+        aligned, _ = design_matrix(features.head(5), columns=columns, fill_values={})
+
+        assert list(aligned.columns) == columns
+        assert (aligned['Month_2099-01'] == 0).all()
+
+
+class TestSearch:
+    """Test the parallel grid search."""
+
+    def test_candidates_expand_grid(self):
+        """Test every parameter combination becomes one candidate."""
+        assert candidates(SMALL_GRID) == [('linear', {}), ('ridge', {'alpha': 1.0}), ('ridge', {'alpha': 10.0})]
+        with pytest.raises(ValueError):
+            candidates({'unknown': {}})
+
+    def test_parallel_matches_serial(self):
+        """Test results do not depend on the number of workers."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 5))
+        y = X @ np.array([1.0, -2.0, 0.5, 0.0, 3.0]) + rng.normal(scale=0.1, size=200)
+
+        parallel = search(X, y, SMALL_GRID, n_splits=4, n_jobs=2)
+        serial = search(X, y, SMALL_GRID, n_splits=4, n_jobs=1)
+
+        assert [(r['estimator'], r['params']) for r in parallel] == [(r['estimator'], r['params']) for r in serial]
+        np.testing.assert_allclose([r['rmse'] for r in parallel], [r['rmse'] for r in serial])
+        assert parallel[0]['rmse'] < 0.2
+        assert parallel[0]['r2'] > 0.99
+
+    def test_constant_target_scores_finite(self):
+        """Test folds with a constant target get a finite R^2."""
+        X = np.random.default_rng(0).normal(size=(40, 3))
+        y = np.full(40, 12.5)
+
+        results = search(X, y, SMALL_GRID, n_splits=4, n_jobs=1)
+
+        assert all(np.isfinite(r['r2']) for r in results)
+
+
+class TestTrain:
+    """Test training artifacts."""
+
+    def test_saves_best_model_metrics_and_features(self, features, tmp_path):
+        """Test the artifacts reproduce the design matrix and the best candidate."""
+        metrics = train(features, tmp_path, grid=SMALL_GRID, n_splits=3, n_jobs=2, neighborhoods=['Res'])
+
+        saved = json.loads((tmp_path / METRICS_FILE).read_text())
+        assert saved['best'] == metrics['best']
+        assert len(saved['leaderboard']) == 3
+        assert saved['best']['rmse'] == min(r['rmse'] for r in saved['leaderboard'])
+
+        vocabulary = json.loads((tmp_path / FEATURES_FILE).read_text())
+        assert vocabulary['neighborhoods'] == ['Res']
+        X, _ = design_matrix(features, vocabulary['columns'], vocabulary['fill_values'])
+        model = joblib.load(tmp_path / MODEL_FILE)
+        assert model.predict(X.to_numpy()).shape == (len(X),)
+
+    def test_matrix_matches_frame(self, features, features_dir, tmp_path):
+        """Test training on the exported float32 matrix matches training on the frame."""
+        matrix = FeatureMatrix.open(features_dir)
+        from_matrix = train_matrix(matrix, tmp_path / 'matrix', grid=SMALL_GRID, n_splits=3, n_jobs=2)
+        from_frame = train(features, tmp_path / 'frame', grid=SMALL_GRID, n_splits=3, n_jobs=2)
+
+        assert from_matrix['rows'] == from_frame['rows']
+        assert from_matrix['best']['estimator'] == from_frame['best']['estimator']
+        np.testing.assert_allclose(from_matrix['best']['rmse'], from_frame['best']['rmse'], rtol=1e-3)
+        saved = json.loads((tmp_path / 'matrix' / FEATURES_FILE).read_text())
+        assert saved['columns'] == matrix.columns
+
+    def test_cli(self, features_dir, tmp_path):
+        """Test the entry point trains from the feature cache."""
+        result = CliRunner().invoke(main, [str(features_dir), str(tmp_path / 'model'),
+                                           '--estimator', 'ridge', '--folds', '3', '--jobs', '2'])
+
+        assert result.exit_code == 0, result.output
+        assert 'Using exported design matrix' in result.output
+        assert 'Best: ridge' in result.output
+        features = json.loads((tmp_path / 'model' / FEATURES_FILE).read_text())
+        assert features['neighborhoods'] == ['Fairhaven', 'Res', 'Sunnyland', 'York']
+
+    def test_cli_requires_cached_features(self, tmp_path):
+        """Test a directory without cached features is reported."""
+        result = CliRunner().invoke(main, [str(tmp_path), str(tmp_path / 'model')])
+
+        assert result.exit_code != 0
+        assert 'No cached' in result.output
@@ -0,0 +1,92 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+from src.visualization.visualize import (
+    MANIFEST_FILE, figure_path, quarterly_category_counts, render_figures, visualize
+)
+
+
+def notebook_counts(data):
+    """The CrimeData_EDA notebook's per-quarter category grouping."""
+    data = data.copy()
+    data['Quarter'] = pd.to_datetime(data.Date).dt.to_period('Q')
+    return data.groupby(['Quarter', 'Crime Category'])['Case'].count().reset_index()
+
+
+@pytest.fixture
+def crimes():
+    rng = np.random.default_rng(3)
+    n = 2000
+    return pd.DataFrame({
+        'Date': pd.date_range('2015-01-01', periods=2000, freq='D').strftime('%m/%d/%Y')[rng.integers(0, 2000, n)],
+        'Crime Category': rng.choice(['property crime', 'violent crimes', 'drug - narcotics violations'], n),
+        'Case': np.where(rng.random(n) < 0.9, 'C', None),
+    })
+
+
+class TestQuarterlyCounts:
+    """Test the quarter x category aggregate."""
+
+    def test_matches_notebook_grouping(self, crimes):
+        """Test one crosstab equals the notebook's groupby counts."""
+        counts = quarterly_category_counts(crimes, case_column='Case')
+        expected = notebook_counts(crimes)
+
+        stacked = counts.stack()
+        stacked = stacked[stacked > 0]
+        for row in expected.itertuples():
+            assert stacked[(row.Quarter, row._2)] == row.Case
+        assert stacked.sum() == expected['Case'].sum()
+
+
+class TestRenderFigures:
+    """Test parallel rendering and skipping unchanged charts."""
+
+    def test_renders_then_skips_unchanged(self, crimes, tmp_path):
+        """Test a second render only redraws categories whose counts changed."""
+        counts = quarterly_category_counts(crimes)
+        first = render_figures(counts, tmp_path, jobs=2)
+
+        assert sorted(first['rendered']) == sorted(counts.columns)
+        for category in counts.columns:
+            assert figure_path(tmp_path, category).read_bytes()[:8] == b'\x89PNG\r\n\x1a\n'
+
+        changed = pd.concat([crimes, crimes.head(1).assign(**{'Crime Category': 'violent crimes'})])
+        second = render_figures(quarterly_category_counts(changed), tmp_path, jobs=2)
+
+        assert second['rendered'] == ['violent crimes']
+        assert sorted(second['skipped']) == ['drug - narcotics violations', 'property crime']
+
+    def test_missing_file_and_force_rerender(self, crimes, tmp_path):
+        """Test deleted charts are redrawn and force redraws everything."""
+        counts = quarterly_category_counts(crimes)
+        render_figures(counts, tmp_path, jobs=1)
+
+        figure_path(tmp_path, 'property crime').unlink()
+        assert render_figures(counts, tmp_path, jobs=1)['rendered'] == ['property crime']
+        assert len(render_figures(counts, tmp_path, jobs=1, force=True)['rendered']) == 3
+
+        manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+        assert sorted(manifest) == sorted(counts.columns)
+
+    def test_cli(self, crimes, tmp_path):
+        """Test the command renders from a crime CSV."""
+        crimes.to_csv(tmp_path / 'crime.csv', index=False)
+        args = [str(tmp_path / 'crime.csv'), str(tmp_path / 'figures'), '--case-column', 'Case', '--jobs', '2']
+
+        result = CliRunner().invoke(visualize, args)
+        assert result.exit_code == 0, result.output
+        assert 'Rendered 3 charts' in result.output
+
+        result = CliRunner().invoke(visualize, args)
+        assert 'Rendered 0 charts' in result.output and '3 unchanged' in result.output
+
+    def test_cli_missing_column(self, crimes, tmp_path):
+        """Test a missing column is reported."""
+        crimes.to_csv(tmp_path / 'crime.csv', index=False)
+        result = CliRunner().invoke(visualize, [str(tmp_path / 'crime.csv'), str(tmp_path), '--case-column', 'Nope'])
+
+        assert result.exit_code != 0
+        assert 'Nope' in result.output